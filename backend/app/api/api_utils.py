@@ -1,29 +1,292 @@
 """
-Data Validation Function for Experiments
+Request Utilities for Experiments
 
-This function is designed to validate experiment data in the Flask application.
+These functions validate experiment data and read uploaded experiment files in the Flask application.
 
 Features:
 - Utilizes a custom validation function 'validate_table_data' to check the integrity and format of experiment data.
 - Handles the validation process for the data received from API requests.
-- Catches any ValueError raised during validation and returns an error response.
+- Catches any ValueError raised during validation and returns an error response, listing every problem found under
+  'issues' next to the first error message in 'error'.
 - Returns None if the data passes validation, indicating no errors.
+- Reads an uploaded CSV or Parquet experiment, sent as the 'file' part of a multipart form or as the raw request body,
+  straight into an ExperimentMatrix with 'read_experiment_upload'.
+- Reports the first malformed cell of an upload with its row and column, then checks the parsed values
+  (non-finite values, duplicate names) and reports all of their problems at once.
+- Reads the optional bootstrap settings of an analysis request ('bootstrapReplicates', 'bootstrapSeed' and
+  'bootstrapConfidence') with 'read_bootstrap_options'.
+- Reads the optional permutation p-value settings ('pValueMode', 'permutations', 'permutationSeed' and 'earlyStopping')
+  with 'read_permutation_options'.
+- Reads the raw results of every run ('experimentRuns', a table whose cells are lists of run results) into a RunMatrix
+  and aggregates them per cell as 'aggregation' and 'aggregationPercentile' ask with 'read_run_matrix'.
+- Reads the experiment of an analysis request, from 'experimentRuns' when given and 'experimentData' otherwise, with
+  'read_analysis_matrix'.
+- Builds the analysis request of a stored experiment with 'read_stored_analysis': the stored alpha, optimization mode,
+  name and description are the defaults, 'selectedAlgorithms' picks algorithms by name instead of by row number, and
+  'aggregation' re-aggregates the stored runs.
+- Reads a batch of streamed results ('records' of 'algorithm', 'benchmark', 'value' and, outside an experiment's own
+  route, 'experimentId') grouped by experiment with 'read_result_records'.
 
 Usage:
-This function is called to validate experiment data before processing it further (e.g., storing it in the database).
+These functions are called to validate experiment data before processing it further (e.g., storing it in the database).
 
 Example:
 validation_response = validate_and_return(experiment_data)
 if validation_response:
     # Handle error response
+
+experiment_matrix, fields, error_response = read_experiment_upload()
+bootstrap_options, error_response = read_bootstrap_options(payload)
+permutation_options, error_response = read_permutation_options(payload)
+records_by_experiment, error_response = read_result_records(payload)
+analysis_payload, experiment_matrix, run_matrix, error_response = read_stored_analysis(payload, experiment)
+experiment_matrix, run_matrix, error_response = read_analysis_matrix(payload, optimization_mode)
 """
 
-from flask import jsonify
-from app.util.validation.experiment_validation import validate_table_data
+import math
+import os
+import shutil
+import tempfile
+from flask import jsonify, request
+from app.util.validation.experiment_validation import validate_table_data, collect_matrix_issues, \
+    has_errors, ExperimentValidationError
+from app.util.conversion.experiment_matrix import ExperimentMatrix
+from app.util.conversion.run_matrix import RunMatrix, DEFAULT_AGGREGATION
+from app.util.conversion.experiment_stream import read_experiment_csv, read_experiment_parquet, UploadValidationError
+from app.constants.optimization_mode import OptimizationMode
+from app.services.stats.resampling import BootstrapOptions, MAX_BOOTSTRAP_REPLICATES, PermutationOptions, MAX_PERMUTATIONS
+
+P_VALUE_MODES = ('asymptotic', 'permutation')
+
+MAX_STREAMED_RECORDS = int(os.environ.get('STREAMED_RECORDS_MAX', 100_000))
+
+PARQUET_CONTENT_TYPES = ('application/vnd.apache.parquet', 'application/x-parquet', 'application/parquet')
 
 def validate_and_return(experiment_data):
     try:
         validate_table_data(experiment_data)
+    except ExperimentValidationError as error:
+        return jsonify(error.to_dict()), 400
     except ValueError as error:
         return jsonify({"error": str(error)}), 400
     return None
+
+def read_experiment_upload():
+    """
+    Reads the experiment uploaded with the current request.
+
+    Multipart requests carry the file in the 'file' part and the other fields as form fields; raw requests carry the
+    file as the body and the other fields as query parameters. Parquet is detected from a '.parquet' file name, a
+    Parquet content type or a 'format=parquet' field; anything else is read as CSV.
+
+    :return: A tuple of the ExperimentMatrix (or None), a dictionary of the other fields, and an error response (or None).
+    """
+    if request.mimetype == 'multipart/form-data':
+        upload = request.files.get('file')
+        if upload is None:
+            return None, {}, (jsonify({"error": "The multipart request has no 'file' part."}), 400)
+        fields = request.form.to_dict()
+        stream = upload.stream
+        is_parquet = (upload.filename or '').lower().endswith(('.parquet', '.pq')) or upload.mimetype in PARQUET_CONTENT_TYPES
+    else:
+        fields = request.args.to_dict()
+        stream = request.stream
+        is_parquet = request.mimetype in PARQUET_CONTENT_TYPES
+
+    is_parquet = is_parquet or fields.get('format', '').lower() == 'parquet'
+
+    try:
+        if is_parquet:
+            # Parquet needs random access to its footer, so the body is spooled to a temporary file first.
+            with tempfile.TemporaryFile() as spooled:
+                shutil.copyfileobj(stream, spooled)
+                spooled.seek(0)
+                experiment_matrix = read_experiment_parquet(spooled)
+        else:
+            experiment_matrix = read_experiment_csv(stream, delimiter=fields.get('delimiter', ','))
+    except UploadValidationError as error:
+        return None, fields, (jsonify(error.to_dict()), 400)
+    except RuntimeError as error:
+        return None, fields, (jsonify({"error": str(error)}), 415)
+
+    issues, truncated = collect_matrix_issues(experiment_matrix)
+    if has_errors(issues):
+        return None, fields, (jsonify(ExperimentValidationError(issues, truncated).to_dict()), 400)
+
+    return experiment_matrix, fields, None
+
+def read_run_matrix(runs_table, aggregation, percentile, optimization_mode):
+    """
+    Reads the raw run results of an experiment and aggregates every cell. The table gets the same corner, name and
+    row-length checks as 'experimentData' before the run block is built, and every problem is listed under 'issues'.
+
+    :param runs_table: A table whose first row holds the benchmark names, whose first column holds the algorithm names
+                       and whose cells hold lists of run results
+    :param aggregation: One of the RunMatrix aggregations, 'mean' when empty
+    :param percentile: The percentile of the 'percentile' aggregation, or None
+    :return: A tuple of the RunMatrix (or None), the aggregated ExperimentMatrix (or None) and an error response (or None).
+    """
+    try:
+        run_matrix = RunMatrix.from_table(runs_table)
+        percentile = None if percentile in (None, '') else float(percentile)
+        experiment_matrix = run_matrix.aggregate(aggregation or DEFAULT_AGGREGATION, optimization_mode, percentile)
+    except ExperimentValidationError as error:
+        return None, None, (jsonify(error.to_dict()), 400)
+    except (TypeError, ValueError, IndexError) as error:
+        return None, None, (jsonify({"error": str(error)}), 400)
+
+    issues, truncated = collect_matrix_issues(experiment_matrix)
+    if has_errors(issues):
+        return None, None, (jsonify(ExperimentValidationError(issues, truncated).to_dict()), 400)
+
+    return run_matrix, experiment_matrix, None
+
+def read_analysis_matrix(payload, optimization_mode):
+    """
+    Reads the experiment of an analysis request: the aggregated runs of 'experimentRuns' when the request has them,
+    and the one result per cell of 'experimentData' otherwise.
+
+    :return: A tuple of the ExperimentMatrix (or None), the RunMatrix (or None) and an error response (or None).
+    """
+    if payload.get('experimentRuns') is not None:
+        run_matrix, experiment_matrix, error_response = read_run_matrix(payload['experimentRuns'], payload.get('aggregation'),
+                                                                        payload.get('aggregationPercentile'), optimization_mode)
+        return experiment_matrix, run_matrix, error_response
+
+    error_response = validate_and_return(payload['experimentData'])
+    if error_response is not None:
+        return None, None, error_response
+    return ExperimentMatrix.from_table(payload['experimentData']), None, None
+
+def read_stored_analysis(payload, experiment):
+    """
+    Builds the analysis request of a stored experiment. The request's 'alpha' and 'optimizationMode' override the
+    stored settings, and 'selectedAlgorithms' (names) replaces 'selectedRows' (1-based row numbers) when given.
+
+    :param experiment: The CachedExperiment of the stored experiment
+    :return: A tuple of the analysis payload, the ExperimentMatrix, the RunMatrix (or None) and an error response (or
+             None).
+    """
+    settings = experiment.settings
+    analysis_payload = dict(payload)
+    analysis_payload['experimentName'] = experiment.experiment_name
+    analysis_payload['experimentDescription'] = payload.get('experimentDescription') or experiment.experiment_description
+    analysis_payload['alpha'] = payload.get('alpha', settings.get('alpha', 0.05))
+    analysis_payload['optimizationMode'] = payload.get('optimizationMode') or settings.get('optimizationMode', 'minimize')
+
+    experiment_matrix = experiment.experiment_matrix
+    selected_algorithms = payload.get('selectedAlgorithms')
+    if selected_algorithms is not None:
+        rows = {name: row for row, name in enumerate(experiment_matrix.algorithm_names, start=1)}
+        unknown = [name for name in selected_algorithms if name not in rows]
+        if unknown:
+            return None, None, None, (jsonify({"error": f"Unknown algorithms: {', '.join(map(str, unknown))}."}), 400)
+        analysis_payload['selectedRows'] = [rows[name] for name in selected_algorithms]
+    else:
+        analysis_payload['selectedRows'] = payload.get('selectedRows', [])
+
+    run_matrix = experiment.run_matrix
+    aggregation = payload.get('aggregation')
+    if run_matrix is None:
+        if aggregation:
+            return None, None, None, (jsonify({"error": f"Experiment {experiment.experiment_name} has no stored runs to aggregate."}), 400)
+        return analysis_payload, experiment_matrix, None, None
+
+    # The stored cells hold the runs aggregated as the stored settings ask; 'best', 'worst' and percentiles also
+    # depend on the optimization mode, so a request differing in any of the three re-aggregates the runs.
+    stored = (settings.get('aggregation') or DEFAULT_AGGREGATION, settings.get('aggregationPercentile'),
+              settings.get('optimizationMode', 'minimize'))
+    requested = (aggregation or stored[0], payload.get('aggregationPercentile') if aggregation else stored[1],
+                 analysis_payload['optimizationMode'])
+    analysis_payload['aggregation'], analysis_payload['aggregationPercentile'] = requested[:2]
+    if requested != stored:
+        optimization_mode = OptimizationMode.MINIMIZE if requested[2] == 'minimize' else OptimizationMode.MAXIMIZE
+        try:
+            percentile = None if requested[1] in (None, '') else float(requested[1])
+            experiment_matrix = run_matrix.aggregate(requested[0], optimization_mode, percentile)
+        except (TypeError, ValueError) as error:
+            return None, None, None, (jsonify({"error": str(error)}), 400)
+
+    return analysis_payload, experiment_matrix, run_matrix, None
+
+def read_bootstrap_options(payload):
+    """
+    Reads the bootstrap settings of an analysis request. The bootstrap is off unless 'bootstrapReplicates' is positive;
+    the seed defaults to 0 and the confidence level to 0.95.
+
+    :return: A tuple of the BootstrapOptions (or None when the bootstrap is off) and an error response (or None).
+    """
+    try:
+        replicates = int(payload.get('bootstrapReplicates') or 0)
+        seed = int(payload.get('bootstrapSeed') or 0)
+        confidence = float(payload.get('bootstrapConfidence') or 0.95)
+    except (TypeError, ValueError):
+        return None, (jsonify({"error": "Bootstrap replicates and seed must be integers and the confidence a number."}), 400)
+
+    if replicates <= 0:
+        return None, None
+    if replicates > MAX_BOOTSTRAP_REPLICATES:
+        return None, (jsonify({"error": f"At most {MAX_BOOTSTRAP_REPLICATES} bootstrap replicates are allowed."}), 400)
+    if not 0 < confidence < 1 or seed < 0:
+        return None, (jsonify({"error": "The bootstrap confidence must lie between 0 and 1 and the seed must not be negative."}), 400)
+
+    return BootstrapOptions(replicates, seed, confidence), None
+
+def read_permutation_options(payload):
+    """
+    Reads the permutation settings of an analysis request. Permutation p-values are computed when 'pValueMode' is
+    'permutation'; up to 'permutations' (default 10000) Monte Carlo permutations are drawn from 'permutationSeed'
+    (default 0), stopping early unless 'earlyStopping' is false.
+
+    :return: A tuple of the PermutationOptions (or None for asymptotic p-values) and an error response (or None).
+    """
+    mode = payload.get('pValueMode') or 'asymptotic'
+    if mode not in P_VALUE_MODES:
+        return None, (jsonify({"error": f"Invalid p-value mode: {mode}. Use one of: {', '.join(P_VALUE_MODES)}."}), 400)
+    if mode == 'asymptotic':
+        return None, None
+
+    try:
+        permutations = int(payload.get('permutations') or 10000)
+        seed = int(payload.get('permutationSeed') or 0)
+    except (TypeError, ValueError):
+        return None, (jsonify({"error": "The number of permutations and the permutation seed must be integers."}), 400)
+
+    if not 0 < permutations <= MAX_PERMUTATIONS or seed < 0:
+        return None, (jsonify({"error": f"The number of permutations must lie between 1 and {MAX_PERMUTATIONS} and the seed must not be negative."}), 400)
+
+    early_stopping = payload.get('earlyStopping', True)
+    if isinstance(early_stopping, str):
+        early_stopping = early_stopping.lower() not in ('0', 'false', 'no')
+
+    return PermutationOptions(permutations, seed, bool(early_stopping)), None
+
+def read_result_records(payload, experiment_id=None):
+    """
+    Reads a batch of streamed results. Every record names an algorithm, a benchmark and a finite value; records sent to
+    a route without an experiment ID also carry an integer 'experimentId'.
+
+    :return: A tuple of a dictionary mapping experiment IDs to lists of (algorithm, benchmark, value) tuples, in
+             ascending ID order, and an error response (or None).
+    """
+    records = (payload or {}).get('records')
+    if not isinstance(records, list) or not records:
+        return None, (jsonify({"error": "Missing required field: records"}), 400)
+    if len(records) > MAX_STREAMED_RECORDS:
+        return None, (jsonify({"error": f"A batch may hold at most {MAX_STREAMED_RECORDS} records, got {len(records)}."}), 400)
+
+    grouped = {}
+    for index, record in enumerate(records):
+        try:
+            record_experiment = experiment_id if experiment_id is not None else int(record['experimentId'])
+            algorithm = str(record['algorithm']).strip()
+            benchmark = str(record['benchmark']).strip()
+            value = float(record['value'])
+        except (KeyError, TypeError, ValueError):
+            return None, (jsonify({"error": f"Record {index + 1} must have an algorithm, a benchmark, a numeric value"
+                                            f"{'' if experiment_id is not None else ' and an integer experimentId'}."}), 400)
+        if not algorithm or not benchmark or not math.isfinite(value):
+            return None, (jsonify({"error": f"Record {index + 1} has an empty name or a non-finite value."}), 400)
+        grouped.setdefault(record_experiment, []).append((algorithm, benchmark, value))
+
+    return dict(sorted(grouped.items())), None
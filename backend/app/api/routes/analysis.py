@@ -4,7 +4,14 @@ Analysis Blueprint for Flask Application
 This script defines the analysis Blueprint for handling different types of analysis requests in the Flask application.
 
 Features:
-- Defines routes for pairwise, control, and all analysis types.
+- Defines routes for pairwise, pairwise matrix (all pairs with Wilcoxon and a family-wise correction), control, and all analysis types.
+- Defines an upload route that analyses a CSV or Parquet file directly, synchronously or as a job.
+- Defines a route that analyses a stored experiment, given by ID or name, with any analysis type, synchronously or as a
+  job. The decoded matrix comes from the per-worker cache of stored experiments while its version is current, so the
+  request carries neither the matrix nor a copy of it, and selects algorithms by name ('selectedAlgorithms').
+- Defines job routes to submit an analysis to the background process pool, poll its status, fetch its result and cancel it.
+- Exposes hit and miss counters of the analysis result cache and of the stored experiment cache.
+- Renders critical difference plots on demand, as SVG (the default) or PNG, from the plot handles returned by control and all analyses.
 - Implements an 'analyse' function that processes the analysis requests based on the analysis type.
 - Utilizes specific functions for each analysis type to handle the computation.
 - Includes error handling for invalid analysis types and exceptions during analysis processing.
@@ -21,10 +28,22 @@ from app import app
 app.register_blueprint(analysis)
 """
 
-from flask import Blueprint, request, jsonify
-from app.api.routes.analysis_types.pairwise_analysis import request_pairwise_analysis
-from app.api.routes.analysis_types.control_analysis  import request_control_analysis
-from app.api.routes.analysis_types.all_analysis  import request_all_analysis
+from flask import Blueprint, Response, request, jsonify
+import base64
+import math
+from app.api.routes.analysis_types.pairwise_analysis import request_pairwise_analysis, prepare_pairwise_analysis
+from app.api.routes.analysis_types.pairwise_matrix_analysis import request_pairwise_matrix_analysis, prepare_pairwise_matrix_analysis
+from app.api.routes.analysis_types.control_analysis  import request_control_analysis, prepare_control_analysis
+from app.api.routes.analysis_types.all_analysis  import request_all_analysis, prepare_all_analysis
+from app.api.routes.analysis_types.analysis_task import AnalysisTask
+from app.util.cache.analysis_cache import analysis_cache
+from app.util.cache.experiment_cache import experiment_cache
+from app.db.database import get_db
+from app.db.helpers.stored_experiment import get_stored_experiment
+from app.util.graphs.cd_plot_store import render_cd_plot
+from app.util.graphs.critical_difference_plots import DEFAULT_FIGSIZE, DEFAULT_DPI
+from app.api.api_utils import read_experiment_upload, read_stored_analysis
+from app.util.jobs.job_queue import job_queue, JobQueueFullError, COMPLETED, PENDING, RUNNING, TIMED_OUT, CANCELLED
 import logging
 
 logging.basicConfig(level=logging.DEBUG)
@@ -36,6 +55,8 @@ def analyse(payload):
     try:
         if analysis_type == 'pairwise':
             result = request_pairwise_analysis(payload)
+        elif analysis_type == 'pairwise-matrix':
+            result = request_pairwise_matrix_analysis(payload)
         elif analysis_type == 'control':
             result = request_control_analysis(payload)
         elif analysis_type == 'all':
@@ -45,6 +66,9 @@ def analyse(payload):
     except Exception as e:
         return jsonify({"error": f"An error occurred while executing {analysis_type}: {str(e)}"}), 500
 
+    if isinstance(result, tuple):
+        return result
+
     return jsonify({"message": f"{analysis_type} executed successfully.", "result": result}), 201
 
 @analysis.route('/api/analysis/pairwise', methods=['POST'])
@@ -53,6 +77,12 @@ def pairwise_analysis():
     return analyse(payload)
 
 
+@analysis.route('/api/analysis/pairwise-matrix', methods=['POST'])
+def pairwise_matrix_analysis():
+    payload = request.get_json()
+    return analyse(payload)
+
+
 @analysis.route('/api/analysis/control', methods=['POST'])
 def control_analysis():
     payload = request.get_json()
@@ -62,4 +92,211 @@ def control_analysis():
 @analysis.route('/api/analysis/all', methods=['POST'])
 def all_analysis():
     payload = request.get_json()
-    return analyse(payload)
\ No newline at end of file
+    return analyse(payload)
+
+
+@analysis.route('/api/analysis/cache', methods=['GET'])
+def analysis_cache_stats():
+    stats = analysis_cache.stats()
+    stats['experiments'] = experiment_cache.stats()
+    return jsonify(stats), 200
+
+
+@analysis.route('/api/analysis/plots/<plot_id>', methods=['GET'])
+def cd_plot(plot_id):
+    try:
+        width = float(request.args.get('width', DEFAULT_FIGSIZE[0]))
+        height = float(request.args.get('height', DEFAULT_FIGSIZE[1]))
+        dpi = int(request.args.get('dpi', DEFAULT_DPI))
+    except ValueError:
+        return jsonify({"error": "Plot width, height and dpi must be numeric."}), 400
+
+    if not (0 < width <= 50 and 0 < height <= 50 and 0 < dpi <= 600):
+        return jsonify({"error": "Plot width and height must be in (0, 50] inches and dpi in (0, 600]."}), 400
+
+    output_format = request.args.get('format', 'svg')
+    if output_format not in ('png', 'svg', 'json'):
+        return jsonify({"error": "Plot format must be one of 'png', 'svg' or 'json'."}), 400
+
+    image_format = 'png' if output_format == 'png' else 'svg'
+    cd_plot_data = render_cd_plot(plot_id, figsize=(width, height), dpi=dpi, image_format=image_format)
+    if cd_plot_data is None:
+        return jsonify({"error": f"Unknown or expired plot: {plot_id}"}), 404
+
+    if output_format == 'json':
+        return jsonify(cd_plot_data), 200
+
+    return Response(base64.b64decode(cd_plot_data['imageData']), mimetype=cd_plot_data['mimeType'])
+
+
+def prepare_analysis(payload, experiment_matrix=None, run_matrix=None):
+    analysis_type = payload['analysisType']
+
+    if analysis_type == 'pairwise':
+        return prepare_pairwise_analysis(payload, experiment_matrix, run_matrix)
+    elif analysis_type == 'pairwise-matrix':
+        return prepare_pairwise_matrix_analysis(payload, experiment_matrix)
+    elif analysis_type == 'control':
+        return prepare_control_analysis(payload, experiment_matrix)
+    elif analysis_type == 'all':
+        return prepare_all_analysis(payload, experiment_matrix)
+    else:
+        raise ValueError(f"Invalid analysis type: {analysis_type}")
+
+
+def submit_job(task, payload):
+    timeout = payload.get('timeout')
+    if timeout not in (None, ''):
+        try:
+            timeout = float(timeout)
+        except (TypeError, ValueError):
+            return jsonify({"error": "Job timeout must be a number of seconds."}), 400
+        if not math.isfinite(timeout) or timeout <= 0 or timeout > job_queue.timeout > 0:
+            return jsonify({"error": f"Job timeout must be in (0, {job_queue.timeout:g}] seconds."}), 400
+    else:
+        timeout = None
+
+    job_id = job_queue.submit(task, timeout=timeout)
+    return jsonify({"message": f"{task.analysis_type} job submitted.", "job": job_queue.status(job_id)}), 202
+
+
+@analysis.route('/api/analysis/upload', methods=['POST'])
+def upload_analysis():
+    experiment_matrix, fields, error_response = read_experiment_upload()
+    if error_response is not None:
+        return error_response
+
+    analysis_type = fields.get('analysisType')
+    try:
+        selected_rows = [int(row) for row in fields.get('selectedRows', '').replace('[', '').replace(']', '').split(',') if row.strip()]
+    except ValueError:
+        return jsonify({"error": "Selected rows must be a comma-separated list of row numbers."}), 400
+
+    payload = {"analysisType": analysis_type,
+               "alpha": fields.get('alpha', 0.05),
+               "optimizationMode": fields.get('optimizationMode', 'minimize'),
+               "selectedRows": selected_rows,
+               "experimentName": fields.get('experimentName', 'upload'),
+               "experimentDescription": fields.get('experimentDescription', ''),
+               "renderPlots": fields.get('renderPlots', '').lower() in ('1', 'true'),
+               "correction": fields.get('correction', 'holm'),
+               "omnibusTest": fields.get('omnibusTest'),
+               "bootstrapReplicates": fields.get('bootstrapReplicates'),
+               "bootstrapSeed": fields.get('bootstrapSeed'),
+               "bootstrapConfidence": fields.get('bootstrapConfidence'),
+               "pValueMode": fields.get('pValueMode'),
+               "permutations": fields.get('permutations'),
+               "permutationSeed": fields.get('permutationSeed'),
+               "earlyStopping": fields.get('earlyStopping', 'true'),
+               "timeout": fields.get('timeout'),
+    }
+
+    try:
+        task = prepare_analysis(payload, experiment_matrix)
+        if not isinstance(task, AnalysisTask):
+            return task
+
+        if fields.get('runAsJob', '').lower() in ('1', 'true'):
+            return submit_job(task, payload)
+
+        result = task.run()
+    except JobQueueFullError as e:
+        return jsonify({"error": str(e)}), 503
+    except Exception as e:
+        return jsonify({"error": f"An error occurred while executing {analysis_type}: {str(e)}"}), 500
+
+    return jsonify({"message": f"{analysis_type} executed successfully.", "result": result}), 201
+
+
+@analysis.route('/api/analysis/experiments', methods=['POST'])
+@analysis.route('/api/analysis/experiments/<int:experiment_id>', methods=['POST'])
+def stored_experiment_analysis(experiment_id=None):
+    payload = request.get_json() or {}
+    analysis_type = payload.get('analysisType')
+    experiment_name = payload.get('experimentName')
+
+    if experiment_id is None and payload.get('experimentId') is not None:
+        try:
+            experiment_id = int(payload['experimentId'])
+        except (TypeError, ValueError):
+            return jsonify({"error": "Experiment ID must be an integer."}), 400
+    if experiment_id is None and not experiment_name:
+        return jsonify({"error": "An experiment ID or an experiment name is required."}), 400
+
+    try:
+        stored = get_stored_experiment(get_db(), experiment_id, experiment_name)
+        if stored is None:
+            return jsonify({"error": f"Experiment {experiment_id if experiment_id is not None else experiment_name} not found."}), 404
+
+        analysis_payload, experiment_matrix, run_matrix, error_response = read_stored_analysis(payload, stored[1])
+        if error_response is not None:
+            return error_response
+
+        task = prepare_analysis(analysis_payload, experiment_matrix, run_matrix)
+        if not isinstance(task, AnalysisTask):
+            return task
+
+        if payload.get('runAsJob'):
+            return submit_job(task, analysis_payload)
+
+        result = task.run()
+    except JobQueueFullError as e:
+        return jsonify({"error": str(e)}), 503
+    except Exception as e:
+        return jsonify({"error": f"An error occurred while executing {analysis_type}: {str(e)}"}), 500
+
+    return jsonify({"message": f"{analysis_type} executed successfully.", "result": result}), 201
+
+
+@analysis.route('/api/analysis/jobs', methods=['POST'])
+def submit_analysis_job():
+    payload = request.get_json()
+    analysis_type = payload.get('analysisType')
+
+    try:
+        task = prepare_analysis(payload)
+        if not isinstance(task, AnalysisTask):
+            return task
+
+        return submit_job(task, payload)
+    except JobQueueFullError as e:
+        return jsonify({"error": str(e)}), 503
+    except Exception as e:
+        return jsonify({"error": f"An error occurred while submitting {analysis_type}: {str(e)}"}), 500
+
+
+@analysis.route('/api/analysis/jobs/<job_id>', methods=['GET'])
+def analysis_job_status(job_id):
+    status = job_queue.status(job_id)
+    if status is None:
+        return jsonify({"error": f"Unknown or expired job: {job_id}"}), 404
+
+    return jsonify(status), 200
+
+
+@analysis.route('/api/analysis/jobs/<job_id>/result', methods=['GET'])
+def analysis_job_result(job_id):
+    job = job_queue.result(job_id)
+    if job is None:
+        return jsonify({"error": f"Unknown or expired job: {job_id}"}), 404
+
+    status, result = job
+    if status['status'] == COMPLETED:
+        return jsonify({"message": f"{status['analysisType']} executed successfully.", "result": result}), 200
+    if status['status'] in (PENDING, RUNNING):
+        return jsonify({"message": f"Job {job_id} is {status['status']}.", "job": status}), 202
+    if status['status'] == CANCELLED:
+        return jsonify({"error": f"Job {job_id} was cancelled.", "job": status}), 409
+    if status['status'] == TIMED_OUT:
+        return jsonify({"error": status['error'], "job": status}), 504
+
+    return jsonify({"error": f"An error occurred while executing {status['analysisType']}: {status['error']}", "job": status}), 500
+
+
+@analysis.route('/api/analysis/jobs/<job_id>', methods=['DELETE'])
+def cancel_analysis_job(job_id):
+    status = job_queue.cancel(job_id)
+    if status is None:
+        return jsonify({"error": f"Unknown or expired job: {job_id}"}), 404
+
+    return jsonify(status), 200
@@ -0,0 +1,57 @@
+"""
+Analysis Task
+
+This class describes a validated analysis request as a cacheable computation plus the step that turns its result into a response.
+
+Features:
+- Separates the expensive 'perform_*' computation from request parsing and response assembly.
+- Runs the computation in the request handler for the synchronous endpoints, reusing cached results.
+- Exposes the computation as a picklable function and argument tuple, so the job queue can run it in a worker process.
+- Assembles responses in the web process, where plot handles and cache entries are registered.
+
+Attributes:
+- cache_key: Key from 'make_cache_key' identifying the analysis result.
+- function: Module-level analysis function, such as 'perform_all_analysis'.
+- args: Positional arguments for 'function'.
+- assemble: Callable turning the analysis result into the response dictionary.
+
+Usage:
+- Analysis handlers build a task with their 'prepare_*' function; the synchronous endpoints call 'run' and the job queue calls 'complete'.
+
+Example:
+task = prepare_all_analysis(payload)
+result = task.run()
+"""
+
+from app.util.cache.analysis_cache import analysis_cache
+
+class AnalysisTask:
+    __slots__ = ('analysis_type', 'cache_key', 'function', 'args', 'assemble')
+
+    def __init__(self, analysis_type, cache_key, function, args, assemble):
+        self.analysis_type = analysis_type
+        self.cache_key = cache_key
+        self.function = function
+        self.args = args
+        self.assemble = assemble
+
+    def cached_result(self):
+        """
+        Returns the cached analysis result, or None when the analysis has not been computed yet.
+        """
+        return analysis_cache.get(self.cache_key)
+
+    def complete(self, analysis_result):
+        """
+        Stores a computed analysis result in the cache and assembles the response.
+        """
+        return self.assemble(analysis_cache.put(self.cache_key, analysis_result))
+
+    def run(self):
+        """
+        Computes the analysis in the current process, reusing a cached result for identical inputs.
+        """
+        return self.assemble(analysis_cache.get_or_compute(self.cache_key, lambda: self.function(*self.args)))
+
+    def __repr__(self):
+        return f"AnalysisTask(type={self.analysis_type}, function={self.function.__name__})"
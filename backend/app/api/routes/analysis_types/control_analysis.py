@@ -4,13 +4,19 @@ Control Analysis Request Handler
 This function is responsible for processing 'control analysis' requests within the Flask application.
 
 Features:
-- Converts experiment data from the payload to a NumPy array for analysis.
+- Converts experiment data from the payload to an ExperimentMatrix for analysis, unless an uploaded matrix is passed in.
 - Extracts essential information such as alpha value, analysis type, experiment name, and description.
 - Validates the number of selected rows for control analysis, ensuring exactly one row is selected.
 - Determines the optimization mode (minimize or maximize) based on the payload.
-- Validates the experiment data using the 'validate_and_return' function.
-- Calls 'perform_control_analysis' to execute the required control analysis.
-- Constructs and returns the analysis results including tables, descriptions, and plot data.
+- Reads the omnibus test from 'omnibusTest' ('friedman', the default, 'iman-davenport', 'aligned-friedman' or 'quade').
+- Reads the optional bootstrap of the mean ranks from 'bootstrapReplicates', 'bootstrapSeed' and 'bootstrapConfidence'.
+- Reads the optional permutation p-values from 'pValueMode', 'permutations', 'permutationSeed' and 'earlyStopping'.
+- Validates the experiment data with 'read_analysis_matrix', aggregating the raw runs of 'experimentRuns' per cell
+  ('aggregation', 'aggregationPercentile') when the request sends them instead of 'experimentData'.
+- Describes the 'perform_control_analysis' computation as an AnalysisTask, which the job queue can run in a worker process.
+- Calls 'perform_control_analysis' to execute the required control analysis, reusing a cached result for identical inputs.
+- Constructs and returns the analysis results including tables, descriptions, and plot handles.
+- Includes Base64 plot images only when the payload sets 'renderPlots'.
 
 Parameters:
 - payload: The JSON payload from the API request containing experiment and analysis details.
@@ -27,17 +33,18 @@ if isinstance(result, dict):
     Process analysis results
 """
 from flask import jsonify
-from app.api.api_utils import validate_and_return
-from app.util.conversion.experiment_conversion import convert_experiment_data_to_numpy
+from app.api.api_utils import read_analysis_matrix, read_bootstrap_options, read_permutation_options
+from app.util.cache.analysis_cache import make_cache_key
+from app.util.graphs.cd_plot_store import prepare_cd_plot_data
+from app.api.routes.analysis_types.analysis_task import AnalysisTask
 from app.services.analysis import perform_control_analysis
+from app.services.stats.nonparametric import OMNIBUS_TESTS, DEFAULT_OMNIBUS_TEST
 from app.constants.optimization_mode import OptimizationMode
 
-def request_control_analysis(payload):
-    result = []
+def prepare_control_analysis(payload, experiment_matrix=None):
     alpha = float(payload['alpha'])
     analysis_type = payload['analysisType']
 
-    experiment_data = convert_experiment_data_to_numpy(payload['experimentData'])
     experiment_name = payload['experimentName']
     experiment_description = payload['experimentDescription']
 
@@ -46,24 +53,48 @@ def request_control_analysis(payload):
 
     selected_row = payload['selectedRows'][0] - 1
     optimization_mode = OptimizationMode.MINIMIZE if payload['optimizationMode'] == 'minimize' else OptimizationMode.MAXIMIZE
+    omnibus_test = payload.get('omnibusTest') or DEFAULT_OMNIBUS_TEST
+
+    if omnibus_test not in OMNIBUS_TESTS:
+        return jsonify({"error": f"Invalid omnibus test: {omnibus_test}. Use one of: {', '.join(OMNIBUS_TESTS)}."}), 400
+
+    bootstrap_options, error_response = read_bootstrap_options(payload)
+    if error_response is not None:
+        return error_response
 
-    error_response = validate_and_return(experiment_data)
+    permutation_options, error_response = read_permutation_options(payload)
     if error_response is not None:
         return error_response
-    
-    experiment_data = experiment_data[1:, :]
-
-    ranks_table, table, description, cd_plot_data = perform_control_analysis(experiment_data, selected_row, optimization_mode, alpha)
-    
-    result = {"experimentName": experiment_name,
-              "experimentDescription": experiment_description,
-              "analysisType": analysis_type,
-              "analysisName": f"{experiment_name}_{analysis_type}" , 
-              "analysisData": table,
-              "ranksTable": ranks_table, 
-              "description": description, 
-              "cdPlotData": cd_plot_data,
-              "alpha": alpha, 
-              "analysisType": "control"}
-
-    return result
+
+    if experiment_matrix is None:
+        experiment_matrix, _, error_response = read_analysis_matrix(payload, optimization_mode)
+        if error_response is not None:
+            return error_response
+
+    def assemble(analysis_result):
+        ranks_table, table, description, cd_plot_specs = analysis_result
+        cd_plot_data = prepare_cd_plot_data(cd_plot_specs, render=bool(payload.get('renderPlots', False)))
+
+        return {"experimentName": experiment_name,
+                "experimentDescription": experiment_description,
+                "analysisType": analysis_type,
+                "analysisName": f"{experiment_name}_{analysis_type}" , 
+                "analysisData": table,
+                "ranksTable": ranks_table, 
+                "description": description, 
+                "cdPlotData": cd_plot_data,
+                "alpha": alpha, 
+                "analysisType": "control"}
+
+    cache_key = make_cache_key(experiment_matrix, analysis_type, selected_row=selected_row, optimization_mode=optimization_mode.name, alpha=alpha,
+                               omnibus_test=omnibus_test, bootstrap=bootstrap_options,
+                               permutation=permutation_options)
+    return AnalysisTask(analysis_type, cache_key, perform_control_analysis, (experiment_matrix, selected_row, optimization_mode, alpha, omnibus_test,
+                        bootstrap_options, permutation_options), assemble)
+
+def request_control_analysis(payload):
+    task = prepare_control_analysis(payload)
+    if not isinstance(task, AnalysisTask):
+        return task
+
+    return task.run()
@@ -4,13 +4,17 @@ Pairwise Analysis Request Handler
 This function processes 'pairwise analysis' requests within the Flask application.
 
 Features:
-- Transforms experiment data from the payload into a NumPy array for detailed analysis.
+- Transforms experiment data from the payload into an ExperimentMatrix for detailed analysis, unless an uploaded matrix is passed in.
 - Extracts key details from the payload, including experiment name, selected rows, alpha value, and analysis type.
 - Checks that exactly two rows are selected for the pairwise analysis, returning an error if not.
 - Determines the optimization mode (minimize or maximize) based on the payload.
-- Validates the experiment data using the 'validate_and_return' function.
-- Performs pairwise analysis using 'perform_pairwise_analysis', focusing on two selected data sets.
-- Assembles and returns detailed analysis results, including Wilcoxon table, critical values table, and descriptive text.
+- Validates the experiment data with 'read_analysis_matrix', aggregating the raw runs of 'experimentRuns' per cell
+  ('aggregation', 'aggregationPercentile') when the request sends them instead of 'experimentData'.
+- Describes the 'perform_pairwise_analysis' computation as an AnalysisTask, which the job queue can run in a worker process.
+- Performs pairwise analysis using 'perform_pairwise_analysis', focusing on two selected data sets and reusing a cached result for identical inputs.
+- Passes the runs of the two selected algorithms on to the analysis when the request sends raw runs, or when the
+  caller passes the stored runs of an experiment in as 'run_matrix', so the result also reports the dispersion of every benchmark and the Vargha-Delaney A12 effect size.
+- Assembles and returns detailed analysis results, including Wilcoxon table, critical values table, run table (or None), and descriptive text.
 
 Parameters:
 - payload: The JSON payload from the API request, containing necessary details for the analysis.
@@ -26,16 +30,15 @@ result = request_pairwise_analysis(payload)
 if isinstance(result, dict):
     Process and handle the returned analysis results
 """
+import hashlib
 from flask import jsonify
-from app.api.api_utils import validate_and_return
-from app.util.conversion.experiment_conversion import convert_experiment_data_to_numpy
+from app.api.api_utils import read_analysis_matrix
+from app.util.cache.analysis_cache import make_cache_key
+from app.api.routes.analysis_types.analysis_task import AnalysisTask
 from app.services.analysis import perform_pairwise_analysis
 from app.constants.optimization_mode import OptimizationMode
 
-def request_pairwise_analysis(payload):
-    result = []
-
-    experiment_data = convert_experiment_data_to_numpy(payload['experimentData'])
+def prepare_pairwise_analysis(payload, experiment_matrix=None, run_matrix=None):
     experiment_name = payload['experimentName']
     selected_rows = payload['selectedRows']
     alpha = float(payload['alpha'])
@@ -44,26 +47,45 @@ def request_pairwise_analysis(payload):
 
     optimization_mode = OptimizationMode.MINIMIZE if payload['optimizationMode'] == 'minimize' else OptimizationMode.MAXIMIZE
 
-    error_response = validate_and_return(experiment_data)
-    if error_response is not None:
-        return error_response
+    if experiment_matrix is None:
+        experiment_matrix, run_matrix, error_response = read_analysis_matrix(payload, optimization_mode)
+        if error_response is not None:
+            return error_response
     
     if len(selected_rows) != 2:
         return jsonify({"error": "Invalid number of selected rows for pairwise analysis. Exactly two rows should be selected."}), 400
 
-    algorithm1_data = experiment_data[selected_rows[0]].tolist()
-    algorithm2_data = experiment_data[selected_rows[1]].tolist()
+    algorithm_one, algorithm_two = selected_rows[0] - 1, selected_rows[1] - 1
+
+    runs, aggregation, run_params = None, None, {}
+    if run_matrix is not None:
+        runs = run_matrix.runs[[algorithm_one, algorithm_two]]
+        aggregation = payload.get('aggregation') or 'mean'
+        if aggregation == 'percentile':
+            aggregation = f"percentile {payload.get('aggregationPercentile')}"
+        run_params = {"runs": hashlib.blake2b(runs.tobytes(), digest_size=20).hexdigest(), "aggregation": aggregation}
 
-    wilcoxon_table, critical_values_table, description = perform_pairwise_analysis(algorithm1_data, algorithm2_data, optimization_mode, alpha)
+    def assemble(analysis_result):
+        wilcoxon_table, critical_values_table, run_table, description = analysis_result
 
-    result = {"experimentName": experiment_name,
-              "analysisType": analysis_type,
-              "analysisName": f"{experiment_name}_{analysis_type}" ,
-              "analysisData": wilcoxon_table, 
-              "cTable": critical_values_table, 
-              "description": description, 
-              "alpha": alpha,
-              "experimentDescription": experiment_description,
-            }
+        return {"experimentName": experiment_name,
+                "analysisType": analysis_type,
+                "analysisName": f"{experiment_name}_{analysis_type}" ,
+                "analysisData": wilcoxon_table, 
+                "cTable": critical_values_table, 
+                "runTable": run_table,
+                "description": description, 
+                "alpha": alpha,
+                "experimentDescription": experiment_description,
+              }
+
+    cache_key = make_cache_key(experiment_matrix, analysis_type, selected_rows=[algorithm_one, algorithm_two], optimization_mode=optimization_mode.name, alpha=alpha, **run_params)
+    return AnalysisTask(analysis_type, cache_key, perform_pairwise_analysis,
+                        (experiment_matrix, algorithm_one, algorithm_two, optimization_mode, alpha, runs, aggregation), assemble)
+
+def request_pairwise_analysis(payload):
+    task = prepare_pairwise_analysis(payload)
+    if not isinstance(task, AnalysisTask):
+        return task
 
-    return result
+    return task.run()
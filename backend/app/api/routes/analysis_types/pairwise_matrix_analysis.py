@@ -0,0 +1,83 @@
+"""
+Pairwise Matrix Analysis Request Handler
+
+This function processes 'pairwise-matrix' analysis requests, which compare every pair of the selected algorithms with the
+Wilcoxon signed-rank test in a single request.
+
+Features:
+- Transforms experiment data from the payload into an ExperimentMatrix, unless an uploaded matrix is passed in.
+- Compares the selected rows, or every algorithm when no rows are selected; at least two algorithms are required.
+- Reads the family-wise correction from 'correction' ('holm', the default, or 'bonferroni').
+- Determines the optimization mode (minimize or maximize) based on the payload.
+- Validates the experiment data with 'read_analysis_matrix', aggregating the raw runs of 'experimentRuns' per cell
+  ('aggregation', 'aggregationPercentile') when the request sends them instead of 'experimentData'.
+- Describes the 'perform_pairwise_matrix_analysis' computation as an AnalysisTask, which the job queue can run in a worker
+  process, reusing a cached result for identical inputs.
+- Assembles and returns the pair table, the dense result matrices and a descriptive summary.
+
+Parameters:
+- payload: The JSON payload from the API request, containing necessary details for the analysis.
+
+Returns:
+- A dictionary containing the analysis results, or an error response if the validation checks fail.
+
+Example:
+result = request_pairwise_matrix_analysis(payload)
+"""
+from flask import jsonify
+from app.api.api_utils import read_analysis_matrix
+from app.util.cache.analysis_cache import make_cache_key
+from app.api.routes.analysis_types.analysis_task import AnalysisTask
+from app.services.analysis import perform_pairwise_matrix_analysis
+from app.services.analysis.analyse_pairwise_matrix import CORRECTIONS
+from app.constants.optimization_mode import OptimizationMode
+
+def prepare_pairwise_matrix_analysis(payload, experiment_matrix=None):
+    experiment_name = payload['experimentName']
+    selected_rows = payload.get('selectedRows') or []
+    alpha = float(payload['alpha'])
+    analysis_type = payload['analysisType']
+    experiment_description = payload['experimentDescription']
+    correction = payload.get('correction', 'holm')
+
+    if correction not in CORRECTIONS:
+        return jsonify({"error": f"Invalid correction: {correction}. Use one of: {', '.join(CORRECTIONS)}."}), 400
+
+    optimization_mode = OptimizationMode.MINIMIZE if payload['optimizationMode'] == 'minimize' else OptimizationMode.MAXIMIZE
+
+    if experiment_matrix is None:
+        experiment_matrix, _, error_response = read_analysis_matrix(payload, optimization_mode)
+        if error_response is not None:
+            return error_response
+
+    algorithm_indices = sorted({row - 1 for row in selected_rows}) or None
+    algorithm_count = experiment_matrix.shape[0] if algorithm_indices is None else len(algorithm_indices)
+    if algorithm_count < 2:
+        return jsonify({"error": "Invalid number of selected rows for pairwise matrix analysis. At least two rows should be selected."}), 400
+    if algorithm_indices is not None and not 0 <= algorithm_indices[0] <= algorithm_indices[-1] < experiment_matrix.shape[0]:
+        return jsonify({"error": "Selected rows must refer to rows of the experiment data."}), 400
+
+    def assemble(analysis_result):
+        table, matrices, description = analysis_result
+
+        return {"experimentName": experiment_name,
+                "analysisType": analysis_type,
+                "analysisName": f"{experiment_name}_{analysis_type}",
+                "analysisData": table,
+                "matrices": matrices,
+                "description": description,
+                "alpha": alpha,
+                "experimentDescription": experiment_description,
+        }
+
+    cache_key = make_cache_key(experiment_matrix, analysis_type, selected_rows=algorithm_indices, correction=correction,
+                               optimization_mode=optimization_mode.name, alpha=alpha)
+    return AnalysisTask(analysis_type, cache_key, perform_pairwise_matrix_analysis,
+                        (experiment_matrix, algorithm_indices, optimization_mode, alpha, correction), assemble)
+
+def request_pairwise_matrix_analysis(payload):
+    task = prepare_pairwise_matrix_analysis(payload)
+    if not isinstance(task, AnalysisTask):
+        return task
+
+    return task.run()
@@ -7,11 +7,36 @@ Features:
 - Provides an API endpoint for creating new experiment entries.
 - Processes POST requests with experiment data including name, data, and description.
 - Utilizes utility functions for data validation, conversion, and duplication checks.
-- Commits validated and processed experiment data to the database.
+- Commits validated and processed experiment data to the database, checking for duplicates in the same transaction.
+- Stream-parses uploaded CSV or Parquet result files into float64 matrices, reporting the row and column of the first invalid cell.
+- Stores every experiment's results as a binary matrix; the JSON experiment document keeps only its settings.
+- Returns a single stored experiment with its settings and shape; its results are exported on request, as the JSON
+  table ('include=table') or as the binary matrix ('format=binary').
+- Appends benchmarks or algorithms to a stored experiment and returns the refreshed Friedman summary, updating the stored
+  rank sums incrementally instead of ranking the whole experiment again.
+- Accepts the raw results of every run in 'experimentData.experimentRuns' (cells holding lists of run results), stores
+  them as one binary block and keeps the cells aggregated by 'experimentData.aggregation' (default mean) as the
+  experiment matrix.
+- Returns the stored runs of an experiment as a JSON table on request.
+- Creates campaign experiments that list their algorithms and receive their results streamed in, one run at a time.
+- Ingests batches of streamed (experiment, algorithm, benchmark, value) records, adding every benchmark to the running
+  Friedman accumulators as soon as all algorithms have a result for it.
+- Returns the live standings of an experiment from its running accumulators, with the benchmarks still waiting for
+  results and the algorithms they are waiting for.
 - Includes robust error handling for validation failures and database operations.
 
-Endpoint:
+Endpoints:
 - '/api/experiments': Accepts POST requests for creating new experiments.
+- '/api/experiments/upload': Accepts POST requests with a CSV or Parquet file, as a multipart 'file' part or the raw body.
+- '/api/experiments/<id>': Accepts GET requests for a stored experiment, with optional 'include=table' or 'format=binary'
+  query parameters.
+- '/api/experiments/<id>/benchmarks': Accepts POST requests with an 'experimentTable' of new benchmarks for every stored algorithm.
+- '/api/experiments/<id>/algorithms': Accepts POST requests with an 'experimentTable' of new algorithms for every stored benchmark.
+- '/api/experiments/<id>/runs': Accepts GET requests for the raw runs of a stored experiment.
+- '/api/experiments/campaigns': Accepts POST requests with an 'experimentName' and the 'algorithms' of a campaign.
+- '/api/experiments/results': Accepts POST requests with 'records' of 'experimentId', 'algorithm', 'benchmark' and 'value'.
+- '/api/experiments/<id>/results': Accepts POST requests with 'records' of 'algorithm', 'benchmark' and 'value'.
+- '/api/experiments/<id>/standings': Accepts GET requests, with an optional 'optimizationMode' query parameter.
 
 Usage:
 The Blueprint 'experiments' is registered to the Flask app to handle experiment-related routes.
@@ -21,13 +46,19 @@ from app import app
 app.register_blueprint(experiments)
 """
 
-from flask import Blueprint, request, jsonify
-from app.db.database import Database
-from app.util.validation.experiment_validation import validate_table_data
-from app.util.conversion.experiment_conversion import convert_experiment_data_to_numpy
+import numpy as np
+from flask import Blueprint, Response, request, jsonify
+from app.constants.optimization_mode import OptimizationMode
+from app.db.database import get_db
+from app.util.conversion.experiment_matrix import ExperimentMatrix
 from app.db.commit.commit_experiment import commit_experiment_data
+from app.db.commit.append_experiment import append_experiment_benchmarks, append_experiment_algorithms, append_experiment_results
 from app.db.helpers.check_duplicate import check_duplicate_field
-from app.api.api_utils import validate_and_return
+from app.db.helpers.matrix_store import load_experiment_matrix
+from app.db.helpers.run_store import load_runs
+from app.db.helpers.experiment_standings import get_experiment_standings
+from app.services.stats.nonparametric.friedman_test.rank_state import friedman_from_sums
+from app.api.api_utils import validate_and_return, read_experiment_upload, read_result_records, read_run_matrix
 
 experiments = Blueprint('experiments', __name__)
 
@@ -37,23 +68,246 @@ def create_experiment():
     
     experiment_name = payload['experimentName']
     experiment_data = payload['experimentData']
-    experiment_table = experiment_data['experimentTable']
     experiment_description = payload['experimentDescription']
- 
-    experiment_table = convert_experiment_data_to_numpy(experiment_table)
 
+    runs_table = experiment_data.pop('experimentRuns', None)
+    if runs_table is not None:
+        optimization_mode = OptimizationMode.MAXIMIZE if experiment_data.get('optimizationMode') == 'maximize' else OptimizationMode.MINIMIZE
+        run_matrix, experiment_matrix, error_response = read_run_matrix(runs_table, experiment_data.get('aggregation'),
+                                                                        experiment_data.get('aggregationPercentile'), optimization_mode)
+        if error_response is not None:
+            return error_response
+
+        return save_experiment(experiment_name, experiment_matrix, experiment_data, experiment_description, run_matrix)
+
+    experiment_table = experiment_data['experimentTable']
+ 
     error_response = validate_and_return(experiment_table)
 
     if error_response is not None:
         return error_response
 
-    with Database() as db:
-        if check_duplicate_field(db.conn, experiment_name, 'experiment_name', 'experiments'):
-            return jsonify({"error": "Duplicate experiment name in database."}), 400
+    experiment_matrix = ExperimentMatrix.from_table(experiment_table)
+
+    return save_experiment(experiment_name, experiment_matrix, experiment_data, experiment_description)
+
+
+@experiments.route('/api/experiments/upload', methods=['POST'])
+def upload_experiment():
+    experiment_matrix, fields, error_response = read_experiment_upload()
+    if error_response is not None:
+        return error_response
+
+    experiment_name = fields.get('experimentName')
+    if not experiment_name:
+        return jsonify({"error": "Missing required field: experimentName"}), 400
+
+    try:
+        alpha = float(fields.get('alpha', 0.05))
+    except ValueError:
+        return jsonify({"error": "Alpha must be numeric."}), 400
+
+    experiment_data = {"experimentName": experiment_name,
+                       "optimizationMode": fields.get('optimizationMode', 'minimize'),
+                       "alpha": alpha,
+    }
+
+    return save_experiment(experiment_name, experiment_matrix, experiment_data, fields.get('experimentDescription', ''))
+
+
+def save_experiment(experiment_name, experiment_matrix, experiment_data, experiment_description, run_matrix=None):
+    db = get_db()
+    try:
+        with db.transaction():
+            if check_duplicate_field(db.conn, experiment_name, 'experiment_name', 'experiments'):
+                return jsonify({"error": "Duplicate experiment name in database."}), 400
+
+            commit_experiment_data(experiment_name, experiment_matrix, experiment_data, experiment_description, run_matrix)
+    except Exception as error:
+        return jsonify({"error": str(error)}), 400
+
+    return jsonify({"message": "Experiment data saved successfully."}), 201
+
+
+@experiments.route('/api/experiments/<int:experiment_id>', methods=['GET'])
+def get_experiment(experiment_id):
+    db = get_db()
+    loaded = load_experiment_matrix(db, experiment_id)
+    if loaded is None:
+        return jsonify({"error": f"Experiment {experiment_id} not found."}), 404
+    experiment_matrix, settings = loaded
+
+    if request.args.get('format') == 'binary':
+        return Response(experiment_matrix.to_bytes(), mimetype='application/octet-stream')
+
+    query = "SELECT experiment_id, experiment_name, experiment_description, alpha FROM experiments WHERE experiment_id = %s"
+    db.execute_query(query, (experiment_id,))
+    experiment = dict(db.cur.fetchone())
+
+    if request.args.get('include') == 'table':
+        settings['experimentTable'] = experiment_matrix.to_table(as_text=True)
+    experiment['experiment_data'] = settings
+    experiment['algorithms'], experiment['benchmarks'] = experiment_matrix.shape
+
+    return jsonify(experiment), 200
+
+
+@experiments.route('/api/experiments/<int:experiment_id>/runs', methods=['GET'])
+def get_experiment_runs(experiment_id):
+    db = get_db()
+    loaded = load_experiment_matrix(db, experiment_id)
+    if loaded is None:
+        return jsonify({"error": f"Experiment {experiment_id} not found."}), 404
+    experiment_matrix, settings = loaded
+
+    run_matrix = load_runs(db, experiment_id, experiment_matrix.algorithm_names, experiment_matrix.benchmark_names)
+    if run_matrix is None:
+        return jsonify({"error": f"Experiment {experiment_id} has no stored runs."}), 404
+
+    return jsonify({"experimentRuns": run_matrix.to_table(),
+                    "runs": run_matrix.shape[2],
+                    "aggregation": settings.get('aggregation', 'mean')}), 200
+
+
+@experiments.route('/api/experiments/<int:experiment_id>/benchmarks', methods=['POST'])
+def append_benchmarks(experiment_id):
+    return append_to_experiment(experiment_id, append_experiment_benchmarks)
+
+
+@experiments.route('/api/experiments/<int:experiment_id>/algorithms', methods=['POST'])
+def append_algorithms(experiment_id):
+    return append_to_experiment(experiment_id, append_experiment_algorithms)
+
+
+def append_to_experiment(experiment_id, append_function):
+    payload = request.get_json()
+    append_table = payload.get('experimentTable') if payload else None
+    if append_table is None:
+        return jsonify({"error": "Missing required field: experimentTable"}), 400
+
+    error_response = validate_and_return(append_table)
+    if error_response is not None:
+        return error_response
+
+    try:
+        appended = append_function(experiment_id, append_table)
+    except ValueError as error:
+        return jsonify({"error": str(error)}), 400
+
+    if appended is None:
+        return jsonify({"error": f"Experiment {experiment_id} not found."}), 404
+
+    rank_sums, stored_mode = appended
+    algorithm_names = rank_sums.algorithm_names
+    mode = payload.get('optimizationMode', stored_mode)
+    optimization_mode = OptimizationMode.MINIMIZE if mode == 'minimize' else OptimizationMode.MAXIMIZE
+    try:
+        summary = friedman_from_sums(rank_sums.rank_sums, rank_sums.tie_sum_total, rank_sums.benchmark_count, optimization_mode)
+    except ValueError as error:
+        return jsonify({"error": str(error)}), 400
+
+    first, second = np.triu_indices(len(algorithm_names), 1)
+    return jsonify({"algorithms": len(algorithm_names),
+                    "benchmarks": rank_sums.benchmark_count,
+                    "friedmanStat": float(summary.friedman_stat),
+                    "pValue": float(summary.p_value),
+                    "imanDavenportStat": float(summary.iman_davenport_stat),
+                    "meanRanks": dict(zip(algorithm_names, summary.mean_ranks.tolist())),
+                    "zValues": [[f"{algorithm_names[i]} vs {algorithm_names[j]}", z]
+                                for i, j, z in zip(first.tolist(), second.tolist(), summary.z_values.tolist())]}), 200
+
+
+@experiments.route('/api/experiments/campaigns', methods=['POST'])
+def create_campaign():
+    payload = request.get_json() or {}
+
+    experiment_name = payload.get('experimentName')
+    algorithm_names = [str(name).strip() for name in payload.get('algorithms') or []]
+    if not experiment_name or not algorithm_names:
+        return jsonify({"error": "Missing required fields: experimentName and algorithms"}), 400
+    if not all(algorithm_names) or len(set(algorithm_names)) != len(algorithm_names):
+        return jsonify({"error": "Algorithm names must be non-empty and unique."}), 400
+
+    try:
+        alpha = float(payload.get('alpha', 0.05))
+    except (TypeError, ValueError):
+        return jsonify({"error": "Alpha must be numeric."}), 400
+
+    experiment_matrix = ExperimentMatrix(algorithm_names, [], np.empty((len(algorithm_names), 0)))
+    experiment_data = {"experimentName": experiment_name,
+                       "optimizationMode": payload.get('optimizationMode', 'minimize'),
+                       "alpha": alpha,
+    }
+
+    return save_experiment(experiment_name, experiment_matrix, experiment_data, payload.get('experimentDescription', ''))
+
+
+@experiments.route('/api/experiments/results', methods=['POST'])
+def ingest_results():
+    return ingest_result_records(request.get_json(), None)
+
+
+@experiments.route('/api/experiments/<int:experiment_id>/results', methods=['POST'])
+def ingest_experiment_results(experiment_id):
+    return ingest_result_records(request.get_json(), experiment_id)
+
+
+def ingest_result_records(payload, experiment_id):
+    records_by_experiment, error_response = read_result_records(payload, experiment_id)
+    if error_response is not None:
+        return error_response
+
+    db = get_db()
+    completed = {}
+    try:
+        # One transaction for the batch, taking the experiment locks in ascending ID order.
+        with db.transaction():
+            for record_experiment, records in records_by_experiment.items():
+                completed_benchmarks = append_experiment_results(record_experiment, records)
+                if completed_benchmarks is None:
+                    raise LookupError(f"Experiment {record_experiment} not found.")
+                completed[str(record_experiment)] = completed_benchmarks
+    except LookupError as error:
+        return jsonify({"error": str(error)}), 404
+    except ValueError as error:
+        return jsonify({"error": str(error)}), 400
+
+    return jsonify({"accepted": sum(len(records) for records in records_by_experiment.values()),
+                    "completedBenchmarks": completed}), 200
+
+
+@experiments.route('/api/experiments/<int:experiment_id>/standings', methods=['GET'])
+def get_standings(experiment_id):
+    standings = get_experiment_standings(get_db(), experiment_id)
+    if standings is None:
+        return jsonify({"error": f"Experiment {experiment_id} not found."}), 404
+
+    mode = request.args.get('optimizationMode', standings.optimization_mode)
+    optimization_mode = OptimizationMode.MINIMIZE if mode == 'minimize' else OptimizationMode.MAXIMIZE
+    k, n = len(standings.algorithm_names), standings.benchmark_count
+
+    try:
+        summary = friedman_from_sums(standings.rank_sums, standings.tie_sum_total, n, optimization_mode)
+        mean_ranks = summary.mean_ranks
+        statistics = {"friedmanStat": float(summary.friedman_stat),
+                      "pValue": float(summary.p_value),
+                      "imanDavenportStat": float(summary.iman_davenport_stat)}
+    except ValueError as error:
+        # Too few algorithms or no complete benchmark yet: the mean ranks are still shown when there are any.
+        rank_sums = standings.rank_sums if optimization_mode == OptimizationMode.MINIMIZE else n * (k + 1) - standings.rank_sums
+        mean_ranks = rank_sums / n if n else None
+        statistics = {"friedmanStat": None, "pValue": None, "imanDavenportStat": None, "message": str(error)}
 
-        try:
-            commit_experiment_data(experiment_name, experiment_table, experiment_data, experiment_description)
-        except Exception as error:
-            return jsonify({"error": str(error)}), 400
+    table = []
+    if mean_ranks is not None:
+        order = np.argsort(mean_ranks, kind='stable')
+        table = [[standings.algorithm_names[i], float(mean_ranks[i]), position + 1] for position, i in enumerate(order.tolist())]
 
-    return jsonify({"message": "Experiment data saved successfully."}), 201
\ No newline at end of file
+    return jsonify({"experimentId": experiment_id,
+                    "optimizationMode": mode,
+                    "algorithms": k,
+                    "completeBenchmarks": n,
+                    **statistics,
+                    "standings": table,
+                    "incompleteBenchmarks": [{"benchmark": benchmark, "missingAlgorithms": missing}
+                                             for benchmark, missing in standings.incomplete]}), 200
@@ -8,10 +8,12 @@ Features:
 - Handles POST requests containing analysis name, experiment name, result data, and additional details.
 - Performs validation to ensure all required fields are provided in the request payload.
 - Checks for duplicate analysis names in the database to avoid conflicts.
-- Commits the analysis results to the database, handling any database-related exceptions.
+- Commits the analysis results to the database in the same transaction as the duplicate check, handling any database-related exceptions.
+- Returns a single stored analysis with its full result data, which search responses omit by default.
 
-Endpoint:
+Endpoints:
 - '/api/results': Accepts POST requests for saving analysis results.
+- '/api/results/<id>': Accepts GET requests for a stored analysis, including its full result data.
 
 Logging:
 - Configures logging at DEBUG level for detailed logging, useful for development and debugging.
@@ -25,7 +27,7 @@ app.register_blueprint(results)
 """
 
 from flask import Blueprint, request, jsonify
-from app.db.database import Database
+from app.db.database import get_db
 from app.db.commit.commit_result import commit_result_data
 from app.db.helpers.check_duplicate import check_duplicate_field
 import logging
@@ -47,18 +49,35 @@ def create_analysis():
     if not all([analysis_name, experiment_name, analysis_data, test_type]):
         return jsonify({"error": "Missing required fields in payload"}), 400
 
-    with Database() as db:
-        if check_duplicate_field(db.conn, analysis_name, 'analysis_name', 'analyses'):
-            return jsonify({"error": "Duplicate analysis name in database."}), 400
+    db = get_db()
+    try:
+        with db.transaction():
+            if check_duplicate_field(db.conn, analysis_name, 'analysis_name', 'analyses'):
+                return jsonify({"error": "Duplicate analysis name in database."}), 400
 
-        try:
             commit_result_data(analysis_name=analysis_name, 
                                experiment_name=experiment_name, 
                                test_type=test_type, 
                                result_data=analysis_data, 
                                experiment_description=experiment_description, 
                                analysis_notes=analysis_notes)
-        except Exception as error:
-            return jsonify({"error": str(error)}), 400
+    except Exception as error:
+        return jsonify({"error": str(error)}), 400
 
-    return jsonify({"message": "Analysis data saved successfully."}), 201
\ No newline at end of file
+    return jsonify({"message": "Analysis data saved successfully."}), 201
+
+
+@results.route('/api/results/<int:analysis_id>', methods=['GET'])
+def get_analysis(analysis_id):
+    db = get_db()
+    query = """
+    SELECT analysis_id, analysis_name, experiment_name, test_type, experiment_description, analysis_notes, result_data
+    FROM analyses WHERE analysis_id = %s
+    """
+    db.execute_query(query, (analysis_id,))
+    analysis = db.cur.fetchone()
+
+    if analysis is None:
+        return jsonify({"error": f"Analysis {analysis_id} not found."}), 404
+
+    return jsonify(dict(analysis)), 200
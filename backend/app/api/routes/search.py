@@ -7,13 +7,35 @@ Features:
 - Implements an API endpoint to perform search queries in the database.
 - Handles POST requests with search parameters such as search type and search string.
 - Supports different search types, including searching all records, experiments, or analyses.
-- Executes database queries based on the provided search parameters and returns the results.
-- Uses PostgreSQL's ILIKE for case-insensitive search.
+- Returns metadata columns only by default; stored experiment tables and analysis results are fetched by ID from
+  '/api/experiments/<id>?include=table' and '/api/results/<id>'. The experiments' 'experiment_data' column, which
+  holds their settings, and the analysis results can be requested explicitly through 'columns'.
+- Matches the search string against names, descriptions and analysis notes, both as a case-insensitive substring (ILIKE)
+  and as a fuzzy word match (pg_trgm's '<%' operator); both are served by the GIN trigram indexes in 'init.sql'.
+- Orders matches by relevance: trigram word similarity to the name, and at half weight to the description and notes.
+- Pages results with keyset pagination on (relevance, ID), or on the ID alone when listing without a search string,
+  returning a cursor for the next page. The total match count is computed for the first page only, unless
+  'includeTotal' asks for it on every page or on none.
+- Reads each page through a server-side cursor, so rows are streamed from the database instead of buffered by the driver.
 - Provides robust error handling for database query errors.
 
 Endpoint:
 - '/api/search': Accepts POST requests for searching the database based on given criteria.
 
+Request payload:
+- searchType: 'all', 'default', 'experiments' or 'analyses'.
+- searchString: Text to search for; ignored for 'all'.
+- limit: Maximum number of rows per table (default 50, at most 500).
+- cursor: The 'nextCursor' of each table from a previous response, as {"experiments": ..., "analyses": ...}.
+- columns: Columns to return per table, as {"experiments": [...], "analyses": [...]}; the ID column is always included.
+- includeTotal: true to count all matches on every page, false never to count them; by default they are counted for
+  the first page (without a cursor) only. Accepts a JSON boolean or 'true', 'false', '1' or '0'.
+
+Response:
+- {"experiments": {"items": [...], "total": n, "nextCursor": ...}, "analyses": {...}} for the searched tables, with a
+  null 'total' when the matches were not counted.
+- With a search string, items carry a 'relevance' score and 'nextCursor' is a [relevance, id] pair; otherwise it is an ID.
+
 Usage:
 This Blueprint should be registered in the Flask app to enable search-related routes.
 
@@ -23,7 +45,7 @@ app.register_blueprint(search)
 """
 
 from flask import Blueprint, request, jsonify
-from app.db.database import Database
+from app.db.database import get_db
 import logging
 import psycopg2
 
@@ -31,40 +53,153 @@ logging.basicConfig(level=logging.DEBUG)
 
 search = Blueprint('search', __name__)
 
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+SEARCH_TABLES = {
+    'experiments': {
+        'id_column': 'experiment_id',
+        'name_column': 'experiment_name',
+        'text_columns': ['experiment_description'],
+        'default_columns': ['experiment_id', 'experiment_name', 'experiment_description', 'alpha'],
+        'payload_columns': ['experiment_data'],
+    },
+    'analyses': {
+        'id_column': 'analysis_id',
+        'name_column': 'analysis_name',
+        'text_columns': ['experiment_description', 'analysis_notes'],
+        'default_columns': ['analysis_id', 'analysis_name', 'experiment_name', 'test_type', 'experiment_description', 'analysis_notes'],
+        'payload_columns': ['result_data'],
+    },
+}
+
+SEARCH_TYPE_TABLES = {
+    'all': ['experiments', 'analyses'],
+    'default': ['experiments', 'analyses'],
+    'experiments': ['experiments'],
+    'analyses': ['analyses'],
+}
+
+def parse_columns(table_name, requested):
+    table = SEARCH_TABLES[table_name]
+    if requested is None:
+        return table['default_columns']
+
+    allowed = table['default_columns'] + table['payload_columns']
+    unknown = [column for column in requested if column not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown {table_name} columns: {', '.join(map(str, unknown))}.")
+
+    return [table['id_column']] + [column for column in requested if column != table['id_column']]
+
+def parse_cursor(value, ranked):
+    if value is None:
+        return None
+    if ranked:
+        relevance, id_ = value
+        return float(relevance), int(id_)
+    return int(value)
+
+def parse_flag(name, value):
+    if value is None or isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().lower() in ('true', '1'):
+        return True
+    if isinstance(value, str) and value.strip().lower() in ('false', '0'):
+        return False
+    raise ValueError(f"{name} must be true or false.")
+
+def relevance_expression(table):
+    # Rounded so that the relevance in a returned cursor compares exactly with the recomputed value.
+    text_similarities = ', '.join(f"word_similarity(%(search)s, coalesce({column}, ''))" for column in table['text_columns'])
+    return (f"round(GREATEST(word_similarity(%(search)s, {table['name_column']}), "
+            f"0.5 * GREATEST({text_similarities}))::numeric, 6)")
+
+def search_table(db, table_name, search_string, columns, after, limit, include_total):
+    table = SEARCH_TABLES[table_name]
+    id_column = table['id_column']
+    ranked = bool(search_string)
+    params = {'limit': limit + 1}
+
+    where = ""
+    if ranked:
+        params['search'] = search_string
+        params['pattern'] = '%' + search_string.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        matches = [f"{column} ILIKE %(pattern)s OR %(search)s <%% {column}" for column in [table['name_column']] + table['text_columns']]
+        where = f"WHERE {' OR '.join(matches)}"
+
+    # Counting reads every match, so by default only the first page pays for it.
+    total = None
+    if include_total or (include_total is None and after is None):
+        db.execute_query(f"SELECT COUNT(*) FROM {table_name} {where}", params)
+        total = db.cur.fetchone()[0]
+
+    if ranked:
+        page_condition = ""
+        if after is not None:
+            params['after_relevance'], params['after_id'] = after
+            page_condition = ("WHERE relevance < %(after_relevance)s "
+                              f"OR (relevance = %(after_relevance)s AND {id_column} > %(after_id)s)")
+        # One extra row tells whether another page follows without a second query.
+        query = f"""
+        SELECT * FROM (
+            SELECT {', '.join(columns)}, {relevance_expression(table)} AS relevance FROM {table_name} {where}
+        ) matches {page_condition}
+        ORDER BY relevance DESC, {id_column} LIMIT %(limit)s
+        """
+    else:
+        page_condition = ""
+        if after is not None:
+            params['after_id'] = after
+            page_condition = f"WHERE {id_column} > %(after_id)s"
+        query = f"SELECT {', '.join(columns)} FROM {table_name} {page_condition} ORDER BY {id_column} LIMIT %(limit)s"
+
+    items = [dict(row) for row in db.stream_query(query, params)]
+    for item in items:
+        if 'relevance' in item:
+            item['relevance'] = float(item['relevance'])
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = [items[-1]['relevance'], items[-1][id_column]] if ranked else items[-1][id_column]
+
+    return {'items': items, 'total': total, 'nextCursor': next_cursor}
+
 @search.route('/api/search', methods=['POST'])
 def search_database():
     payload = request.get_json()
     search_type = payload.get('searchType')
-    search_string = payload.get('searchString', '')
-
-    with Database() as db:
-        try:
-            results = {}
-
-            if search_type == "all":
-                db.execute_query("SELECT * FROM experiments")
-                experiments_results = db.cur.fetchall()
-                results['experiments'] = [dict(result) for result in experiments_results]
-
-                db.execute_query("SELECT * FROM analyses")
-                analyses_results = db.cur.fetchall()
-                results['analyses'] = [dict(result) for result in analyses_results]
-            else:
-
-                if search_type == "experiments" or search_type == "default":
-                    query = "SELECT * FROM experiments WHERE experiment_name ILIKE %s"
-                    db.execute_query(query, ('%' + search_string + '%',))
-                    experiments_results = db.cur.fetchall()
-                    results['experiments'] = [dict(result) for result in experiments_results]
-
-                if search_type == "analyses" or search_type == "default":
-                    query = "SELECT * FROM analyses WHERE analysis_name ILIKE %s"
-                    db.execute_query(query, ('%' + search_string + '%',))
-                    analyses_results = db.cur.fetchall()
-                    results['analyses'] = [dict(result) for result in analyses_results]
-
-            return jsonify(results), 200
-
-        except psycopg2.Error as error:
-            logging.exception("Search error")
-            return jsonify({"error": str(error)}), 500
\ No newline at end of file
+    search_string = (payload.get('searchString') or '').strip()
+
+    if search_type not in SEARCH_TYPE_TABLES:
+        return jsonify({"error": f"Invalid search type: {search_type}"}), 400
+
+    try:
+        limit = int(payload.get('limit', DEFAULT_LIMIT))
+        cursor = payload.get('cursor') or {}
+        requested_columns = payload.get('columns') or {}
+        include_total = parse_flag('includeTotal', payload.get('includeTotal'))
+
+        if not 0 < limit <= MAX_LIMIT:
+            raise ValueError(f"Limit must be between 1 and {MAX_LIMIT}.")
+
+        table_names = SEARCH_TYPE_TABLES[search_type]
+        columns = {name: parse_columns(name, requested_columns.get(name)) for name in table_names}
+        ranked = search_type != 'all' and bool(search_string)
+        after = {name: parse_cursor(cursor.get(name), ranked) for name in table_names}
+    except (TypeError, ValueError, AttributeError) as error:
+        return jsonify({"error": str(error)}), 400
+
+    db = get_db()
+    try:
+        results = {}
+        for table_name in table_names:
+            results[table_name] = search_table(db, table_name, search_string if ranked else None,
+                                               columns[table_name], after[table_name], limit, include_total)
+
+        return jsonify(results), 200
+
+    except psycopg2.Error as error:
+        logging.exception("Search error")
+        return jsonify({"error": str(error)}), 500
@@ -6,6 +6,7 @@ This function initializes and configures the Flask application.
 Features:
 - Sets up CORS (Cross-Origin Resource Sharing) to allow requests from different origins.
 - Registers blueprints for various routes: experiments, analysis, results, and search.
+- Returns each request's pooled database connection on teardown.
 - Defines a simple home route that returns a greeting message.
 - Configures logging to reduce verbosity of certain libraries like matplotlib.
 
@@ -22,6 +23,7 @@ from app.api.routes.experiments import experiments
 from app.api.routes.analysis import analysis
 from app.api.routes.results import results
 from app.api.routes.search import search
+from app.db.database import close_db
 from flask import Flask
 import logging
 
@@ -36,6 +38,8 @@ def create_app():
     app.register_blueprint(results)
     app.register_blueprint(search)
 
+    app.teardown_appcontext(close_db)
+
     @app.route('/')
     def home():
         return 'Greetings from the backend!'   
@@ -0,0 +1,214 @@
+"""
+Experiment Append Module
+
+This module contains functions to add benchmarks or algorithms to a stored experiment while updating its Friedman rank
+state incrementally.
+
+Functions:
+1. append_experiment_benchmarks:
+    - Adds benchmark columns to a stored experiment.
+    - Parameters: experiment_id, append_table (a table of the new benchmarks for every stored algorithm, in any row order).
+    - Ranks only the new columns, adds their ranks to the stored rank sums and stores the new columns as rows of their
+      own, so neither the stored matrix nor the ranks of the stored benchmarks are read or rewritten.
+
+2. append_experiment_algorithms:
+    - Adds algorithm rows to a stored experiment.
+    - Parameters: experiment_id, append_table (a table of the new algorithms for every stored benchmark, in any column order).
+    - Inserts every new row into the ranks of each column with one vectorised comparison. A new algorithm changes the
+      ranks of every benchmark, so this loads the matrix and writes it back as one block.
+
+3. append_experiment_results:
+    - Adds streamed results of single runs to a stored experiment.
+    - Parameters: experiment_id, records (a list of (algorithm, benchmark, value) tuples of algorithms in the experiment).
+    - Holds the results in the experiment_pending_results table until every algorithm has a result for the benchmark,
+      then ranks the completed benchmarks as new columns, moves their results into the experiment matrix and clears them.
+    - A later result for the same pending cell replaces the earlier one; results for benchmarks already in the
+      experiment are rejected, since their ranks are part of the running sums.
+    - Reads only the algorithm names and the links of the batch's benchmarks, and writes only the completed columns,
+      so the cost of a batch depends on the batch and not on the size of the experiment.
+
+All three functions:
+- Lock the experiment row with a plain 'SELECT ... FOR UPDATE' that does not read the matrix, so concurrent appends to
+  the same experiment are applied one after the other.
+- Refuse experiments that store raw runs, whose run block would no longer match the appended results.
+- Build the rank sums from the stored matrix on first use for experiments that have none.
+- Link the new algorithm or benchmark names to the experiment, store the new results and save the updated rank sums,
+  all in the request's transaction.
+- Return None for an unknown experiment. The first two return the updated 'RankSums' and the stored optimization mode;
+  append_experiment_results returns the names of the benchmarks it completed.
+- Raise ValueError when the appended names clash with stored ones or do not cover the stored algorithms or benchmarks.
+
+Example:
+rank_sums, stored_mode = append_experiment_benchmarks(experiment_id, payload['experimentTable'])
+summary = friedman_from_sums(rank_sums.rank_sums, rank_sums.tie_sum_total, rank_sums.benchmark_count, OptimizationMode.MINIMIZE)
+"""
+
+import logging
+import numpy as np
+from app.db.database import get_db
+from app.db.commit.commit_experiment import link_experiment_names
+from app.db.helpers.matrix_store import load_experiment_matrix, save_experiment_matrix, append_matrix_columns
+from app.db.helpers.rank_state_store import RankSums, add_rank_columns, load_rank_sums, rebuild_rank_sums, save_rank_sums
+from app.services.stats.nonparametric.friedman_test.rank_state import FriedmanRankState
+from app.util.conversion.experiment_matrix import ExperimentMatrix
+
+logging.basicConfig(level=logging.DEBUG)
+
+def _lock_experiment(db, experiment_id):
+    # Locks the experiment row without reading its matrix, then reads the names and rank sums kept next to it.
+    query = """
+    SELECT experiment_data->>'optimizationMode' AS optimization_mode,
+           EXISTS (SELECT 1 FROM experiment_runs r WHERE r.experiment_id = e.experiment_id) AS has_runs
+    FROM experiments e WHERE e.experiment_id = %s FOR UPDATE
+    """
+    db.execute_query(query, (experiment_id,))
+    row = db.cur.fetchone()
+    if row is None:
+        return None
+    if row['has_runs']:
+        raise ValueError(f"Experiment {experiment_id} stores raw runs; results cannot be appended to it.")
+
+    rank_sums = load_rank_sums(db, experiment_id) or rebuild_rank_sums(db, experiment_id)
+    return rank_sums, row['optimization_mode'] or 'minimize'
+
+def _stored_benchmarks(db, experiment_id, benchmark_names):
+    query = """
+    SELECT b.benchmark_name FROM experiment_benchmarks eb JOIN benchmarks b ON b.benchmark_id = eb.benchmark_id
+    WHERE eb.experiment_id = %s AND b.benchmark_name = ANY(%s)
+    """
+    db.execute_query(query, (experiment_id, list(benchmark_names)))
+    return {row[0] for row in db.cur.fetchall()}
+
+def _append_columns(db, experiment_id, rank_sums, benchmark_names, values):
+    append_matrix_columns(db, experiment_id, rank_sums.benchmark_count, benchmark_names, values)
+    link_experiment_names(db, experiment_id, [], benchmark_names)
+    rank_sums = add_rank_columns(rank_sums, values)
+    save_rank_sums(db, experiment_id, rank_sums)
+    return rank_sums
+
+def _positions(stored_names, appended_names, label):
+    positions = {name: i for i, name in enumerate(appended_names)}
+    if set(positions) != set(stored_names) or len(positions) != len(appended_names):
+        raise ValueError(f"The appended data must contain exactly one row or column for every stored {label}.")
+    return [positions[name] for name in stored_names]
+
+def append_experiment_benchmarks(experiment_id, append_table):
+    db = get_db()
+    try:
+        with db.transaction():
+            locked = _lock_experiment(db, experiment_id)
+            if locked is None:
+                return None
+            rank_sums, stored_mode = locked
+
+            appended = ExperimentMatrix.from_table(append_table)
+            clashes = _stored_benchmarks(db, experiment_id, appended.benchmark_names)
+            if clashes:
+                raise ValueError(f"Benchmarks already in the experiment: {', '.join(sorted(clashes))}.")
+            order = _positions(rank_sums.algorithm_names, appended.algorithm_names, "algorithm")
+            rank_sums = _append_columns(db, experiment_id, rank_sums, appended.benchmark_names, appended.values[order])
+
+        logging.info(f"Appended {len(appended.benchmark_names)} benchmarks to experiment {experiment_id}.")
+        return rank_sums, stored_mode
+    except Exception as e:
+        logging.error(f"Error appending benchmarks: {e}")
+        raise e
+
+def append_experiment_algorithms(experiment_id, append_table):
+    db = get_db()
+    try:
+        with db.transaction():
+            locked = _lock_experiment(db, experiment_id)
+            if locked is None:
+                return None
+            _, stored_mode = locked
+            stored, _ = load_experiment_matrix(db, experiment_id)
+
+            appended = ExperimentMatrix.from_table(append_table)
+            clashes = set(appended.algorithm_names) & set(stored.algorithm_names)
+            if clashes:
+                raise ValueError(f"Algorithms already in the experiment: {', '.join(sorted(clashes))}.")
+            order = _positions(stored.benchmark_names, appended.benchmark_names, "benchmark")
+            rows = ExperimentMatrix(appended.algorithm_names, stored.benchmark_names, appended.values[:, order])
+
+            state = FriedmanRankState.from_values(stored.values)
+            for row in rows.values:
+                state.append_row(row)
+            algorithm_names = stored.algorithm_names + rows.algorithm_names
+            rank_sums = RankSums(algorithm_names, state.shape[1], state.rank_sums, float(state.tie_sums.sum()))
+
+            link_experiment_names(db, experiment_id, rows.algorithm_names, [])
+            save_experiment_matrix(db, experiment_id, ExperimentMatrix(algorithm_names, stored.benchmark_names, state.values))
+            save_rank_sums(db, experiment_id, rank_sums)
+
+        logging.info(f"Appended {len(appended.algorithm_names)} algorithms to experiment {experiment_id}.")
+        return rank_sums, stored_mode
+    except Exception as e:
+        logging.error(f"Error appending algorithms: {e}")
+        raise e
+
+def _store_pending_results(db, experiment_id, cells):
+    query = """
+    INSERT INTO experiment_pending_results (experiment_id, benchmark_name, algorithm_name, value)
+    SELECT %s, cells.benchmark_name, cells.algorithm_name, cells.value
+    FROM unnest(%s::text[], %s::text[], %s::float8[]) AS cells (benchmark_name, algorithm_name, value)
+    ON CONFLICT (experiment_id, benchmark_name, algorithm_name) DO UPDATE SET value = EXCLUDED.value, received_at = CURRENT_TIMESTAMP
+    """
+    benchmarks, algorithms = zip(*cells)
+    db.execute_query(query, (experiment_id, list(benchmarks), list(algorithms), list(cells.values())))
+
+def _complete_benchmarks(db, experiment_id, benchmark_names, algorithm_names):
+    query = """
+    SELECT benchmark_name, algorithm_name, value FROM experiment_pending_results
+    WHERE experiment_id = %s AND benchmark_name = ANY(%s)
+    AND benchmark_name IN (
+        SELECT benchmark_name FROM experiment_pending_results
+        WHERE experiment_id = %s AND benchmark_name = ANY(%s)
+        GROUP BY benchmark_name HAVING COUNT(*) = %s
+    )
+    """
+    db.execute_query(query, (experiment_id, benchmark_names, experiment_id, benchmark_names, len(algorithm_names)))
+    rows = db.cur.fetchall()
+
+    # Completed benchmarks become columns in the order the batch first mentioned them.
+    columns = {name: i for i, name in enumerate(sorted({row[0] for row in rows}, key=benchmark_names.index))}
+    positions = {name: i for i, name in enumerate(algorithm_names)}
+    values = np.empty((len(algorithm_names), len(columns)), dtype=np.float64)
+    for benchmark_name, algorithm_name, value in rows:
+        values[positions[algorithm_name], columns[benchmark_name]] = value
+    return list(columns), values
+
+def append_experiment_results(experiment_id, records):
+    db = get_db()
+    try:
+        with db.transaction():
+            locked = _lock_experiment(db, experiment_id)
+            if locked is None:
+                return None
+            rank_sums, _ = locked
+            algorithm_names = rank_sums.algorithm_names
+
+            unknown = set(algorithm for algorithm, _, _ in records) - set(algorithm_names)
+            if unknown:
+                raise ValueError(f"Algorithms not in the experiment: {', '.join(sorted(unknown))}.")
+            complete = _stored_benchmarks(db, experiment_id, set(benchmark for _, benchmark, _ in records))
+            if complete:
+                raise ValueError(f"Benchmarks already complete in the experiment: {', '.join(sorted(complete))}.")
+
+            cells = {(benchmark, algorithm): value for algorithm, benchmark, value in records}
+            if not cells:
+                return []
+            _store_pending_results(db, experiment_id, cells)
+
+            touched = list(dict.fromkeys(benchmark for benchmark, _ in cells))
+            completed, values = _complete_benchmarks(db, experiment_id, touched, algorithm_names)
+            if completed:
+                _append_columns(db, experiment_id, rank_sums, completed, values)
+                db.execute_query("DELETE FROM experiment_pending_results WHERE experiment_id = %s AND benchmark_name = ANY(%s)",
+                                 (experiment_id, completed))
+
+        logging.info(f"Stored {len(cells)} streamed results for experiment {experiment_id}, completing {len(completed)} benchmarks.")
+        return completed
+    except Exception as e:
+        logging.error(f"Error appending streamed results: {e}")
+        raise e
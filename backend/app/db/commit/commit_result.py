@@ -7,7 +7,7 @@ Functions:
 1. commit_result_data:
     - Commits analysis results to the database.
     - Parameters: experiment_name, analysis_name, test_type, result_data, experiment_description, analysis_notes.
-    - Utilizes the 'Database' class for database operations and handles transactions.
+    - Uses the request's pooled database connection and joins the request's transaction.
     - Logs the process and errors, and performs a rollback in case of exceptions.
 
 2. get_or_create_analysis:
@@ -24,23 +24,20 @@ commit_result_data('Experiment1', 'Analysis1', 'TestType', result_data, 'Experim
 """
 
 import logging
-from contextlib import closing
-from app.db.database import Database
+from app.db.database import get_db
 from psycopg2.extras import Json 
 
 logging.basicConfig(level=logging.DEBUG)
 
 def commit_result_data(experiment_name, analysis_name, test_type, result_data, experiment_description, analysis_notes):
-    with closing(Database()) as db:
-        db.begin_transaction()
-        try:
+    db = get_db()
+    try:
+        with db.transaction():
             analysis_id = get_or_create_analysis(db, analysis_name, experiment_name, test_type, result_data, experiment_description, analysis_notes)
-            db.commit()
-            logging.info(f"Data for analysis_id {analysis_id} committed successfully.")
-        except Exception as e:
-            db.rollback()
-            logging.error(f"Error processing analysis data: {e}")
-            raise e
+        logging.info(f"Data for analysis_id {analysis_id} committed successfully.")
+    except Exception as e:
+        logging.error(f"Error processing analysis data: {e}")
+        raise e
 
 def get_or_create_analysis(db, analysis_name, experiment_name, test_type, result_data, experiment_description, analysis_notes):
     query = "SELECT analysis_id FROM analyses WHERE analysis_name = %s"
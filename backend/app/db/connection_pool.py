@@ -0,0 +1,198 @@
+"""
+Database Connection Pool
+
+This class keeps a process-wide pool of PostgreSQL connections, so requests reuse connections instead of opening new ones.
+
+Features:
+- Opens a configurable minimum of connections up front and at most a configurable maximum, keeping returned connections open
+  for reuse (psycopg2's own pools close every idle connection above the minimum).
+- Blocks for up to a configurable timeout when every connection is checked out, instead of failing immediately.
+- Health-checks connections on checkout: closed connections are replaced, and connections idle for longer than the check
+  interval are pinged with 'SELECT 1' first.
+- Rolls back unfinished transactions when a connection is returned, and discards connections left in a broken state.
+- Reinitialises itself after a fork (e.g. in gunicorn workers), never touching connections inherited from the parent process.
+
+Configuration (environment variables):
+- POSTGRES_HOST, POSTGRES_PORT, POSTGRES_DB, POSTGRES_USER, POSTGRES_PASSWORD: Connection details.
+- POSTGRES_POOL_MIN: Connections opened when the pool is created (default 1).
+- POSTGRES_POOL_MAX: Maximum number of connections (default 10).
+- POSTGRES_POOL_TIMEOUT: Seconds to wait for a free connection (default 30).
+- POSTGRES_POOL_CHECK_INTERVAL: Idle seconds after which a connection is pinged before reuse (default 30, 0 pings always).
+
+Usage:
+- The Database class checks connections out of 'get_connection_pool()'; code does not normally use the pool directly.
+
+Example:
+pool = get_connection_pool()
+conn = pool.getconn()
+pool.putconn(conn)
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+import psycopg2
+import psycopg2.extensions
+from psycopg2.pool import PoolError
+
+logger = logging.getLogger(__name__)
+
+class ConnectionPool:
+
+    def __init__(self, min_size=1, max_size=10, timeout=30.0, check_interval=30.0, **connect_kwargs):
+        if not 0 <= min_size <= max_size or max_size < 1:
+            raise ValueError(f"Invalid pool size: minimum {min_size}, maximum {max_size}.")
+
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.check_interval = check_interval
+        self.connect_kwargs = connect_kwargs
+
+        self._pid = None
+        self._idle = None
+        self._slots = None
+        self._last_used = {}
+        self._inherited = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_environment(cls):
+        return cls(
+            min_size=int(os.environ.get('POSTGRES_POOL_MIN', 1)),
+            max_size=int(os.environ.get('POSTGRES_POOL_MAX', 10)),
+            timeout=float(os.environ.get('POSTGRES_POOL_TIMEOUT', 30)),
+            check_interval=float(os.environ.get('POSTGRES_POOL_CHECK_INTERVAL', 30)),
+            host=os.environ.get('POSTGRES_HOST', 'db'),
+            port=os.environ.get('POSTGRES_PORT', '5432'),
+            dbname=os.environ.get('POSTGRES_DB', 'aamh_database'),
+            user=os.environ.get('POSTGRES_USER', 'aamh_user'),
+            password=os.environ.get('POSTGRES_PASSWORD', 'aamh_password'),
+        )
+
+    def getconn(self):
+        """
+        Checks out a healthy connection, waiting up to 'timeout' seconds for one to become free.
+
+        :raises PoolError: If no connection becomes free in time.
+        :raises psycopg2.Error: If a new connection cannot be opened.
+        """
+        slots = self._ensure_pool()
+        if not slots.acquire(timeout=self.timeout):
+            raise PoolError(f"No database connection became free within {self.timeout:g} seconds.")
+
+        try:
+            while True:
+                with self._lock:
+                    conn = self._idle.pop() if self._idle else None
+                if conn is None:
+                    return self._connect()
+                if self._is_healthy(conn):
+                    return conn
+                logger.warning("Discarding unhealthy pooled database connection")
+                self._discard(conn)
+        except Exception:
+            slots.release()
+            raise
+
+    def putconn(self, conn):
+        """
+        Returns a connection to the pool, rolling back any unfinished transaction.
+        """
+        if self._pid != os.getpid() or self._idle is None:
+            return
+
+        try:
+            if conn.closed:
+                self._discard(conn)
+                return
+            if conn.info.transaction_status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+            conn.autocommit = False
+            with self._lock:
+                self._last_used[id(conn)] = time.monotonic()
+                self._idle.append(conn)
+        except psycopg2.Error as e:
+            logger.warning(f"Discarding database connection that could not be reset: {e}")
+            self._discard(conn)
+        finally:
+            self._slots.release()
+
+    def closeall(self):
+        with self._lock:
+            if self._idle is not None and self._pid == os.getpid():
+                for conn in self._idle:
+                    conn.close()
+            self._idle, self._slots, self._pid = None, None, None
+            self._last_used.clear()
+
+    def _ensure_pool(self):
+        with self._lock:
+            pid = os.getpid()
+            if self._idle is not None and self._pid == pid:
+                return self._slots
+
+            if self._idle is not None:
+                # Connections inherited through fork share their sockets with the parent; closing them here would
+                # end the parent's sessions, so they are only kept referenced and never used again.
+                self._inherited.append(self._idle)
+                self._last_used.clear()
+            self._idle = deque()
+            self._slots = threading.BoundedSemaphore(self.max_size)
+            self._pid = pid
+
+        for _ in range(self.min_size):
+            conn = self._connect()
+            with self._lock:
+                self._last_used[id(conn)] = time.monotonic()
+                self._idle.append(conn)
+        logger.info(f"Database connection pool created (min {self.min_size}, max {self.max_size})")
+        return self._slots
+
+    def _connect(self):
+        try:
+            conn = psycopg2.connect(**self.connect_kwargs)
+        except psycopg2.Error as e:
+            logger.error(f"Error connecting to the database: {e}")
+            raise e
+        logger.info('Database connection established successfully')
+        return conn
+
+    def _is_healthy(self, conn):
+        if conn.closed:
+            return False
+
+        last_used = self._last_used.get(id(conn))
+        if last_used is not None and time.monotonic() - last_used < self.check_interval:
+            return True
+
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _discard(self, conn):
+        with self._lock:
+            self._last_used.pop(id(conn), None)
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+
+_connection_pool = None
+_connection_pool_lock = threading.Lock()
+
+def get_connection_pool():
+    """
+    Returns the process-wide connection pool, creating it from the environment on first use.
+    """
+    global _connection_pool
+    with _connection_pool_lock:
+        if _connection_pool is None:
+            _connection_pool = ConnectionPool.from_environment()
+        return _connection_pool
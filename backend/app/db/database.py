@@ -4,44 +4,47 @@ Database Connection Handler
 This class manages the database connections and operations for the Flask application.
 
 Features:
-- Initializes and maintains a database connection using psycopg2.
-- Fetches database connection details from environment variables with default fallbacks.
-- Implements context management to ensure proper opening and closing of database connections.
+- Checks a connection out of the process-wide connection pool and returns it when closed.
+- Implements context management to ensure connections are returned to the pool.
 - Provides methods for executing queries, handling transactions, and managing commits and rollbacks.
+- Streams large result sets through server-side cursors with 'stream_query'.
+- Provides a nestable 'transaction' context, so helpers called within a request share the request's transaction.
+- Provides 'get_db', which hands every helper in a Flask request the same Database; the app returns it to the pool on teardown.
 
 Usage:
-- Create an instance of the Database class to interact with the PostgreSQL database.
-- Use context management (with statement) to automatically handle connection closing.
+- Call 'get_db' in request handlers and database helpers to interact with the PostgreSQL database.
+- Create an instance of the Database class directly outside of requests, using context management to return the connection.
 - Call provided methods for various database operations like executing queries and managing transactions.
 
 Logging:
-- Uses logging to report successful connections, errors, and closing of database connections.
+- Uses logging to report errors and the return of connections to the pool.
 
 Example:
-with Database() as db:
+db = get_db()
+with db.transaction():
     db.execute_query("SELECT * FROM table")
     results = db.cur.fetchall()
 """
 
-import os
 import psycopg2
 import psycopg2.extras
+import itertools
 import logging
+from contextlib import contextmanager
+from flask import g, has_app_context
+from app.db.connection_pool import get_connection_pool
 
 logger = logging.getLogger(__name__)
 
-class Database:
+_cursor_ids = itertools.count()
 
-    def __init__(self):
-        db_host = os.environ.get('POSTGRES_HOST', 'db')
-        db_port = os.environ.get('POSTGRES_PORT', '5432')
-        db_name = os.environ.get('POSTGRES_DB', 'aamh_database')
-        db_user = os.environ.get('POSTGRES_USER', 'aamh_user')
-        db_password = os.environ.get('POSTGRES_PASSWORD', 'aamh_password')
+class Database:
 
-        self.conn = None
-        self.get_conn(db_host, db_port, db_name, db_user, db_password)
+    def __init__(self, pool=None):
+        self.pool = pool or get_connection_pool()
+        self.conn = self.pool.getconn()
         self.cur = self.conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+        self._transaction_depth = 0
 
     def __enter__(self):
         return self
@@ -49,24 +52,14 @@ class Database:
     def __exit__(self, type, value, traceback):
         self.close()
 
-    def get_conn(self, host, port, dbname, user, password):
-        try:
-            self.conn = psycopg2.connect(
-                host=host,
-                port=port,
-                dbname=dbname,
-                user=user,
-                password=password
-            )
-            logger.info('Database connection established successfully')
-        except psycopg2.Error as e:
-            logger.error(f"Error connecting to the database: {e}")
-            raise e
-
     def close(self):
         if self.conn is not None:
-            self.conn.close()
-            logger.info("Database connection closed.")
+            try:
+                self.cur.close()
+            finally:
+                self.pool.putconn(self.conn)
+                self.conn = None
+                logger.debug("Database connection returned to the pool.")
 
     def execute_query(self, query, params=None):
         try:
@@ -75,6 +68,21 @@ class Database:
             logger.error(f"Error executing query: {e}")
             raise e
 
+    def stream_query(self, query, params=None, itersize=200):
+        """
+        Executes a query on a server-side cursor and yields its rows, fetching 'itersize' rows per round trip,
+        so large result sets are never held in memory at once.
+        """
+        cursor_name = f"stream_{next(_cursor_ids)}"
+        try:
+            with self.conn.cursor(name=cursor_name, cursor_factory=psycopg2.extras.DictCursor) as cur:
+                cur.itersize = itersize
+                cur.execute(query, params)
+                yield from cur
+        except psycopg2.Error as e:
+            logger.error(f"Error executing query: {e}")
+            raise e
+
     def commit(self):
         try:
             self.conn.commit()
@@ -87,3 +95,42 @@ class Database:
 
     def rollback(self):
         self.conn.rollback()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Runs a block in a transaction. Only the outermost block commits or rolls back, so nested helpers join the
+        transaction of their caller.
+        """
+        self._transaction_depth += 1
+        try:
+            yield self
+            if self._transaction_depth == 1:
+                self.commit()
+        except Exception:
+            if self._transaction_depth == 1:
+                self.rollback()
+            raise
+        finally:
+            self._transaction_depth -= 1
+
+def get_db():
+    """
+    Returns the Database of the current Flask request, checking a connection out of the pool on first use.
+
+    Outside of an application context a new Database is returned, which the caller must close.
+    """
+    if not has_app_context():
+        return Database()
+
+    if 'db' not in g:
+        g.db = Database()
+    return g.db
+
+def close_db(exception=None):
+    """
+    Returns the connection of the current Flask request to the pool. Registered as an app teardown function.
+    """
+    db = g.pop('db', None)
+    if db is not None:
+        db.close()
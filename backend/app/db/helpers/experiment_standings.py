@@ -0,0 +1,58 @@
+"""
+Experiment Standings
+
+This function returns the live standings of a stored experiment whose results are still being streamed in, from the
+running Friedman accumulators kept in its rank state.
+
+Features:
+- Reads only the algorithm names, the benchmark count and the running rank and tie sums of the experiment, so the
+  query does not rank anything or read the result block, however many benchmarks are complete.
+- Rebuilds and saves the rank sums once from the stored experiment matrix when the experiment has none.
+- Reports the benchmarks that have streamed results waiting for other algorithms, with the algorithms still missing,
+  oldest first.
+
+Parameters:
+- db: The request's database object.
+- experiment_id: The ID of the stored experiment.
+
+Returns:
+- A namedtuple 'Standings' with the algorithm names, the number of complete benchmarks, the running rank sums (for
+  minimization), the total of the tie sums, the stored optimization mode and a list of (benchmark, missing algorithms)
+  tuples, or None for an unknown experiment.
+
+Example:
+standings = get_experiment_standings(db, experiment_id)
+summary = friedman_from_sums(standings.rank_sums, standings.tie_sum_total, standings.benchmark_count, optimization_mode)
+"""
+
+from collections import namedtuple
+from app.db.helpers.rank_state_store import load_rank_sums, rebuild_rank_sums
+
+Standings = namedtuple('Standings', ['algorithm_names', 'benchmark_count', 'rank_sums', 'tie_sum_total',
+                                     'optimization_mode', 'incomplete'])
+
+def get_experiment_standings(db, experiment_id):
+    sums = load_rank_sums(db, experiment_id)
+    if sums is None:
+        with db.transaction():
+            sums = rebuild_rank_sums(db, experiment_id)
+        if sums is None:
+            return None
+
+    db.execute_query("SELECT experiment_data->>'optimizationMode' AS optimization_mode FROM experiments WHERE experiment_id = %s",
+                     (experiment_id,))
+    optimization_mode = db.cur.fetchone()['optimization_mode'] or 'minimize'
+
+    query = """
+    SELECT benchmark_name, array_agg(algorithm_name) AS algorithm_names
+    FROM experiment_pending_results WHERE experiment_id = %s
+    GROUP BY benchmark_name ORDER BY MIN(received_at), benchmark_name
+    """
+    db.execute_query(query, (experiment_id,))
+    incomplete = []
+    for row in db.cur.fetchall():
+        received = set(row['algorithm_names'])
+        incomplete.append((row['benchmark_name'], [name for name in sums.algorithm_names if name not in received]))
+
+    return Standings(sums.algorithm_names, sums.benchmark_count, sums.rank_sums, sums.tie_sum_total,
+                     optimization_mode, incomplete)
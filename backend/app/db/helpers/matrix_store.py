@@ -0,0 +1,139 @@
+"""
+Experiment Matrix Storage
+
+These functions save and load the result matrix of a stored experiment in its binary form, kept in the
+'experiments.experiment_matrix' BYTEA column, so loading an experiment neither parses a JSON table nor fetches a row
+per cell.
+
+Features:
+- Stores the matrix as written by 'ExperimentMatrix.to_bytes': a small header with the shape and the names followed by
+  one little-endian float64 block, which loading wraps with 'np.frombuffer' without creating a Python object per cell.
+- Appends benchmark columns without rewriting the stored block: 'append_matrix_columns' inserts one row per new column
+  into 'experiment_matrix_columns', and loading places them after the block's columns in position order. Saving a
+  whole matrix, as appending algorithms must, writes a new block and drops the separate columns.
+- Keeps only the experiment's settings (name, optimization mode, alpha, aggregation) in the 'experiment_data' JSON
+  document; the JSON table is produced on request from the binary form by the export routes.
+- Converts experiments stored before the binary column existed, whose JSON document still holds the 'experimentTable':
+  'load_experiment_matrix' converts one on first load, and 'convert_experiment_matrices' converts all of them in
+  batches, as the migration '006_binary_experiment_matrices.sql' asks.
+- Increments the experiment's 'matrix_version' with every save, column append and conversion, and drops the experiment
+  from this worker's cache of decoded experiments, so no worker analyses a stale matrix.
+
+Functions:
+- experiment_settings(experiment_data): Returns the JSON document without the experiment table.
+- save_experiment_matrix(db, experiment_id, experiment_matrix): Replaces the binary matrix of an experiment.
+- append_matrix_columns(db, experiment_id, position, benchmark_names, values): Stores a (k, m) block of new benchmark
+  columns, the first of which is column 'position' of the experiment.
+- load_experiment_matrix(db, experiment_id, for_update=False): Returns the ExperimentMatrix and the settings of an
+  experiment, or None for an unknown experiment. 'for_update' locks the experiment row.
+- convert_experiment_matrices(db, batch_size=100): Converts every experiment still stored as a JSON table and returns
+  the number converted.
+
+Usage:
+Run the conversion once after applying the migration, from the 'backend' directory:
+python -m app.db.helpers.matrix_store
+
+Example:
+experiment_matrix, settings = load_experiment_matrix(db, experiment_id)
+"""
+
+import logging
+import numpy as np
+import psycopg2
+from psycopg2.extras import Json
+from app.util.conversion.experiment_matrix import ExperimentMatrix
+from app.util.cache.experiment_cache import experiment_cache
+
+logging.basicConfig(level=logging.DEBUG)
+
+def experiment_settings(experiment_data):
+    return {key: value for key, value in (experiment_data or {}).items() if key != 'experimentTable'}
+
+def save_experiment_matrix(db, experiment_id, experiment_matrix):
+    db.execute_query("UPDATE experiments SET experiment_matrix = %s, matrix_version = matrix_version + 1 WHERE experiment_id = %s",
+                     (psycopg2.Binary(experiment_matrix.to_bytes()), experiment_id))
+    db.execute_query("DELETE FROM experiment_matrix_columns WHERE experiment_id = %s", (experiment_id,))
+    experiment_cache.invalidate(experiment_id)
+
+def append_matrix_columns(db, experiment_id, position, benchmark_names, values):
+    values = np.asarray(values, dtype='<f8').reshape(-1, len(benchmark_names))
+    query = """
+    INSERT INTO experiment_matrix_columns (experiment_id, position, benchmark_name, column_values)
+    SELECT %s, columns.position, columns.benchmark_name, columns.column_values
+    FROM unnest(%s::integer[], %s::text[], %s::bytea[]) AS columns (position, benchmark_name, column_values)
+    """
+    columns = [psycopg2.Binary(np.ascontiguousarray(column).tobytes()) for column in values.T]
+    db.execute_query(query, (experiment_id, list(range(position, position + len(benchmark_names))),
+                             list(benchmark_names), columns))
+    # The experiment row keeps its TOASTed matrix when only the version changes, so this does not copy the block.
+    db.execute_query("UPDATE experiments SET matrix_version = matrix_version + 1 WHERE experiment_id = %s", (experiment_id,))
+    experiment_cache.invalidate(experiment_id)
+
+def _with_appended_columns(db, experiment_id, experiment_matrix):
+    db.execute_query("SELECT benchmark_name, column_values FROM experiment_matrix_columns WHERE experiment_id = %s ORDER BY position",
+                     (experiment_id,))
+    rows = db.cur.fetchall()
+    if not rows:
+        return experiment_matrix
+
+    k = experiment_matrix.shape[0]
+    columns = np.empty((k, len(rows)), dtype=np.float64)
+    for i, row in enumerate(rows):
+        columns[:, i] = np.frombuffer(row['column_values'], dtype='<f8', count=k)
+    return ExperimentMatrix(experiment_matrix.algorithm_names,
+                            experiment_matrix.benchmark_names + [row['benchmark_name'] for row in rows],
+                            np.hstack([experiment_matrix.values, columns]))
+
+def _convert(db, experiment_id, experiment_data):
+    experiment_matrix = ExperimentMatrix.from_table(experiment_data['experimentTable'])
+    settings = experiment_settings(experiment_data)
+    query = """
+    UPDATE experiments SET experiment_matrix = %s, experiment_data = %s, matrix_version = matrix_version + 1
+    WHERE experiment_id = %s
+    """
+    db.execute_query(query, (psycopg2.Binary(experiment_matrix.to_bytes()), Json(settings), experiment_id))
+    experiment_cache.invalidate(experiment_id)
+    return experiment_matrix, settings
+
+def load_experiment_matrix(db, experiment_id, for_update=False):
+    with db.transaction():
+        query = "SELECT experiment_matrix, experiment_data FROM experiments WHERE experiment_id = %s"
+        db.execute_query(query + (" FOR UPDATE" if for_update else ""), (experiment_id,))
+        row = db.cur.fetchone()
+        if row is None:
+            return None
+
+        if row['experiment_matrix'] is not None:
+            experiment_matrix = ExperimentMatrix.from_bytes(row['experiment_matrix'])
+            return _with_appended_columns(db, experiment_id, experiment_matrix), experiment_settings(row['experiment_data'])
+
+        # Stored before the binary column existed: lock the row, as the plain read above did not, and convert it.
+        if not for_update:
+            db.execute_query(query + " FOR UPDATE", (experiment_id,))
+            row = db.cur.fetchone()
+            if row['experiment_matrix'] is not None:
+                experiment_matrix = ExperimentMatrix.from_bytes(row['experiment_matrix'])
+                return _with_appended_columns(db, experiment_id, experiment_matrix), experiment_settings(row['experiment_data'])
+        return _convert(db, experiment_id, row['experiment_data'])
+
+def convert_experiment_matrices(db, batch_size=100):
+    converted = 0
+    while True:
+        with db.transaction():
+            query = """
+            SELECT experiment_id, experiment_data FROM experiments
+            WHERE experiment_matrix IS NULL ORDER BY experiment_id LIMIT %s FOR UPDATE SKIP LOCKED
+            """
+            db.execute_query(query, (batch_size,))
+            rows = db.cur.fetchall()
+            for row in rows:
+                _convert(db, row['experiment_id'], row['experiment_data'])
+        converted += len(rows)
+        if len(rows) < batch_size:
+            return converted
+
+if __name__ == '__main__':
+    from app.db.database import Database
+
+    with Database() as db:
+        logging.info(f"Converted {convert_experiment_matrices(db)} experiments to binary matrices.")
@@ -0,0 +1,81 @@
+"""
+Rank State Storage
+
+These functions save and load the running Friedman rank sums of a stored experiment, kept in the
+'experiment_rank_states' table next to the experiment.
+
+Features:
+- Stores only what the Friedman test needs: the rank sums of the k algorithms (for minimization) as raw little-endian
+  float64 bytes, the total of the tie sums, the number of ranked benchmarks and the algorithm names in the sums' order.
+  The results themselves stay in the experiment's binary matrix, and ranks are derived from it when they are needed.
+- Keeps the row O(k) in size whatever the number of benchmarks, so appending benchmarks rewrites k + 1 numbers.
+- Adds the ranks of new benchmark columns to the sums with 'add_rank_columns', ranking only those columns.
+- Rebuilds the sums once from the stored experiment matrix for experiments that have none.
+
+Functions:
+- rank_sums_from_values(algorithm_names, values): Ranks a whole (k, n) result block and returns its 'RankSums'.
+- add_rank_columns(rank_sums, values): Returns the 'RankSums' extended by a (k, m) block of new benchmark columns.
+- save_rank_sums(db, experiment_id, rank_sums): Inserts or replaces the rank sums of an experiment.
+- load_rank_sums(db, experiment_id): Returns the 'RankSums' of an experiment, or None when it has none.
+- rebuild_rank_sums(db, experiment_id): Ranks the stored matrix of an experiment under a row lock, saves and returns
+  its 'RankSums', or returns None for an unknown experiment.
+
+Example:
+rank_sums = load_rank_sums(db, experiment_id) or rebuild_rank_sums(db, experiment_id)
+rank_sums = add_rank_columns(rank_sums, values)
+save_rank_sums(db, experiment_id, rank_sums)
+"""
+
+from collections import namedtuple
+import numpy as np
+import psycopg2
+from app.db.helpers.matrix_store import load_experiment_matrix
+from app.services.stats.util.ranking import rank_columns
+
+RankSums = namedtuple('RankSums', ['algorithm_names', 'benchmark_count', 'rank_sums', 'tie_sum_total'])
+
+def rank_sums_from_values(algorithm_names, values):
+    values = np.asarray(values, dtype=np.float64).reshape(len(algorithm_names), -1)
+    ranks, tie_sums = rank_columns(values)
+    return RankSums(list(algorithm_names), values.shape[1], ranks.sum(axis=1), float(tie_sums.sum()))
+
+def add_rank_columns(rank_sums, values):
+    added = rank_sums_from_values(rank_sums.algorithm_names, values)
+    return RankSums(rank_sums.algorithm_names, rank_sums.benchmark_count + added.benchmark_count,
+                    rank_sums.rank_sums + added.rank_sums, rank_sums.tie_sum_total + added.tie_sum_total)
+
+def save_rank_sums(db, experiment_id, rank_sums):
+    query = """
+    INSERT INTO experiment_rank_states (experiment_id, algorithm_count, benchmark_count, rank_sums, tie_sum_total, algorithm_names)
+    VALUES (%s, %s, %s, %s, %s, %s)
+    ON CONFLICT (experiment_id) DO UPDATE SET
+        algorithm_count = EXCLUDED.algorithm_count, benchmark_count = EXCLUDED.benchmark_count,
+        rank_sums = EXCLUDED.rank_sums, tie_sum_total = EXCLUDED.tie_sum_total, algorithm_names = EXCLUDED.algorithm_names
+    """
+    sums = psycopg2.Binary(np.ascontiguousarray(rank_sums.rank_sums, dtype='<f8').tobytes())
+    db.execute_query(query, (experiment_id, len(rank_sums.algorithm_names), rank_sums.benchmark_count, sums,
+                             float(rank_sums.tie_sum_total), list(rank_sums.algorithm_names)))
+
+def load_rank_sums(db, experiment_id):
+    query = """
+    SELECT algorithm_names, benchmark_count, rank_sums, tie_sum_total
+    FROM experiment_rank_states WHERE experiment_id = %s
+    """
+    db.execute_query(query, (experiment_id,))
+    row = db.cur.fetchone()
+    if row is None:
+        return None
+
+    return RankSums(list(row['algorithm_names']), row['benchmark_count'], np.frombuffer(row['rank_sums'], dtype='<f8'),
+                    row['tie_sum_total'])
+
+def rebuild_rank_sums(db, experiment_id):
+    # Locks the experiment row, so the sums cannot be saved over those of an append committed in the meantime.
+    loaded = load_experiment_matrix(db, experiment_id, for_update=True)
+    if loaded is None:
+        return None
+
+    experiment_matrix, _ = loaded
+    rank_sums = rank_sums_from_values(experiment_matrix.algorithm_names, experiment_matrix.values)
+    save_rank_sums(db, experiment_id, rank_sums)
+    return rank_sums
@@ -0,0 +1,45 @@
+"""
+Run Storage
+
+These functions save and load the raw results of every independent run of a stored experiment, kept in the
+'experiment_runs' table next to the experiment.
+
+Features:
+- Stores the NaN-padded (algorithms x benchmarks x runs) block as one BYTEA value of raw little-endian float64 bytes
+  with its shape, so an experiment with 51 runs costs one row instead of 51 rows per cell.
+- Loads the block with a single 'np.frombuffer', taking the algorithm and benchmark names from the experiment table,
+  whose rows and columns are in the block's order.
+
+Functions:
+- save_runs(db, experiment_id, run_matrix): Inserts or replaces the runs of an experiment.
+- load_runs(db, experiment_id, algorithm_names, benchmark_names): Returns the RunMatrix of an experiment, or None.
+
+Example:
+save_runs(db, experiment_id, run_matrix)
+run_matrix = load_runs(db, experiment_id, experiment_matrix.algorithm_names, experiment_matrix.benchmark_names)
+"""
+
+import psycopg2
+from app.util.conversion.run_matrix import RunMatrix
+
+def save_runs(db, experiment_id, run_matrix):
+    k, n, r = run_matrix.shape
+    query = """
+    INSERT INTO experiment_runs (experiment_id, algorithm_count, benchmark_count, run_count, runs)
+    VALUES (%s, %s, %s, %s, %s)
+    ON CONFLICT (experiment_id) DO UPDATE SET
+        algorithm_count = EXCLUDED.algorithm_count, benchmark_count = EXCLUDED.benchmark_count,
+        run_count = EXCLUDED.run_count, runs = EXCLUDED.runs
+    """
+    db.execute_query(query, (experiment_id, k, n, r, psycopg2.Binary(run_matrix.to_bytes())))
+
+def load_runs(db, experiment_id, algorithm_names, benchmark_names):
+    db.execute_query("SELECT algorithm_count, benchmark_count, run_count, runs FROM experiment_runs WHERE experiment_id = %s",
+                     (experiment_id,))
+    row = db.cur.fetchone()
+    if row is None:
+        return None
+
+    if (row['algorithm_count'], row['benchmark_count']) != (len(algorithm_names), len(benchmark_names)):
+        raise ValueError(f"Stored runs of experiment {experiment_id} do not match its experiment table.")
+    return RunMatrix.from_bytes(algorithm_names, benchmark_names, row['run_count'], row['runs'])
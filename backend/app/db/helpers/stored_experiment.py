@@ -0,0 +1,70 @@
+"""
+Stored Experiment Loading
+
+This function returns the decoded matrix of a stored experiment for analysis, from this worker's cache of decoded
+experiments when it holds the current version and from the database otherwise.
+
+Features:
+- Finds the experiment by ID or by name with one single-row query, which also reads its 'matrix_version' but not its
+  matrix, so repeated analyses of an unchanged experiment neither fetch nor decode its result block.
+- Loads the matrix with 'load_experiment_matrix', converting an experiment stored as a JSON table on the way, and the
+  raw runs with 'load_runs' when the experiment has them, and caches them with the version they were read at.
+- Reads the version before the matrix, so an update committed in between pairs a newer matrix with an older version,
+  which only causes one needless reload, and never the reverse, which would hide the update.
+
+Parameters:
+- db: The request's database object.
+- experiment_id: The ID of the stored experiment, or None to look it up by name.
+- experiment_name: The name of the stored experiment, used when no ID is given.
+
+Returns:
+- A tuple of the experiment ID and a namedtuple 'CachedExperiment' with the matrix version, the ExperimentMatrix, the
+  settings, the name, the description and the RunMatrix (or None), or None for an unknown experiment.
+
+Example:
+stored = get_stored_experiment(db, experiment_name='CEC 2017')
+if stored is not None:
+    experiment_id, experiment = stored
+"""
+
+from app.db.helpers.matrix_store import load_experiment_matrix
+from app.db.helpers.run_store import load_runs
+from app.util.cache.experiment_cache import experiment_cache, CachedExperiment
+
+def _find_experiment(db, experiment_id, experiment_name):
+    query = """
+    SELECT experiment_id, experiment_name, experiment_description, matrix_version, experiment_matrix IS NULL AS legacy
+    FROM experiments
+    """
+    if experiment_id is not None:
+        db.execute_query(query + "WHERE experiment_id = %s", (experiment_id,))
+    else:
+        db.execute_query(query + "WHERE experiment_name = %s ORDER BY experiment_id LIMIT 1", (experiment_name,))
+    return db.cur.fetchone()
+
+def get_stored_experiment(db, experiment_id=None, experiment_name=None):
+    row = _find_experiment(db, experiment_id, experiment_name)
+    if row is None:
+        return None
+
+    experiment_id = row['experiment_id']
+    if not row['legacy']:
+        cached = experiment_cache.get(experiment_id, row['matrix_version'])
+        if cached is not None:
+            return experiment_id, cached
+
+    with db.transaction():
+        loaded = load_experiment_matrix(db, experiment_id)
+        if loaded is None:
+            return None
+        experiment_matrix, settings = loaded
+
+        # The conversion of a legacy row incremented its version, under a row lock this transaction still holds.
+        if row['legacy']:
+            row = _find_experiment(db, experiment_id, None)
+        run_matrix = load_runs(db, experiment_id, experiment_matrix.algorithm_names, experiment_matrix.benchmark_names)
+
+    experiment = CachedExperiment(row['matrix_version'], experiment_matrix, settings, row['experiment_name'],
+                                  row['experiment_description'] or '', run_matrix)
+    experiment_cache.put(experiment_id, experiment)
+    return experiment_id, experiment
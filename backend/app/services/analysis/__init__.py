@@ -1,3 +1,4 @@
 from .analyse_pairwise import perform_pairwise_analysis
 from .analyse_control import perform_control_analysis
-from .analyse_all import perform_all_analysis
\ No newline at end of file
+from .analyse_all import perform_all_analysis
+from .analyse_pairwise_matrix import perform_pairwise_matrix_analysis
\ No newline at end of file
@@ -4,92 +4,127 @@ All Analysis Performance Function
 This function performs a comprehensive statistical analysis on experiment data.
 
 Process:
-- Converts the experiment data to a NumPy array and retrieves algorithm names.
-- Conducts the standard Friedman test and calculates related statistics like ranks and p-values.
-- Performs pairwise z-value calculations and adjusts p-values using multiple test corrections (Holm's method).
-- Conducts the Nemenyi post-hoc test for pairwise comparisons.
-- Generates detailed tables and descriptions of the analysis results.
-- Constructs critical difference (CD) plots data for visual representation of the results.
+- Reads the algorithm names and the float64 result block from the experiment matrix.
+- Runs the omnibus tests (Friedman, Iman-Davenport, Friedman Aligned Ranks and Quade) in one pass over the result block
+  and decides the global hypothesis with the test chosen by 'omnibus_test'; the Friedman mean ranks feed the post-hoc
+  procedures whichever test is chosen.
+- Runs the all-pairs post-hoc engine on the Friedman mean ranks, which returns the z-values, p-values, Holm, Nemenyi,
+  Shaffer and Bergmann-Hommel adjusted p-values and rejection masks of all pairs as NumPy arrays, without ranking the
+  data again. The Bergmann-Hommel columns are left out above BERGMANN_HOMMEL_MAX_K algorithms.
+- Derives the table rows, the lists of significant pairs and the CD significance matrices from those arrays by indexing.
+- Optionally adds permutation p-values of every pair, unadjusted and adjusted with the permutation distribution of the
+  range of the mean ranks. They also replace the p-value of a Friedman or Iman-Davenport omnibus test.
+- Optionally resamples the benchmarks to add bootstrap confidence intervals of every mean rank and final position.
+- Generates detailed tables and descriptions of the analysis results; the description names the post-hoc procedures
+  that were actually run.
+- Collects critical difference (CD) plot specifications, which are rendered on demand rather than during the analysis.
 
 Parameters:
-- experiment_data: A NumPy array of experiment data.
+- experiment_matrix: An ExperimentMatrix of experiment data.
 - optimization_mode: An instance of OptimizationMode Enum indicating the optimization direction.
 - alpha: The significance level used for statistical tests.
+- omnibus_test: Key of the omnibus test in OMNIBUS_TESTS that decides the global hypothesis (default 'friedman').
+- bootstrap_options: A 'BootstrapOptions' tuple to add bootstrap confidence intervals of the mean ranks, or None.
+- permutation_options: A 'PermutationOptions' tuple to add permutation p-values, or None.
 
 Returns:
-- A tuple containing the ranks table, detailed analysis table, descriptive statistics, and CD plot data.
+- A tuple containing the ranks table, detailed analysis table, descriptive statistics, and CD plot specifications.
 
 Usage:
 - This function is used to perform an end-to-end analysis of experiment data, especially in comparing multiple algorithms or methods.
 
 Example:
-ranks_table, analysis_table, description, cd_plot_data = perform_all_analysis(experiment_data, OptimizationMode.MINIMIZE, 0.05)
+ranks_table, analysis_table, description, cd_plot_specs = perform_all_analysis(experiment_matrix, OptimizationMode.MINIMIZE, 0.05)
 """
 
-import numpy as np
-import pandas as pd
 import logging
-import scikit_posthocs as sp
-from statsmodels.stats.multitest import multipletests
+import numpy as np
 
-from app.services.stats.nonparametric import standard_friedman_test
-from app.services.stats.nonparametric.friedman_test.friedman_util import calculate_f_critical_value, calculate_iman_davenport_stat
-from app.util.graphs.critical_difference_plots import generate_cd_plot_data
-from app.services.stats.util.z_values import calculate_pairwise_z_values, calculate_p_value
+from app.services.stats.nonparametric import omnibus_tests, summarise_omnibus_tests, OMNIBUS_TESTS, DEFAULT_OMNIBUS_TEST
+from app.services.stats.nonparametric.friedman_test.friedman_util import calculate_f_critical_value
+from app.services.stats.resampling import bootstrap_mean_ranks, summarise_bootstrap, permutation_tests, summarise_permutation, \
+    PERMUTATION_OMNIBUS_TESTS
+from app.util.graphs.critical_difference_plots import build_cd_plot_spec
+from app.services.stats.posthoc import all_pairs_posthoc, symmetric_matrix
 
 logging.basicConfig(level=logging.DEBUG)
 
-def perform_all_analysis(experiment_data, optimization_mode, alpha: float):
-    k, n = experiment_data.shape[0], experiment_data.shape[1] - 1
-    algorithm_names = experiment_data[:, 0]
+def _format_5g(values):
+    return ["{:.5g}".format(value) for value in values.tolist()]
+
+def perform_all_analysis(experiment_matrix, optimization_mode, alpha: float, omnibus_test=DEFAULT_OMNIBUS_TEST,
+                         bootstrap_options=None, permutation_options=None):
+    k, n = experiment_matrix.shape
+    algorithm_names = experiment_matrix.algorithm_names
 
-    friedman_result = standard_friedman_test(np.vstack(experiment_data), optimization_mode)
+    omnibus_result = omnibus_tests(experiment_matrix, optimization_mode)
+    friedman_result = omnibus_result.friedman
     friedman_stat = friedman_result.friedman_stat
-    p_value = friedman_result.p_value
+    p_value = omnibus_result.tests[omnibus_test].p_value
+
+    permutation = None
+    if permutation_options is not None:
+        permutation = permutation_tests(friedman_result.rank_matrix, permutation_options, alpha)
+        if omnibus_test in PERMUTATION_OMNIBUS_TESTS:
+            p_value = permutation.friedman_p_value
     ranks = friedman_result.ranks
 
-    z_values = calculate_pairwise_z_values(ranks, n)
-
-    p_values_unadjusted = {pair: calculate_p_value(z) for pair, z in z_values.items()}
-    transposed_data = experiment_data[:, 1:].T
-    nemenyi_result = sp.posthoc_nemenyi_friedman(transposed_data)
-
-    all_p_values = [calculate_p_value(z) for z in z_values.values()]
-    _, holm_p_values_adjusted, _, _ = multipletests(pvals=all_p_values, alpha=alpha, method='holm')
-
-    table = [["Algorithm Pair", "z-value", "p-value", "APV (Holm)", "APV (Nemenyi)", "Holm NH", "Nemenyi NH"]]
-    significant_algorithms_nemenyi = []
-    significant_algorithms_holm = []
-
-    for i in range(len(algorithm_names)):
-        for j in range(i + 1, len(algorithm_names)):
-            z_value = z_values.get((i, j), None)
-            alg_pair = f"{algorithm_names[i]} vs {algorithm_names[j]}"
-            p_unadj = p_values_unadjusted.get((i, j), None)
-            holm_p_adj = holm_p_values_adjusted[list(z_values.keys()).index((i, j))]
-            nemenyi_p_adj = nemenyi_result.iloc[i, j]
-            nemenyi_nh_outcome = "Rejected" if nemenyi_p_adj < alpha else "Retained"
-            if nemenyi_nh_outcome == "Rejected":
-                significant_algorithms_nemenyi.append(alg_pair)
-            holm_nh_outcome = "Rejected" if holm_p_adj < alpha else "Retained"
-            if holm_nh_outcome == "Rejected":
-                significant_algorithms_holm.append(alg_pair)
-
-            table.append([alg_pair, 
-                        "{:.5g}".format(z_value),
-                        "{:.5g}".format(p_unadj),
-                        "{:.5g}".format(holm_p_adj),
-                        "{:.5g}".format(nemenyi_p_adj),
-                        holm_nh_outcome, nemenyi_nh_outcome])
-
-    nemenyi_result = nemenyi_result.astype(float)
-    
-    iman_davenport_stat = calculate_iman_davenport_stat(friedman_stat, k, n)
+    posthoc = all_pairs_posthoc(ranks, n, alpha)
+
+    names = np.array(algorithm_names, dtype=object)
+    pair_names = names[posthoc.first] + " vs " + names[posthoc.second]
+    holm_outcomes = np.where(posthoc.holm_rejected, "Rejected", "Retained")
+    nemenyi_outcomes = np.where(posthoc.nemenyi_rejected, "Rejected", "Retained")
+    shaffer_outcomes = np.where(posthoc.shaffer_rejected, "Rejected", "Retained")
+    bergmann_available = posthoc.bergmann_p_value is not None
+
+    header = ["Algorithm Pair", "z-value", "p-value", "APV (Holm)", "APV (Nemenyi)", "APV (Shaffer)"]
+    columns = [pair_names.tolist(),
+               _format_5g(posthoc.z),
+               _format_5g(posthoc.p_value),
+               _format_5g(posthoc.holm_p_value),
+               _format_5g(posthoc.nemenyi_p_value),
+               _format_5g(posthoc.shaffer_p_value)]
+    if bergmann_available:
+        header.append("APV (Bergmann)")
+        columns.append(_format_5g(posthoc.bergmann_p_value))
+    if permutation is not None:
+        header.extend(["p-value (Permutation)", "APV (Permutation)"])
+        columns.extend([_format_5g(permutation.p_value), _format_5g(permutation.range_p_value)])
+
+    header.extend(["Holm NH", "Nemenyi NH", "Shaffer NH"])
+    columns.extend([holm_outcomes.tolist(), nemenyi_outcomes.tolist(), shaffer_outcomes.tolist()])
+    if bergmann_available:
+        header.append("Bergmann NH")
+        columns.append(np.where(posthoc.bergmann_rejected, "Rejected", "Retained").tolist())
+    if permutation is not None:
+        header.append("Permutation NH")
+        columns.append(np.where(permutation.range_p_value < alpha, "Rejected", "Retained").tolist())
+
+    table = [header]
+    table.extend(map(list, zip(*columns)))
+
+    post_hoc_procedures = ["Holm", "Nemenyi", "Shaffer"]
+    if bergmann_available:
+        post_hoc_procedures.append("Bergmann-Hommel")
+    if permutation is not None:
+        post_hoc_procedures.append("Permutation")
+
+    significant_algorithms_nemenyi = pair_names[posthoc.nemenyi_rejected].tolist()
+    significant_algorithms_holm = pair_names[posthoc.holm_rejected].tolist()
+    significant_algorithms_shaffer = pair_names[posthoc.shaffer_rejected].tolist()
+    significant_algorithms_bergmann = pair_names[posthoc.bergmann_rejected].tolist() if bergmann_available else None
+    significant_algorithms_permutation = pair_names[permutation.range_p_value < alpha].tolist() if permutation is not None else None
+
+    iman_davenport_stat = friedman_result.iman_davenport_stat
     f_critical_value = calculate_f_critical_value(k, n, alpha)
 
     description = {
-        "test_applied": "Standard Friedman Test",
-        "post_hoc": "Nemenyi",
+        "test_applied": OMNIBUS_TESTS[omnibus_test],
+        "omnibus_test": omnibus_test,
+        "omnibus_tests": summarise_omnibus_tests(omnibus_result, alpha),
+        "post_hoc": ", ".join(post_hoc_procedures),
+        "post_hoc_procedures": post_hoc_procedures,
         "friedman_stat": '{:.5e}'.format(friedman_stat) if friedman_stat < 0.001 else '{:.5f}'.format(friedman_stat),
         "p_value": '{:.5e}'.format(p_value) if p_value < 0.001 else '{:.5f}'.format(p_value),
         "significant": True if p_value < alpha else False,
@@ -98,33 +133,38 @@ def perform_all_analysis(experiment_data, optimization_mode, alpha: float):
         "significant_algorithms" : significant_algorithms_nemenyi + significant_algorithms_holm, 
         "significant_algorithms_nemenyi": significant_algorithms_nemenyi,
         "significant_algorithms_holm": significant_algorithms_holm,
+        "significant_algorithms_shaffer": significant_algorithms_shaffer,
+        "significant_algorithms_bergmann": significant_algorithms_bergmann,
+        "bergmann_available": bergmann_available,
         "algorithm_cardinality": k,
         "benchmark_cardinality": n,
         "iman_davenport_critical": '{:.5e}'.format(f_critical_value) if f_critical_value < 0.001 else '{:.5f}'.format(f_critical_value),
         "iman_davenport_stat": '{:.5e}'.format(iman_davenport_stat) if iman_davenport_stat < 0.001 else '{:.5f}'.format(iman_davenport_stat),
     }
 
+    if permutation is not None:
+        description["permutation"] = summarise_permutation(permutation)
+        description["permutation"]["significant_algorithms"] = significant_algorithms_permutation
+
+    if bootstrap_options is not None:
+        bootstrap_result = bootstrap_mean_ranks(friedman_result.rank_matrix, bootstrap_options, optimization_mode)
+        description["bootstrap"] = summarise_bootstrap(bootstrap_result, experiment_matrix.algorithm_names)
+
     ranks_for_cd = dict(zip(algorithm_names, ranks))
 
-    sig_matrix_for_nemenyi = pd.DataFrame(np.ones((k, k)), index=algorithm_names, columns=algorithm_names)
-    for (i, j), _ in z_values.items():
-        p_adj_value = float(nemenyi_result.iloc[min(i, j), max(i, j)])
-        sig_matrix_for_nemenyi.iloc[i, j] = p_adj_value
-        sig_matrix_for_nemenyi.iloc[j, i] = p_adj_value
+    sig_matrix_for_nemenyi = symmetric_matrix(k, posthoc.nemenyi_p_value)
+    nemenyi_cd_plot_spec = build_cd_plot_spec(ranks_for_cd, sig_matrix_for_nemenyi, "Nemenyi")
 
-    nemenyi_cd_plot_data = generate_cd_plot_data(ranks_for_cd, sig_matrix_for_nemenyi, "Nemenyi")
+    sig_matrix_for_holm = symmetric_matrix(k, posthoc.holm_p_value)
+    holm_cd_plot_spec = build_cd_plot_spec(ranks_for_cd, sig_matrix_for_holm, "Holm")
 
-    sig_matrix_for_holm = pd.DataFrame(np.ones((k, k)), index=algorithm_names, columns=algorithm_names)
-    counter = 0
-    for i in range(len(algorithm_names)):
-        for j in range(i + 1, len(algorithm_names)):
-            holm_p_adj = holm_p_values_adjusted[counter]
-            sig_matrix_for_holm.iloc[i, j] = holm_p_adj
-            sig_matrix_for_holm.iloc[j, i] = holm_p_adj
-            counter += 1
+    sig_matrix_for_shaffer = symmetric_matrix(k, posthoc.shaffer_p_value)
+    shaffer_cd_plot_spec = build_cd_plot_spec(ranks_for_cd, sig_matrix_for_shaffer, "Shaffer")
 
-    holm_cd_plot_data = generate_cd_plot_data(ranks_for_cd, sig_matrix_for_holm, "Holm")
+    cd_plot_specs = [nemenyi_cd_plot_spec, holm_cd_plot_spec, shaffer_cd_plot_spec]
 
-    cd_plot_data = [nemenyi_cd_plot_data, holm_cd_plot_data]
+    if bergmann_available:
+        sig_matrix_for_bergmann = symmetric_matrix(k, posthoc.bergmann_p_value)
+        cd_plot_specs.append(build_cd_plot_spec(ranks_for_cd, sig_matrix_for_bergmann, "Bergmann"))
 
-    return friedman_result.ranks_table, table, description, cd_plot_data
\ No newline at end of file
+    return friedman_result.ranks_table, table, description, cd_plot_specs
\ No newline at end of file
@@ -5,26 +5,34 @@ This function performs a control analysis on experiment data, comparing a contro
 
 Process:
 - Retrieves the control algorithm's data and compares it with other algorithms.
-- Conducts the standard Friedman test and calculates related statistics like ranks and p-values.
+- Runs the omnibus tests (Friedman, Iman-Davenport, Friedman Aligned Ranks and Quade) in one pass over the result block
+  and decides the global hypothesis with the test chosen by 'omnibus_test'; the Friedman mean ranks feed the post-hoc
+  procedures whichever test is chosen.
 - Performs control-specific z-value calculations for pairwise comparisons with the control algorithm.
 - Adjusts p-values using the Holm correction method for multiple testing.
+- Optionally adds permutation p-values of the control's pairs, unadjusted and Holm-adjusted. They also replace the
+  p-value of a Friedman or Iman-Davenport omnibus test.
+- Optionally resamples the benchmarks to add bootstrap confidence intervals of every mean rank and final position.
 - Generates detailed tables and descriptions of the analysis results, including algorithm pairs, z-values, and p-values.
-- Constructs a critical difference (CD) plot data matrix for visual representation of the results.
+- Collects a critical difference (CD) plot specification, which is rendered on demand rather than during the analysis.
 
 Parameters:
-- experiment_data: A NumPy array of experiment data.
-- selected_row: Index of the control algorithm in the experiment data.
+- experiment_matrix: An ExperimentMatrix of experiment data.
+- selected_row: Index of the control algorithm in the experiment matrix.
 - optimization_mode: An instance of OptimizationMode Enum indicating the optimization direction.
 - alpha: The significance level used for statistical tests.
+- omnibus_test: Key of the omnibus test in OMNIBUS_TESTS that decides the global hypothesis (default 'friedman').
+- bootstrap_options: A 'BootstrapOptions' tuple to add bootstrap confidence intervals of the mean ranks, or None.
+- permutation_options: A 'PermutationOptions' tuple to add permutation p-values, or None.
 
 Returns:
-- A tuple containing the ranks table, analysis table, descriptive statistics, and CD plot data.
+- A tuple containing the ranks table, analysis table, descriptive statistics, and CD plot specifications.
 
 Usage:
 - Used to analyze the performance of a control algorithm relative to other algorithms, particularly useful in benchmarking studies.
 
 Example:
-ranks_table, analysis_table, description, cd_plot_data = perform_control_analysis(experiment_data, selected_row, OptimizationMode.MINIMIZE, 0.05)
+ranks_table, analysis_table, description, cd_plot_specs = perform_control_analysis(experiment_matrix, selected_row, OptimizationMode.MINIMIZE, 0.05)
 """
 
 import numpy as np
@@ -32,22 +40,37 @@ import pandas as pd
 from statsmodels.stats.multitest import multipletests
 import logging
 
-from app.services.stats.nonparametric import standard_friedman_test
+from app.services.stats.nonparametric import omnibus_tests, summarise_omnibus_tests, OMNIBUS_TESTS, DEFAULT_OMNIBUS_TEST
+from app.services.stats.posthoc import holm_adjust
 from app.services.stats.util.z_values import calculate_control_z_values, calculate_p_value
-from app.services.stats.nonparametric.friedman_test.friedman_util import calculate_f_critical_value, calculate_iman_davenport_stat
-from app.util.graphs.critical_difference_plots import generate_cd_plot_data
+from app.services.stats.nonparametric.friedman_test.friedman_util import calculate_f_critical_value
+from app.services.stats.resampling import bootstrap_mean_ranks, summarise_bootstrap, permutation_tests, summarise_permutation, \
+    pair_positions, PERMUTATION_OMNIBUS_TESTS
+from app.util.graphs.critical_difference_plots import build_cd_plot_spec
 
 logging.basicConfig(level=logging.DEBUG)
 
-def perform_control_analysis(experiment_data, selected_row, optimization_mode, alpha: float):
-    k, n = experiment_data.shape[0], experiment_data.shape[1] - 1
-    control_algorithm_name = experiment_data[selected_row, 0]
-    other_algorithm_names = experiment_data[np.arange(k) != selected_row, 0]
+def perform_control_analysis(experiment_matrix, selected_row, optimization_mode, alpha: float, omnibus_test=DEFAULT_OMNIBUS_TEST,
+                             bootstrap_options=None, permutation_options=None):
+    k, n = experiment_matrix.shape
+    algorithm_names = np.array(experiment_matrix.algorithm_names, dtype=object)
+    control_algorithm_name = algorithm_names[selected_row]
+    other_algorithm_names = algorithm_names[np.arange(k) != selected_row]
 
-    friedman_result = standard_friedman_test(np.vstack(experiment_data), optimization_mode)
+    omnibus_result = omnibus_tests(experiment_matrix, optimization_mode)
+    friedman_result = omnibus_result.friedman
     friedman_stat = friedman_result.friedman_stat
-    p_value = friedman_result.p_value
-    z_values = calculate_control_z_values(friedman_result.ranks[0], friedman_result.ranks[1:], k, n)
+    p_value = omnibus_result.tests[omnibus_test].p_value
+
+    permutation = None
+    if permutation_options is not None:
+        permutation = permutation_tests(friedman_result.rank_matrix, permutation_options, alpha)
+        if omnibus_test in PERMUTATION_OMNIBUS_TESTS:
+            p_value = permutation.friedman_p_value
+
+    control_rank = friedman_result.ranks[selected_row]
+    other_ranks = np.delete(friedman_result.ranks, selected_row)
+    z_values = calculate_control_z_values(control_rank, other_ranks, k, n)
 
     p_values_unadjusted = [calculate_p_value(z) for z in z_values]
     reject, p_values_adjusted, _, _ = multipletests(pvals=p_values_unadjusted, alpha=alpha, method='holm')
@@ -65,12 +88,29 @@ def perform_control_analysis(experiment_data, selected_row, optimization_mode, a
          nh_outcome] for alg_pair, z, p_unadj, p_adj, nh_outcome in data_for_table
     ]
 
-    iman_davenport_stat = calculate_iman_davenport_stat(friedman_result.friedman_stat, k, n)
+    significant_algorithms_permutation = None
+    if permutation is not None:
+        other_rows = np.flatnonzero(np.arange(k) != selected_row)
+        permutation_p_values = permutation.p_value[pair_positions(k, selected_row, other_rows)]
+        permutation_adjusted = holm_adjust(permutation_p_values)
+        permutation_cells = {f"{control_algorithm_name} vs {alg_name}": (p, p_adj)
+                             for alg_name, p, p_adj in zip(other_algorithm_names, permutation_p_values, permutation_adjusted)}
+
+        table[0].extend(["p-value (permutation)", "p-value (permutation, adjusted)"])
+        for row in table[1:]:
+            p_perm, p_perm_adj = permutation_cells[row[0]]
+            row.extend([f"{p_perm:.5f}" if p_perm >= 0.001 else f"{p_perm:.5e}",
+                        f"{p_perm_adj:.5f}" if p_perm_adj >= 0.001 else f"{p_perm_adj:.5e}"])
+        significant_algorithms_permutation = [alg_pair for alg_pair, (_, p_perm_adj) in permutation_cells.items() if p_perm_adj < alpha]
+
+    iman_davenport_stat = friedman_result.iman_davenport_stat
     f_critical_value = calculate_f_critical_value(k, n, alpha)
     significant_algorithms = [alg_name for alg_name, _, _, p_adj, _ in data_for_table if p_adj < alpha]
 
     description = {
-        "test_applied": "Standard Friedman Test",
+        "test_applied": OMNIBUS_TESTS[omnibus_test],
+        "omnibus_test": omnibus_test,
+        "omnibus_tests": summarise_omnibus_tests(omnibus_result, alpha),
         "post_hoc": "Holm",
         "friedman_stat": '{:.5e}'.format(friedman_stat) if friedman_stat < 0.001 else '{:.5f}'.format(friedman_stat),
         "p_value": '{:.5e}'.format(p_value) if p_value < 0.001 else '{:.5f}'.format(p_value),
@@ -85,7 +125,15 @@ def perform_control_analysis(experiment_data, selected_row, optimization_mode, a
         "control_algorithm": control_algorithm_name,
     }
 
-    ranks_for_cd = {algorithm: rank for algorithm, rank in zip(np.concatenate(([control_algorithm_name], other_algorithm_names)), friedman_result.ranks)}
+    if permutation is not None:
+        description["permutation"] = summarise_permutation(permutation)
+        description["permutation"]["significant_algorithms"] = significant_algorithms_permutation
+
+    if bootstrap_options is not None:
+        bootstrap_result = bootstrap_mean_ranks(friedman_result.rank_matrix, bootstrap_options, optimization_mode)
+        description["bootstrap"] = summarise_bootstrap(bootstrap_result, experiment_matrix.algorithm_names)
+
+    ranks_for_cd = {algorithm: rank for algorithm, rank in zip(np.concatenate(([control_algorithm_name], other_algorithm_names)), np.concatenate(([control_rank], other_ranks)))}
 
     sig_matrix_for_cd = np.ones((len(ranks_for_cd), len(ranks_for_cd)))
     control_index = 0
@@ -93,10 +141,10 @@ def perform_control_analysis(experiment_data, selected_row, optimization_mode, a
         sig_matrix_for_cd[[control_index, i], [i, control_index]] = p_adj
     sig_matrix_for_cd = pd.DataFrame(sig_matrix_for_cd, index=ranks_for_cd.keys(), columns=ranks_for_cd.keys())
 
-    holm_cd_plot_data = generate_cd_plot_data(ranks_for_cd, sig_matrix_for_cd, "Holm")
+    holm_cd_plot_spec = build_cd_plot_spec(ranks_for_cd, sig_matrix_for_cd, "Holm")
 
-    cd_plot_data = [holm_cd_plot_data]
+    cd_plot_specs = [holm_cd_plot_spec]
 
-    return friedman_result.ranks_table, table, description, cd_plot_data
+    return friedman_result.ranks_table, table, description, cd_plot_specs
 
 
@@ -5,45 +5,51 @@ This function performs pairwise statistical analysis on two sets of algorithm re
 
 Functionality:
 - Compares two algorithms using the Wilcoxon signed-rank test.
-- Converts algorithm results to Decimal for precise arithmetic operations.
+- Reads both algorithms' results directly from the float64 block of the experiment matrix.
 - Computes the Wilcoxon test statistics including R⁺, R⁻, and p-value.
 - Generates a table with Wilcoxon test results and a table of critical values for various alpha levels.
 - Provides a descriptive summary of the statistical comparison between the two algorithms.
+- When the raw runs of both algorithms are given, reports every benchmark's mean and standard deviation over the runs
+  and the Vargha-Delaney A12 effect size of the first algorithm over the second, next to the Wilcoxon test of the
+  aggregated results.
 
 Parameters:
-- algorithm_one: A tuple containing the first algorithm's name and a list of its results.
-- algorithm_two: A tuple containing the second algorithm's name and a list of its results.
+- experiment_matrix: An ExperimentMatrix of experiment data.
+- algorithm_one: Row index of the first algorithm in the experiment matrix.
+- algorithm_two: Row index of the second algorithm in the experiment matrix.
 - optimization_mode: An instance of OptimizationMode Enum indicating the optimization direction.
 - alpha: The significance level used for the Wilcoxon test.
+- runs: Optionally, a (2, n, r) float array of the NaN-padded runs of the two algorithms.
+- aggregation: The name of the aggregation that reduced the runs to the experiment matrix, for the description.
 
 Returns:
-- A tuple containing the Wilcoxon test result table, critical values table, and a descriptive summary.
+- A tuple containing the Wilcoxon test result table, critical values table, run table (None without runs), and a descriptive summary.
 
 Usage:
 - This function is used for detailed pairwise comparisons between two algorithms, particularly useful in performance benchmarking studies.
 
 Example:
-wilcoxon_table, critical_values_table, description = perform_pairwise_analysis(algorithm_one, algorithm_two, OptimizationMode.MINIMIZE, 0.05)
+wilcoxon_table, critical_values_table, run_table, description = perform_pairwise_analysis(experiment_matrix, algorithm_one, algorithm_two, OptimizationMode.MINIMIZE, 0.05)
 """
 
-from app.services.stats.nonparametric import wilcoxon_signed_rank_test
-from decimal import Decimal
+from app.services.stats.nonparametric import wilcoxon_signed_rank_test, vargha_delaney_a12
+from app.util.conversion.run_matrix import RunMatrix
 import logging
 
 logging.basicConfig(level=logging.DEBUG)
 
 def perform_pairwise_analysis(
+        experiment_matrix,
         algorithm_one, 
         algorithm_two, 
         optimization_mode, 
-        alpha: float
+        alpha: float,
+        runs=None,
+        aggregation=None
     ):
     
-    algorithm_one_name, algorithm_one_results = algorithm_one[0], algorithm_one[1:]
-    algorithm_two_name, algorithm_two_results = algorithm_two[0], algorithm_two[1:]
-
-    algorithm_one_results = [Decimal(result) for result in algorithm_one_results]
-    algorithm_two_results = [Decimal(result) for result in algorithm_two_results]
+    algorithm_one_name, algorithm_one_results = experiment_matrix.row(algorithm_one)
+    algorithm_two_name, algorithm_two_results = experiment_matrix.row(algorithm_two)
 
     n = len(algorithm_one_results)
 
@@ -87,4 +93,31 @@ def perform_pairwise_analysis(
         "benchmark_cardinality": str(n),
     }
     
-    return wilcoxon_table, critical_values_table, description
\ No newline at end of file
+    run_table = None
+    if runs is not None:
+        run_table, description["runs"] = _run_dispersion(experiment_matrix, algorithm_one_name, algorithm_two_name,
+                                                         runs, optimization_mode, aggregation)
+
+    return wilcoxon_table, critical_values_table, run_table, description
+
+def _run_dispersion(experiment_matrix, algorithm_one_name, algorithm_two_name, runs, optimization_mode, aggregation):
+    run_matrix = RunMatrix([algorithm_one_name, algorithm_two_name], experiment_matrix.benchmark_names, runs)
+    means = run_matrix.aggregate('mean', optimization_mode).values
+    deviations = run_matrix.dispersion()
+    counts = run_matrix.run_counts()
+    effect_size = vargha_delaney_a12(runs[0], runs[1], optimization_mode)
+
+    run_table = [["Benchmark", f"{algorithm_one_name} (mean ± sd)", f"{algorithm_two_name} (mean ± sd)", "Runs", "A12", "Effect Size"]]
+    for j, benchmark_name in enumerate(experiment_matrix.benchmark_names):
+        run_table.append([benchmark_name,
+                          '{:.5g} ± {:.3g}'.format(means[0, j], deviations[0, j]),
+                          '{:.5g} ± {:.3g}'.format(means[1, j], deviations[1, j]),
+                          f"{counts[0, j]} / {counts[1, j]}",
+                          '{:.3f}'.format(effect_size.a12[j]),
+                          effect_size.magnitude[j]])
+
+    summary = {"aggregation": aggregation,
+               "max_runs": int(runs.shape[2]),
+               "mean_a12": '{:.3f}'.format(float(effect_size.a12.mean())),
+               "large_effects": sum(1 for magnitude in effect_size.magnitude if magnitude == 'large')}
+    return run_table, summary
\ No newline at end of file
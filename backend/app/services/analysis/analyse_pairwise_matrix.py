@@ -0,0 +1,82 @@
+"""
+Pairwise Matrix Analysis Function
+
+This function compares every pair of a set of algorithms with the Wilcoxon signed-rank test in one batched computation.
+
+Functionality:
+- Runs 'wilcoxon_signed_rank_matrix' on the selected rows of the experiment matrix, or on all rows.
+- Adjusts the p-values of all pairs for multiple comparisons with the Holm or Bonferroni procedure.
+- Generates a table with one row per algorithm pair, and dense (k x k) matrices of R⁺, R⁻, p-values, adjusted p-values
+  and null hypothesis outcomes, where entry [i][j] compares algorithm i against algorithm j and the diagonal is None.
+- Provides a descriptive summary listing the significantly different pairs.
+
+Parameters:
+- experiment_matrix: An ExperimentMatrix of experiment data.
+- algorithm_indices: Row indices of the algorithms to compare, or None for all algorithms.
+- optimization_mode: An instance of OptimizationMode Enum indicating the optimization direction; R⁺ of [i][j] sums the
+  ranks of the benchmarks on which algorithm i is better.
+- alpha: The significance level used for the adjusted p-values.
+- correction: 'holm' or 'bonferroni'.
+
+Returns:
+- A tuple containing the pair table, the dictionary of dense matrices and a descriptive summary.
+
+Example:
+table, matrices, description = perform_pairwise_matrix_analysis(experiment_matrix, None, OptimizationMode.MINIMIZE, 0.05, 'holm')
+"""
+
+import numpy as np
+from statsmodels.stats.multitest import multipletests
+from app.services.stats.nonparametric.wilcoxon_test.wilcoxon_matrix import wilcoxon_signed_rank_matrix
+
+CORRECTIONS = {'holm': 'Holm', 'bonferroni': 'Bonferroni'}
+
+def _dense(k, first, second, upper, lower):
+    matrix = np.full((k, k), None, dtype=object)
+    matrix[first, second] = upper
+    matrix[second, first] = lower
+    return matrix.tolist()
+
+def perform_pairwise_matrix_analysis(experiment_matrix, algorithm_indices, optimization_mode, alpha: float, correction='holm'):
+    if algorithm_indices is None:
+        algorithm_indices = list(range(experiment_matrix.shape[0]))
+
+    algorithm_names = [experiment_matrix.algorithm_names[i] for i in algorithm_indices]
+    values = experiment_matrix.values[algorithm_indices]
+    k, n = values.shape
+
+    result = wilcoxon_signed_rank_matrix(values, optimization_mode)
+    rejected, adjusted_p_values, _, _ = multipletests(pvals=result.p_value, alpha=alpha, method=correction)
+    correction_name = CORRECTIONS[correction]
+
+    table = [["Algorithm Pair", "R⁺", "R⁻", "T", "p-value", f"APV ({correction_name})", f"{correction_name} NH"]]
+    significant_algorithms = []
+    for i, j, r_plus, r_minus, t, p, p_adj, reject in zip(result.first, result.second, result.R_plus, result.R_minus,
+                                                          result.T, result.p_value, adjusted_p_values, rejected):
+        pair = f"{algorithm_names[i]} vs {algorithm_names[j]}"
+        if reject:
+            significant_algorithms.append(pair)
+        table.append([pair, "{:g}".format(r_plus), "{:g}".format(r_minus), "{:g}".format(t),
+                      "{:.5g}".format(p), "{:.5g}".format(p_adj), "Rejected" if reject else "Retained"])
+
+    outcomes = np.where(rejected, "Rejected", "Retained")
+    matrices = {
+        "algorithms": algorithm_names,
+        "rPlus": _dense(k, result.first, result.second, result.R_plus, result.R_minus),
+        "rMinus": _dense(k, result.first, result.second, result.R_minus, result.R_plus),
+        "pValues": _dense(k, result.first, result.second, result.p_value, result.p_value),
+        "adjustedPValues": _dense(k, result.first, result.second, adjusted_p_values, adjusted_p_values),
+        "nullHypothesis": _dense(k, result.first, result.second, outcomes, outcomes),
+    }
+
+    description = {
+        "test_applied": "Wilcoxon Signed-ranks Test (all pairs)",
+        "correction": correction_name,
+        "alpha": '{:.5g}'.format(alpha),
+        "algorithm_cardinality": k,
+        "benchmark_cardinality": n,
+        "comparisons": len(result.first),
+        "significant_algorithms": significant_algorithms,
+    }
+
+    return table, matrices, description
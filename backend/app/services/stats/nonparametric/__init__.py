@@ -1,2 +1,4 @@
 from .wilcoxon_test.wilcoxon_signed_rank_test import wilcoxon_signed_rank_test
-from .friedman_test.standard_friedman_test import standard_friedman_test
\ No newline at end of file
+from .friedman_test.standard_friedman_test import standard_friedman_test
+from .omnibus_test.omnibus_tests import omnibus_tests, summarise_omnibus_tests, OMNIBUS_TESTS, DEFAULT_OMNIBUS_TEST
+from .effect_size.vargha_delaney import vargha_delaney_a12, EffectSize
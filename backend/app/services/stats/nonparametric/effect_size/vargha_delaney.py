@@ -0,0 +1,55 @@
+"""
+Vargha-Delaney Effect Size Function
+
+This function measures, on every benchmark, how often the independent runs of one algorithm beat those of another.
+
+Functionality:
+- Computes the Vargha-Delaney A12 statistic of every benchmark at once: the probability that a randomly chosen run of
+  the first algorithm is better than a randomly chosen run of the second, with ties counting half.
+- Compares all r1 x r2 pairs of runs of every benchmark as one (n, r1, r2) broadcast, ignoring the NaN padding of
+  cells with fewer runs.
+- Labels every A12 value negligible, small, medium or large by the thresholds of Vargha and Delaney (2000) on
+  max(A12, 1 - A12): 0.56, 0.64 and 0.71.
+
+Parameters:
+- runs_one: An (n, r1) float array of the runs of the first algorithm on each of the n benchmarks, NaN-padded.
+- runs_two: An (n, r2) float array of the runs of the second algorithm, NaN-padded.
+- optimization_mode: An instance of OptimizationMode Enum deciding whether smaller or larger results are better.
+
+Returns:
+- A namedtuple 'EffectSize' holding the (n,) A12 values and a list of their magnitude labels.
+
+Example:
+effect_size = vargha_delaney_a12(run_matrix.runs[0], run_matrix.runs[1], OptimizationMode.MINIMIZE)
+"""
+
+from collections import namedtuple
+import numpy as np
+from app.constants.optimization_mode import OptimizationMode
+
+EffectSize = namedtuple('EffectSize', ['a12', 'magnitude'])
+
+MAGNITUDE_THRESHOLDS = ((0.56, 'negligible'), (0.64, 'small'), (0.71, 'medium'))
+
+def a12_magnitude(a12):
+    distance = max(a12, 1.0 - a12)
+    for threshold, label in MAGNITUDE_THRESHOLDS:
+        if distance < threshold:
+            return label
+    return 'large'
+
+def vargha_delaney_a12(runs_one, runs_two, optimization_mode):
+    runs_one = np.asarray(runs_one, dtype=np.float64)[:, :, None]
+    runs_two = np.asarray(runs_two, dtype=np.float64)[:, None, :]
+
+    if optimization_mode == OptimizationMode.MAXIMIZE:
+        wins = runs_one > runs_two
+    else:
+        wins = runs_one < runs_two
+    scores = wins + 0.5 * (runs_one == runs_two)
+
+    # Comparisons with NaN padding are neither wins nor ties, so only the pair count needs masking.
+    pairs = (~np.isnan(runs_one)).sum(axis=1) * (~np.isnan(runs_two)).sum(axis=2)
+    a12 = scores.sum(axis=(1, 2)) / pairs.ravel()
+
+    return EffectSize(a12, [a12_magnitude(value) for value in a12.tolist()])
@@ -2,6 +2,7 @@ import logging
 
 logging.basicConfig(level=logging.DEBUG)
 
+import numpy as np
 import scipy.stats as stats
 
 def calculate_f_critical_value(dfn, dfd, alpha: float):
@@ -26,4 +27,29 @@ def calculate_iman_davenport_stat(friedman_statistic, k, n):
     :return: Iman-Davenport statistic
     """
 
-    return (friedman_statistic * (n - 1)) / (n * (k - 1) - friedman_statistic)
\ No newline at end of file
+    return (friedman_statistic * (n - 1)) / (n * (k - 1) - friedman_statistic)
+
+def calculate_friedman_stat(rank_sums, tie_sum, k, n):
+    """
+    Calculates the tie-corrected Friedman chi-square statistic from per-algorithm rank sums.
+
+    :param rank_sums: Rank sum of every algorithm over all blocks
+    :param tie_sum: Sum of (t^3 - t) over every tie group in every block
+    :param k: Number of groups
+    :param n: Number of blocks (repeated measures)
+    :return: Friedman statistic
+    """
+
+    correction = 1.0 - tie_sum / (k * (k * k - 1) * n)
+    return (12.0 / (n * k * (k + 1)) * np.sum(np.square(rank_sums)) - 3.0 * n * (k + 1)) / correction
+
+def calculate_friedman_p_value(friedman_statistic, k):
+    """
+    Calculates the p-value of the Friedman statistic from the chi-square distribution.
+
+    :param friedman_statistic: Friedman statistic
+    :param k: Number of groups
+    :return: p-value
+    """
+
+    return stats.chi2.sf(friedman_statistic, k - 1)
@@ -0,0 +1,129 @@
+"""
+Incremental Friedman Rank State
+
+This class keeps the within-benchmark ranks of a stored experiment, so that appending benchmarks or algorithms updates
+the Friedman test instead of ranking the whole result block again.
+
+Features:
+- Holds the results, the (k, n) rank matrix, the tie sums of every benchmark column and the rank sums of every algorithm.
+  Ranks are kept for minimization; the ranks for maximization are k + 1 minus them, with the same ties.
+- Appends benchmark columns by ranking only the new columns and adding their ranks to the rank sums, O(k log k) per column.
+- Appends an algorithm row by comparing the new result with every column in one vectorised step: results worse than the
+  new one move down one rank, tied results half a rank, and the tie sums grow by 3t² + 3t for a tie group of size t.
+- Refreshes the Friedman statistic, p-value, Iman-Davenport statistic, mean ranks and pairwise z-values from the rank
+  and tie sums alone, without reading the rank matrix. 'friedman_from_sums' does the same for sums loaded on their own,
+  e.g. for the live standings of a streamed experiment.
+
+Usage:
+- Build the state with 'from_values' from a result block in memory and update it with 'append_columns' and
+  'append_row' when benchmarks or algorithms are added. Stored experiments keep only the rank sums and the tie sum
+  total, which 'friedman_from_sums' needs, and rebuild a full state from their matrix when an algorithm is added.
+
+Example:
+state = FriedmanRankState.from_values(experiment_matrix.values)
+state.append_row(new_algorithm_results)
+summary = state.friedman(OptimizationMode.MINIMIZE)
+"""
+
+from collections import namedtuple
+import numpy as np
+from app.constants.optimization_mode import OptimizationMode
+from app.services.stats.util.ranking import rank_columns
+from app.services.stats.nonparametric.friedman_test.friedman_util import calculate_friedman_stat, calculate_friedman_p_value, calculate_iman_davenport_stat
+
+FriedmanSummary = namedtuple('FriedmanSummary', ['mean_ranks', 'friedman_stat', 'p_value', 'iman_davenport_stat', 'z_values'])
+
+class FriedmanRankState:
+    __slots__ = ('values', 'ranks', 'tie_sums', 'rank_sums')
+
+    def __init__(self, values, ranks, tie_sums, rank_sums):
+        self.values = np.ascontiguousarray(values, dtype=np.float64)
+        self.ranks = np.ascontiguousarray(ranks, dtype=np.float64)
+        self.tie_sums = np.ascontiguousarray(tie_sums, dtype=np.float64)
+        self.rank_sums = np.ascontiguousarray(rank_sums, dtype=np.float64)
+
+    @classmethod
+    def from_values(cls, values):
+        """
+        Ranks every benchmark column of a (k, n) result block for minimization.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        ranks, tie_sums = rank_columns(values)
+        return cls(values, ranks, tie_sums, ranks.sum(axis=1))
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    def append_columns(self, values):
+        """
+        Appends benchmark columns, given as a (k, m) block with the algorithms in the state's order.
+        """
+        values = np.asarray(values, dtype=np.float64).reshape(self.shape[0], -1)
+        ranks, tie_sums = rank_columns(values)
+
+        self.values = np.hstack([self.values, values])
+        self.ranks = np.hstack([self.ranks, ranks])
+        self.tie_sums = np.concatenate([self.tie_sums, tie_sums])
+        self.rank_sums = self.rank_sums + ranks.sum(axis=1)
+
+    def append_row(self, values):
+        """
+        Appends an algorithm, given as its n results with the benchmarks in the state's order.
+        """
+        row = np.asarray(values, dtype=np.float64).reshape(1, -1)
+
+        worse = self.values > row
+        tied = self.values == row
+        shift = worse + 0.5 * tied
+        less = self.shape[0] - worse.sum(axis=0) - tied.sum(axis=0)
+        ties = tied.sum(axis=0)
+
+        # The new result shares the average rank of its tie group, which spans less + 1 .. less + ties + 1.
+        row_ranks = less + (ties + 2) / 2.0
+
+        self.ranks = np.vstack([self.ranks + shift, row_ranks])
+        self.rank_sums = np.append(self.rank_sums + shift.sum(axis=1), row_ranks.sum())
+        self.tie_sums = self.tie_sums + 3.0 * ties * ties + 3.0 * ties
+        self.values = np.vstack([self.values, row])
+
+    def oriented_rank_sums(self, optimization_mode):
+        k, n = self.shape
+        if optimization_mode == OptimizationMode.MAXIMIZE:
+            return n * (k + 1) - self.rank_sums
+        return self.rank_sums
+
+    def oriented_ranks(self, optimization_mode):
+        if optimization_mode == OptimizationMode.MAXIMIZE:
+            return self.shape[0] + 1 - self.ranks
+        return self.ranks
+
+    def friedman(self, optimization_mode):
+        """
+        Returns the Friedman test of the current results as a 'FriedmanSummary', with the z-values of all pairs in
+        'np.triu_indices(k, 1)' order.
+        """
+        return friedman_from_sums(self.rank_sums, self.tie_sums.sum(), self.shape[1], optimization_mode)
+
+def friedman_from_sums(rank_sums, tie_sum_total, n, optimization_mode):
+    """
+    Returns the Friedman test of n benchmarks as a 'FriedmanSummary' from the minimization rank sums of the k algorithms
+    and the total of the tie sums, in O(k^2) time whatever the number of benchmarks.
+    """
+    rank_sums = np.asarray(rank_sums, dtype=np.float64)
+    k = len(rank_sums)
+    if k < 3:
+        raise ValueError('At least 3 sets of samples must be given for Friedman test, got {}.'.format(k))
+    if n < 1:
+        raise ValueError('At least 1 complete benchmark must be given for Friedman test, got 0.')
+
+    if optimization_mode == OptimizationMode.MAXIMIZE:
+        rank_sums = n * (k + 1) - rank_sums
+    friedman_stat = calculate_friedman_stat(rank_sums, tie_sum_total, k, n)
+
+    mean_ranks = rank_sums / n
+    first, second = np.triu_indices(k, 1)
+    z_values = (mean_ranks[first] - mean_ranks[second]) / np.sqrt(k * (k + 1) / (6.0 * n))
+
+    return FriedmanSummary(mean_ranks, friedman_stat, calculate_friedman_p_value(friedman_stat, k),
+                           calculate_iman_davenport_stat(friedman_stat, k, n), z_values)
@@ -4,50 +4,64 @@ Standard Friedman Test Function
 This function performs the Friedman test, a non-parametric statistical test for comparing multiple related samples.
 
 Functionality:
-- Converts the algorithm data to numeric values and adjusts for optimization mode (minimize or maximize).
-- Applies the Friedman test to the numeric data, calculating the Friedman statistic and p-value.
+- Adjusts the numeric result block for optimization mode (minimize or maximize).
+- Ranks every benchmark column in a single vectorised sort, assigning average ranks to ties.
+- Derives the Friedman statistic, p-value and Iman-Davenport statistic from that one rank matrix.
 - Computes the mean ranks for each algorithm and sorts them based on the optimization mode.
 - Creates a detailed table of algorithms with their mean and ultimate ranks.
 - Handles both maximization and minimization scenarios by adjusting the direction of comparison.
 
 Parameters:
-- algorithm_data: A NumPy array with the first column as algorithm names and the remaining columns as numeric results.
+- experiment_matrix: An ExperimentMatrix holding the algorithm names and the float64 result block.
 - optimization_mode: An instance of OptimizationMode Enum indicating the direction of optimization.
 
 Returns:
-- A namedtuple 'Result' containing the mean ranks, a detailed ranks table, the Friedman statistic, and the p-value.
+- A namedtuple 'Result' containing the mean ranks, a detailed ranks table, the Friedman statistic, the p-value,
+  the Iman-Davenport statistic, and the full rank matrix for reuse by post-hoc procedures.
 
 Usage:
 - This function is primarily used for comparing multiple algorithms or treatments across multiple test attempts or conditions.
 - Useful in scenarios where the data does not meet the assumptions of parametric tests and where multiple related samples are compared.
 
 Example:
-result = standard_friedman_test(algorithm_data, OptimizationMode.MINIMIZE)
+result = standard_friedman_test(experiment_matrix, OptimizationMode.MINIMIZE)
 """
 
-from scipy.stats import friedmanchisquare, rankdata
 from collections import namedtuple
 from app.constants.optimization_mode import OptimizationMode
-import numpy as np
+from app.services.stats.util.ranking import rank_columns
+from app.services.stats.nonparametric.friedman_test.friedman_util import calculate_friedman_stat, calculate_friedman_p_value, calculate_iman_davenport_stat
 import logging
 
 logging.basicConfig(level=logging.DEBUG)
 
-Result = namedtuple('Result', ['ranks', 'ranks_table', 'friedman_stat', 'p_value'])
+Result = namedtuple('Result', ['ranks', 'ranks_table', 'friedman_stat', 'p_value', 'iman_davenport_stat', 'rank_matrix'])
 
-def standard_friedman_test(algorithm_data, optimization_mode):
-    numeric_data = algorithm_data[:, 1:].astype(float)
+def standard_friedman_test(experiment_matrix, optimization_mode):
+    numeric_data = experiment_matrix.values
 
     if optimization_mode == OptimizationMode.MAXIMIZE:
         numeric_data = -numeric_data
 
-    ranks = np.apply_along_axis(rankdata, 0, numeric_data)
+    k, n = numeric_data.shape
+    if k < 3:
+        raise ValueError('At least 3 sets of samples must be given for Friedman test, got {}.'.format(k))
 
+    ranks, tie_sums = rank_columns(numeric_data)
+
+    return friedman_from_ranks(experiment_matrix.algorithm_names, ranks, tie_sums, optimization_mode)
+
+def friedman_from_ranks(algorithm_names, ranks, tie_sums, optimization_mode):
+    """
+    Completes the Friedman test from a rank matrix that has already been computed, as returned by 'rank_columns'.
+    """
+    k, n = ranks.shape
     ranks_mean = ranks.mean(axis=1)
 
-    friedman_stat, p_value = friedmanchisquare(*numeric_data)
+    friedman_stat = calculate_friedman_stat(ranks.sum(axis=1), tie_sums.sum(), k, n)
+    p_value = calculate_friedman_p_value(friedman_stat, k)
+    iman_davenport_stat = calculate_iman_davenport_stat(friedman_stat, k, n)
 
-    algorithm_names = algorithm_data[:, 0]
     mean_ranks_with_names = [(name, rank) for name, rank in zip(algorithm_names, ranks_mean)]
     mean_ranks_with_names.sort(key=lambda x: x[1], reverse=optimization_mode == OptimizationMode.MAXIMIZE)
 
@@ -61,4 +75,4 @@ def standard_friedman_test(algorithm_data, optimization_mode):
         formatted_ultimate_rank = '{:.5f}'.format(ultimate_rank).rstrip('0').rstrip('.')
         ranks_table.append([algorithm_name, formatted_mean_rank, formatted_ultimate_rank])
 
-    return Result(ranks_mean, ranks_table, friedman_stat, p_value)
\ No newline at end of file
+    return Result(ranks_mean, ranks_table, friedman_stat, p_value, iman_davenport_stat, ranks)
\ No newline at end of file
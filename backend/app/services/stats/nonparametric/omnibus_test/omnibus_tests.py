@@ -0,0 +1,125 @@
+"""
+Omnibus Tests Function
+
+This function performs the four omnibus tests for comparing multiple algorithms over multiple benchmarks in a single pass
+over the result block, so the matrix is ranked once instead of once per test.
+
+Functionality:
+- Adjusts the numeric result block for optimization mode (minimize or maximize).
+- Ranks every benchmark column once; the Friedman test, its Iman-Davenport extension and the Quade test all use these ranks.
+- Centres every benchmark on its mean over the algorithms and ranks all k·n aligned observations together for the
+  Friedman Aligned Ranks test (Hodges & Lehmann).
+- Ranks the benchmarks by their range (largest minus smallest result) to weight the within-benchmark ranks of the Quade test.
+- Computes every statistic and p-value with closed-form array expressions:
+  - Friedman: chi-square with k - 1 degrees of freedom, with the tie correction.
+  - Iman-Davenport: F with k - 1 and (k - 1)(n - 1) degrees of freedom.
+  - Friedman Aligned Ranks: chi-square with k - 1 degrees of freedom.
+  - Quade: F with k - 1 and (k - 1)(n - 1) degrees of freedom.
+
+Parameters:
+- experiment_matrix: An ExperimentMatrix holding the algorithm names and the float64 result block.
+- optimization_mode: An instance of OptimizationMode Enum indicating the direction of optimization.
+
+Returns:
+- A namedtuple 'OmnibusResult' holding the Friedman 'Result' (mean ranks, ranks table and rank matrix, as returned by
+  'standard_friedman_test') and a dictionary of 'OmnibusTest' tuples keyed by OMNIBUS_TESTS.
+
+Example:
+result = omnibus_tests(experiment_matrix, OptimizationMode.MINIMIZE)
+quade = result.tests['quade']
+summary = summarise_omnibus_tests(result, 0.05)
+"""
+
+from collections import namedtuple
+import numpy as np
+import scipy.stats as stats
+from app.constants.optimization_mode import OptimizationMode
+from app.services.stats.util.ranking import rank_columns
+from app.services.stats.nonparametric.friedman_test.standard_friedman_test import friedman_from_ranks
+
+OmnibusTest = namedtuple('OmnibusTest', ['name', 'statistic', 'p_value', 'distribution', 'df'])
+OmnibusResult = namedtuple('OmnibusResult', ['friedman', 'tests'])
+
+OMNIBUS_TESTS = {
+    'friedman': "Standard Friedman Test",
+    'iman-davenport': "Iman-Davenport Test",
+    'aligned-friedman': "Friedman Aligned Ranks Test",
+    'quade': "Quade Test",
+}
+DEFAULT_OMNIBUS_TEST = 'friedman'
+
+def _f_test(statistic, dfn, dfd):
+    return stats.f.sf(statistic, dfn, dfd) if np.isfinite(statistic) else 0.0
+
+def _aligned_friedman(numeric_data):
+    k, n = numeric_data.shape
+    aligned = numeric_data - numeric_data.mean(axis=0)
+    # One column of all k·n observations, so 'rank_columns' ranks them together.
+    aligned_ranks = rank_columns(aligned.reshape(-1, 1))[0].reshape(k, n)
+
+    algorithm_sums = aligned_ranks.sum(axis=1)
+    benchmark_sums = aligned_ranks.sum(axis=0)
+    kn = k * n
+
+    numerator = (k - 1) * (np.sum(algorithm_sums ** 2) - (k * n * n / 4.0) * (kn + 1) ** 2)
+    denominator = kn * (kn + 1) * (2 * kn + 1) / 6.0 - np.sum(benchmark_sums ** 2) / k
+    return numerator / denominator
+
+def _quade(numeric_data, ranks):
+    k, n = numeric_data.shape
+    ranges = numeric_data.max(axis=0) - numeric_data.min(axis=0)
+    range_ranks = rank_columns(ranges.reshape(-1, 1))[0].ravel()
+
+    weighted = range_ranks * (ranks - (k + 1) / 2.0)
+    total = np.sum(weighted ** 2)
+    treatments = np.sum(weighted.sum(axis=1) ** 2) / n
+
+    if total == treatments:
+        return np.inf
+    return (n - 1) * treatments / (total - treatments)
+
+def omnibus_tests(experiment_matrix, optimization_mode):
+    numeric_data = experiment_matrix.values
+
+    if optimization_mode == OptimizationMode.MAXIMIZE:
+        numeric_data = -numeric_data
+
+    k, n = numeric_data.shape
+    if k < 3:
+        raise ValueError('At least 3 sets of samples must be given for the omnibus tests, got {}.'.format(k))
+
+    ranks, tie_sums = rank_columns(numeric_data)
+    friedman = friedman_from_ranks(experiment_matrix.algorithm_names, ranks, tie_sums, optimization_mode)
+
+    f_df = (k - 1, (k - 1) * (n - 1))
+    aligned_stat = _aligned_friedman(numeric_data)
+    quade_stat = _quade(numeric_data, ranks)
+    iman_davenport_stat = friedman.iman_davenport_stat
+
+    tests = {
+        'friedman': OmnibusTest(OMNIBUS_TESTS['friedman'], friedman.friedman_stat, friedman.p_value, 'chi2', (k - 1,)),
+        'iman-davenport': OmnibusTest(OMNIBUS_TESTS['iman-davenport'], iman_davenport_stat,
+                                      _f_test(iman_davenport_stat, *f_df), 'F', f_df),
+        'aligned-friedman': OmnibusTest(OMNIBUS_TESTS['aligned-friedman'], aligned_stat,
+                                        stats.chi2.sf(aligned_stat, k - 1), 'chi2', (k - 1,)),
+        'quade': OmnibusTest(OMNIBUS_TESTS['quade'], quade_stat, _f_test(quade_stat, *f_df), 'F', f_df),
+    }
+
+    return OmnibusResult(friedman, tests)
+
+def _format_value(value):
+    return '{:.5e}'.format(value) if value < 0.001 else '{:.5f}'.format(value)
+
+def summarise_omnibus_tests(result, alpha: float):
+    """
+    Formats every omnibus test of an 'OmnibusResult' for an analysis description.
+
+    :return: A list with a dictionary of the test key, name, statistic, p-value, distribution and significance per test.
+    """
+    return [{"test": key,
+             "name": test.name,
+             "statistic": _format_value(test.statistic),
+             "p_value": _format_value(test.p_value),
+             "distribution": f"{test.distribution}({', '.join(str(df) for df in test.df)})",
+             "significant": bool(test.p_value < alpha)}
+            for key, test in result.tests.items()]
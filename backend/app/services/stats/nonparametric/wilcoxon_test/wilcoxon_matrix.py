@@ -0,0 +1,111 @@
+"""
+All-Pairs Wilcoxon Signed-Rank Test
+
+This function runs the Wilcoxon signed-rank test on every pair of algorithms of a results matrix in batched NumPy passes,
+instead of one SciPy call per pair.
+
+Functionality:
+- Builds the benchmark differences of a batch of algorithm pairs as one array and ranks their absolute values with a
+  single batched sort per batch, averaging tied ranks.
+- Splits the ranks of zero differences evenly between R⁺ and R⁻, like SciPy's 'zsplit' zero method.
+- Computes T = min(R⁺, R⁻) and two-sided p-values, choosing between the exact signed-rank distribution and the
+  tie-corrected normal approximation per pair exactly as 'wilcoxon_signed_rank_test' does.
+- Bounds memory by processing at most WILCOXON_MATRIX_BATCH_CELLS (default 4,000,000) differences per batch.
+
+Parameters:
+- values: A (k, n) float array with algorithms as rows and benchmarks as columns.
+- optimization_mode: An instance of OptimizationMode Enum; R⁺ of a pair (i, j) sums the ranks of the benchmarks on which
+  algorithm i is better than algorithm j.
+
+Returns:
+- A namedtuple 'MatrixResult' with the pair indices (i < j) and per-pair arrays of R⁺, R⁻, T and p-values.
+
+Example:
+result = wilcoxon_signed_rank_matrix(experiment_matrix.values, OptimizationMode.MINIMIZE)
+"""
+
+import os
+from collections import namedtuple
+import numpy as np
+from scipy.stats import norm
+from app.constants.optimization_mode import OptimizationMode
+from app.services.stats.nonparametric.wilcoxon_test.wilcoxon_util import signed_rank_cdf, EXACT_MAX_N
+from app.services.stats.nonparametric.wilcoxon_test.wilcoxon_signed_rank_test import SCIPY_EXACT_MAX_N
+
+BATCH_CELLS = int(os.environ.get('WILCOXON_MATRIX_BATCH_CELLS', 4_000_000))
+
+MatrixResult = namedtuple('MatrixResult', ['first', 'second', 'R_plus', 'R_minus', 'T', 'p_value'])
+
+def _sorted_average_ranks(sorted_values):
+    """
+    Ranks the rows of a matrix whose rows are already sorted, giving tied values the average of the ranks they span.
+
+    :return: A tuple of the rank matrix and an array holding sum(t^3 - t) over the tie groups of each row.
+    """
+    pairs, n = sorted_values.shape
+    positions = np.broadcast_to(np.arange(n), (pairs, n))
+
+    group_starts = np.ones((pairs, n), dtype=bool)
+    group_starts[:, 1:] = sorted_values[:, 1:] != sorted_values[:, :-1]
+    group_ends = np.ones((pairs, n), dtype=bool)
+    group_ends[:, :-1] = group_starts[:, 1:]
+
+    first = np.maximum.accumulate(np.where(group_starts, positions, 0), axis=1)
+    last = np.minimum.accumulate(np.where(group_ends, positions, n - 1)[:, ::-1], axis=1)[:, ::-1]
+
+    tie_sizes = last - first + 1
+    return (first + last) / 2.0 + 1.0, (tie_sizes * tie_sizes - 1).sum(axis=1).astype(float)
+
+def wilcoxon_signed_rank_matrix(values, optimization_mode=OptimizationMode.MINIMIZE):
+    values = np.asarray(values, dtype=np.float64)
+    k, n = values.shape
+    first, second = np.triu_indices(k, 1)
+    pair_count = len(first)
+
+    R_plus = np.empty(pair_count)
+    ties = np.empty(pair_count)
+    has_zeros = np.empty(pair_count, dtype=bool)
+
+    # Positive differences mean that the first algorithm of the pair is better.
+    sign = -1.0 if optimization_mode == OptimizationMode.MINIMIZE else 1.0
+    batch_size = max(1, BATCH_CELLS // max(n, 1))
+
+    for start in range(0, pair_count, batch_size):
+        stop = min(start + batch_size, pair_count)
+        differences = sign * (values[first[start:stop]] - values[second[start:stop]])
+
+        # The rank sums only need each difference's sign next to its rank, so the differences are sorted by absolute
+        # value and ranked in sorted order, without scattering the ranks back.
+        order = np.argsort(np.abs(differences), axis=1)
+        sorted_differences = np.take_along_axis(differences, order, axis=1)
+        ranks, tie_sums = _sorted_average_ranks(np.abs(sorted_differences))
+
+        zero_ranks = np.where(sorted_differences == 0, ranks, 0.0).sum(axis=1)
+        R_plus[start:stop] = np.where(sorted_differences > 0, ranks, 0.0).sum(axis=1) + zero_ranks / 2
+        ties[start:stop] = tie_sums
+        has_zeros[start:stop] = zero_ranks > 0
+
+    R_minus = n * (n + 1) / 2 - R_plus
+    T = np.minimum(R_plus, R_minus)
+
+    # The same choice as 'wilcoxon_signed_rank_test': SciPy computes exact p-values up to 50 benchmarks unless there are
+    # zero differences, and the memoised distribution extends this to larger untied samples.
+    exact = ~has_zeros & ((n <= SCIPY_EXACT_MAX_N) | ((ties == 0) & (n <= EXACT_MAX_N)))
+    p_value = np.empty(pair_count)
+
+    if exact.any():
+        # Like SciPy, the exact p-value is read at the truncated rank sum of the positive differences x_i - x_j.
+        cdf = signed_rank_cdf(n)
+        rank_sum = np.floor(R_plus[exact] if sign > 0 else R_minus[exact]).astype(np.int64)
+        tail = np.minimum(cdf[rank_sum], cdf[n * (n + 1) // 2 - rank_sum])
+        p_value[exact] = np.minimum(1.0, 2.0 * tail)
+
+    approximate = ~exact
+    if approximate.any():
+        mean = n * (n + 1) / 4
+        std = np.sqrt((n * (n + 1) * (2 * n + 1) - 0.5 * ties[approximate]) / 24)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z = (T[approximate] - mean) / std
+        p_value[approximate] = np.where(std > 0, 2 * norm.sf(np.abs(z)), 1.0)
+
+    return MatrixResult(first, second, R_plus, R_minus, T, p_value)
@@ -6,14 +6,16 @@ This function conducts the Wilcoxon signed-rank test, a non-parametric statistic
 Functionality:
 - Calculates the differences between paired observations of two algorithms.
 - Applies the Wilcoxon signed-rank test on these differences to determine statistical significance.
-- Computes the test statistic (T) and the p-value for the differences.
+- Computes the test statistic (T) and the p-value for the differences. Beyond the 50 observations up to which SciPy computes
+  exact p-values, the exact p-value is taken from the memoised signed-rank distribution when there are no ties or zero
+  differences, instead of SciPy's normal approximation.
 - Determines whether the differences are statistically significant based on the alpha level.
 - Calculates R⁺ and R⁻ values, which represent the sum of ranks for positive and negative differences, respectively.
-- Retrieves critical values for the Wilcoxon test and assesses the null hypothesis acceptance or rejection for different alpha levels.
+- Retrieves critical values for the Wilcoxon test, for any number of benchmarks, and assesses the null hypothesis acceptance or rejection for different alpha levels.
 
 Parameters:
-- algorithm_one: A list of results from the first algorithm.
-- algorithm_two: A list of results from the second algorithm.
+- algorithm_one: A float array of results from the first algorithm.
+- algorithm_two: A float array of results from the second algorithm.
 - alpha: The significance level used to determine the threshold for statistical significance.
 
 Returns:
@@ -27,12 +29,15 @@ result = wilcoxon_signed_rank_test(algorithm_one_results, algorithm_two_results,
 """
 
 from scipy.stats import wilcoxon
+import numpy as np
 from collections import namedtuple
-from app.services.stats.nonparametric.wilcoxon_test.wilcoxon_util import get_wilcoxon_critical_values
+from app.services.stats.nonparametric.wilcoxon_test.wilcoxon_util import get_wilcoxon_critical_values, wilcoxon_exact_p_value, EXACT_MAX_N
 from app.constants.optimization_mode import OptimizationMode
 import logging
 logging.basicConfig(level=logging.DEBUG)
 
+SCIPY_EXACT_MAX_N = 50
+
 Result = namedtuple('Result', ['T', 'R_plus', 'R_minus', 'p_value', 'significant', 'critical_values'])
 
 def wilcoxon_signed_rank_test(
@@ -41,9 +46,13 @@ def wilcoxon_signed_rank_test(
         alpha: float):
     n = len(algorithm_one)
 
-    differences = [float(algorithm_one[i] - algorithm_two[i]) for i in range(n)]
+    differences = np.asarray(algorithm_one, dtype=float) - np.asarray(algorithm_two, dtype=float)
     T, p_value = wilcoxon(x=differences, zero_method='zsplit')
 
+    absolute_differences = np.abs(differences)
+    if SCIPY_EXACT_MAX_N < n <= EXACT_MAX_N and np.all(absolute_differences > 0) and len(np.unique(absolute_differences)) == n:
+        p_value = wilcoxon_exact_p_value(T, n)
+
     significant = p_value < alpha
 
     R_plus = T
@@ -52,9 +61,9 @@ def wilcoxon_signed_rank_test(
     critical_values = get_wilcoxon_critical_values(n)
 
     for alpha, c in critical_values.items():
-        if T <= int(c): 
-            critical_values[alpha] = (int(c), 'Rejected')
+        if T <= c:
+            critical_values[alpha] = (c, 'Rejected')
         else:
-            critical_values[alpha] = (int(c), 'Retained')
+            critical_values[alpha] = (c, 'Retained')
 
     return Result(T, R_plus, R_minus, p_value, significant, critical_values)
\ No newline at end of file
@@ -1,31 +1,116 @@
-import pandas as pd
+"""
+Wilcoxon Signed-Rank Distribution Utilities
+
+These functions provide critical values and exact p-values of the Wilcoxon signed-rank statistic T for any number of
+benchmarks.
+
+Features:
+- Loads the published critical value table ('data/wilcoxon_t_distribution.csv') once at import into a compact integer
+  array, so a lookup is a single row index.
+- Computes the exact null distribution of T for sample sizes beyond the table with a dynamic program over rank sums,
+  memoised per sample size in memory and, when ANALYSIS_CACHE_DIR is set, saved to disk as a '.npy' file.
+- Derives critical values from the exact distribution for the same two-sided alpha levels as the table, and falls back
+  to the normal approximation beyond WILCOXON_EXACT_MAX_N (default 1000) benchmarks.
+
+Functions:
+- get_wilcoxon_critical_values(n): Returns a dictionary of alpha level to critical value.
+- signed_rank_cdf(n): Returns P(T <= t) for t = 0 .. n(n+1)/2.
+- wilcoxon_exact_p_value(t, n): Returns the two-sided exact p-value of a T statistic.
+
+Example:
+critical_values = get_wilcoxon_critical_values(250)
+p_value = wilcoxon_exact_p_value(11024, 250)
+"""
+
+import csv
+import functools
+import math
 import os
+import numpy as np
+from scipy.stats import norm
+from app.util.cache.array_store import load_or_compute_array
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', '..', 'data', 'wilcoxon_t_distribution.csv')
+EXACT_MAX_N = int(os.environ.get('WILCOXON_EXACT_MAX_N', 1000))
 
-def load_wilcoxon_data(csv_file):
+def load_wilcoxon_table(csv_file=TABLE_PATH):
     """
-    Load Wilcoxon T distribution data from a CSV file into a Pandas DataFrame.
+    Loads the Wilcoxon T critical value table.
+
+    :param csv_file: Path of a CSV file with an 'n' column followed by one column per two-sided alpha level, where 'x'
+                     marks sample sizes too small for that level.
+    :return: A tuple of the alpha labels, the smallest tabulated n and an int32 array with one row per n (-1 for 'x').
     """
-    full_path = os.path.join('/app', csv_file)
+    with open(csv_file, newline='') as file:
+        reader = csv.reader(file)
+        alphas = tuple(next(reader)[1:])
+        rows = {int(row[0]): [-1 if cell.strip() == 'x' else int(cell) for cell in row[1:]] for row in reader if row}
 
-    if not os.path.exists(full_path):
-        return f"File not found: {full_path}"
-    
-    try:
-        return pd.read_csv(full_path, index_col=0)
-    except Exception as e:
-        return f"Error reading the file: {e}"
+    min_n, max_n = min(rows), max(rows)
+    table = np.full((max_n - min_n + 1, len(alphas)), -1, dtype=np.int32)
+    for n, values in rows.items():
+        table[n - min_n] = values
+    return alphas, min_n, table
 
-def get_wilcoxon_critical_values(n):
-    csv_file = 'data/wilcoxon_t_distribution.csv'
-    df = load_wilcoxon_data(csv_file)
+TABLE_ALPHAS, TABLE_MIN_N, CRITICAL_TABLE = load_wilcoxon_table()
+TABLE_MAX_N = TABLE_MIN_N + CRITICAL_TABLE.shape[0] - 1
+
+def _compute_signed_rank_cdf(n):
+    # Each rank k enters the positive rank sum with probability 1/2, so the distribution of the sum over ranks 1..k is
+    # the average of the distribution over ranks 1..k-1 and its copy shifted by k. Halving at every step keeps the
+    # values probabilities instead of counts, which would overflow float64 beyond n = 1000.
+    max_sum = n * (n + 1) // 2
+    pmf = np.zeros(max_sum + 1, dtype=np.float64)
+    pmf[0] = 1.0
+    top = 0
+    for k in range(1, n + 1):
+        pmf[k:top + k + 1] += pmf[:top + 1].copy()
+        top += k
+        pmf[:top + 1] *= 0.5
+    return np.minimum(np.cumsum(pmf), 1.0)
+
+@functools.lru_cache(maxsize=32)
+def signed_rank_cdf(n):
+    """
+    Returns the exact null cumulative distribution of the Wilcoxon signed-rank statistic for n untied, non-zero differences.
 
-    if not isinstance(df, pd.DataFrame):
-        return df
+    :param n: Number of paired observations.
+    :return: A read-only float64 array whose entry t is P(T <= t).
+    """
+    return load_or_compute_array('wilcoxon', f'signed_rank_cdf_{n}', lambda: _compute_signed_rank_cdf(n),
+                                 expected_shape=(n * (n + 1) // 2 + 1,))
+
+def wilcoxon_exact_p_value(t, n):
+    """
+    Returns the two-sided exact p-value of a signed-rank statistic T = min(R⁺, R⁻), assuming no ties or zero differences.
+    """
+    cdf = signed_rank_cdf(n)
+    t = min(int(math.floor(t)), len(cdf) - 1)
+    return min(1.0, 2.0 * cdf[t]) if t >= 0 else 0.0
+
+def _computed_critical_values(n):
+    alphas = np.array([float(alpha) for alpha in TABLE_ALPHAS])
 
-    if n in df.index:
-        row = df.loc[n].replace('x', pd.NA).dropna()
-        critical_values = row.to_dict()
-        return critical_values
+    if n <= EXACT_MAX_N:
+        # The critical value is the largest t with P(T <= t) <= alpha / 2; none exists where even T = 0 is too likely.
+        cdf = signed_rank_cdf(n)
+        critical = np.searchsorted(cdf, alphas / 2, side='right') - 1
     else:
-        return f"No data available for n={n}"
+        mean = n * (n + 1) / 4
+        std = math.sqrt(n * (n + 1) * (2 * n + 1) / 24)
+        critical = np.floor(mean + norm.ppf(alphas / 2) * std - 0.5).astype(np.int64)
+
+    return {alpha: int(c) for alpha, c in zip(TABLE_ALPHAS, critical) if c >= 0}
+
+def get_wilcoxon_critical_values(n):
+    """
+    Returns the critical values of the Wilcoxon signed-rank statistic for n benchmarks, keyed by two-sided alpha level.
+
+    Alpha levels that cannot be reached with n benchmarks are left out. Tabulated sample sizes are served from the
+    table; others are derived from the exact distribution.
+    """
+    if TABLE_MIN_N <= n <= TABLE_MAX_N:
+        row = CRITICAL_TABLE[n - TABLE_MIN_N]
+        return {alpha: int(c) for alpha, c in zip(TABLE_ALPHAS, row) if c >= 0}
 
+    return _computed_critical_values(n) if n > 0 else {}
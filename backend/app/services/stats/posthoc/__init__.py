@@ -0,0 +1,4 @@
+from .nemenyi import nemenyi_friedman, studentized_range_sf, symmetric_matrix
+from .adjustments import holm_adjust, shaffer_adjust, bergmann_hommel_adjust, BERGMANN_HOMMEL_MAX_K
+from .hypothesis_sets import shaffer_limits, exhaustive_sets
+from .all_pairs import all_pairs_posthoc
@@ -0,0 +1,86 @@
+"""
+Multiple Comparison Adjustments
+
+These functions adjust arrays of p-values for multiple comparisons in a few vectorised NumPy passes.
+
+Functions:
+- holm_adjust(p_values): Holm step-down adjusted p-values, equal to statsmodels' multipletests(method='holm').
+- shaffer_adjust(p_values, k): Adjusted p-values of Shaffer's static procedure for all pairs of k algorithms.
+- bergmann_hommel_adjust(p_values, k): Adjusted p-values of Bergmann and Hommel's procedure for all pairs of k algorithms.
+
+The all-pairs procedures expect the p-values in 'np.triu_indices(k, 1)' order, like the all-pairs post-hoc engine.
+
+Example:
+adjusted_p_values = holm_adjust(p_values)
+rejected = adjusted_p_values < alpha
+"""
+
+import os
+import numpy as np
+from app.services.stats.posthoc.hypothesis_sets import shaffer_limits, exhaustive_sets, MAX_BITMASK_K
+
+BERGMANN_HOMMEL_MAX_K = min(int(os.environ.get('BERGMANN_HOMMEL_MAX_K', 10)), MAX_BITMASK_K)
+
+def holm_adjust(p_values):
+    """
+    Adjusts p-values with Holm's step-down procedure.
+
+    :param p_values: Array of unadjusted p-values.
+    :return: Array of adjusted p-values in the order of 'p_values'.
+    """
+    p_values = np.asarray(p_values, dtype=np.float64)
+    m = len(p_values)
+    order = np.argsort(p_values)
+
+    adjusted = np.empty(m)
+    adjusted[order] = np.minimum(np.maximum.accumulate(p_values[order] * np.arange(m, 0, -1)), 1.0)
+    return adjusted
+
+def shaffer_adjust(p_values, k):
+    """
+    Adjusts the p-values of all pairs of k algorithms with Shaffer's static procedure: the j-th smallest p-value is
+    multiplied by Shaffer's limit t_j instead of Holm's m - j + 1, followed by the same running maximum.
+
+    :param p_values: Array of the k(k-1)/2 unadjusted p-values in 'np.triu_indices(k, 1)' order.
+    :param k: Number of algorithms.
+    :return: Array of adjusted p-values in the order of 'p_values'.
+    """
+    p_values = np.asarray(p_values, dtype=np.float64)
+    order = np.argsort(p_values)
+
+    adjusted = np.empty(len(p_values))
+    adjusted[order] = np.minimum(np.maximum.accumulate(p_values[order] * shaffer_limits(k)), 1.0)
+    return adjusted
+
+def bergmann_hommel_adjust(p_values, k):
+    """
+    Adjusts the p-values of all pairs of k algorithms with Bergmann and Hommel's procedure. The adjusted p-value of a
+    hypothesis is the largest |I| · min{p_j : j in I} over the exhaustive sets I that contain it.
+
+    :param p_values: Array of the k(k-1)/2 unadjusted p-values in 'np.triu_indices(k, 1)' order.
+    :param k: Number of algorithms, at most BERGMANN_HOMMEL_MAX_K.
+    :return: Array of adjusted p-values in the order of 'p_values'.
+    :raises ValueError: If k exceeds BERGMANN_HOMMEL_MAX_K.
+    """
+    if k > BERGMANN_HOMMEL_MAX_K:
+        raise ValueError(f"Bergmann-Hommel's procedure is limited to {BERGMANN_HOMMEL_MAX_K} algorithms, got {k}.")
+
+    p_values = np.asarray(p_values, dtype=np.float64)
+    masks, sizes = exhaustive_sets(k)
+
+    # Visiting the hypotheses from the smallest p-value up, a set's minimum is the p-value of the first member seen.
+    set_minimum = np.empty(len(masks))
+    unseen = np.ones(len(masks), dtype=bool)
+    for bit in np.argsort(p_values):
+        contains = ((masks >> np.uint64(bit)) & np.uint64(1)).astype(bool)
+        first_seen = contains & unseen
+        set_minimum[first_seen] = p_values[bit]
+        unseen &= ~contains
+
+    set_values = sizes * set_minimum
+
+    adjusted = np.empty(len(p_values))
+    for bit in range(len(p_values)):
+        contains = ((masks >> np.uint64(bit)) & np.uint64(1)).astype(bool)
+        adjusted[bit] = set_values[contains].max()
+    return np.minimum(adjusted, 1.0)
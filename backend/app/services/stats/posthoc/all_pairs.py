@@ -0,0 +1,56 @@
+"""
+All-Pairs Post-hoc Engine
+
+This function runs the post-hoc comparisons of every pair of algorithms after a Friedman test as whole-array operations,
+so it scales to parameter sweeps with hundreds of algorithm configurations.
+
+Functionality:
+- Computes the z-value of every pair of the upper triangle from the mean ranks, |R̄ᵢ - R̄ⱼ| / √(k(k + 1) / 6n).
+- Computes the unadjusted two-sided p-values, the Holm-adjusted p-values and the Nemenyi p-values.
+- Computes the Shaffer and Bergmann-Hommel adjusted p-values, which use the logical relations between the pairwise
+  hypotheses and so reject at least as many pairs as Holm. Bergmann-Hommel's fields are None for more than
+  BERGMANN_HOMMEL_MAX_K algorithms, as the number of exhaustive sets grows with the Bell numbers.
+- Returns rejection masks for every procedure at the given alpha.
+- Keeps every array in 'np.triu_indices(k, 1)' order, so table rows and significance matrices are derived by indexing.
+
+Parameters:
+- mean_ranks: The mean rank of every algorithm, as returned by 'standard_friedman_test'.
+- n: Number of benchmarks.
+- alpha: The significance level of the rejection masks.
+
+Returns:
+- A namedtuple 'AllPairsResult' of flat arrays over the pairs (i < j).
+
+Example:
+result = all_pairs_posthoc(friedman_result.ranks, n, 0.05)
+holm_matrix = symmetric_matrix(k, result.holm_p_value)
+"""
+
+from collections import namedtuple
+import numpy as np
+from scipy.stats import norm
+from app.services.stats.posthoc.adjustments import holm_adjust, shaffer_adjust, bergmann_hommel_adjust, BERGMANN_HOMMEL_MAX_K
+from app.services.stats.posthoc.nemenyi import nemenyi_friedman
+
+AllPairsResult = namedtuple('AllPairsResult', ['first', 'second', 'z', 'p_value', 'holm_p_value', 'holm_rejected',
+                                               'nemenyi_p_value', 'nemenyi_rejected', 'shaffer_p_value',
+                                               'shaffer_rejected', 'bergmann_p_value', 'bergmann_rejected'])
+
+def all_pairs_posthoc(mean_ranks, n, alpha: float):
+    mean_ranks = np.asarray(mean_ranks, dtype=np.float64)
+    k = len(mean_ranks)
+    first, second = np.triu_indices(k, 1)
+
+    standard_error = np.sqrt(k * (k + 1) / (6.0 * n))
+    z = np.abs(mean_ranks[first] - mean_ranks[second]) / standard_error
+    p_value = 2 * (1 - norm.cdf(z))
+
+    holm_p_value = holm_adjust(p_value)
+    nemenyi_p_value = nemenyi_friedman(mean_ranks, n).p_value
+    shaffer_p_value = shaffer_adjust(p_value, k)
+    bergmann_p_value = bergmann_hommel_adjust(p_value, k) if 2 <= k <= BERGMANN_HOMMEL_MAX_K else None
+
+    return AllPairsResult(first, second, z, p_value, holm_p_value, holm_p_value < alpha,
+                          nemenyi_p_value, nemenyi_p_value < alpha,
+                          shaffer_p_value, shaffer_p_value < alpha,
+                          bergmann_p_value, None if bergmann_p_value is None else bergmann_p_value < alpha)
@@ -0,0 +1,87 @@
+"""
+Hypothesis Sets for All-Pairs Comparisons
+
+These functions precompute the logical structure of the k(k-1)/2 hypotheses "algorithm i equals algorithm j", which
+Shaffer's and Bergmann and Hommel's procedures exploit (García & Herrera 2008).
+
+Features:
+- Tabulates Shaffer's per-step limits: before step j, at most t_j hypotheses can still be true given that any j - 1 are
+  false. They follow from the possible numbers of true hypotheses, which are sums of C(size, 2) over the blocks of a
+  partition of the k algorithms.
+- Enumerates the exhaustive sets: the sets of hypotheses that can all be true together, one per partition of the
+  algorithms into groups of equal performance with at least one group of two. Each set is a uint64 bitmask over the
+  pairs in 'np.triu_indices(k, 1)' order, so k is limited to 11 (55 pairs).
+- Generates the partitions as restricted growth strings with array operations, memoises the sets per k in memory and,
+  when ANALYSIS_CACHE_DIR is set, saves them to disk as '.npy' files, since there are Bell(k) of them (115,975 for k = 10).
+
+Example:
+limits = shaffer_limits(5)
+masks, sizes = exhaustive_sets(5)
+"""
+
+import functools
+import numpy as np
+from app.util.cache.array_store import load_or_compute_array
+
+MAX_BITMASK_K = 11
+
+@functools.lru_cache(maxsize=None)
+def _true_hypothesis_counts(k):
+    # Every partition of the k algorithms into groups makes exactly the pairs inside each group true.
+    if k <= 1:
+        return frozenset([0])
+    return frozenset(size * (size - 1) // 2 + rest
+                     for size in range(1, k + 1)
+                     for rest in _true_hypothesis_counts(k - size))
+
+@functools.lru_cache(maxsize=None)
+def shaffer_limits(k):
+    """
+    Returns Shaffer's limits t_1 .. t_m for the m = k(k-1)/2 ordered hypotheses of k algorithms.
+
+    :param k: Number of algorithms.
+    :return: A read-only int64 array of length m.
+    """
+    m = k * (k - 1) // 2
+    counts = np.array(sorted(_true_hypothesis_counts(k)), dtype=np.int64)
+    # t_j is the largest possible number of true hypotheses that does not exceed the m - j + 1 not yet rejected.
+    limits = counts[np.searchsorted(counts, np.arange(m, 0, -1), side='right') - 1]
+    limits.setflags(write=False)
+    return limits
+
+def _compute_exhaustive_masks(k):
+    # Restricted growth strings: element e joins one of the groups used so far or opens the next one.
+    groups = np.zeros((1, 1), dtype=np.int8)
+    highest = np.zeros(1, dtype=np.int8)
+    for _ in range(1, k):
+        choices = highest.astype(np.int64) + 2
+        parents = np.repeat(np.arange(len(groups)), choices)
+        offsets = np.arange(len(parents)) - np.repeat(np.cumsum(choices) - choices, choices)
+        groups = np.column_stack([groups[parents], offsets.astype(np.int8)])
+        highest = np.maximum(highest[parents], offsets.astype(np.int8))
+
+    masks = np.zeros(len(groups), dtype=np.uint64)
+    for bit, (i, j) in enumerate(zip(*np.triu_indices(k, 1))):
+        masks |= (groups[:, i] == groups[:, j]).astype(np.uint64) << np.uint64(bit)
+
+    return masks[masks != 0]
+
+@functools.lru_cache(maxsize=4)
+def exhaustive_sets(k):
+    """
+    Returns the exhaustive sets of hypotheses for k algorithms.
+
+    :param k: Number of algorithms, at most MAX_BITMASK_K.
+    :return: A tuple of a read-only uint64 array of bitmasks and an int64 array of the number of hypotheses in each set.
+    """
+    if not 2 <= k <= MAX_BITMASK_K:
+        raise ValueError(f"Exhaustive sets are available for 2 to {MAX_BITMASK_K} algorithms, got {k}.")
+
+    masks = load_or_compute_array('posthoc', f'exhaustive_sets_{k}', lambda: _compute_exhaustive_masks(k))
+
+    sizes = np.zeros(len(masks), dtype=np.int64)
+    for bit in range(k * (k - 1) // 2):
+        sizes += ((masks >> np.uint64(bit)) & np.uint64(1)).astype(np.int64)
+    sizes.setflags(write=False)
+
+    return masks, sizes
@@ -0,0 +1,3 @@
+from .bootstrap import bootstrap_mean_ranks, summarise_bootstrap, BootstrapOptions, MAX_BOOTSTRAP_REPLICATES
+from .permutation import permutation_tests, summarise_permutation, pair_positions, PermutationOptions, MAX_PERMUTATIONS, \
+    PERMUTATION_OMNIBUS_TESTS
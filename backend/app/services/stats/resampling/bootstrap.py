@@ -0,0 +1,111 @@
+"""
+Bootstrap Confidence Intervals for Mean Ranks
+
+This function estimates how stable the Friedman mean rank, and the resulting final position, of every algorithm is when
+the benchmark suite is resampled.
+
+Functionality:
+- Draws B bootstrap replicates of the benchmark columns with replacement. The ranks within a benchmark do not change when
+  columns are resampled, so the rank matrix of the Friedman test is reused and a replicate's mean ranks are its column
+  counts times the rank matrix, computed for a whole chunk of replicates with one matrix product.
+- Ranks the mean ranks of every replicate to get the final positions, with ties sharing the average position, ordered
+  like the 'ultimate rank' column of the ranks table.
+- Splits the replicates into fixed-size chunks, each drawn from its own child of one SeedSequence. The intervals
+  therefore depend only on the seed and the number of replicates, not on how many workers run the chunks.
+- Runs the chunks in the shared resampling process pool when more than one worker is configured and the bootstrap is
+  large enough to repay sending work to other processes.
+- Returns percentile intervals and the wall-clock time of the bootstrap.
+
+Configuration (environment variables):
+- BOOTSTRAP_MAX_REPLICATES: Largest number of replicates a request may ask for (default 100000).
+- BOOTSTRAP_PARALLEL_MIN_CELLS: Smallest replicates x algorithms x benchmarks product run in the pool (default 100000000).
+
+Parameters:
+- rank_matrix: The (k, n) rank matrix returned by the Friedman test.
+- options: A 'BootstrapOptions' tuple of the number of replicates, the seed and the confidence level.
+- optimization_mode: An instance of OptimizationMode Enum, which orders the final positions.
+
+Returns:
+- A namedtuple 'BootstrapResult' with the lower and upper bounds of the mean rank and position of every algorithm, the
+  options, the number of workers used and the elapsed seconds.
+
+Example:
+result = bootstrap_mean_ranks(friedman_result.rank_matrix, BootstrapOptions(10000, 0, 0.95), OptimizationMode.MINIMIZE)
+summary = summarise_bootstrap(result, experiment_matrix.algorithm_names)
+"""
+
+import os
+import time
+from collections import namedtuple
+import numpy as np
+from app.constants.optimization_mode import OptimizationMode
+from app.services.stats.util.ranking import rank_columns
+from app.services.stats.resampling import pool
+
+BootstrapOptions = namedtuple('BootstrapOptions', ['replicates', 'seed', 'confidence'])
+BootstrapResult = namedtuple('BootstrapResult', ['mean_rank_lower', 'mean_rank_upper', 'position_lower', 'position_upper',
+                                                 'options', 'workers', 'elapsed_seconds'])
+
+CHUNK_REPLICATES = 1000
+MAX_BOOTSTRAP_REPLICATES = int(os.environ.get('BOOTSTRAP_MAX_REPLICATES', 100_000))
+PARALLEL_MIN_CELLS = int(os.environ.get('BOOTSTRAP_PARALLEL_MIN_CELLS', 100_000_000))
+
+def _bootstrap_chunk(rank_matrix, replicates, seed_sequence, descending):
+    k, n = rank_matrix.shape
+    rng = np.random.default_rng(seed_sequence)
+
+    counts = rng.multinomial(n, np.full(n, 1.0 / n), size=replicates)
+    mean_ranks = counts @ rank_matrix.T / n
+
+    positions = rank_columns(-mean_ranks.T if descending else mean_ranks.T)[0].T
+    return mean_ranks, positions
+
+def bootstrap_mean_ranks(rank_matrix, options, optimization_mode):
+    started = time.perf_counter()
+    rank_matrix = np.ascontiguousarray(rank_matrix, dtype=np.float64)
+    descending = optimization_mode == OptimizationMode.MAXIMIZE
+
+    sizes = [CHUNK_REPLICATES] * (options.replicates // CHUNK_REPLICATES)
+    if options.replicates % CHUNK_REPLICATES:
+        sizes.append(options.replicates % CHUNK_REPLICATES)
+    seeds = np.random.SeedSequence(options.seed).spawn(len(sizes))
+
+    if pool.WORKERS > 1 and len(sizes) > 1 and options.replicates * rank_matrix.size >= PARALLEL_MIN_CELLS:
+        workers = min(pool.WORKERS, len(sizes))
+        chunks = list(pool.get_executor().map(_bootstrap_chunk, [rank_matrix] * len(sizes), sizes, seeds,
+                                          [descending] * len(sizes)))
+    else:
+        workers = 1
+        chunks = [_bootstrap_chunk(rank_matrix, size, seed, descending) for size, seed in zip(sizes, seeds)]
+
+    mean_ranks = np.concatenate([chunk[0] for chunk in chunks])
+    positions = np.concatenate([chunk[1] for chunk in chunks])
+
+    tail = 50.0 * (1.0 - options.confidence)
+    mean_rank_lower, mean_rank_upper = np.percentile(mean_ranks, [tail, 100.0 - tail], axis=0)
+    position_lower, position_upper = np.percentile(positions, [tail, 100.0 - tail], axis=0)
+
+    return BootstrapResult(mean_rank_lower, mean_rank_upper, position_lower, position_upper, options, workers,
+                           time.perf_counter() - started)
+
+def _format_rank(value):
+    return '{:.5f}'.format(value).rstrip('0').rstrip('.')
+
+def summarise_bootstrap(result, algorithm_names):
+    """
+    Formats a 'BootstrapResult' for an analysis description, with one table row per algorithm in matrix order.
+    """
+    percent = _format_rank(100 * result.options.confidence)
+    table = [["Algorithm", f"Mean Rank {percent}% CI", f"Position {percent}% CI"]]
+    table.extend([name, f"[{_format_rank(mean_lower)}, {_format_rank(mean_upper)}]",
+                  f"[{_format_rank(position_lower)}, {_format_rank(position_upper)}]"]
+                 for name, mean_lower, mean_upper, position_lower, position_upper
+                 in zip(algorithm_names, result.mean_rank_lower.tolist(), result.mean_rank_upper.tolist(),
+                        result.position_lower.tolist(), result.position_upper.tolist()))
+
+    return {"replicates": result.options.replicates,
+            "seed": result.options.seed,
+            "confidence": result.options.confidence,
+            "workers": result.workers,
+            "elapsed_seconds": round(result.elapsed_seconds, 3),
+            "table": table}
@@ -0,0 +1,184 @@
+"""
+Permutation Friedman and Post-hoc Tests
+
+This function computes permutation p-values for the Friedman test and for the differences in mean rank between every
+pair of algorithms. They stay valid for the small benchmark suites where the chi-square and normal approximations do not.
+
+Functionality:
+- Permutes the ranks within every benchmark column, which are exchangeable under the null hypothesis, and evaluates a
+  whole batch of permutations at once as a (permutations, k, n) array.
+- Enumerates every one of the (k!)^n permutations when there are at most PERMUTATION_EXACT_MAX of them, and otherwise
+  draws Monte Carlo permutations.
+- Compares, for every permutation:
+  - The sum of squared rank sums, which orders permutations exactly like the tie-corrected Friedman (and Iman-Davenport)
+    statistic because the tie correction does not change under permutations within a benchmark.
+  - The absolute difference in mean rank of every pair, for unadjusted pairwise p-values.
+  - The range of the mean ranks, for single-step adjusted pairwise p-values that control the family-wise error like
+    the Nemenyi test.
+- Splits the Monte Carlo permutations into fixed-size batches, each drawn from its own child of one SeedSequence, and
+  runs them in the shared resampling process pool when the run is large enough. Batches are consumed in order, so the
+  result depends only on the seed and the settings, not on the number of workers.
+- Stops early, after a batch of at most 10,000 permutations, once the 99.9% Clopper-Pearson interval of every p-value
+  lies entirely above or below alpha.
+- Monte Carlo p-values are (1 + exceedances) / (1 + permutations), so they are never zero.
+
+Configuration (environment variables):
+- PERMUTATION_EXACT_MAX: Largest number of permutations enumerated exactly (default 200000).
+- PERMUTATION_MAX: Largest number of Monte Carlo permutations a request may ask for (default 1000000).
+- PERMUTATION_BATCH_CELLS: Number of permuted ranks held in memory per batch (default 4000000).
+- PERMUTATION_PARALLEL_MIN_CELLS: Smallest permutations x algorithms x benchmarks product run in the pool (default 100000000).
+
+Parameters:
+- rank_matrix: The (k, n) rank matrix returned by the Friedman test.
+- options: A 'PermutationOptions' tuple of the maximum number of permutations, the seed and whether to stop early.
+- alpha: The significance level the early stopping rule compares the p-values against.
+
+Returns:
+- A namedtuple 'PermutationResult' with the Friedman p-value, the unadjusted and range-adjusted pairwise p-values in
+  'np.triu_indices(k, 1)' order, whether the permutations were enumerated exactly, the number evaluated, whether the
+  run stopped early, the number of workers and the elapsed seconds.
+
+Example:
+result = permutation_tests(friedman_result.rank_matrix, PermutationOptions(10000, 0, True), 0.05)
+summary = summarise_permutation(result)
+"""
+
+import itertools
+import math
+import os
+import time
+from collections import namedtuple
+import numpy as np
+from scipy.stats import beta
+from app.services.stats.resampling import pool
+
+PermutationOptions = namedtuple('PermutationOptions', ['permutations', 'seed', 'early_stopping'])
+PermutationResult = namedtuple('PermutationResult', ['friedman_p_value', 'p_value', 'range_p_value', 'exact',
+                                                     'permutations', 'stopped_early', 'workers', 'elapsed_seconds'])
+
+EXACT_MAX = int(os.environ.get('PERMUTATION_EXACT_MAX', 200_000))
+MAX_PERMUTATIONS = int(os.environ.get('PERMUTATION_MAX', 1_000_000))
+BATCH_CELLS = int(os.environ.get('PERMUTATION_BATCH_CELLS', 4_000_000))
+PARALLEL_MIN_CELLS = int(os.environ.get('PERMUTATION_PARALLEL_MIN_CELLS', 100_000_000))
+STOPPING_CONFIDENCE = 0.999
+MAX_BATCH_PERMUTATIONS = 10_000
+
+# Omnibus tests whose statistic orders permutations like the sum of squared rank sums.
+PERMUTATION_OMNIBUS_TESTS = ('friedman', 'iman-davenport')
+
+def _statistics(rank_sums, first, second):
+    # rank_sums has shape (permutations, k); the mean ranks are a constant multiple, so sums are compared directly.
+    return (np.sum(rank_sums ** 2, axis=1),
+            np.abs(rank_sums[:, first] - rank_sums[:, second]),
+            rank_sums.max(axis=1) - rank_sums.min(axis=1))
+
+def _count_exceedances(rank_sums, observed, first, second):
+    # A small tolerance keeps permutations whose statistic equals the observed one, up to rounding, among the exceedances.
+    friedman, pairs, ranges = _statistics(rank_sums, first, second)
+    friedman_observed, pairs_observed, range_observed = observed
+    return (np.count_nonzero(friedman >= friedman_observed - 1e-9),
+            np.count_nonzero(pairs >= pairs_observed - 1e-9, axis=0),
+            np.count_nonzero(ranges[:, None] >= pairs_observed - 1e-9, axis=0))
+
+def _monte_carlo_batch(rank_matrix, size, seed_sequence, observed):
+    k, n = rank_matrix.shape
+    first, second = np.triu_indices(k, 1)
+    rng = np.random.default_rng(seed_sequence)
+
+    order = np.argsort(rng.random((size, k, n)), axis=1)
+    permuted = np.take_along_axis(np.broadcast_to(rank_matrix, (size, k, n)), order, axis=1)
+    return _count_exceedances(permuted.sum(axis=2), observed, first, second)
+
+def _exact_batch(rank_matrix, start, stop, observed):
+    k, n = rank_matrix.shape
+    first, second = np.triu_indices(k, 1)
+    orders = np.array(list(itertools.permutations(range(k))))
+
+    # Permutation number i picks, for every benchmark, one of the k! orders by the digits of i in base k!.
+    choices = np.stack(np.unravel_index(np.arange(start, stop), (len(orders),) * n), axis=1)
+    permuted = rank_matrix[orders[choices], np.arange(n)[None, :, None]]
+    return _count_exceedances(permuted.sum(axis=1), observed, first, second)
+
+def _clearly_decided(exceedances, permutations, alpha):
+    tail = (1.0 - STOPPING_CONFIDENCE) / 2
+    lower = np.where(exceedances > 0, beta.ppf(tail, exceedances, permutations - exceedances + 1), 0.0)
+    upper = np.where(exceedances < permutations, beta.ppf(1 - tail, exceedances + 1, permutations - exceedances), 1.0)
+    return bool(np.all((upper < alpha) | (lower > alpha)))
+
+def _run_batches(function, batch_args, parallel):
+    if parallel:
+        # Map yields results in submission order, so consuming them in order keeps runs reproducible.
+        return pool.get_executor().map(function, *zip(*batch_args))
+    return (function(*args) for args in batch_args)
+
+def permutation_tests(rank_matrix, options, alpha: float):
+    started = time.perf_counter()
+    rank_matrix = np.ascontiguousarray(rank_matrix, dtype=np.float64)
+    k, n = rank_matrix.shape
+    first, second = np.triu_indices(k, 1)
+
+    observed = tuple(statistic[0] for statistic in _statistics(rank_matrix.sum(axis=1)[None, :], first, second))
+    batch_size = max(1, min(MAX_BATCH_PERMUTATIONS, BATCH_CELLS // max(k * n, len(first))))
+
+    # Compared on a log scale first, as (k!)^n is astronomically large for the suites that need Monte Carlo.
+    exact = n * math.lgamma(k + 1) <= math.log(EXACT_MAX) + 1e-9 and math.factorial(k) ** n <= EXACT_MAX
+    if exact:
+        total = math.factorial(k) ** n
+        starts = list(range(0, total, batch_size))
+        batch_args = [(rank_matrix, start, min(start + batch_size, total), observed) for start in starts]
+        function, planned = _exact_batch, total
+    else:
+        sizes = [batch_size] * (options.permutations // batch_size)
+        if options.permutations % batch_size:
+            sizes.append(options.permutations % batch_size)
+        seeds = np.random.SeedSequence(options.seed).spawn(len(sizes))
+        batch_args = [(rank_matrix, size, seed, observed) for size, seed in zip(sizes, seeds)]
+        function, planned = _monte_carlo_batch, options.permutations
+
+    parallel = pool.WORKERS > 1 and len(batch_args) > 1 and planned * k * n >= PARALLEL_MIN_CELLS
+    workers = min(pool.WORKERS, len(batch_args)) if parallel else 1
+
+    friedman_count, pair_counts, range_counts = 0, np.zeros(len(first), dtype=np.int64), np.zeros(len(first), dtype=np.int64)
+    evaluated, stopped_early = 0, False
+    batches = _run_batches(function, batch_args, parallel)
+    for args, (friedman, pairs, ranges) in zip(batch_args, batches):
+        friedman_count += friedman
+        pair_counts += pairs
+        range_counts += ranges
+        evaluated += args[2] - args[1] if exact else args[1]
+
+        if not exact and options.early_stopping and evaluated < planned and \
+                _clearly_decided(np.concatenate(([friedman_count], pair_counts, range_counts)), evaluated, alpha):
+            stopped_early = True
+            break
+
+    if hasattr(batches, 'close'):
+        batches.close()
+
+    if exact:
+        p_values = (friedman_count / evaluated, pair_counts / evaluated, range_counts / evaluated)
+    else:
+        p_values = ((friedman_count + 1) / (evaluated + 1), (pair_counts + 1) / (evaluated + 1), (range_counts + 1) / (evaluated + 1))
+
+    return PermutationResult(float(p_values[0]), p_values[1], p_values[2], exact, evaluated, stopped_early, workers,
+                             time.perf_counter() - started)
+
+def summarise_permutation(result):
+    """
+    Formats the run of a 'PermutationResult' for an analysis description.
+    """
+    p_value = result.friedman_p_value
+    return {"exact": result.exact,
+            "permutations": result.permutations,
+            "stopped_early": result.stopped_early,
+            "workers": result.workers,
+            "elapsed_seconds": round(result.elapsed_seconds, 3),
+            "friedman_p_value": '{:.5e}'.format(p_value) if p_value < 0.001 else '{:.5f}'.format(p_value)}
+
+def pair_positions(k, row, others):
+    """
+    Returns the positions in 'np.triu_indices(k, 1)' order of the pairs of algorithm 'row' with each of 'others'.
+    """
+    others = np.asarray(others)
+    first, second = np.minimum(row, others), np.maximum(row, others)
+    return first * k - first * (first + 1) // 2 + (second - first - 1)
@@ -0,0 +1,37 @@
+"""
+Resampling Process Pool
+
+This module holds the process pool shared by the resampling procedures (bootstrap and permutation tests), which split
+their replicates into independently seeded chunks and run the chunks in parallel.
+
+Features:
+- Starts the pool on first use and keeps it for later requests of the same process.
+- Replaces a pool inherited through fork, or broken by a dead worker, with a fresh one, like the analysis job queue.
+
+Configuration (environment variables):
+- RESAMPLING_WORKERS: Number of worker processes (default: CPU count, at most 4; 1 runs every chunk in the calling process).
+- RESAMPLING_START_METHOD: Multiprocessing start method of the pool (default 'spawn').
+
+Example:
+chunks = list(get_executor().map(run_chunk, sizes, seeds))
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+WORKERS = int(os.environ.get('RESAMPLING_WORKERS', 0)) or min(os.cpu_count() or 1, 4)
+START_METHOD = os.environ.get('RESAMPLING_START_METHOD', 'spawn')
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+def get_executor():
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid() or getattr(_executor, '_broken', False):
+            _executor = ProcessPoolExecutor(max_workers=WORKERS, mp_context=multiprocessing.get_context(START_METHOD))
+            _executor_pid = os.getpid()
+        return _executor
@@ -0,0 +1,256 @@
+"""
+Analysis Result Cache
+
+This module provides a content-addressed cache for analysis results, shared by the pairwise, control and all analysis handlers.
+
+Features:
+- Keys results by a BLAKE2 hash of the float64 result block, the algorithm and benchmark names, and the analysis parameters.
+- Keeps a bounded in-memory LRU tier per worker process.
+- Optionally keeps an on-disk tier of JSON files that survives restarts and is shared between gunicorn workers.
+- Evicts memory entries by count and age, and disk entries by total size and age.
+- Tracks hit and miss counters for both tiers.
+- Stores every result in its JSON form (lists, dicts, strings and plain numbers), so a fresh result, a memory hit and a
+  disk hit have the same types. Results that cannot be serialised are returned uncached.
+
+Configuration (environment variables):
+- ANALYSIS_CACHE_MAX_ENTRIES: Maximum number of results held in memory (default 128, 0 disables the memory tier).
+- ANALYSIS_CACHE_MAX_AGE: Maximum age of a cached result in seconds (default 3600).
+- ANALYSIS_CACHE_DIR: Directory of the disk tier. The disk tier is disabled when this is not set.
+- ANALYSIS_CACHE_MAX_DISK_BYTES: Maximum total size of the disk tier in bytes (default 512 MiB).
+
+Usage:
+- Build a key with 'make_cache_key' and wrap the analysis computation in 'analysis_cache.get_or_compute'.
+
+Example:
+key = make_cache_key(experiment_matrix, 'all', optimization_mode=optimization_mode.name, alpha=alpha)
+ranks_table, table, description, cd_plot_specs = analysis_cache.get_or_compute(
+    key, lambda: perform_all_analysis(experiment_matrix, optimization_mode, alpha))
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+def make_cache_key(experiment_matrix, analysis_type, **params):
+    """
+    Builds a content-addressed key for an analysis of an experiment matrix.
+
+    :param experiment_matrix: The ExperimentMatrix being analysed
+    :param analysis_type: Name of the analysis, e.g. 'pairwise', 'control' or 'all'
+    :param params: Analysis parameters that influence the result, such as alpha and the optimization mode
+    :return: A hexadecimal digest
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(analysis_type.encode('utf-8'))
+    digest.update(repr(experiment_matrix.shape).encode('utf-8'))
+    digest.update(experiment_matrix.values.tobytes())
+    digest.update('\x1f'.join(experiment_matrix.algorithm_names).encode('utf-8'))
+    digest.update(b'\x1e')
+    digest.update('\x1f'.join(experiment_matrix.benchmark_names).encode('utf-8'))
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode('utf-8'))
+    return digest.hexdigest()
+
+def _to_json(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+class AnalysisCache:
+
+    def __init__(self, max_entries=128, max_age=3600.0, cache_dir=None, max_disk_bytes=512 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0}
+
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    @classmethod
+    def from_environment(cls, subdirectory=None):
+        cache_dir = os.environ.get('ANALYSIS_CACHE_DIR') or None
+        if cache_dir and subdirectory:
+            cache_dir = os.path.join(cache_dir, subdirectory)
+
+        return cls(
+            max_entries=int(os.environ.get('ANALYSIS_CACHE_MAX_ENTRIES', 128)),
+            max_age=float(os.environ.get('ANALYSIS_CACHE_MAX_AGE', 3600)),
+            cache_dir=cache_dir,
+            max_disk_bytes=int(os.environ.get('ANALYSIS_CACHE_MAX_DISK_BYTES', 512 * 1024 * 1024)),
+        )
+
+    def get(self, key):
+        """
+        Returns the cached result for a key, or None if neither tier holds a fresh entry.
+        """
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if now - stored_at <= self.max_age:
+                    self._entries.move_to_end(key)
+                    self._counters['memory_hits'] += 1
+                    return value
+                del self._entries[key]
+
+        value = self._read_disk(key, now)
+        with self._lock:
+            if value is None:
+                self._counters['misses'] += 1
+                return None
+            self._counters['disk_hits'] += 1
+            self._store_memory(key, value, now)
+        return value
+
+    def put(self, key, value):
+        """
+        Stores a result in the memory tier and, when configured, in the disk tier.
+
+        :return: The stored JSON form of the result, or the result itself when it cannot be serialised
+        """
+        try:
+            text = json.dumps(value, default=_to_json)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Not caching entry {key}: {e}")
+            return value
+
+        value = json.loads(text)
+        now = time.time()
+        with self._lock:
+            self._store_memory(key, value, now)
+        self._write_disk(key, text)
+        return value
+
+    def get_or_compute(self, key, compute):
+        """
+        Returns the cached result for a key, computing and storing it on a miss.
+
+        :param key: A key from 'make_cache_key'
+        :param compute: A callable without arguments that produces the result
+        :return: The cached or freshly computed result, in its JSON form
+        """
+        value = self.get(key)
+        if value is None:
+            value = self.put(key, compute())
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.cache_dir:
+            for path in self._disk_files():
+                self._remove(path)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats['memory_entries'] = len(self._entries)
+        hits = stats['memory_hits'] + stats['disk_hits']
+        lookups = hits + stats['misses']
+        stats['hit_rate'] = hits / lookups if lookups else 0.0
+        stats['disk_enabled'] = bool(self.cache_dir)
+        return stats
+
+    def _store_memory(self, key, value, now):
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (now, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters['evictions'] += 1
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _read_disk(self, key, now):
+        if not self.cache_dir:
+            return None
+
+        path = self._path(key)
+        try:
+            if now - os.path.getmtime(path) > self.max_age:
+                self._remove(path)
+                return None
+            with open(path, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable cache entry {path}: {e}")
+            self._remove(path)
+            return None
+
+    def _write_disk(self, key, text):
+        if not self.cache_dir:
+            return
+
+        temp_path = None
+        try:
+            # Write to a temporary file first so other workers never read a partial entry.
+            descriptor, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(descriptor, 'w', encoding='utf-8') as file:
+                file.write(text)
+            os.replace(temp_path, self._path(key))
+        except OSError as e:
+            logger.warning(f"Could not write cache entry {key}: {e}")
+            # Temporary files are not '.json' entries, so disk eviction would never remove a leftover one.
+            if temp_path is not None:
+                self._remove(temp_path)
+            return
+
+        self._evict_disk()
+
+    def _disk_files(self):
+        try:
+            return [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir) if name.endswith('.json')]
+        except OSError:
+            return []
+
+    def _evict_disk(self):
+        now = time.time()
+        entries = []
+        for path in self._disk_files():
+            try:
+                status = os.stat(path)
+            except OSError:
+                continue
+            if now - status.st_mtime > self.max_age:
+                self._remove(path)
+            else:
+                entries.append((status.st_mtime, status.st_size, path))
+
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_bytes <= self.max_disk_bytes:
+                break
+            self._remove(path)
+            total_bytes -= size
+            with self._lock:
+                self._counters['evictions'] += 1
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+analysis_cache = AnalysisCache.from_environment()
@@ -0,0 +1,66 @@
+"""
+Precomputed Array Store
+
+This module keeps precomputed NumPy arrays, such as exact null distributions and hypothesis sets, on disk so they are
+computed once and shared between worker processes and restarts.
+
+Features:
+- Loads an array from a '.npy' file under a subdirectory of ANALYSIS_CACHE_DIR, or computes and saves it when missing.
+- Writes files atomically through a temporary file, so concurrent workers never read a partial array.
+- Ignores unreadable or mis-shaped files and recomputes them.
+- Computes arrays without saving them when ANALYSIS_CACHE_DIR is not set.
+
+Usage:
+- Callers wrap 'load_or_compute_array' in their own in-memory memoisation (e.g. functools.lru_cache).
+
+Example:
+cdf = load_or_compute_array('wilcoxon', f'signed_rank_cdf_{n}', lambda: compute_cdf(n))
+"""
+
+import logging
+import os
+import tempfile
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+def array_store_dir(subdirectory):
+    cache_dir = os.environ.get('ANALYSIS_CACHE_DIR')
+    return os.path.join(cache_dir, subdirectory) if cache_dir else None
+
+def load_or_compute_array(subdirectory, name, compute, expected_shape=None):
+    """
+    Returns a stored array, computing and storing it first if necessary.
+
+    :param subdirectory: Subdirectory of ANALYSIS_CACHE_DIR holding the array.
+    :param name: File name of the array without the '.npy' extension.
+    :param compute: Function returning the array.
+    :param expected_shape: Shape the stored array must have, or None to accept any shape.
+    :return: A read-only NumPy array.
+    """
+    directory = array_store_dir(subdirectory)
+    path = os.path.join(directory, f'{name}.npy') if directory else None
+
+    array = None
+    if path and os.path.exists(path):
+        try:
+            array = np.load(path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable array file {path}: {e}")
+        if array is not None and expected_shape is not None and array.shape != tuple(expected_shape):
+            array = None
+
+    if array is None:
+        array = compute()
+        if path:
+            try:
+                os.makedirs(directory, exist_ok=True)
+                descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix='.npy')
+                with os.fdopen(descriptor, 'wb') as file:
+                    np.save(file, array)
+                os.replace(temp_path, path)
+            except OSError as e:
+                logger.warning(f"Could not save array file {path}: {e}")
+
+    array.setflags(write=False)
+    return array
@@ -0,0 +1,87 @@
+"""
+Stored Experiment Cache
+
+This module keeps the decoded float64 matrices of recently analysed stored experiments in memory, so analyses of a
+stored experiment do not load and decode its matrix again.
+
+Features:
+- Holds one entry per experiment ID in a bounded LRU per worker process, with the experiment's matrix, settings,
+  description and, when it has them, its raw runs.
+- Tags every entry with the experiment's 'matrix_version', which every save of the matrix increments. A lookup with a
+  different version drops the entry, so an update made through any worker invalidates the entries of all of them.
+- Drops the entry of an experiment at once when this worker saves its matrix.
+- Tracks hit, miss, stale and eviction counters.
+
+Configuration (environment variables):
+- EXPERIMENT_CACHE_MAX_ENTRIES: Maximum number of experiments held per worker (default 16, 0 disables the cache).
+
+Example:
+entry = experiment_cache.get(experiment_id, version)
+if entry is None:
+    entry = CachedExperiment(version, experiment_matrix, settings, experiment_name, experiment_description, run_matrix)
+    experiment_cache.put(experiment_id, entry)
+"""
+
+import os
+import threading
+from collections import OrderedDict, namedtuple
+
+CachedExperiment = namedtuple('CachedExperiment', ['version', 'experiment_matrix', 'settings', 'experiment_name',
+                                                   'experiment_description', 'run_matrix'])
+
+class ExperimentCache:
+
+    def __init__(self, max_entries=16):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'stale': 0, 'evictions': 0}
+
+    @classmethod
+    def from_environment(cls):
+        return cls(max_entries=int(os.environ.get('EXPERIMENT_CACHE_MAX_ENTRIES', 16)))
+
+    def get(self, experiment_id, version):
+        """
+        Returns the cached entry of an experiment if it holds the given matrix version, or None.
+        """
+        with self._lock:
+            entry = self._entries.get(experiment_id)
+            if entry is not None and entry.version == version:
+                self._entries.move_to_end(experiment_id)
+                self._counters['hits'] += 1
+                return entry
+            if entry is not None:
+                del self._entries[experiment_id]
+                self._counters['stale'] += 1
+            self._counters['misses'] += 1
+            return None
+
+    def put(self, experiment_id, entry):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[experiment_id] = entry
+            self._entries.move_to_end(experiment_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters['evictions'] += 1
+
+    def invalidate(self, experiment_id):
+        with self._lock:
+            self._entries.pop(experiment_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats['entries'] = len(self._entries)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+
+experiment_cache = ExperimentCache.from_environment()
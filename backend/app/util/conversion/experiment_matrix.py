@@ -0,0 +1,147 @@
+"""
+Experiment Matrix
+
+This class holds an experiment as algorithm names, benchmark names and one contiguous float64 block of results.
+
+Features:
+- Builds the matrix in a single pass from the JSON table format (list of lists with a header row and name column).
+- Builds the matrix in a single pass from CSV text or file objects, such as the files in 'sample_data/'.
+- Keeps the numeric results as a C-contiguous (algorithms x benchmarks) float64 array that services use without further casts.
+- Converts to and from a compact binary form for storage: a small header with the shape and the names, followed by the
+  results as one little-endian float64 block that 'from_bytes' wraps with 'np.frombuffer' instead of copying it.
+- Converts back to the JSON table format for exports and responses.
+
+Attributes:
+- algorithm_names: A list with one name per row of the result block.
+- benchmark_names: A list with one name per column of the result block.
+- values: A (k, n) float64 NumPy array of results, algorithms as rows and benchmarks as columns.
+
+Usage:
+- Build an ExperimentMatrix once at the API boundary and pass it through the analysis services and database commit helpers.
+
+Example:
+experiment_matrix = ExperimentMatrix.from_table(payload['experimentData'])
+ranks = rank_columns(experiment_matrix.values)
+"""
+
+import csv
+import io
+import json
+import struct
+import numpy as np
+
+# Binary layout: magic, format version, algorithm count, benchmark count and the byte length of the UTF-8 JSON names,
+# then the names, zero-padded so the float64 block that follows starts at a multiple of 8 bytes.
+MATRIX_MAGIC = b'EXPM'
+MATRIX_VERSION = 1
+_HEADER = struct.Struct('<4sHxxIII')
+
+class ExperimentMatrix:
+    __slots__ = ('algorithm_names', 'benchmark_names', 'values')
+
+    def __init__(self, algorithm_names, benchmark_names, values):
+        values = np.ascontiguousarray(values, dtype=np.float64)
+
+        if values.ndim != 2 or values.shape != (len(algorithm_names), len(benchmark_names)):
+            raise ValueError(f"Result block of shape {values.shape} does not match "
+                             f"{len(algorithm_names)} algorithms and {len(benchmark_names)} benchmarks.")
+
+        self.algorithm_names = list(algorithm_names)
+        self.benchmark_names = list(benchmark_names)
+        self.values = values
+
+    @classmethod
+    def from_table(cls, table):
+        """
+        Builds an experiment matrix from a table whose first row holds the benchmark names and whose first column holds the algorithm names.
+
+        :param table: A list of lists, as sent in 'experimentData' or 'experimentTable'
+        :return: An ExperimentMatrix
+        """
+        benchmark_names = [str(name).strip() for name in table[0][1:]]
+        algorithm_names = [str(row[0]).strip() for row in table[1:]]
+        values = np.array([row[1:] for row in table[1:]], dtype=np.float64)
+
+        return cls(algorithm_names, benchmark_names, values.reshape(len(algorithm_names), len(benchmark_names)))
+
+    @classmethod
+    def from_csv(cls, source, delimiter=','):
+        """
+        Builds an experiment matrix from CSV text or a text file object laid out like the JSON table.
+
+        The top-left header cell is ignored, so exported files with a label such as 'Algorithm' in that cell are accepted.
+
+        :param source: CSV text or a text file object
+        :param delimiter: Field delimiter
+        :return: An ExperimentMatrix
+        """
+        if isinstance(source, str):
+            source = io.StringIO(source)
+
+        table = []
+        for row in csv.reader(source, delimiter=delimiter):
+            row = [cell.strip() for cell in row]
+            while row and not row[-1]:
+                row.pop()
+            if row:
+                table.append(row)
+
+        if not table:
+            raise ValueError("CSV input contains no rows.")
+
+        table[0][0] = ''
+
+        return cls.from_table(table)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Rebuilds an experiment matrix from the binary form written by 'to_bytes', e.g. a BYTEA value. The results are a
+        read-only view of 'data' rather than a copy.
+
+        :param data: A bytes-like object
+        :return: An ExperimentMatrix
+        """
+        data = memoryview(data)
+        magic, version, k, n, names_length = _HEADER.unpack_from(data)
+        if magic != MATRIX_MAGIC or version != MATRIX_VERSION:
+            raise ValueError("Data is not a binary experiment matrix of a supported version.")
+
+        algorithm_names, benchmark_names = json.loads(bytes(data[_HEADER.size:_HEADER.size + names_length]).decode('utf-8'))
+        offset = -(-(_HEADER.size + names_length) // 8) * 8
+        values = np.frombuffer(data, dtype='<f8', count=k * n, offset=offset).reshape(k, n)
+        return cls(algorithm_names, benchmark_names, values)
+
+    def to_bytes(self):
+        """
+        Converts the matrix to its binary form.
+        """
+        k, n = self.shape
+        names = json.dumps([self.algorithm_names, self.benchmark_names], ensure_ascii=False).encode('utf-8')
+        padding = b'\0' * (-(_HEADER.size + len(names)) % 8)
+        values = np.ascontiguousarray(self.values, dtype='<f8').tobytes()
+        return _HEADER.pack(MATRIX_MAGIC, MATRIX_VERSION, k, n, len(names)) + names + padding + values
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    def row(self, index):
+        """
+        Returns the name and results of a single algorithm.
+        """
+        return self.algorithm_names[index], self.values[index]
+
+    def to_table(self, as_text=False):
+        """
+        Converts the matrix back to the JSON table format with an empty top-left cell.
+
+        :param as_text: Whether to write the results as strings, like the tables edited in the frontend
+        """
+        rows = self.values.tolist()
+        if as_text:
+            rows = [[repr(value) for value in row] for row in rows]
+        return [[''] + self.benchmark_names] + [[name] + row for name, row in zip(self.algorithm_names, rows)]
+
+    def __repr__(self):
+        return f"ExperimentMatrix(algorithms={len(self.algorithm_names)}, benchmarks={len(self.benchmark_names)})"
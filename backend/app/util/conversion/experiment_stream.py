@@ -0,0 +1,211 @@
+"""
+Streaming Experiment Readers
+
+This module reads uploaded experiment files straight into an ExperimentMatrix, without building an intermediate table.
+
+Features:
+- Parses CSV line by line from a binary stream (a request body or an uploaded file), decoding UTF-8 and skipping a BOM.
+- Parses each row into a float64 row of a preallocated block that grows geometrically, so memory stays close to the
+  size of the final (algorithms x benchmarks) array.
+- Reads Parquet files record batch by record batch when the optional 'pyarrow' package is installed; the first column
+  holds the algorithm names and every other column one benchmark.
+- Validates while reading: name patterns, row lengths, numeric cells and an overall cell limit. The first problem
+  stops the read with an UploadValidationError that carries the table row and column, counted like the JSON table
+  (row 0 and column 0 hold the names). Value-level checks (non-finite values, duplicate names, constant benchmarks) are
+  left to 'collect_matrix_issues' in the validation module, which reports all of them at once.
+
+Usage:
+- API handlers call 'read_experiment_csv' or 'read_experiment_parquet' with the uploaded stream and pass the
+  resulting ExperimentMatrix to the commit and analysis paths.
+
+Example:
+experiment_matrix = read_experiment_csv(request.stream)
+"""
+
+import csv
+import os
+import numpy as np
+from app.util.conversion.experiment_matrix import ExperimentMatrix
+from app.util.validation.experiment_validation import NAME_PATTERN, NAME_MESSAGE
+
+try:
+    import pyarrow
+    import pyarrow.parquet as pq
+except ImportError:
+    pyarrow = None
+    pq = None
+
+MAX_CELLS = int(os.environ.get('EXPERIMENT_UPLOAD_MAX_CELLS', 10_000_000))
+
+class UploadValidationError(ValueError):
+
+    def __init__(self, message, row=None, column=None):
+        super().__init__(message)
+        self.row = row
+        self.column = column
+
+    def to_dict(self):
+        return {'error': str(self), 'row': self.row, 'column': self.column}
+
+class _RowBuffer:
+    """
+    Collects float64 rows of a fixed width in a block that doubles in height when full.
+    """
+
+    def __init__(self, width, capacity=64):
+        self.values = np.empty((capacity, width), dtype=np.float64)
+        self.size = 0
+
+    def append(self, row):
+        if self.size == self.values.shape[0]:
+            grown = np.empty((2 * self.values.shape[0], self.values.shape[1]), dtype=np.float64)
+            grown[:self.size] = self.values[:self.size]
+            self.values = grown
+        self.values[self.size] = row
+        self.size += 1
+
+    def result(self):
+        return self.values[:self.size]
+
+def _check_name(name, row, column):
+    if not name or not NAME_PATTERN.match(name):
+        raise UploadValidationError(f"Cell [{row}][{column}] {NAME_MESSAGE}", row, column)
+
+def _parse_row(cells, row):
+    try:
+        return np.array(cells, dtype=np.float64)
+    except ValueError:
+        pass
+
+    # Locate the offending cell only when the fast bulk conversion fails.
+    for j, cell in enumerate(cells, start=1):
+        try:
+            float(cell)
+        except ValueError:
+            raise UploadValidationError(f"Cell [{row}][{j}] must be numeric.", row, j)
+    raise UploadValidationError(f"Row {row} must be numeric.", row)
+
+def _decoded_lines(stream, encoding):
+    first = True
+    for line in stream:
+        text = line.decode(encoding) if isinstance(line, bytes) else line
+        if first:
+            text = text.lstrip('\ufeff')
+            first = False
+        yield text
+
+def read_experiment_csv(stream, delimiter=',', encoding='utf-8', max_cells=None):
+    """
+    Reads an experiment CSV laid out like the JSON table: benchmark names in the first row, algorithm names in the first column.
+
+    The top-left header cell is ignored, so exported files with a label such as 'algorithm' in that cell are accepted.
+
+    :param stream: Binary or text file object, such as 'request.stream' or an uploaded file.
+    :param delimiter: Field delimiter, a single character other than a quote or a line break.
+    :param encoding: Text encoding of a binary stream.
+    :param max_cells: Maximum number of result cells (default 'EXPERIMENT_UPLOAD_MAX_CELLS').
+    :return: An ExperimentMatrix.
+    :raises UploadValidationError: For an invalid delimiter, and at the first invalid cell or row.
+    """
+    if not isinstance(delimiter, str) or len(delimiter) != 1 or delimiter in '\r\n"':
+        raise UploadValidationError("The delimiter must be a single character other than a quote or a line break.")
+
+    max_cells = MAX_CELLS if max_cells is None else max_cells
+    reader = csv.reader(_decoded_lines(stream, encoding), delimiter=delimiter)
+
+    benchmark_names = None
+    algorithm_names = []
+    buffer = None
+
+    try:
+        for row in reader:
+            row = [cell.strip() for cell in row]
+            while row and not row[-1]:
+                row.pop()
+            if not row:
+                continue
+
+            if benchmark_names is None:
+                benchmark_names = row[1:]
+                if not benchmark_names:
+                    raise UploadValidationError("The header row must name at least one benchmark.", 0)
+                for j, name in enumerate(benchmark_names, start=1):
+                    _check_name(name, 0, j)
+                buffer = _RowBuffer(len(benchmark_names))
+                continue
+
+            i = len(algorithm_names) + 1
+            if len(row) != len(benchmark_names) + 1:
+                raise UploadValidationError(f"Row {i} must contain {len(benchmark_names) + 1} cells.", i)
+            _check_name(row[0], i, 0)
+            if i * len(benchmark_names) > max_cells:
+                raise UploadValidationError(f"Experiments are limited to {max_cells} result cells.", i)
+
+            buffer.append(_parse_row(row[1:], i))
+            algorithm_names.append(row[0])
+    except (csv.Error, UnicodeDecodeError) as e:
+        raise UploadValidationError(f"Malformed CSV near row {len(algorithm_names) + 1}: {e}", len(algorithm_names) + 1)
+
+    if benchmark_names is None or not algorithm_names:
+        raise UploadValidationError("The file must contain a header row and at least one algorithm row.")
+
+    return ExperimentMatrix(algorithm_names, benchmark_names, buffer.result())
+
+def read_experiment_parquet(source, max_cells=None):
+    """
+    Reads an experiment Parquet file whose first column holds the algorithm names and whose other columns hold the
+    results of one benchmark each.
+
+    :param source: Path or seekable binary file object.
+    :param max_cells: Maximum number of result cells (default 'EXPERIMENT_UPLOAD_MAX_CELLS').
+    :return: An ExperimentMatrix.
+    :raises RuntimeError: If 'pyarrow' is not installed.
+    :raises UploadValidationError: At the first invalid cell or column.
+    """
+    if pq is None:
+        raise RuntimeError("Parquet uploads require the 'pyarrow' package.")
+
+    max_cells = MAX_CELLS if max_cells is None else max_cells
+    try:
+        parquet_file = pq.ParquetFile(source)
+    except (pyarrow.ArrowException, OSError) as e:
+        raise UploadValidationError(f"Malformed Parquet file: {e}")
+
+    column_names = parquet_file.schema_arrow.names
+    benchmark_names = [str(name).strip() for name in column_names[1:]]
+    if not benchmark_names:
+        raise UploadValidationError("The file must contain a name column and at least one benchmark column.", 0)
+    for j, name in enumerate(benchmark_names, start=1):
+        _check_name(name, 0, j)
+
+    rows = parquet_file.metadata.num_rows
+    if rows * len(benchmark_names) > max_cells:
+        raise UploadValidationError(f"Experiments are limited to {max_cells} result cells.")
+
+    values = np.empty((rows, len(benchmark_names)), dtype=np.float64)
+    algorithm_names = []
+
+    offset = 0
+    for batch in parquet_file.iter_batches():
+        for i, name in enumerate(batch.column(0).to_pylist(), start=offset + 1):
+            name = '' if name is None else str(name).strip()
+            _check_name(name, i, 0)
+            algorithm_names.append(name)
+
+        for j in range(1, batch.num_columns):
+            column = batch.column(j)
+            if column.null_count:
+                i = offset + 1 + column.is_null().to_numpy(zero_copy_only=False).argmax()
+                raise UploadValidationError(f"Cell [{i}][{j}] must be numeric.", int(i), j)
+            try:
+                column = column.cast(pyarrow.float64())
+            except pyarrow.ArrowException:
+                raise UploadValidationError(f"Column {j} must be numeric.", None, j)
+            values[offset:offset + batch.num_rows, j - 1] = column.to_numpy(zero_copy_only=False)
+
+        offset += batch.num_rows
+
+    if not algorithm_names:
+        raise UploadValidationError("The file must contain at least one algorithm row.")
+
+    return ExperimentMatrix(algorithm_names, benchmark_names, values)
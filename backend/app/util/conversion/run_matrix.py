@@ -0,0 +1,152 @@
+"""
+Run Matrix
+
+This class holds the raw results of every independent run of an experiment as one (algorithms x benchmarks x runs)
+float64 block, and reduces it to the per-cell ExperimentMatrix the analyses work on.
+
+Features:
+- Builds the block from the JSON table format whose cells are lists of run results; a single number is one run. The
+  table is checked with 'validate_run_table' first, so its names follow the same rules as 'experimentData'.
+- Allows cells with different numbers of runs by padding the shorter ones with NaN, which is reserved for padding:
+  every cell needs at least one run and every run result must be finite.
+- Aggregates every cell with one vectorised reduction over the run axis: the mean, the median, the best or worst run
+  for the optimization mode, or a chosen percentile. Blocks without padding use the plain NumPy reductions and padded
+  blocks their NaN-ignoring counterparts.
+- Reports the run counts and the sample standard deviations of every cell for the dispersion-aware pairwise paths.
+- Converts to and from raw little-endian float64 bytes for the compact binary storage column, and back to the JSON
+  table format.
+
+Attributes:
+- algorithm_names: A list with one name per row of the block.
+- benchmark_names: A list with one name per column of the block.
+- runs: A (k, n, r) float64 NumPy array of run results, NaN-padded up to the largest number of runs r.
+
+Example:
+run_matrix = RunMatrix.from_table(payload['experimentRuns'])
+experiment_matrix = run_matrix.aggregate('median', OptimizationMode.MINIMIZE)
+"""
+
+import numpy as np
+from app.constants.optimization_mode import OptimizationMode
+from app.util.conversion.experiment_matrix import ExperimentMatrix
+from app.util.validation.experiment_validation import validate_run_table
+
+AGGREGATIONS = ('mean', 'median', 'best', 'worst', 'percentile')
+DEFAULT_AGGREGATION = 'mean'
+
+class RunMatrix:
+    __slots__ = ('algorithm_names', 'benchmark_names', 'runs', '_padded')
+
+    def __init__(self, algorithm_names, benchmark_names, runs):
+        runs = np.ascontiguousarray(runs, dtype=np.float64)
+
+        if runs.ndim != 3 or runs.shape[:2] != (len(algorithm_names), len(benchmark_names)) or runs.shape[2] < 1:
+            raise ValueError(f"Run block of shape {runs.shape} does not match "
+                             f"{len(algorithm_names)} algorithms and {len(benchmark_names)} benchmarks with at least one run.")
+
+        missing = np.isnan(runs)
+        empty = np.argwhere(missing.all(axis=2))
+        if len(empty):
+            i, j = empty[0]
+            raise ValueError(f"Cell [{i + 1}][{j + 1}] has no runs.")
+        if np.isinf(runs).any():
+            raise ValueError("Run results must be finite.")
+
+        self.algorithm_names = list(algorithm_names)
+        self.benchmark_names = list(benchmark_names)
+        self.runs = runs
+        self._padded = bool(missing.any())
+
+    @classmethod
+    def from_table(cls, table):
+        """
+        Builds a run matrix from a table whose first row holds the benchmark names, whose first column holds the
+        algorithm names and whose cells hold lists of run results.
+
+        :param table: A list of lists, as sent in 'experimentRuns'
+        :return: A RunMatrix
+        :raises ExperimentValidationError: When the table's shape, names or run results are invalid
+        """
+        validate_run_table(table)
+
+        benchmark_names = [str(name).strip() for name in table[0][1:]]
+        algorithm_names = [str(row[0]).strip() for row in table[1:]]
+        cells = [[cell if isinstance(cell, (list, tuple)) else [cell] for cell in row[1:]] for row in table[1:]]
+
+        run_count = max((len(cell) for row in cells for cell in row), default=1)
+        runs = np.full((len(algorithm_names), len(benchmark_names), run_count), np.nan)
+        for i, row in enumerate(cells):
+            for j, cell in enumerate(row):
+                runs[i, j, :len(cell)] = [float(value) for value in cell]
+
+        return cls(algorithm_names, benchmark_names, runs)
+
+    @classmethod
+    def from_bytes(cls, algorithm_names, benchmark_names, run_count, data):
+        """
+        Rebuilds a run matrix from the raw little-endian float64 bytes written by 'to_bytes'.
+        """
+        runs = np.frombuffer(data, dtype='<f8').reshape(len(algorithm_names), len(benchmark_names), run_count)
+        return cls(algorithm_names, benchmark_names, runs)
+
+    def to_bytes(self):
+        return np.ascontiguousarray(self.runs, dtype='<f8').tobytes()
+
+    @property
+    def shape(self):
+        return self.runs.shape
+
+    def run_counts(self):
+        """
+        Returns the (k, n) number of runs of every cell.
+        """
+        return np.count_nonzero(~np.isnan(self.runs), axis=2)
+
+    def dispersion(self):
+        """
+        Returns the (k, n) sample standard deviations of the runs of every cell, 0 for cells with a single run.
+        """
+        counts = self.run_counts()
+        centred = self.runs - self._reduce(np.mean, np.nanmean)[:, :, None]
+        squares = np.nansum(centred * centred, axis=2)
+        return np.sqrt(np.divide(squares, counts - 1, out=np.zeros_like(squares), where=counts > 1))
+
+    def _reduce(self, plain, ignoring_nan, **kwargs):
+        return (ignoring_nan if self._padded else plain)(self.runs, axis=2, **kwargs)
+
+    def aggregate(self, aggregation, optimization_mode, percentile=None):
+        """
+        Reduces the runs of every cell to one result.
+
+        :param aggregation: One of AGGREGATIONS
+        :param optimization_mode: Decides whether the best run is the smallest or the largest one
+        :param percentile: The percentile (0 to 100) used by the 'percentile' aggregation
+        :return: An ExperimentMatrix of the aggregated results
+        """
+        maximize = optimization_mode == OptimizationMode.MAXIMIZE
+        if aggregation == 'mean':
+            values = self._reduce(np.mean, np.nanmean)
+        elif aggregation == 'median':
+            values = self._reduce(np.median, np.nanmedian)
+        elif aggregation in ('best', 'worst'):
+            largest = maximize == (aggregation == 'best')
+            values = self._reduce(np.max, np.nanmax) if largest else self._reduce(np.min, np.nanmin)
+        elif aggregation == 'percentile':
+            if percentile is None or not 0 <= percentile <= 100:
+                raise ValueError("The percentile aggregation needs a percentile between 0 and 100.")
+            values = self._reduce(np.percentile, np.nanpercentile, q=percentile)
+        else:
+            raise ValueError(f"Invalid aggregation: {aggregation}. Use one of: {', '.join(AGGREGATIONS)}.")
+
+        return ExperimentMatrix(self.algorithm_names, self.benchmark_names, values)
+
+    def to_table(self):
+        """
+        Converts the block back to the JSON table format, with the NaN padding dropped from every cell.
+        """
+        rows = [[[value for value in cell if value == value] for cell in row] for row in self.runs.tolist()]
+        return [[''] + self.benchmark_names] + [[name] + row for name, row in zip(self.algorithm_names, rows)]
+
+    def __repr__(self):
+        k, n, r = self.shape
+        return f"RunMatrix(algorithms={k}, benchmarks={n}, runs={r})"
@@ -0,0 +1,81 @@
+"""
+Critical Difference Plot Store
+
+This module defers critical difference plot rendering out of the analysis request.
+
+Features:
+- Registers plot specifications (ranks and significance matrix) under a content-addressed plot handle.
+- Stores specifications and rendered images in an AnalysisCache, so handles resolve in any gunicorn worker when the disk tier is enabled.
+  Without ANALYSIS_CACHE_DIR a handle only resolves in the worker that created it; the backend image sets it to a
+  directory shared by its workers.
+- Renders a plot on demand at a requested size, DPI and format (SVG or PNG), memoising each rendering.
+- Optionally renders SVG images inline for clients that still want Base64 images in the analysis response.
+
+Usage:
+- Analysis handlers call 'prepare_cd_plot_data' with the specifications returned by the analysis services.
+- The plot endpoint calls 'render_cd_plot' with the handle from the analysis response.
+
+Example:
+cd_plot_data = prepare_cd_plot_data(cd_plot_specs, render=payload.get('renderPlots', False))
+png = render_cd_plot(cd_plot_data[0]['plotId'], figsize=(11.5, 5), dpi=150, image_format='png')
+"""
+
+import hashlib
+import json
+from app.util.cache.analysis_cache import AnalysisCache
+from app.util.graphs.critical_difference_plots import DEFAULT_FIGSIZE, DEFAULT_DPI, generate_cd_plot_data_from_spec
+
+plot_store = AnalysisCache.from_environment(subdirectory='plots')
+
+def register_cd_plot(spec):
+    """
+    Stores a plot specification and returns its handle.
+
+    :param spec: Dictionary returned by 'build_cd_plot_spec'.
+    :return: The plot handle.
+    """
+    plot_id = hashlib.blake2b(json.dumps(spec, sort_keys=True).encode('utf-8'), digest_size=16).hexdigest()
+    if plot_store.get(f'spec-{plot_id}') is None:
+        plot_store.put(f'spec-{plot_id}', spec)
+    return plot_id
+
+def render_cd_plot(plot_id, figsize=DEFAULT_FIGSIZE, dpi=DEFAULT_DPI, image_format='svg'):
+    """
+    Renders a registered plot, reusing an earlier rendering of the same size, DPI and format.
+
+    :param plot_id: Handle returned by 'register_cd_plot'.
+    :param figsize: Width and height of the figure in inches.
+    :param dpi: Resolution of the figure in dots per inch.
+    :param image_format: 'svg' or 'png'.
+    :return: A dictionary containing the Base64-encoded plot image, its MIME type and its title, or None for an unknown handle.
+    """
+    spec = plot_store.get(f'spec-{plot_id}')
+    if spec is None:
+        return None
+
+    image_key = f'image-{plot_id}-{float(figsize[0]):g}x{float(figsize[1]):g}-{int(dpi)}.{image_format}'
+    return plot_store.get_or_compute(image_key, lambda: generate_cd_plot_data_from_spec(spec, figsize, dpi, image_format))
+
+def prepare_cd_plot_data(cd_plot_specs, render=False):
+    """
+    Turns plot specifications into the 'cdPlotData' entries of an analysis response.
+
+    :param cd_plot_specs: List of dictionaries returned by 'build_cd_plot_spec'.
+    :param render: Whether to include the Base64 SVG image of each plot at the default size.
+    :return: A list of dictionaries with the plot handle, title and post-hoc name, plus 'imageData' and 'mimeType' when rendered.
+    """
+    cd_plot_data = []
+    for spec in cd_plot_specs:
+        plot_id = register_cd_plot(spec)
+        plot_data = {
+            'plotId': plot_id,
+            'title': spec['title'],
+            'postHoc': spec['postHoc'],
+        }
+        if render:
+            rendered = render_cd_plot(plot_id)
+            plot_data['imageData'] = rendered['imageData']
+            plot_data['mimeType'] = rendered['mimeType']
+        cd_plot_data.append(plot_data)
+
+    return cd_plot_data
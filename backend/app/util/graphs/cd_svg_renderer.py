@@ -0,0 +1,214 @@
+"""
+Native Critical Difference Diagram Renderer
+
+This module draws critical difference (CD) diagrams as SVG directly from computed geometry, without matplotlib.
+
+Features:
+- Reproduces the layout of scikit-posthocs' 'critical_difference_diagram' with the styling used by 'plot_critical_difference_diagram'.
+- Finds the crossbars (maximal groups of algorithms without significant differences) with a bitmask Bron-Kerbosch search.
+- Stacks crossbars on levels, places elbows and labels, and computes the rank axis ticks in plain Python.
+- Emits a self-contained SVG document, and a PNG when the optional 'cairosvg' package is installed.
+- Keeps no global state between calls, so rendering is safe in any worker and never retains figures.
+
+Usage:
+- Call 'render_cd_svg' with the ranks dictionary and significance matrix used for the matplotlib diagram.
+
+Example:
+svg = render_cd_svg({'A': 1.5, 'B': 2.25, 'C': 2.25}, sig_matrix, figsize=(11.5, 5), dpi=100)
+"""
+
+import math
+from html import escape
+import numpy as np
+
+try:
+    import cairosvg
+except (ImportError, OSError):
+    cairosvg = None
+
+FIGURE_MARGINS = {'left': 0.1, 'right': 0.9, 'top': 0.8, 'bottom': 0.3}
+AXIS_MARGIN = 0.05
+TEXT_H_MARGIN = 0.15
+CROSSBAR_COLORS = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf']
+ELBOW_COLOR = '#808080'
+FONT_FAMILY = 'DejaVu Sans, Bitstream Vera Sans, Arial, Helvetica, sans-serif'
+
+def _maximal_cliques(adjacency):
+    """
+    Finds all maximal cliques of a graph given as adjacency bitmasks, using Bron-Kerbosch with pivoting.
+    """
+    cliques = []
+
+    def expand(clique, candidates, excluded):
+        if not candidates and not excluded:
+            cliques.append(clique)
+            return
+        pivot_pool = candidates | excluded
+        pivot = max((v for v in range(len(adjacency)) if pivot_pool >> v & 1), key=lambda v: bin(candidates & adjacency[v]).count('1'))
+        remaining = candidates & ~adjacency[pivot]
+        while remaining:
+            v = (remaining & -remaining).bit_length() - 1
+            remaining &= remaining - 1
+            expand(clique | 1 << v, candidates & adjacency[v], excluded & adjacency[v])
+            candidates &= ~(1 << v)
+            excluded |= 1 << v
+
+    expand(0, (1 << len(adjacency)) - 1, 0)
+    return cliques
+
+def _nice_ticks(lower, upper, max_bins=9):
+    """
+    Chooses evenly spaced axis ticks with steps of 1, 2, 2.5 or 5 times a power of ten.
+    """
+    span = upper - lower
+    if span <= 0:
+        return [lower]
+
+    scale = 10 ** math.floor(math.log10(span / max_bins))
+    for multiple in (1, 2, 2.5, 5, 10):
+        step = multiple * scale
+        if span / step <= max_bins:
+            break
+
+    first = math.ceil(lower / step - 1e-9)
+    last = math.floor(upper / step + 1e-9)
+    return [round(i * step, 10) for i in range(first, last + 1)]
+
+def compute_cd_layout(ranks, sig_matrix, alpha=0.05):
+    """
+    Computes the geometry of a critical difference diagram in data coordinates.
+
+    The x coordinate is the mean rank; the y coordinate is 0 on the axis and decreases by 1 for every crossbar level and label row.
+
+    :param ranks: Dictionary of algorithm names and their mean ranks.
+    :param sig_matrix: Square DataFrame or array of p-values, ordered like 'ranks'.
+    :param alpha: Significance level below which two algorithms are not joined by a crossbar.
+    :return: A dictionary with the crossbars, items (label, rank, label position, side), limits and ticks.
+    """
+    names = [str(name) for name in ranks.keys()]
+    rank_values = np.asarray(list(ranks.values()), dtype=float)
+    p_values = np.asarray(sig_matrix, dtype=float)
+    k = len(names)
+
+    not_significant = p_values >= alpha
+    np.fill_diagonal(not_significant, False)
+    adjacency = [sum(1 << int(j) for j in np.flatnonzero(row)) for row in not_significant]
+
+    crossbar_sets = [[i for i in range(k) if clique >> i & 1] for clique in _maximal_cliques(adjacency)]
+    crossbar_sets = sorted((members for members in crossbar_sets if len(members) > 1),
+                           key=lambda members: (rank_values[members].min(), rank_values[members].max()))
+
+    crossbar_levels = []
+    crossbars = []
+    for members in crossbar_sets:
+        mask = sum(1 << i for i in members)
+        for level, level_mask in enumerate(crossbar_levels):
+            if not mask & level_mask:
+                crossbar_levels[level] |= mask
+                break
+        else:
+            level = len(crossbar_levels)
+            crossbar_levels.append(mask)
+        crossbars.append({'ranks': sorted(rank_values[members].tolist()), 'y': -level - 1})
+
+    order = np.argsort(rank_values, kind='mergesort')
+    split = (k + 1) // 2
+    left, right = order[:split], order[split:][::-1]
+
+    items = []
+    left_x = rank_values[order[0]] - TEXT_H_MARGIN
+    right_x = rank_values[order[-1]] + TEXT_H_MARGIN
+    for side, indices, text_x in (('left', left, left_x), ('right', right, right_x)):
+        y = -len(crossbar_levels) - 1
+        for index in indices:
+            items.append({'label': names[index], 'rank': float(rank_values[index]), 'x': float(text_x), 'y': y, 'side': side})
+            y -= 1
+
+    x_min, x_max = float(min(left_x, rank_values.min())), float(max(right_x, rank_values.max()))
+    y_min = float(min(item['y'] for item in items)) if items else -1.0
+    x_pad, y_pad = (x_max - x_min) * AXIS_MARGIN, -y_min * AXIS_MARGIN
+    x_limits, y_limits = (x_min - x_pad, x_max + x_pad), (y_min - y_pad, y_pad)
+
+    return {
+        'crossbars': crossbars,
+        'items': items,
+        'x_limits': x_limits,
+        'y_limits': y_limits,
+        'ticks': [tick for tick in _nice_ticks(*x_limits) if x_limits[0] <= tick <= x_limits[1]],
+    }
+
+def render_cd_svg(ranks, sig_matrix, figsize=(11.5, 5), dpi=100, alpha=0.05):
+    """
+    Renders a critical difference diagram as an SVG document.
+
+    :param ranks: Dictionary of algorithm names and their mean ranks.
+    :param sig_matrix: Square DataFrame or array of p-values, ordered like 'ranks'.
+    :param figsize: Width and height of the diagram in inches.
+    :param dpi: Resolution in dots per inch, which sets the pixel size of the document.
+    :param alpha: Significance level below which two algorithms are not joined by a crossbar.
+    :return: The SVG document as a string.
+    """
+    layout = compute_cd_layout(ranks, sig_matrix, alpha)
+
+    width, height = figsize[0] * dpi, figsize[1] * dpi
+    pt = dpi / 72.0
+
+    axes_left, axes_right = FIGURE_MARGINS['left'] * width, FIGURE_MARGINS['right'] * width
+    axes_top, axes_bottom = (1 - FIGURE_MARGINS['top']) * height, (1 - FIGURE_MARGINS['bottom']) * height
+    (x_lo, x_hi), (y_lo, y_hi) = layout['x_limits'], layout['y_limits']
+
+    def px(x):
+        return axes_left + (x - x_lo) / (x_hi - x_lo) * (axes_right - axes_left)
+
+    def py(y):
+        return axes_top + (y_hi - y) / (y_hi - y_lo) * (axes_bottom - axes_top)
+
+    axis_y = py(0)
+    line_width, marker_radius, font_size = 1.5 * pt, 3 * pt, 10 * pt
+    dash = f"{5.55 * pt:.2f},{2.4 * pt:.2f}"
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.0f}" height="{height:.0f}" viewBox="0 0 {width:.2f} {height:.2f}">',
+        f'<rect width="100%" height="100%" fill="#ffffff"/>',
+    ]
+
+    for item in layout['items']:
+        x_text, y_text, x_rank = px(item['x']), py(item['y']), px(item['rank'])
+        parts.append(f'<polyline points="{x_text:.2f},{y_text:.2f} {x_rank:.2f},{y_text:.2f} {x_rank:.2f},{axis_y:.2f}" '
+                     f'fill="none" stroke="{ELBOW_COLOR}" stroke-width="{line_width:.2f}" stroke-dasharray="{dash}"/>')
+
+    parts.append(f'<line x1="{axes_left:.2f}" y1="{axis_y:.2f}" x2="{axes_right:.2f}" y2="{axis_y:.2f}" stroke="#000000" stroke-width="{0.8 * pt:.2f}"/>')
+    for tick in layout['ticks']:
+        x_tick = px(tick)
+        parts.append(f'<line x1="{x_tick:.2f}" y1="{axis_y:.2f}" x2="{x_tick:.2f}" y2="{axis_y - 3.5 * pt:.2f}" stroke="#000000" stroke-width="{0.8 * pt:.2f}"/>')
+        parts.append(f'<text x="{x_tick:.2f}" y="{axis_y - 7 * pt:.2f}" font-family="{FONT_FAMILY}" font-size="{font_size:.2f}" '
+                     f'text-anchor="middle">{tick:g}</text>')
+
+    for index, crossbar in enumerate(layout['crossbars']):
+        colour = CROSSBAR_COLORS[index % len(CROSSBAR_COLORS)]
+        y_bar = py(crossbar['y'])
+        parts.append(f'<line x1="{px(crossbar["ranks"][0]):.2f}" y1="{y_bar:.2f}" x2="{px(crossbar["ranks"][-1]):.2f}" y2="{y_bar:.2f}" '
+                     f'stroke="{colour}" stroke-width="{line_width:.2f}"/>')
+        parts.extend(f'<circle cx="{px(rank):.2f}" cy="{y_bar:.2f}" r="{marker_radius:.2f}" fill="{colour}"/>' for rank in crossbar['ranks'])
+
+    for item in layout['items']:
+        if item['side'] == 'left':
+            text, anchor = f"{item['label']} [{item['rank']:.3f}]  ", 'end'
+        else:
+            text, anchor = f"  [{item['rank']:.3f}] {item['label']}", 'start'
+        parts.append(f'<circle cx="{px(item["rank"]):.2f}" cy="{axis_y:.2f}" r="{marker_radius:.2f}" fill="{ELBOW_COLOR}"/>')
+        parts.append(f'<text x="{px(item["x"]):.2f}" y="{py(item["y"]):.2f}" font-family="{FONT_FAMILY}" font-size="{font_size:.2f}" '
+                     f'font-weight="bold" text-anchor="{anchor}" dominant-baseline="central" xml:space="preserve">{escape(text)}</text>')
+
+    parts.append('</svg>')
+    return '\n'.join(parts)
+
+def render_cd_png(ranks, sig_matrix, figsize=(11.5, 5), dpi=100, alpha=0.05):
+    """
+    Renders a critical difference diagram as PNG bytes by rasterising the SVG.
+
+    :return: The PNG image as bytes, or None when the optional 'cairosvg' package is not installed.
+    """
+    if cairosvg is None:
+        return None
+    return cairosvg.svg2png(bytestring=render_cd_svg(ranks, sig_matrix, figsize, dpi, alpha).encode('utf-8'))
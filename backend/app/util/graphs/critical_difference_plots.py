@@ -1,21 +1,28 @@
 import scikit_posthocs as sp
 import pandas as pd
+import numpy as np
 import matplotlib.pyplot as plt
 import base64
 from io import BytesIO
+from app.util.graphs.cd_svg_renderer import render_cd_svg, render_cd_png
 
-def plot_critical_difference_diagram(ranks, sig_matrix):
+DEFAULT_FIGSIZE = (11.5, 5)
+DEFAULT_DPI = 100
+
+def plot_critical_difference_diagram(ranks, sig_matrix, figsize=DEFAULT_FIGSIZE, dpi=DEFAULT_DPI):
     """
     Plots a Critical Difference diagram based on provided ranks and significance matrix.
 
     Parameters:
     ranks (dict): A dictionary with classifiers/estimators as keys and their ranks as values.
     sig_matrix (DataFrame): A pandas DataFrame representing the significance matrix (p-values).
+    figsize (tuple): Width and height of the figure in inches.
+    dpi (int): Resolution of the figure in dots per inch.
 
     Returns:
     matplotlib figure: A figure containing the plotted Critical Difference diagram.
     """
-    fig, ax = plt.subplots(figsize=(11.5, 5))
+    fig, ax = plt.subplots(figsize=figsize, dpi=dpi)
 
     sp.critical_difference_diagram(
         ranks, 
@@ -33,21 +40,39 @@ def plot_critical_difference_diagram(ranks, sig_matrix):
 
     return fig
 
-def generate_cd_plot_data(ranks, sig_matrix, post_hoc_name):
+def render_cd_plot_png(ranks, sig_matrix, figsize=DEFAULT_FIGSIZE, dpi=DEFAULT_DPI):
+    """
+    Renders a critical difference plot to PNG bytes and releases the figure.
+
+    :param ranks: Dictionary of algorithm names and their ranks.
+    :param sig_matrix: DataFrame representing the significance matrix.
+    :param figsize: Width and height of the figure in inches.
+    :param dpi: Resolution of the figure in dots per inch.
+    :return: The PNG image as bytes.
+    """
+    fig = plot_critical_difference_diagram(ranks, sig_matrix, figsize, dpi)
+    buf = BytesIO()
+    try:
+        fig.savefig(buf, format='png', dpi=dpi)
+    finally:
+        plt.close(fig)
+
+    return buf.getvalue()
+
+def generate_cd_plot_data(ranks, sig_matrix, post_hoc_name, figsize=DEFAULT_FIGSIZE, dpi=DEFAULT_DPI):
     """
     Generates a critical difference plot and returns it in a format suitable for frontend use.
 
     :param ranks: Dictionary of algorithm names and their ranks.
     :param sig_matrix: DataFrame representing the significance matrix.
     :param post_hoc_name: String representing the name of the post-hoc test.
+    :param figsize: Width and height of the figure in inches.
+    :param dpi: Resolution of the figure in dots per inch.
     :return: A dictionary containing the Base64-encoded plot image and its title.
     """
-    fig = plot_critical_difference_diagram(ranks, sig_matrix)
-    buf = BytesIO()
-    fig.savefig(buf, format='png')
-    buf.seek(0)
+    png = render_cd_plot_png(ranks, sig_matrix, figsize, dpi)
 
-    img_base64 = base64.b64encode(buf.getvalue()).decode('utf-8')
+    img_base64 = base64.b64encode(png).decode('utf-8')
 
     cd_plot_data = {
         'imageData': img_base64,
@@ -56,3 +81,52 @@ def generate_cd_plot_data(ranks, sig_matrix, post_hoc_name):
 
     return cd_plot_data
 
+def build_cd_plot_spec(ranks, sig_matrix, post_hoc_name):
+    """
+    Collects everything needed to render a critical difference plot later, without drawing it.
+
+    :param ranks: Dictionary of algorithm names and their ranks.
+    :param sig_matrix: DataFrame or array representing the significance matrix, ordered like 'ranks'.
+    :param post_hoc_name: String representing the name of the post-hoc test.
+    :return: A JSON-serialisable dictionary with the algorithm names, ranks, significance matrix and title.
+    """
+    return {
+        'title': f'Critical Difference Plot: {post_hoc_name}',
+        'postHoc': post_hoc_name,
+        'algorithms': [str(name) for name in ranks.keys()],
+        'ranks': [float(rank) for rank in ranks.values()],
+        'sigMatrix': np.asarray(sig_matrix, dtype=float).tolist(),
+    }
+
+def generate_cd_plot_data_from_spec(spec, figsize=DEFAULT_FIGSIZE, dpi=DEFAULT_DPI, image_format='svg'):
+    """
+    Renders a plot specification produced by 'build_cd_plot_spec'.
+
+    SVG images come from the native renderer. PNG images are rasterised from the SVG when 'cairosvg' is installed
+    and drawn with matplotlib otherwise.
+
+    :param spec: Dictionary returned by 'build_cd_plot_spec'.
+    :param figsize: Width and height of the figure in inches.
+    :param dpi: Resolution of the figure in dots per inch.
+    :param image_format: 'svg' or 'png'.
+    :return: A dictionary containing the Base64-encoded plot image, its MIME type and its title.
+    """
+    ranks = dict(zip(spec['algorithms'], spec['ranks']))
+
+    if image_format == 'svg':
+        image = render_cd_svg(ranks, spec['sigMatrix'], figsize, dpi).encode('utf-8')
+        mime_type = 'image/svg+xml'
+    elif image_format == 'png':
+        image = render_cd_png(ranks, spec['sigMatrix'], figsize, dpi)
+        if image is None:
+            sig_matrix = pd.DataFrame(spec['sigMatrix'], index=spec['algorithms'], columns=spec['algorithms'])
+            image = render_cd_plot_png(ranks, sig_matrix, figsize, dpi)
+        mime_type = 'image/png'
+    else:
+        raise ValueError(f"Unsupported plot format: {image_format}")
+
+    return {
+        'imageData': base64.b64encode(image).decode('utf-8'),
+        'mimeType': mime_type,
+        'title': spec['title'],
+    }
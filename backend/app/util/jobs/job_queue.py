@@ -0,0 +1,268 @@
+"""
+Analysis Job Queue
+
+This module runs analysis tasks asynchronously in a bounded process pool, so long analyses do not block the web workers.
+
+Features:
+- Submits the 'perform_*' computation of an AnalysisTask to a ProcessPoolExecutor and returns a job ID immediately.
+- Completes jobs without using the pool when the analysis result is already cached.
+- Tracks each job through the 'pending', 'running', 'completed', 'failed', 'timed_out' and 'cancelled' states.
+- Enforces a per-job timeout inside the worker process with an interval timer.
+- Cancels pending jobs before they start; a running job that is cancelled is discarded when its worker finishes, and
+  keeps counting towards the bound on unfinished jobs until then, so cancelling does not free room for more work.
+- Assembles the response, and stores the result in the analysis cache, in the web process when the result is first fetched.
+- Forgets finished jobs after a retention period and bounds the number of unfinished jobs.
+- Creates the pool lazily, so it is started in each gunicorn worker after forking.
+
+Job state lives in the memory of the web process that accepted the job, so status and result requests must reach the same process.
+
+Configuration (environment variables):
+- ANALYSIS_JOB_WORKERS: Number of worker processes (default: CPU count, at most 4).
+- ANALYSIS_JOB_TIMEOUT: Default per-job timeout in seconds (default 600, 0 disables the timeout).
+- ANALYSIS_JOB_MAX_PENDING: Maximum number of unfinished jobs accepted at a time (default 32).
+- ANALYSIS_JOB_RETENTION: Seconds a finished job is kept for status and result requests (default 3600).
+- ANALYSIS_JOB_START_METHOD: Multiprocessing start method of the pool (default 'spawn').
+
+Usage:
+- The analysis blueprint calls 'job_queue.submit' with a prepared AnalysisTask and polls it with 'status' and 'result'.
+
+Example:
+job_id = job_queue.submit(prepare_all_analysis(payload))
+status = job_queue.status(job_id)
+"""
+
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+PENDING = 'pending'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+TIMED_OUT = 'timed_out'
+CANCELLED = 'cancelled'
+
+FINISHED_STATES = (COMPLETED, FAILED, TIMED_OUT, CANCELLED)
+
+class JobTimeoutError(Exception):
+    pass
+
+class JobQueueFullError(Exception):
+    pass
+
+def _raise_timeout(signum, frame):
+    raise JobTimeoutError()
+
+def run_with_timeout(function, args, timeout):
+    """
+    Runs an analysis function in a worker process, aborting it once 'timeout' seconds have passed.
+
+    :param function: Module-level analysis function.
+    :param args: Positional arguments for 'function'.
+    :param timeout: Timeout in seconds, or None for no timeout.
+    :return: The result of the analysis function.
+    """
+    if timeout:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return function(*args)
+    finally:
+        if timeout:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+class AnalysisJob:
+    __slots__ = ('job_id', 'task', 'timeout', 'future', 'state', 'error', 'result',
+                 'submitted_at', 'started_at', 'finished_at')
+
+    def __init__(self, job_id, task, timeout):
+        self.job_id = job_id
+        self.task = task
+        self.timeout = timeout
+        self.future = None
+        self.state = PENDING
+        self.error = None
+        self.result = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    def to_dict(self):
+        status = {
+            'jobId': self.job_id,
+            'analysisType': self.task.analysis_type,
+            'status': self.state,
+            'submittedAt': self.submitted_at,
+            'startedAt': self.started_at,
+            'finishedAt': self.finished_at,
+            'timeout': self.timeout,
+        }
+        if self.error is not None:
+            status['error'] = self.error
+        return status
+
+class JobQueue:
+
+    def __init__(self, max_workers=None, timeout=600.0, max_pending=32, retention=3600.0, start_method='spawn'):
+        self.max_workers = max_workers or min(os.cpu_count() or 1, 4)
+        self.timeout = timeout
+        self.max_pending = max_pending
+        self.retention = retention
+        self.start_method = start_method
+
+        self._executor = None
+        self._executor_pid = None
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_environment(cls):
+        return cls(
+            max_workers=int(os.environ.get('ANALYSIS_JOB_WORKERS', 0)) or None,
+            timeout=float(os.environ.get('ANALYSIS_JOB_TIMEOUT', 600)),
+            max_pending=int(os.environ.get('ANALYSIS_JOB_MAX_PENDING', 32)),
+            retention=float(os.environ.get('ANALYSIS_JOB_RETENTION', 3600)),
+            start_method=os.environ.get('ANALYSIS_JOB_START_METHOD', 'spawn'),
+        )
+
+    def submit(self, task, timeout=None):
+        """
+        Queues an analysis task and returns its job ID.
+
+        :param task: A prepared AnalysisTask.
+        :param timeout: Timeout in seconds for this job, overriding the queue default.
+        :return: The job ID.
+        :raises JobQueueFullError: If the maximum number of unfinished jobs has been reached.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        job = AnalysisJob(uuid.uuid4().hex, task, timeout or None)
+
+        with self._lock:
+            self._forget_expired()
+            unfinished = sum(1 for queued in self._jobs.values() if self._occupies_pool(queued))
+            if unfinished >= self.max_pending:
+                raise JobQueueFullError(f"The job queue is full ({self.max_pending} unfinished jobs).")
+            self._jobs[job.job_id] = job
+
+        cached = task.cached_result()
+        if cached is not None:
+            job.result = task.assemble(cached)
+            job.state = COMPLETED
+            job.started_at = job.finished_at = time.time()
+            return job.job_id
+
+        job.future = self._get_executor().submit(run_with_timeout, task.function, task.args, job.timeout)
+        return job.job_id
+
+    def status(self, job_id):
+        """
+        Returns the status of a job as a dictionary, or None for an unknown job.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            self._refresh(job)
+            return job.to_dict()
+
+    def result(self, job_id):
+        """
+        Returns the status of a job and, once it has completed, its assembled response.
+
+        :param job_id: The job ID returned by 'submit'.
+        :return: A tuple of the status dictionary and the response (None until completed), or None for an unknown job.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            state = self._refresh(job)
+            if state == COMPLETED and job.result is None:
+                try:
+                    job.result = job.task.complete(job.future.result())
+                except Exception as e:
+                    logger.exception(f"Analysis job {job_id} failed")
+                    job.state, job.error = FAILED, str(e)
+            return job.to_dict(), job.result
+
+    def cancel(self, job_id):
+        """
+        Cancels a job. Pending jobs never start; the result of a running job is discarded, and the job counts towards
+        'max_pending' until its worker finishes.
+
+        :return: The status dictionary after cancelling, or None for an unknown job.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if self._refresh(job) in (PENDING, RUNNING):
+                if job.future is not None:
+                    job.future.cancel()
+                job.state = CANCELLED
+                job.finished_at = time.time()
+            return job.to_dict()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _get_executor(self):
+        with self._lock:
+            # A pool inherited through fork belongs to the parent process, and a broken pool (a worker died) rejects
+            # every submission, so both are replaced by a fresh pool.
+            if self._executor is None or self._executor_pid != os.getpid() or getattr(self._executor, '_broken', False):
+                context = multiprocessing.get_context(self.start_method)
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def _refresh(self, job):
+        if job.state in FINISHED_STATES or job.future is None:
+            return job.state
+
+        future = job.future
+        if future.running() and job.started_at is None:
+            job.started_at = time.time()
+            job.state = RUNNING
+
+        if future.done():
+            job.finished_at = time.time()
+            if job.started_at is None:
+                job.started_at = job.finished_at
+            try:
+                error = future.exception()
+            except CancelledError:
+                job.state = CANCELLED
+                return job.state
+
+            if error is None:
+                job.state = COMPLETED
+            elif isinstance(error, JobTimeoutError):
+                job.state, job.error = TIMED_OUT, f"The analysis did not finish within {job.timeout:g} seconds."
+            else:
+                job.state, job.error = FAILED, str(error)
+
+        return job.state
+
+    def _occupies_pool(self, job):
+        # A cancelled job whose worker is still running holds a worker until it finishes or times out.
+        return self._refresh(job) not in FINISHED_STATES or (job.future is not None and not job.future.done())
+
+    def _forget_expired(self):
+        now = time.time()
+        for job_id in [job_id for job_id, job in self._jobs.items()
+                       if job.finished_at is not None and now - job.finished_at > self.retention
+                       and not (job.future is not None and not job.future.done())]:
+            del self._jobs[job_id]
+
+job_queue = JobQueue.from_environment()
@@ -1,55 +1,284 @@
 """
 Table Data Validator
 
-This function validates the format and content of a data table used in the application.
+These functions validate the format and content of a data table used in the application, reporting every problem found
+in a single pass instead of stopping at the first one.
 
 Validation Rules:
 - The cell at [0][0] (top-left corner) must be empty.
 - The first row (excluding the first cell) should contain headers with alphanumeric characters or specific symbols (-, _, *, $, #).
 - The first column (excluding the first cell) should contain row headers fitting the same criteria as above.
-- All other cells should contain numeric values, ensuring they can be processed as part of analyses.
+- Every row must contain as many cells as the header row.
+- All other cells should contain finite numeric values, ensuring they can be processed as part of analyses.
+- Algorithm names and benchmark names must be unique.
+- A benchmark whose results are the same for every algorithm is reported as a warning, since it cannot separate the
+  algorithms; it does not fail validation.
 
-Parameters:
-- data: A 2D NumPy array representing the table data to be validated.
+Implementation:
+- Names are checked with a precompiled pattern, and the numeric block is parsed with one NumPy conversion. Cells are
+  parsed one by one only in rows where the bulk conversion fails, to locate the offending cells.
+- Problems are collected as dictionaries with 'severity' ('error' or 'warning'), 'code', 'message', 'row' and 'column',
+  counted like the table (row 0 and column 0 hold the names); 'row' or 'column' is None for problems of a whole
+  column or row.
+- Collection stops after 'max_errors' problems (default EXPERIMENT_VALIDATION_MAX_ERRORS, 100).
 
-Returns:
-- True if the validation passes without any errors.
+Functions:
+- collect_table_issues(data, max_errors=None): Returns the list of problems of a table.
+- collect_run_table_issues(data, max_errors=None): Returns the problems of a table whose cells hold lists of run results
+  (the same shape and name checks, then empty, non-numeric and non-finite runs).
+- collect_matrix_issues(experiment_matrix, max_errors=None): Returns the problems of an already parsed ExperimentMatrix
+  (non-finite values, duplicate names and constant benchmarks), e.g. of a streamed upload.
+- has_errors(issues): Whether any collected problem is an error rather than a warning.
+- validate_table_data(data, max_errors=None): Returns True, or raises ExperimentValidationError listing every error.
+- validate_run_table(data, max_errors=None): The same for a table of run results.
 
 Raises:
-- ValueError: If any of the validation rules are violated, with a message indicating the specific issue and cell location.
+- ExperimentValidationError: A ValueError whose message is the first error and whose 'issues' hold all collected problems.
 
 Usage:
-- Call this function to validate data tables before processing or storing them in the database.
+- Call 'validate_table_data' to validate data tables before processing or storing them in the database.
 - Ensures that the table data adheres to a consistent format, facilitating reliable analysis and processing.
 
 Example:
 try:
     validate_table_data(data)
-except ValueError as e:
-    print(f"Validation error: {e}")
+except ExperimentValidationError as e:
+    print(f"Validation errors: {e.issues}")
 """
 
+import os
 import re
+import numpy as np
 
-def validate_table_data(data):
-    if data[0, 0]:
-        raise ValueError("Cell [0][0] must be empty.")
+NAME_PATTERN = re.compile(r"^[a-zA-Z0-9\-_*#$]+$")
+NAME_MESSAGE = "must be alphanumeric or contain any of these symbols: -, _, *, $, #, and non-empty."
+MAX_ERRORS = int(os.environ.get('EXPERIMENT_VALIDATION_MAX_ERRORS', 100))
 
-    rows, cols = data.shape
+ERROR = 'error'
+WARNING = 'warning'
 
-    for j in range(1, cols):
-        if not data[0, j] or not re.match("^[a-zA-Z0-9\-_*#$]+$", data[0, j]):
-            raise ValueError(f"Cell [0][{j}] must be alphanumeric or contain any of these symbols: -, _, *, $, #, and non-empty.")
+class ExperimentValidationError(ValueError):
 
-    for i in range(1, rows):
-        if not data[i, 0] or not re.match("^[a-zA-Z0-9\-_*#$]+$", data[i, 0]):
-            raise ValueError(f"Cell [{i}][0] must be alphanumeric or contain any of these symbols: -, _, *, $, #, and non-empty.")
+    def __init__(self, issues, truncated=False):
+        errors = [issue for issue in issues if issue['severity'] == ERROR]
+        super().__init__(errors[0]['message'] if errors else "The experiment data is invalid.")
+        self.issues = issues
+        self.truncated = truncated
+
+    def to_dict(self):
+        return {'error': str(self), 'issues': self.issues, 'truncated': self.truncated}
+
+class _IssueCollector:
+
+    def __init__(self, max_errors):
+        self.max_errors = MAX_ERRORS if max_errors is None else max_errors
+        self.issues = []
+        self.truncated = False
+
+    @property
+    def full(self):
+        return len(self.issues) >= self.max_errors
+
+    def add(self, code, message, row=None, column=None, severity=ERROR):
+        if self.full:
+            self.truncated = True
+            return
+        self.issues.append({'severity': severity, 'code': code, 'message': message,
+                            'row': None if row is None else int(row), 'column': None if column is None else int(column)})
+
+def _is_valid_name(name):
+    return isinstance(name, str) and NAME_PATTERN.match(name) is not None
+
+def _check_names(collector, names, cells):
+    for name, (row, column) in zip(names, cells):
+        if not _is_valid_name(name):
+            collector.add('invalid_name', f"Cell [{row}][{column}] {NAME_MESSAGE}", row, column)
+
+def _check_duplicates(collector, label, names, cells):
+    first_seen = {}
+    for name, (row, column) in zip(names, cells):
+        if name in first_seen:
+            first_row, first_column = first_seen[name]
+            collector.add(f'duplicate_{label}', f"Cell [{row}][{column}] repeats the {label} name '{name}' "
+                          f"of cell [{first_row}][{first_column}].", row, column)
+        else:
+            first_seen[name] = (row, column)
+
+def _check_values(collector, values, row_numbers, invalid=None):
+    """
+    Reports non-finite values and constant benchmarks of a parsed numeric block. 'row_numbers' maps the rows of 'values'
+    to table rows; cells flagged in 'invalid' were already reported as not numeric and are skipped.
+    """
+    invalid = np.zeros(values.shape, dtype=bool) if invalid is None else invalid
+
+    for i, j in zip(*np.nonzero(~np.isfinite(values) & ~invalid)):
+        if collector.full:
+            collector.truncated = True
+            return
+        row = row_numbers[i]
+        collector.add('non_finite', f"Cell [{row}][{j + 1}] must be finite, not {values[i, j]}.", row, j + 1)
+
+    if values.shape[0] > 1:
+        constant = np.all(values == values[0], axis=0) & ~invalid.any(axis=0)
+        for j in np.flatnonzero(constant):
+            collector.add('constant_benchmark', f"Column {j + 1} has the same result for every algorithm and "
+                          "cannot distinguish between them.", None, j + 1, severity=WARNING)
+
+def _parse_rows(collector, body, row_numbers):
+    """
+    Converts the numeric cells of equally long rows in bulk, falling back to per-cell parsing only in rows that fail.
+
+    :return: The float64 block and a mask of the cells that are not numeric, which are reported and left as NaN.
+    """
+    values = np.empty((len(body), len(body[0])), dtype=np.float64)
+    invalid = np.zeros(values.shape, dtype=bool)
+    try:
+        values[:] = np.array(body, dtype=np.float64)
+        failed_rows = []
+    except (TypeError, ValueError):
+        failed_rows = range(len(body))
+
+    for i in failed_rows:
+        try:
+            values[i] = np.array(body[i], dtype=np.float64)
+            continue
+        except (TypeError, ValueError):
+            pass
+        for j, cell in enumerate(body[i]):
+            try:
+                values[i, j] = float(cell)
+            except (TypeError, ValueError):
+                values[i, j] = np.nan
+                invalid[i, j] = True
+
+    # NumPy converts None to NaN without complaint, so missing cells are located among the NaN values.
+    for i, j in zip(*np.nonzero(np.isnan(values) & ~invalid)):
+        if body[i][j] is None:
+            invalid[i, j] = True
+
+    for i, j in zip(*np.nonzero(invalid)):
+        if collector.full:
+            collector.truncated = True
+            break
+        collector.add('not_numeric', f"Cell [{row_numbers[i]}][{j + 1}] must be numeric.", row_numbers[i], j + 1)
+
+    return values, invalid
+
+def _check_layout(collector, data):
+    """
+    Reports the problems of the table's shape and names: the corner cell, the row lengths, and invalid or repeated
+    algorithm and benchmark names.
+
+    :return: The indices of the rows as long as the header row, or None for a table without a header row.
+    """
+    if not data or not data[0]:
+        collector.add('empty', "The table must contain a header row.", 0)
+        return None
+
+    if data[0][0]:
+        collector.add('corner_not_empty', "Cell [0][0] must be empty.", 0, 0)
 
+    rows, cols = len(data), len(data[0])
+    if cols < 2 or rows < 2:
+        collector.add('empty', "The table must contain at least one algorithm and one benchmark.")
+
+    complete_rows = []
     for i in range(1, rows):
-        for j in range(1, cols):
+        if len(data[i]) != cols:
+            collector.add('row_length', f"Row {i} must contain {cols} cells.", i)
+        else:
+            complete_rows.append(i)
+
+    benchmark_cells = [(0, j) for j in range(1, cols)]
+    algorithm_cells = [(i, 0) for i in range(1, rows)]
+    benchmark_names = data[0][1:]
+    algorithm_names = [data[i][0] if data[i] else None for i in range(1, rows)]
+
+    _check_names(collector, benchmark_names, benchmark_cells)
+    _check_names(collector, algorithm_names, algorithm_cells)
+    _check_duplicates(collector, 'benchmark', [str(name).strip() for name in benchmark_names], benchmark_cells)
+    _check_duplicates(collector, 'algorithm', [str(name).strip() for name in algorithm_names], algorithm_cells)
+
+    return complete_rows
+
+def collect_table_issues(data, max_errors=None):
+    """
+    Collects the problems of a data table, such as 'experimentData', in a single pass.
+
+    :param data: A list of lists representing the table data, with the header row first.
+    :param max_errors: Maximum number of problems to collect (default 'EXPERIMENT_VALIDATION_MAX_ERRORS').
+    :return: A tuple of the list of problems and whether the list was truncated.
+    """
+    collector = _IssueCollector(max_errors)
+
+    complete_rows = _check_layout(collector, data)
+    if complete_rows and len(data[0]) > 1:
+        values, invalid = _parse_rows(collector, [data[i][1:] for i in complete_rows], complete_rows)
+        _check_values(collector, values, complete_rows, invalid)
+
+    return collector.issues, collector.truncated
+
+def collect_run_table_issues(data, max_errors=None):
+    """
+    Collects the problems of a table of run results, such as 'experimentRuns', whose cells hold lists of run results
+    (a single number is one run): the checks of the table's shape and names, empty cells, and run results that are
+    not numeric or not finite. The aggregated results are checked with 'collect_matrix_issues' afterwards.
+
+    :param data: A list of lists representing the table, with the header row first.
+    :param max_errors: Maximum number of problems to collect (default 'EXPERIMENT_VALIDATION_MAX_ERRORS').
+    :return: A tuple of the list of problems and whether the list was truncated.
+    """
+    collector = _IssueCollector(max_errors)
+
+    for i in _check_layout(collector, data) or []:
+        for j, cell in enumerate(data[i][1:], start=1):
+            if collector.full:
+                collector.truncated = True
+                return collector.issues, collector.truncated
+            runs = cell if isinstance(cell, (list, tuple)) else [cell]
             try:
-                float(data[i, j])
-            except ValueError:
-                raise ValueError(f"Cell [{i}][{j}] must be numeric.")
+                values = [float(value) for value in runs]
+            except (TypeError, ValueError):
+                collector.add('not_numeric', f"Cell [{i}][{j}] must hold numeric run results.", i, j)
+                continue
+            if not values:
+                collector.add('no_runs', f"Cell [{i}][{j}] must hold at least one run result.", i, j)
+            elif not all(np.isfinite(values)):
+                collector.add('non_finite', f"Cell [{i}][{j}] must hold finite run results.", i, j)
+
+    return collector.issues, collector.truncated
+
+def collect_matrix_issues(experiment_matrix, max_errors=None):
+    """
+    Collects the problems of a parsed ExperimentMatrix whose names and cells are already known to be well formed,
+    such as a streamed upload: non-finite values, duplicate names and constant benchmarks.
+
+    :param experiment_matrix: An ExperimentMatrix.
+    :param max_errors: Maximum number of problems to collect (default 'EXPERIMENT_VALIDATION_MAX_ERRORS').
+    :return: A tuple of the list of problems and whether the list was truncated.
+    """
+    collector = _IssueCollector(max_errors)
+    algorithm_count, benchmark_count = experiment_matrix.shape
+
+    _check_duplicates(collector, 'benchmark', experiment_matrix.benchmark_names, [(0, j) for j in range(1, benchmark_count + 1)])
+    _check_duplicates(collector, 'algorithm', experiment_matrix.algorithm_names, [(i, 0) for i in range(1, algorithm_count + 1)])
+    _check_values(collector, experiment_matrix.values, range(1, algorithm_count + 1))
+
+    return collector.issues, collector.truncated
+
+def has_errors(issues):
+    return any(issue['severity'] == ERROR for issue in issues)
+
+def validate_table_data(data, max_errors=None):
+    issues, truncated = collect_table_issues(data, max_errors)
+    if has_errors(issues):
+        raise ExperimentValidationError(issues, truncated)
+
+    return True
+
+def validate_run_table(data, max_errors=None):
+    issues, truncated = collect_run_table_issues(data, max_errors)
+    if has_errors(issues):
+        raise ExperimentValidationError(issues, truncated)
 
     return True
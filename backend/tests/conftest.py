@@ -0,0 +1,12 @@
+import pytest
+from app.app import create_app
+
+
+@pytest.fixture
+def app():
+    return create_app()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+from scipy.stats import rankdata, studentized_range
+from statsmodels.stats.multitest import multipletests
+from app.services.stats.posthoc import all_pairs_posthoc, holm_adjust, studentized_range_sf
+from app.services.stats.posthoc.nemenyi import INTERPOLATION_THRESHOLD
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("m", [1, 2, 10, 190])
+def test_holm_adjust_matches_statsmodels(seed, m):
+    rng = np.random.default_rng(seed)
+    p_values = rng.uniform(0, 0.2, m) ** 2
+    p_values[: m // 3] = p_values[0]  # ties
+
+    _, expected, _, _ = multipletests(p_values, method="holm")
+    np.testing.assert_allclose(holm_adjust(p_values), expected, rtol=1e-12, atol=0)
+
+
+@pytest.mark.parametrize("k", [2, 3, 5, 10, 30])
+def test_studentized_range_sf_matches_scipy(k):
+    q = np.linspace(0.0, 8.0, 41)
+    np.testing.assert_allclose(studentized_range_sf(q, k), studentized_range.sf(q, k, np.inf), atol=1e-6)
+
+
+def test_studentized_range_sf_interpolated_matches_scipy():
+    k = 8
+    q = np.random.default_rng(0).uniform(0.0, 7.0, INTERPOLATION_THRESHOLD + 1)
+    expected = studentized_range.sf(q[:200], k, np.inf)
+    np.testing.assert_allclose(studentized_range_sf(q, k)[:200], expected, atol=1e-6)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_all_pairs_posthoc_matches_reference(seed):
+    k, n = 6, 15
+    values = np.random.default_rng(seed).normal(np.arange(k)[:, None] * 0.4, 1.0, (k, n))
+    mean_ranks = rankdata(values, axis=0).mean(axis=1)
+
+    result = all_pairs_posthoc(mean_ranks, n, 0.05)
+
+    # Nemenyi: q = |R̄ᵢ - R̄ⱼ| / √(k(k + 1) / 12n) against the studentized range with infinite degrees of freedom.
+    q = np.abs(mean_ranks[result.first] - mean_ranks[result.second]) / np.sqrt(k * (k + 1) / (12.0 * n))
+    np.testing.assert_allclose(result.nemenyi_p_value, studentized_range.sf(q, k, np.inf), atol=1e-6)
+    _, expected_holm, _, _ = multipletests(result.p_value, method="holm")
+    np.testing.assert_allclose(result.holm_p_value, expected_holm, rtol=1e-12, atol=0)
@@ -0,0 +1,133 @@
+import os
+import numpy as np
+import pytest
+from app.util.cache import analysis_cache as cache_module
+from app.util.cache.analysis_cache import AnalysisCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module.time, 'time', clock)
+    return clock
+
+
+def _files(directory):
+    return sorted(os.listdir(directory))
+
+
+def test_memory_tier_evicts_the_least_recently_used_entry(clock):
+    cache = AnalysisCache(max_entries=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+    stats = cache.stats()
+    assert (stats['memory_hits'], stats['disk_hits'], stats['misses'], stats['evictions']) == (3, 0, 1, 1)
+    assert stats['memory_entries'] == 2 and stats['hit_rate'] == 0.75 and not stats['disk_enabled']
+
+
+def test_entries_expire_after_max_age(clock):
+    cache = AnalysisCache(max_age=10)
+    cache.put('a', 1)
+    clock.now += 10
+    assert cache.get('a') == 1
+    clock.now += 10.5
+    assert cache.get('a') is None
+    assert cache.stats()['memory_entries'] == 0
+
+
+def test_get_or_compute_computes_once(clock):
+    cache = AnalysisCache()
+    calls = []
+    compute = lambda: calls.append(1) or {'value': 1}
+
+    assert cache.get_or_compute('a', compute) == {'value': 1}
+    assert cache.get_or_compute('a', compute) == {'value': 1}
+    assert len(calls) == 1
+
+
+def test_fresh_results_and_both_tiers_return_the_same_types(clock, tmp_path):
+    value = (np.arange(3, dtype=np.float64), [('x', np.int64(2))], {'alpha': np.float64(0.05)})
+    expected = [[0.0, 1.0, 2.0], [['x', 2]], {'alpha': 0.05}]
+
+    writer = AnalysisCache(cache_dir=str(tmp_path))
+    fresh = writer.get_or_compute('key', lambda: value)
+    memory_hit = writer.get('key')
+    disk_hit = AnalysisCache(cache_dir=str(tmp_path)).get('key')
+
+    for result in (fresh, memory_hit, disk_hit):
+        assert result == expected
+        assert type(result) is list and type(result[0][0]) is float and type(result[1][0][1]) is int
+
+
+def test_disk_tier_is_shared_and_counted(clock, tmp_path):
+    AnalysisCache(cache_dir=str(tmp_path)).put('key', {'a': [1, 2]})
+    assert _files(tmp_path) == ['key.json']
+
+    reader = AnalysisCache(cache_dir=str(tmp_path))
+    assert reader.get('key') == {'a': [1, 2]}
+    assert reader.get('key') == {'a': [1, 2]}
+    stats = reader.stats()
+    assert (stats['memory_hits'], stats['disk_hits'], stats['misses']) == (1, 1, 0) and stats['disk_enabled']
+
+
+def test_disk_tier_drops_expired_and_unreadable_entries(clock, tmp_path):
+    cache = AnalysisCache(max_entries=0, max_age=10, cache_dir=str(tmp_path))
+    cache.put('old', 1)
+    os.utime(tmp_path / 'old.json', (clock.now - 20, clock.now - 20))
+    (tmp_path / 'broken.json').write_text('{not json', encoding='utf-8')
+
+    assert cache.get('old') is None and cache.get('broken') is None
+    assert _files(tmp_path) == []
+    assert cache.stats()['misses'] == 2
+
+
+def test_disk_tier_evicts_the_oldest_entries_beyond_its_size(clock, tmp_path):
+    cache = AnalysisCache(max_entries=0, cache_dir=str(tmp_path), max_disk_bytes=250)
+    for age, key in enumerate(['c', 'b', 'a']):
+        cache.put(key, 'x' * 100)
+        os.utime(tmp_path / f'{key}.json', (clock.now - 10 + age, clock.now - 10 + age))
+    cache.put('d', 'x' * 100)
+
+    # Each entry takes 102 bytes, so only the two newest fit.
+    assert _files(tmp_path) == ['a.json', 'd.json']
+    assert cache.stats()['evictions'] == 2
+
+
+def test_failed_disk_write_leaves_no_temporary_file(clock, tmp_path, monkeypatch):
+    cache = AnalysisCache(cache_dir=str(tmp_path))
+
+    def fail(source, destination):
+        raise OSError("disk full")
+    monkeypatch.setattr(cache_module.os, 'replace', fail)
+
+    assert cache.put('key', [1, 2]) == [1, 2]
+    assert _files(tmp_path) == []
+    assert cache.get('key') == [1, 2]
+
+
+def test_unserialisable_results_are_returned_uncached(clock, tmp_path):
+    cache = AnalysisCache(cache_dir=str(tmp_path))
+    value = {'handle': object()}
+
+    assert cache.get_or_compute('key', lambda: value) is value
+    assert _files(tmp_path) == [] and cache.get('key') is None
+
+
+def test_clear_empties_both_tiers(clock, tmp_path):
+    cache = AnalysisCache(cache_dir=str(tmp_path))
+    cache.put('a', 1)
+    cache.clear()
+    assert cache.get('a') is None and _files(tmp_path) == []
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+from app.constants.optimization_mode import OptimizationMode
+from app.services.stats.util.ranking import rank_columns
+from app.services.stats.resampling import bootstrap, pool
+from app.services.stats.resampling.bootstrap import bootstrap_mean_ranks, BootstrapOptions
+
+
+@pytest.fixture
+def workers(monkeypatch):
+    def use(count):
+        monkeypatch.setattr(pool, 'WORKERS', count)
+        monkeypatch.setattr(bootstrap, 'PARALLEL_MIN_CELLS', 0)
+    yield use
+    if pool._executor is not None:
+        pool._executor.shutdown()
+        pool._executor = None
+
+
+def _rank_matrix(seed, k=6, n=20):
+    values = np.random.default_rng(seed).integers(0, 5, size=(k, n))
+    return rank_columns(values)[0]
+
+
+@pytest.mark.parametrize("mode", [OptimizationMode.MINIMIZE, OptimizationMode.MAXIMIZE])
+def test_intervals_do_not_depend_on_the_worker_count(workers, mode):
+    rank_matrix = _rank_matrix(0)
+    # Four full chunks and a partial one, so the pool gets more chunks than workers.
+    options = BootstrapOptions(4 * bootstrap.CHUNK_REPLICATES + 500, 7, 0.9)
+
+    workers(1)
+    serial = bootstrap_mean_ranks(rank_matrix, options, mode)
+    workers(4)
+    parallel = bootstrap_mean_ranks(rank_matrix, options, mode)
+
+    assert serial.workers == 1 and parallel.workers == 4
+    for field in ('mean_rank_lower', 'mean_rank_upper', 'position_lower', 'position_upper'):
+        np.testing.assert_array_equal(getattr(serial, field), getattr(parallel, field))
+
+
+def test_intervals_depend_on_the_seed(workers):
+    workers(1)
+    rank_matrix = _rank_matrix(1)
+    first = bootstrap_mean_ranks(rank_matrix, BootstrapOptions(2000, 1, 0.95), OptimizationMode.MINIMIZE)
+    again = bootstrap_mean_ranks(rank_matrix, BootstrapOptions(2000, 1, 0.95), OptimizationMode.MINIMIZE)
+    other = bootstrap_mean_ranks(rank_matrix, BootstrapOptions(2000, 2, 0.95), OptimizationMode.MINIMIZE)
+
+    np.testing.assert_array_equal(first.mean_rank_lower, again.mean_rank_lower)
+    assert not np.array_equal(np.concatenate([first.mean_rank_lower, first.mean_rank_upper]),
+                              np.concatenate([other.mean_rank_lower, other.mean_rank_upper]))
+
+
+def test_intervals_bracket_the_observed_mean_ranks(workers):
+    workers(1)
+    rank_matrix = _rank_matrix(2)
+    result = bootstrap_mean_ranks(rank_matrix, BootstrapOptions(3000, 0, 0.95), OptimizationMode.MINIMIZE)
+
+    mean_ranks = rank_matrix.mean(axis=1)
+    assert np.all(result.mean_rank_lower <= mean_ranks) and np.all(mean_ranks <= result.mean_rank_upper)
+    assert np.all(result.position_lower >= 1) and np.all(result.position_upper <= rank_matrix.shape[0])
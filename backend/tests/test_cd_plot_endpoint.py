@@ -0,0 +1,71 @@
+import xml.etree.ElementTree as ElementTree
+import pytest
+from app.util.cache.analysis_cache import AnalysisCache
+from app.util.graphs import cd_plot_store
+
+EXPERIMENT = [['', 'f1', 'f2', 'f3', 'f4', 'f5', 'f6'],
+              ['A1', 1.0, 2.0, 1.5, 3.0, 2.5, 1.0],
+              ['A2', 2.0, 3.5, 2.5, 4.0, 3.0, 2.5],
+              ['A3', 3.0, 3.0, 4.0, 5.0, 4.5, 3.5],
+              ['A4', 4.0, 5.0, 3.5, 6.0, 5.5, 4.0]]
+
+
+@pytest.fixture
+def worker_store(monkeypatch, tmp_path):
+    """Replaces the plot store with a fresh one, as a newly started gunicorn worker would have."""
+    def start(cache_dir):
+        monkeypatch.setattr(cd_plot_store, 'plot_store', AnalysisCache(cache_dir=cache_dir))
+    return start
+
+
+def _plot_ids(client):
+    response = client.post('/api/analysis/all', json={
+        'analysisType': 'all', 'experimentData': EXPERIMENT, 'experimentName': 'plots', 'experimentDescription': '',
+        'alpha': 0.05, 'optimizationMode': 'minimize', 'selectedRows': []})
+    assert response.status_code == 201, response.get_json()
+    return [plot['plotId'] for plot in response.get_json()['result']['cdPlotData']]
+
+
+def test_plot_handle_round_trip(client, worker_store):
+    worker_store(None)
+    plot_id = _plot_ids(client)[0]
+
+    svg = client.get(f'/api/analysis/plots/{plot_id}')
+    assert svg.status_code == 200 and svg.mimetype == 'image/svg+xml'
+    assert ElementTree.fromstring(svg.data).tag.endswith('svg')
+
+    png = client.get(f'/api/analysis/plots/{plot_id}?format=png&width=4&height=2&dpi=50')
+    assert png.status_code == 200 and png.mimetype == 'image/png' and png.data.startswith(b'\x89PNG')
+
+    data = client.get(f'/api/analysis/plots/{plot_id}?format=json').get_json()
+    assert data['mimeType'] == 'image/svg+xml' and data['imageData']
+
+
+def test_unknown_plot_handle_is_not_found(client, worker_store):
+    worker_store(None)
+    response = client.get('/api/analysis/plots/0123456789abcdef')
+    assert response.status_code == 404
+    assert 'Unknown or expired plot' in response.get_json()['error']
+
+
+@pytest.mark.parametrize('query', ['width=abc', 'dpi=0', 'height=51', 'format=gif'])
+def test_invalid_plot_options_are_rejected(client, worker_store, query):
+    worker_store(None)
+    plot_id = _plot_ids(client)[0]
+    assert client.get(f'/api/analysis/plots/{plot_id}?{query}').status_code == 400
+
+
+def test_plot_handles_resolve_in_another_worker_with_a_shared_cache_dir(client, worker_store, tmp_path):
+    worker_store(str(tmp_path))
+    plot_ids = _plot_ids(client)
+
+    worker_store(str(tmp_path))
+    assert all(client.get(f'/api/analysis/plots/{plot_id}').status_code == 200 for plot_id in plot_ids)
+
+
+def test_plot_handles_are_local_to_a_worker_without_a_cache_dir(client, worker_store):
+    worker_store(None)
+    plot_id = _plot_ids(client)[0]
+
+    worker_store(None)
+    assert client.get(f'/api/analysis/plots/{plot_id}').status_code == 404
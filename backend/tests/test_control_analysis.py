@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from scipy.stats import rankdata
+from app.constants.optimization_mode import OptimizationMode
+from app.util.conversion.experiment_matrix import ExperimentMatrix
+from app.services.analysis.analyse_control import perform_control_analysis
+
+NAMES = ['A', 'B', 'C', 'D', 'E']
+
+
+def _matrix(seed=0):
+    # Distinct shifts give every algorithm a different mean rank, so a wrong control row changes every z-value.
+    rng = np.random.default_rng(seed)
+    values = rng.normal(size=(len(NAMES), 12)) + np.array([0.0, 1.5, 0.5, 2.5, 1.0]).reshape(-1, 1)
+    return ExperimentMatrix(NAMES, [f"B{j}" for j in range(values.shape[1])], values)
+
+
+def _mean_ranks(matrix):
+    return dict(zip(NAMES, np.mean([rankdata(column) for column in matrix.values.T], axis=0)))
+
+
+@pytest.mark.parametrize("selected_row", range(len(NAMES)))
+def test_z_values_compare_the_selected_control(selected_row):
+    matrix = _matrix()
+    k, n = matrix.shape
+    mean_ranks = _mean_ranks(matrix)
+    control = NAMES[selected_row]
+
+    _, table, description, _ = perform_control_analysis(matrix, selected_row, OptimizationMode.MINIMIZE, 0.05)
+
+    assert description['control_algorithm'] == control
+    standard_error = np.sqrt(k * (k + 1) / (6.0 * n))
+    rows = {row[0]: row for row in table[1:]}
+    assert set(rows) == {f"{control} vs {name}" for name in NAMES if name != control}
+    for name in NAMES:
+        if name != control:
+            z = (mean_ranks[control] - mean_ranks[name]) / standard_error
+            assert float(rows[f"{control} vs {name}"][1]) == pytest.approx(z, abs=5e-6)
+
+
+@pytest.mark.parametrize("selected_row", [1, 3])
+def test_cd_plot_ranks_follow_the_algorithm_names(selected_row):
+    matrix = _matrix(1)
+    mean_ranks = _mean_ranks(matrix)
+    control = NAMES[selected_row]
+
+    _, _, _, cd_plot_specs = perform_control_analysis(matrix, selected_row, OptimizationMode.MINIMIZE, 0.05)
+    spec = cd_plot_specs[0]
+
+    assert spec['algorithms'] == [control] + [name for name in NAMES if name != control]
+    assert spec['ranks'] == pytest.approx([mean_ranks[name] for name in spec['algorithms']], rel=1e-12)
+
+    # Only the control's pairs are tested, so every other cell of the significance matrix stays at 1.
+    sig_matrix = np.array(spec['sigMatrix'])
+    assert np.all(sig_matrix[1:, 1:] == 1.0)
+    assert np.all(sig_matrix[0, 1:] == sig_matrix[1:, 0])
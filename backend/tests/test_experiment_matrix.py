@@ -0,0 +1,127 @@
+import json
+
+import numpy as np
+import pytest
+from app.util.conversion.experiment_matrix import ExperimentMatrix, MATRIX_MAGIC, _HEADER
+from app.db.helpers import matrix_store
+
+
+def _matrix(algorithm_names, benchmark_names, seed=0):
+    values = np.random.default_rng(seed).normal(size=(len(algorithm_names), len(benchmark_names)))
+    return ExperimentMatrix(algorithm_names, benchmark_names, values)
+
+
+def _assert_same(restored, matrix):
+    assert restored.algorithm_names == matrix.algorithm_names
+    assert restored.benchmark_names == matrix.benchmark_names
+    np.testing.assert_array_equal(restored.values, matrix.values)
+
+
+@pytest.mark.parametrize("name_length", range(8))
+def test_bytes_round_trip_pads_the_values_to_eight_bytes(name_length):
+    # Growing one name a byte at a time walks the names through every padding length.
+    matrix = _matrix(['x' * name_length, 'B'], ['P1', 'P2', 'P3'])
+    data = matrix.to_bytes()
+
+    names_length = len(json.dumps([matrix.algorithm_names, matrix.benchmark_names]).encode('utf-8'))
+    offset = len(data) - matrix.values.size * 8
+    assert offset % 8 == 0
+    assert 0 <= offset - _HEADER.size - names_length < 8
+    assert data[_HEADER.size + names_length:offset] == b'\0' * (offset - _HEADER.size - names_length)
+
+    _assert_same(ExperimentMatrix.from_bytes(data), matrix)
+
+
+def test_bytes_round_trip_keeps_unicode_names():
+    # Multi-byte characters make the byte length of the names differ from their character count.
+    matrix = _matrix(['Algorithme à ranger', '遗传算法', 'Ωmega 🚀'], ['Función', 'ベンチ', 'quote " and \\ slash'])
+    data = matrix.to_bytes()
+
+    assert 'Ωmega 🚀'.encode('utf-8') in data
+    _assert_same(ExperimentMatrix.from_bytes(data), matrix)
+
+
+def test_bytes_round_trip_keeps_special_values_and_empty_shapes():
+    values = np.array([[np.nan, np.inf], [-np.inf, -0.0]])
+    restored = ExperimentMatrix.from_bytes(ExperimentMatrix(['A', 'B'], ['P1', 'P2'], values).to_bytes())
+    np.testing.assert_array_equal(restored.values, values)
+    assert np.signbit(restored.values[1, 1])
+
+    empty = ExperimentMatrix(['A', 'B'], [], np.empty((2, 0)))
+    _assert_same(ExperimentMatrix.from_bytes(empty.to_bytes()), empty)
+
+
+def test_from_bytes_wraps_a_bytea_value_without_copying():
+    matrix = _matrix(['A', 'B', 'C'], ['P1', 'P2'])
+    restored = ExperimentMatrix.from_bytes(memoryview(matrix.to_bytes()))
+
+    assert restored.values.flags.c_contiguous
+    assert not restored.values.flags.writeable
+    _assert_same(restored, matrix)
+
+
+def test_from_bytes_rejects_other_data():
+    data = bytearray(_matrix(['A', 'B'], ['P1']).to_bytes())
+    data[:4] = b'NOPE'
+    with pytest.raises(ValueError):
+        ExperimentMatrix.from_bytes(bytes(data))
+
+    data[:4] = MATRIX_MAGIC
+    data[4] = 99
+    with pytest.raises(ValueError):
+        ExperimentMatrix.from_bytes(bytes(data))
+
+
+class FakeCursor:
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def fetchall(self):
+        return self.rows
+
+
+class FakeDatabase:
+
+    def __init__(self, rows):
+        self.cur = FakeCursor(rows)
+        self.queries = []
+
+    def execute_query(self, query, params=None):
+        self.queries.append((query, params))
+
+
+def _column_row(name, values):
+    return {'benchmark_name': name, 'column_values': np.asarray(values, dtype='<f8').tobytes()}
+
+
+def test_with_appended_columns_returns_the_block_when_nothing_was_appended():
+    matrix = _matrix(['A', 'B'], ['P1', 'P2'])
+    db = FakeDatabase([])
+
+    assert matrix_store._with_appended_columns(db, 7, matrix) is matrix
+    assert db.queries[0][1] == (7,)
+
+
+def test_with_appended_columns_places_columns_after_the_block_in_position_order():
+    matrix = _matrix(['A', 'B', 'C'], ['P1', 'P2'])
+    # The query orders the rows by position, so they arrive in the order they must take.
+    db = FakeDatabase([_column_row('P3', [1.0, 2.0, 3.0]), _column_row('Pé', [np.nan, -1.0, 0.5])])
+
+    combined = matrix_store._with_appended_columns(db, 7, matrix)
+
+    assert 'ORDER BY position' in db.queries[0][0]
+    assert combined.algorithm_names == ['A', 'B', 'C']
+    assert combined.benchmark_names == ['P1', 'P2', 'P3', 'Pé']
+    np.testing.assert_array_equal(combined.values[:, :2], matrix.values)
+    np.testing.assert_array_equal(combined.values[:, 2:], [[1.0, np.nan], [2.0, -1.0], [3.0, 0.5]])
+    assert combined.values.flags.c_contiguous
+
+
+def test_with_appended_columns_matches_one_saved_block():
+    matrix = _matrix(['A', 'B'], ['P1', 'P2', 'P3', 'P4'], seed=3)
+    base = ExperimentMatrix(matrix.algorithm_names, matrix.benchmark_names[:2], matrix.values[:, :2])
+    rows = [_column_row(name, matrix.values[:, j + 2]) for j, name in enumerate(matrix.benchmark_names[2:])]
+
+    combined = matrix_store._with_appended_columns(FakeDatabase(rows), 1, ExperimentMatrix.from_bytes(base.to_bytes()))
+    _assert_same(ExperimentMatrix.from_bytes(combined.to_bytes()), matrix)
@@ -0,0 +1,156 @@
+import csv
+import glob
+import io
+import os
+import numpy as np
+import pytest
+from app.util.conversion import experiment_stream
+from app.util.conversion.experiment_stream import read_experiment_csv, read_experiment_parquet, UploadValidationError, \
+    _RowBuffer
+
+SAMPLE_DATA = os.path.join(os.path.dirname(__file__), '..', '..', 'sample_data')
+SAMPLE_FILES = ['CEC2005.CSV', 'CEC2005complete.CSV', 'Example1.CSV', 'Example4.CSV', 'demsar2006.csv']
+
+
+def _read(text, **kwargs):
+    return read_experiment_csv(io.BytesIO(text.encode('utf-8')), **kwargs)
+
+
+def _error(text, **kwargs):
+    with pytest.raises(UploadValidationError) as raised:
+        _read(text, **kwargs)
+    return str(raised.value), raised.value.row, raised.value.column
+
+
+def test_reads_names_and_values():
+    matrix = _read("algorithm,f1,f2\nA1,1,2.5\n\nA2, 3 ,-4e-1,,\n")
+
+    assert matrix.algorithm_names == ['A1', 'A2'] and matrix.benchmark_names == ['f1', 'f2']
+    np.testing.assert_array_equal(matrix.values, [[1.0, 2.5], [3.0, -0.4]])
+
+
+@pytest.mark.parametrize('text, expected', [
+    (",f1,f 2\nA1,1,2\n", ("Cell [0][2] must be alphanumeric", 0, 2)),
+    (",f1,f2\nA1,1,2\nA2,1,x\nA3,y,1\n", ("Cell [2][2] must be numeric.", 2, 2)),
+    (",f1,f2\nA1,1,2\nA2,1\n", ("Row 2 must contain 3 cells.", 2, None)),
+    (",f1,f2\nA1,1,2\nA 2,1,2\n", ("Cell [2][0] must be alphanumeric", 2, 0)),
+    ("algorithm\nA1\n", ("The header row must name at least one benchmark.", 0, None)),
+    (",f1,f2\n", ("The file must contain a header row and at least one algorithm row.", None, None)),
+])
+def test_first_error_carries_its_row_and_column(text, expected):
+    message, row, column = _error(text)
+    assert message.startswith(expected[0]) and (row, column) == expected[1:]
+
+
+def test_skips_a_byte_order_mark():
+    matrix = read_experiment_csv(io.BytesIO(b'\xef\xbb\xbf,f1\nA1,1\n'))
+    assert matrix.benchmark_names == ['f1'] and matrix.algorithm_names == ['A1']
+
+    matrix = read_experiment_csv(io.BytesIO('\ufeffalgorithm;f1\nA1;1\n'.encode('utf-8')), delimiter=';')
+    assert matrix.benchmark_names == ['f1']
+
+
+def test_reads_text_streams_with_another_delimiter():
+    matrix = read_experiment_csv(io.StringIO("\tf1\tf2\nA1\t1\t2\n"), delimiter='\t')
+    np.testing.assert_array_equal(matrix.values, [[1.0, 2.0]])
+
+
+@pytest.mark.parametrize('delimiter', ['', ';;', '"', '\n', None, 1])
+def test_rejects_invalid_delimiters(delimiter):
+    message, _, _ = _error(",f1\nA1,1\n", delimiter=delimiter)
+    assert message.startswith("The delimiter must be a single character")
+
+
+def test_rejects_undecodable_input():
+    with pytest.raises(UploadValidationError, match="Malformed CSV near row 2"):
+        read_experiment_csv(io.BytesIO(b',f1\nA1,1\n\xff\xfe,2\n'))
+
+
+def test_row_buffer_grows_and_keeps_its_rows():
+    buffer = _RowBuffer(3, capacity=2)
+    rows = np.arange(30, dtype=np.float64).reshape(10, 3)
+    for row in rows:
+        buffer.append(row)
+
+    assert buffer.values.shape == (16, 3)
+    np.testing.assert_array_equal(buffer.result(), rows)
+
+
+def test_reads_more_rows_than_the_initial_buffer():
+    values = np.arange(200 * 2, dtype=np.float64).reshape(200, 2)
+    text = ",f1,f2\n" + "".join(f"A{i},{a:g},{b:g}\n" for i, (a, b) in enumerate(values))
+
+    matrix = _read(text)
+    assert matrix.shape == (200, 2) and matrix.algorithm_names[-1] == 'A199'
+    np.testing.assert_array_equal(matrix.values, values)
+
+
+def test_enforces_the_cell_limit():
+    text = ",f1,f2,f3\n" + "".join(f"A{i},1,2,3\n" for i in range(1, 5))
+
+    assert _read(text, max_cells=12).shape == (4, 3)
+    assert _error(text, max_cells=11) == ("Experiments are limited to 11 result cells.", 4, None)
+
+
+def _reference_table(path):
+    # An independent reading of the sample files: the csv module, stripped cells and trailing empty cells dropped.
+    with open(path, newline='', encoding='utf-8-sig') as file:
+        rows = [[cell.strip() for cell in row] for row in csv.reader(file)]
+    rows = [row[:max(i + 1 for i, cell in enumerate(row) if cell)] for row in rows if any(row)]
+    return rows[0][1:], [row[0] for row in rows[1:]], np.array([row[1:] for row in rows[1:]], dtype=np.float64)
+
+
+@pytest.mark.parametrize('name', SAMPLE_FILES)
+def test_sample_data_round_trip(name):
+    path = os.path.join(SAMPLE_DATA, name)
+    with open(path, 'rb') as file:
+        matrix = read_experiment_csv(file)
+
+    benchmark_names, algorithm_names, values = _reference_table(path)
+    assert matrix.benchmark_names == benchmark_names and matrix.algorithm_names == algorithm_names
+    np.testing.assert_array_equal(matrix.values, values)
+
+    written = io.StringIO()
+    csv.writer(written).writerows([[''] + matrix.benchmark_names] +
+                                  [[name] + [repr(value) for value in row] for name, row in
+                                   zip(matrix.algorithm_names, matrix.values.tolist())])
+    again = read_experiment_csv(io.BytesIO(written.getvalue().encode('utf-8')))
+    assert again.algorithm_names == matrix.algorithm_names and again.benchmark_names == matrix.benchmark_names
+    np.testing.assert_array_equal(again.values, matrix.values)
+
+
+def test_parquet_needs_pyarrow(monkeypatch):
+    monkeypatch.setattr(experiment_stream, 'pq', None)
+    with pytest.raises(RuntimeError, match="pyarrow"):
+        read_experiment_parquet(io.BytesIO(b''))
+
+
+def test_parquet_round_trip(tmp_path):
+    pyarrow = pytest.importorskip('pyarrow')
+    import pyarrow.parquet as pq
+    path = str(tmp_path / 'experiment.parquet')
+    pq.write_table(pyarrow.table({'algorithm': ['A1', 'A2', 'A3'], 'f1': [1.0, 2.0, 3.0], 'f2': [4, 5, 6]}), path,
+                   row_group_size=2)
+
+    matrix = read_experiment_parquet(path)
+    assert matrix.algorithm_names == ['A1', 'A2', 'A3'] and matrix.benchmark_names == ['f1', 'f2']
+    np.testing.assert_array_equal(matrix.values, [[1, 4], [2, 5], [3, 6]])
+
+    pq.write_table(pyarrow.table({'algorithm': ['A1', 'A2'], 'f1': [1.0, None]}), path)
+    with pytest.raises(UploadValidationError) as raised:
+        read_experiment_parquet(path)
+    assert (raised.value.row, raised.value.column) == (2, 1)
+
+
+def test_upload_endpoint_rejects_an_invalid_delimiter(client):
+    response = client.post('/api/analysis/upload', data={'file': (io.BytesIO(b',f1\nA1,1\n'), 'e.csv'),
+                                                         'delimiter': ';;', 'analysisType': 'all'})
+    assert response.status_code == 400
+    assert response.get_json()['error'].startswith("The delimiter must be a single character")
+
+
+def test_upload_endpoint_reads_the_delimiter_field(client):
+    text = ";f1;f2;f3;f4\nA1;1;2;3;4\nA2;2;3;4;5\nA3;3;1;5;6\n"
+    response = client.post('/api/analysis/upload', data={'file': (io.BytesIO(text.encode('utf-8')), 'e.csv'),
+                                                         'delimiter': ';', 'analysisType': 'all'})
+    assert response.status_code == 201, response.get_json()
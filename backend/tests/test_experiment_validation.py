@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+from app.util.conversion.experiment_matrix import ExperimentMatrix
+from app.util.validation.experiment_validation import collect_table_issues, collect_matrix_issues, has_errors, \
+    validate_table_data, ExperimentValidationError, ERROR, WARNING
+
+
+def _codes(issues):
+    return [(issue['code'], issue['row'], issue['column']) for issue in issues]
+
+
+def test_valid_table_has_no_issues():
+    table = [['', 'f1', 'f2'], ['A1', 1, '2.5'], ['A2', 3.0, -1]]
+    assert collect_table_issues(table) == ([], False)
+    assert validate_table_data(table) is True
+
+
+@pytest.mark.parametrize('table, expected', [
+    ([], [('empty', 0, None)]),
+    ([[]], [('empty', 0, None)]),
+    ([['', 'f1']], [('empty', None, None)]),
+    ([['x', 'f1'], ['A1', 1]], [('corner_not_empty', 0, 0)]),
+    ([['', 'f 1', ''], ['A1', 1, 2], ['', 2, 1]], [('invalid_name', 0, 1), ('invalid_name', 0, 2), ('invalid_name', 2, 0)]),
+    ([['', 'f1', 'f2'], ['A1', 1, 2], ['A2', 1], ['A3', 1, 2, 3]], [('row_length', 2, None), ('row_length', 3, None)]),
+    ([['', 'f1', 'f2', 'f1'], ['A1', 1, 2, 3], ['A1', 2, 1, 4]], [('duplicate_benchmark', 0, 3), ('duplicate_algorithm', 2, 0)]),
+    ([['', 'f1', 'f2'], ['A1', 1, 'x'], ['A2', None, 2]], [('not_numeric', 1, 2), ('not_numeric', 2, 1)]),
+    ([['', 'f1', 'f2'], ['A1', 1, 'inf'], ['A2', float('nan'), 2]], [('non_finite', 1, 2), ('non_finite', 2, 1)]),
+])
+def test_every_error_code(table, expected):
+    issues, truncated = collect_table_issues(table)
+
+    assert _codes(issues) == expected and not truncated
+    assert all(issue['severity'] == ERROR for issue in issues) and has_errors(issues)
+    with pytest.raises(ExperimentValidationError) as raised:
+        validate_table_data(table)
+    assert str(raised.value) == issues[0]['message'] and raised.value.issues == issues
+
+
+def test_messages_name_the_offending_cells():
+    issues, _ = collect_table_issues([['', 'f1', 'f1'], ['A1', 1, 'x'], ['A2', 2]])
+    assert [issue['message'] for issue in issues] == [
+        "Row 2 must contain 3 cells.",
+        "Cell [0][2] repeats the benchmark name 'f1' of cell [0][1].",
+        "Cell [1][2] must be numeric.",
+    ]
+
+
+def test_none_cells_are_not_numeric_rather_than_nan():
+    issues, _ = collect_table_issues([['', 'f1', 'f2'], ['A1', None, 1], ['A2', 2, None]])
+    assert _codes(issues) == [('not_numeric', 1, 1), ('not_numeric', 2, 2)]
+
+
+def test_constant_benchmark_is_only_a_warning():
+    table = [['', 'f1', 'f2', 'f3'], ['A1', 1, 2, 5], ['A2', 1, 3, 5], ['A3', 1, 4, 5]]
+    issues, _ = collect_table_issues(table)
+
+    assert _codes(issues) == [('constant_benchmark', None, 1), ('constant_benchmark', None, 3)]
+    assert all(issue['severity'] == WARNING for issue in issues) and not has_errors(issues)
+    assert validate_table_data(table) is True
+
+
+def test_a_column_with_a_bad_cell_is_not_reported_as_constant():
+    issues, _ = collect_table_issues([['', 'f1'], ['A1', 1], ['A2', 'x'], ['A3', 1]])
+    assert _codes(issues) == [('not_numeric', 2, 1)]
+
+
+def test_a_single_algorithm_has_no_constant_benchmarks():
+    assert collect_table_issues([['', 'f1'], ['A1', 1]]) == ([], False)
+
+
+@pytest.mark.parametrize('max_errors', [1, 3, 5])
+def test_collection_stops_at_max_errors(max_errors):
+    table = [['', 'f1', 'f2', 'f3'], ['A1', 'a', 'b', 'c'], ['A2', 'd', 'e', 'f']]
+    issues, truncated = collect_table_issues(table, max_errors=max_errors)
+
+    assert len(issues) == max_errors and truncated
+    with pytest.raises(ExperimentValidationError) as raised:
+        validate_table_data(table, max_errors=max_errors)
+    assert raised.value.to_dict() == {'error': issues[0]['message'], 'issues': issues, 'truncated': True}
+
+
+def test_collection_is_not_truncated_at_exactly_max_errors():
+    issues, truncated = collect_table_issues([['', 'f1', 'f2'], ['A1', 'a', 'b']], max_errors=2)
+    assert len(issues) == 2 and not truncated
+
+
+def test_non_finite_values_stop_at_max_errors():
+    table = [['', 'f1', 'f2'], ['A1', 'inf', 'inf'], ['A2', 'nan', 'nan']]
+    issues, truncated = collect_table_issues(table, max_errors=3)
+    assert _codes(issues) == [('non_finite', 1, 1), ('non_finite', 1, 2), ('non_finite', 2, 1)] and truncated
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_matrix_issues_match_the_table_issues(seed):
+    rng = np.random.default_rng(seed)
+    k, n = 6, 5
+    values = rng.integers(0, 3, size=(k, n)).astype(np.float64)
+    values[rng.random((k, n)) < 0.15] = np.inf
+    values[rng.random((k, n)) < 0.1] = np.nan
+    values[:, 0] = 2.0
+    algorithm_names = [f'A{i}' for i in rng.integers(0, 4, size=k)]
+    benchmark_names = [f'f{j}' for j in rng.integers(0, 4, size=n)]
+
+    table = [[''] + benchmark_names] + [[name] + row for name, row in zip(algorithm_names, values.tolist())]
+    matrix = ExperimentMatrix(algorithm_names, benchmark_names, values)
+
+    issues, truncated = collect_table_issues(table)
+    assert {issue['code'] for issue in issues} == {'duplicate_algorithm', 'duplicate_benchmark', 'non_finite',
+                                                   'constant_benchmark'}
+    assert collect_matrix_issues(matrix) == (issues, truncated)
+    assert collect_matrix_issues(matrix, max_errors=4) == collect_table_issues(table, max_errors=4)
@@ -0,0 +1,55 @@
+import time
+import pytest
+from app.util.jobs.job_queue import JobQueue, JobQueueFullError, CANCELLED
+
+
+class SleepTask:
+    analysis_type = 'sleep'
+    function = time.sleep
+
+    def __init__(self, seconds):
+        self.args = (seconds,)
+
+    def cached_result(self):
+        return None
+
+
+def _wait_until_running(queue, job_id):
+    deadline = time.time() + 30
+    while queue.status(job_id)['status'] != 'running':
+        assert time.time() < deadline, "the job did not start"
+        time.sleep(0.05)
+
+
+def test_cancelled_running_job_counts_until_its_worker_finishes():
+    queue = JobQueue(max_workers=1, timeout=30, max_pending=1)
+    try:
+        job_id = queue.submit(SleepTask(1.5))
+        _wait_until_running(queue, job_id)
+
+        assert queue.cancel(job_id)['status'] == CANCELLED
+        with pytest.raises(JobQueueFullError):
+            queue.submit(SleepTask(0))
+
+        deadline = time.time() + 30
+        while True:
+            try:
+                queue.submit(SleepTask(0))
+                break
+            except JobQueueFullError:
+                assert time.time() < deadline, "the cancelled job never released its worker"
+                time.sleep(0.1)
+        assert queue.status(job_id)['status'] == CANCELLED
+    finally:
+        queue.shutdown()
+
+
+@pytest.mark.parametrize('timeout', ['abc', 'nan', 'inf', '-1', '0', [1]])
+def test_submit_job_rejects_invalid_timeouts(timeout):
+    from flask import Flask
+    from app.api.routes.analysis import submit_job
+
+    with Flask(__name__).app_context():
+        response, status = submit_job(SleepTask(0), {'timeout': timeout})
+    assert status == 400
+    assert 'timeout' in response.get_json()['error']
@@ -0,0 +1,160 @@
+import numpy as np
+import pytest
+from scipy.stats import chi2, friedmanchisquare, rankdata, f
+from app.constants.optimization_mode import OptimizationMode
+from app.util.conversion.experiment_matrix import ExperimentMatrix
+from app.services.stats.nonparametric.omnibus_test.omnibus_tests import omnibus_tests
+
+# The example of R's ?quade.test (Conover, 1999): 7 stores (blocks) by 5 brands (groups).
+# quade.test(dataFreq) reports Quade F = 3.8293, num df = 4, denom df = 24, p-value = 0.01519.
+QUADE_EXAMPLE = np.array([
+    [5, 4, 7, 10, 12],
+    [1, 3, 1, 0, 2],
+    [16, 12, 22, 22, 35],
+    [5, 4, 3, 5, 4],
+    [10, 9, 7, 13, 10],
+    [19, 18, 28, 37, 58],
+    [10, 7, 6, 8, 7],
+], dtype=np.float64)
+
+
+def _run(values, mode=OptimizationMode.MINIMIZE):
+    k, n = values.shape
+    matrix = ExperimentMatrix([f"A{i}" for i in range(k)], [f"B{j}" for j in range(n)], values)
+    return omnibus_tests(matrix, mode)
+
+
+def _reference_quade(values):
+    # Conover's formulation over blocks (columns): Q_j ranks the block ranges, S_ij = Q_j (R_ij - (k + 1) / 2).
+    k, n = values.shape
+    within = np.column_stack([rankdata(values[:, j]) for j in range(n)])
+    block_weights = rankdata(values.max(axis=0) - values.min(axis=0))
+    s = block_weights * (within - (k + 1) / 2.0)
+    a2 = np.sum(s ** 2)
+    b = np.sum(s.sum(axis=1) ** 2) / n
+    statistic = (n - 1) * b / (a2 - b)
+    return statistic, f.sf(statistic, k - 1, (k - 1) * (n - 1))
+
+
+def test_quade_matches_r_reference_example():
+    quade = _run(QUADE_EXAMPLE.T).tests['quade']
+
+    assert quade.df == (4, 24)
+    assert quade.statistic == pytest.approx(3.8293, abs=5e-5)
+    assert quade.p_value == pytest.approx(0.01519, abs=5e-6)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_quade_matches_reference_formula(seed):
+    values = np.random.default_rng(seed).integers(0, 6, size=(5, 12)).astype(np.float64)
+    quade = _run(values).tests['quade']
+
+    statistic, p_value = _reference_quade(values)
+    assert quade.statistic == pytest.approx(statistic, rel=1e-12)
+    assert quade.p_value == pytest.approx(p_value, rel=1e-9)
+
+
+def test_quade_is_invariant_under_maximisation_of_negated_data():
+    minimised = _run(QUADE_EXAMPLE.T).tests['quade']
+    maximised = _run(-QUADE_EXAMPLE.T, OptimizationMode.MAXIMIZE).tests['quade']
+    assert maximised.statistic == pytest.approx(minimised.statistic, rel=1e-12)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_friedman_matches_scipy(seed):
+    values = np.random.default_rng(seed).integers(0, 4, size=(4, 10)).astype(np.float64)
+    friedman = _run(values).tests['friedman']
+
+    expected = friedmanchisquare(*values)
+    assert friedman.statistic == pytest.approx(expected.statistic, rel=1e-12)
+    assert friedman.p_value == pytest.approx(expected.pvalue, rel=1e-9)
+
+
+# Worked by hand: three algorithms on two benchmarks. Centring on the benchmark means (3 and 12) gives the aligned
+# observations A: -2, -2; B: -1, 2; C: 3, 0, whose joint ranks are A: 1.5, 1.5; B: 3, 5; C: 6, 4. With algorithm
+# rank totals 3, 8, 10 and benchmark totals 10.5, 10.5, Hodges & Lehmann's statistic is
+# 2 (173 - 147) / (91 - 220.5 / 3) = 104 / 35, and its chi-square p-value with 2 degrees of freedom is exp(-52 / 35).
+ALIGNED_EXAMPLE = np.array([
+    [1, 10],
+    [2, 14],
+    [6, 12],
+], dtype=np.float64)
+
+
+def _reference_aligned_friedman(values):
+    # García et al. (2010), eq. for the Friedman Aligned Ranks statistic, evaluated term by term.
+    k, n = values.shape
+    aligned = [[values[i, j] - np.mean(values[:, j]) for j in range(n)] for i in range(k)]
+    flat_ranks = rankdata([aligned[i][j] for i in range(k) for j in range(n)])
+    ranks = [[flat_ranks[i * n + j] for j in range(n)] for i in range(k)]
+
+    algorithm_totals = [sum(ranks[i][j] for j in range(n)) for i in range(k)]
+    benchmark_totals = [sum(ranks[i][j] for i in range(k)) for j in range(n)]
+    kn = k * n
+    numerator = (k - 1) * (sum(total ** 2 for total in algorithm_totals) - (k * n ** 2 / 4.0) * (kn + 1) ** 2)
+    denominator = kn * (kn + 1) * (2 * kn + 1) / 6.0 - sum(total ** 2 for total in benchmark_totals) / k
+    return numerator / denominator
+
+
+def test_aligned_friedman_matches_worked_example():
+    aligned = _run(ALIGNED_EXAMPLE).tests['aligned-friedman']
+
+    assert aligned.df == (2,)
+    assert aligned.statistic == pytest.approx(104 / 35, rel=1e-12)
+    assert aligned.p_value == pytest.approx(np.exp(-52 / 35), rel=1e-12)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_aligned_friedman_matches_reference_formula(seed):
+    # Small integers, so both the aligned observations and the within-benchmark values tie.
+    values = np.random.default_rng(seed).integers(0, 5, size=(5, 9)).astype(np.float64)
+    aligned = _run(values).tests['aligned-friedman']
+
+    statistic = _reference_aligned_friedman(values)
+    assert aligned.statistic == pytest.approx(statistic, rel=1e-12)
+    assert aligned.p_value == pytest.approx(chi2.sf(statistic, 4), rel=1e-9)
+
+
+def test_aligned_friedman_is_invariant_under_maximisation_of_negated_data():
+    values = np.random.default_rng(7).normal(size=(4, 15))
+    minimised = _run(values).tests['aligned-friedman']
+    maximised = _run(-values, OptimizationMode.MAXIMIZE).tests['aligned-friedman']
+    assert maximised.statistic == pytest.approx(minimised.statistic, rel=1e-12)
+
+
+def test_iman_davenport_matches_worked_example():
+    # Within-benchmark ranks A: 1, 1, 1, 2; B: 2, 2, 3, 1; C: 3, 3, 2, 3 give rank totals 5, 8, 11, so the Friedman
+    # statistic is 12 / (4 * 3 * 4) * 210 - 48 = 4.5 and F = 3 * 4.5 / (4 * 2 - 4.5) = 27 / 7 on (2, 6) degrees of freedom.
+    values = np.array([
+        [1, 1, 1, 2],
+        [2, 2, 3, 1],
+        [3, 3, 2, 3],
+    ], dtype=np.float64)
+    iman_davenport = _run(values).tests['iman-davenport']
+
+    assert iman_davenport.df == (2, 6)
+    assert iman_davenport.statistic == pytest.approx(27 / 7, rel=1e-12)
+    assert iman_davenport.p_value == pytest.approx(f.sf(27 / 7, 2, 6), rel=1e-12)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_iman_davenport_matches_closed_form(seed):
+    values = np.random.default_rng(seed).integers(0, 4, size=(6, 11)).astype(np.float64)
+    k, n = values.shape
+    iman_davenport = _run(values).tests['iman-davenport']
+
+    chi_square = friedmanchisquare(*values).statistic
+    statistic = (n - 1) * chi_square / (n * (k - 1) - chi_square)
+    assert iman_davenport.df == (k - 1, (k - 1) * (n - 1))
+    assert iman_davenport.statistic == pytest.approx(statistic, rel=1e-12)
+    assert iman_davenport.p_value == pytest.approx(f.sf(statistic, k - 1, (k - 1) * (n - 1)), rel=1e-9)
+
+
+def test_iman_davenport_is_significant_under_complete_agreement():
+    # Every benchmark ranks the algorithms alike, so the Friedman statistic reaches n (k - 1) and F is unbounded.
+    values = np.tile(np.arange(4, dtype=np.float64).reshape(-1, 1), (1, 6))
+    with np.errstate(divide='ignore'):
+        iman_davenport = _run(values).tests['iman-davenport']
+
+    assert iman_davenport.statistic == np.inf
+    assert iman_davenport.p_value == 0.0
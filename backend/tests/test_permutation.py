@@ -0,0 +1,77 @@
+import itertools
+import numpy as np
+import pytest
+from scipy.stats import friedmanchisquare
+from app.services.stats.util.ranking import rank_columns
+from app.services.stats.resampling import permutation, pool
+from app.services.stats.resampling.permutation import permutation_tests, PermutationOptions
+
+# Small blocks with ties, so the exact mode enumerates them: 6^4 = 1296 and 24^2 = 576 permutations.
+DATA = [
+    np.array([[1, 2, 2, 5], [3, 1, 4, 4], [2, 2, 1, 6]], dtype=np.float64),
+    np.array([[4, 1], [2, 1], [3, 5], [1, 7]], dtype=np.float64),
+]
+
+
+def _brute_force(rank_matrix):
+    # Evaluates the tie-corrected Friedman statistic itself rather than the sum of squared rank sums.
+    k, n = rank_matrix.shape
+    first, second = np.triu_indices(k, 1)
+    observed_statistic = friedmanchisquare(*rank_matrix).statistic
+    observed_differences = np.abs(rank_matrix.mean(axis=1)[first] - rank_matrix.mean(axis=1)[second])
+
+    friedman, pairs, ranges, total = 0, np.zeros(len(first)), np.zeros(len(first)), 0
+    for orders in itertools.product(itertools.permutations(range(k)), repeat=n):
+        permuted = np.column_stack([rank_matrix[list(order), j] for j, order in enumerate(orders)])
+        mean_ranks = permuted.mean(axis=1)
+        friedman += friedmanchisquare(*permuted).statistic >= observed_statistic - 1e-9
+        pairs += np.abs(mean_ranks[first] - mean_ranks[second]) >= observed_differences - 1e-9
+        ranges += mean_ranks.max() - mean_ranks.min() >= observed_differences - 1e-9
+        total += 1
+    return friedman / total, pairs / total, ranges / total, total
+
+
+@pytest.fixture
+def workers(monkeypatch):
+    def use(count):
+        monkeypatch.setattr(pool, 'WORKERS', count)
+        monkeypatch.setattr(permutation, 'PARALLEL_MIN_CELLS', 0)
+    yield use
+    if pool._executor is not None:
+        pool._executor.shutdown()
+        pool._executor = None
+
+
+@pytest.mark.parametrize("data", DATA)
+@pytest.mark.parametrize("batch_cells", [permutation.BATCH_CELLS, 100])
+def test_exact_p_values_match_full_enumeration(monkeypatch, workers, data, batch_cells):
+    workers(1)
+    # A small batch spreads the enumeration over many batches.
+    monkeypatch.setattr(permutation, 'BATCH_CELLS', batch_cells)
+    rank_matrix = rank_columns(data)[0]
+
+    result = permutation_tests(rank_matrix, PermutationOptions(1000, 0, True), 0.05)
+
+    friedman, pairs, ranges, total = _brute_force(rank_matrix)
+    assert result.exact and not result.stopped_early
+    assert result.permutations == total
+    assert result.friedman_p_value == pytest.approx(friedman, abs=1e-12)
+    np.testing.assert_allclose(result.p_value, pairs, rtol=0, atol=1e-12)
+    np.testing.assert_allclose(result.range_p_value, ranges, rtol=0, atol=1e-12)
+
+
+def test_monte_carlo_p_values_do_not_depend_on_the_worker_count(monkeypatch, workers):
+    monkeypatch.setattr(permutation, 'BATCH_CELLS', 4000)
+    rank_matrix = rank_columns(np.random.default_rng(0).integers(0, 4, size=(5, 12)))[0]
+    options = PermutationOptions(2500, 3, False)
+
+    workers(1)
+    serial = permutation_tests(rank_matrix, options, 0.05)
+    workers(4)
+    parallel = permutation_tests(rank_matrix, options, 0.05)
+
+    assert not serial.exact and serial.permutations == parallel.permutations == 2500
+    assert parallel.workers == 4
+    assert serial.friedman_p_value == parallel.friedman_p_value
+    np.testing.assert_array_equal(serial.p_value, parallel.p_value)
+    np.testing.assert_array_equal(serial.range_p_value, parallel.range_p_value)
@@ -0,0 +1,80 @@
+import functools
+import itertools
+import numpy as np
+import pytest
+from app.services.stats.posthoc import shaffer_adjust, bergmann_hommel_adjust, shaffer_limits, exhaustive_sets
+
+
+def _partitions(elements):
+    if not elements:
+        yield []
+        return
+    first, rest = elements[0], elements[1:]
+    for partition in _partitions(rest):
+        yield [[first]] + partition
+        for i in range(len(partition)):
+            yield partition[:i] + [[first] + partition[i]] + partition[i + 1:]
+
+
+@functools.lru_cache(maxsize=None)
+def _brute_exhaustive_sets(k):
+    # Each partition of the algorithms into groups of equal performance makes exactly the pairs inside each group true.
+    pairs = list(zip(*np.triu_indices(k, 1)))
+    sets = set()
+    for partition in _partitions(list(range(k))):
+        group = {algorithm: g for g, members in enumerate(partition) for algorithm in members}
+        true = frozenset(h for h, (i, j) in enumerate(pairs) if group[i] == group[j])
+        if true:
+            sets.add(true)
+    return sets
+
+
+@functools.lru_cache(maxsize=None)
+def _brute_shaffer_limits(k):
+    # t_j: the most hypotheses that can still be true once any j - 1 hypotheses are known to be false.
+    m = k * (k - 1) // 2
+    sets = [(sum(1 << h for h in s), len(s)) for s in _brute_exhaustive_sets(k)] + [(0, 0)]
+    limits = []
+    for j in range(1, m + 1):
+        limits.append(max(size for false in itertools.combinations(range(m), j - 1)
+                          for false_mask in [sum(1 << h for h in false)]
+                          for mask, size in sets if not mask & false_mask))
+    return limits
+
+
+def _brute_shaffer_adjust(p_values, limits):
+    adjusted, running = np.empty(len(p_values)), 0.0
+    for step, h in enumerate(np.argsort(p_values)):
+        running = max(running, min(1.0, limits[step] * p_values[h]))
+        adjusted[h] = running
+    return adjusted
+
+
+def _brute_bergmann_hommel_adjust(p_values, k):
+    sets = _brute_exhaustive_sets(k)
+    return np.array([max(min(1.0, len(s) * min(p_values[i] for i in s)) for s in sets if h in s)
+                     for h in range(len(p_values))])
+
+
+@pytest.mark.parametrize('k', range(3, 7))
+def test_exhaustive_sets_match_enumeration(k):
+    masks, sizes = exhaustive_sets(k)
+    m = k * (k - 1) // 2
+    sets = {frozenset(bit for bit in range(m) if int(mask) >> bit & 1) for mask in masks}
+
+    assert sets == _brute_exhaustive_sets(k)
+    assert sorted(sizes.tolist()) == sorted(len(s) for s in sets)
+
+
+@pytest.mark.parametrize('k', range(3, 7))
+def test_shaffer_limits_match_enumeration(k):
+    assert shaffer_limits(k).tolist() == _brute_shaffer_limits(k)
+
+
+@pytest.mark.parametrize('k', range(3, 7))
+@pytest.mark.parametrize('seed', range(3))
+def test_adjustments_match_enumeration(k, seed):
+    p_values = np.random.default_rng(seed).random(k * (k - 1) // 2) ** 3
+
+    np.testing.assert_allclose(shaffer_adjust(p_values, k), _brute_shaffer_adjust(p_values, _brute_shaffer_limits(k)))
+    np.testing.assert_allclose(bergmann_hommel_adjust(p_values, k), _brute_bergmann_hommel_adjust(p_values, k))
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from app.constants.optimization_mode import OptimizationMode
+from app.db.helpers.rank_state_store import rank_sums_from_values, add_rank_columns
+from app.services.stats.nonparametric.friedman_test.rank_state import FriedmanRankState, friedman_from_sums
+
+
+def _results(k, n, seed):
+    # Rounded results, so that many benchmarks have ties.
+    return np.round(np.random.default_rng(seed).random((k, n)), 1)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_appended_columns_match_full_ranking(seed):
+    values = _results(5, 30, seed)
+    names = [f'A{i}' for i in range(5)]
+
+    rank_sums = add_rank_columns(rank_sums_from_values(names, values[:, :10]), values[:, 10:])
+    expected = rank_sums_from_values(names, values)
+
+    assert rank_sums.benchmark_count == 30
+    np.testing.assert_allclose(rank_sums.rank_sums, expected.rank_sums)
+    assert rank_sums.tie_sum_total == pytest.approx(expected.tie_sum_total)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_appended_rows_match_full_ranking(seed):
+    values = _results(6, 25, seed)
+
+    state = FriedmanRankState.from_values(values[:3])
+    for row in values[3:]:
+        state.append_row(row)
+    expected = FriedmanRankState.from_values(values)
+
+    np.testing.assert_allclose(state.ranks, expected.ranks)
+    np.testing.assert_allclose(state.rank_sums, expected.rank_sums)
+    np.testing.assert_allclose(state.tie_sums, expected.tie_sums)
+
+
+@pytest.mark.parametrize('mode', [OptimizationMode.MINIMIZE, OptimizationMode.MAXIMIZE])
+def test_friedman_from_sums_matches_state(mode):
+    values = _results(4, 20, 7)
+    state = FriedmanRankState.from_values(values)
+    rank_sums = rank_sums_from_values(['A', 'B', 'C', 'D'], values)
+
+    from_state = state.friedman(mode)
+    from_sums = friedman_from_sums(rank_sums.rank_sums, rank_sums.tie_sum_total, rank_sums.benchmark_count, mode)
+
+    np.testing.assert_allclose(from_sums.mean_ranks, from_state.mean_ranks)
+    assert from_sums.friedman_stat == pytest.approx(from_state.friedman_stat)
+    np.testing.assert_allclose(from_sums.z_values, from_state.z_values)
@@ -0,0 +1,117 @@
+import numpy as np
+import pytest
+from app.api.api_utils import read_run_matrix
+from app.constants.optimization_mode import OptimizationMode
+from app.util.conversion.run_matrix import RunMatrix
+from app.util.validation.experiment_validation import ExperimentValidationError
+
+TABLE = [['', 'b1', 'b2', 'b3'],
+         ['A1', [1.0, 3.0, 2.0], [5.0], [2.0, 2.0]],
+         ['A2', [4.0, 0.0], [1.0, 7.0, 4.0], 6.0]]
+
+
+def _codes(error):
+    return [(issue['code'], issue['row'], issue['column']) for issue in error.issues]
+
+
+def test_from_table_pads_cells_with_fewer_runs():
+    run_matrix = RunMatrix.from_table(TABLE)
+
+    assert run_matrix.shape == (2, 3, 3)
+    assert run_matrix.algorithm_names == ['A1', 'A2'] and run_matrix.benchmark_names == ['b1', 'b2', 'b3']
+    np.testing.assert_array_equal(run_matrix.run_counts(), [[3, 1, 2], [2, 3, 1]])
+    assert run_matrix.to_table() == [['', 'b1', 'b2', 'b3'],
+                                     ['A1', [1.0, 3.0, 2.0], [5.0], [2.0, 2.0]],
+                                     ['A2', [4.0, 0.0], [1.0, 7.0, 4.0], [6.0]]]
+
+
+def test_from_table_rejects_invalid_names_and_corner():
+    with pytest.raises(ExperimentValidationError) as raised:
+        RunMatrix.from_table([['x', 'bad name!', 'b2'], ['', [1, 2], [3]], ['x y', [2], [1, 5]]])
+
+    assert _codes(raised.value) == [('corner_not_empty', 0, 0), ('invalid_name', 0, 1), ('invalid_name', 1, 0),
+                                    ('invalid_name', 2, 0)]
+
+
+def test_from_table_reports_every_bad_cell():
+    table = [['', 'b1', 'b2', 'b1'],
+             ['A1', [1.0, 'x'], [], [float('inf')]],
+             ['A2', [1.0], [2.0]],
+             ['A1', None, [1.0], [2.0]]]
+    with pytest.raises(ExperimentValidationError) as raised:
+        RunMatrix.from_table(table)
+
+    assert _codes(raised.value) == [('row_length', 2, None), ('duplicate_benchmark', 0, 3),
+                                    ('duplicate_algorithm', 3, 0), ('not_numeric', 1, 1), ('no_runs', 1, 2),
+                                    ('non_finite', 1, 3), ('not_numeric', 3, 1)]
+    assert str(raised.value) == "Row 2 must contain 4 cells."
+
+
+def test_read_run_matrix_returns_the_issues(app):
+    with app.app_context():
+        run_matrix, experiment_matrix, (response, status) = read_run_matrix(
+            [['', 'b1'], ['bad name', [1.0]], ['A2', [2.0]]], 'mean', None, OptimizationMode.MINIMIZE)
+
+    assert run_matrix is None and experiment_matrix is None and status == 400
+    assert response.get_json()['issues'][0]['message'].startswith("Cell [1][0] ")
+
+
+@pytest.mark.parametrize('aggregation, percentile, mode, expected', [
+    ('mean', None, OptimizationMode.MINIMIZE, [[2.0, 5.0, 2.0], [2.0, 4.0, 6.0]]),
+    ('median', None, OptimizationMode.MINIMIZE, [[2.0, 5.0, 2.0], [2.0, 4.0, 6.0]]),
+    ('best', None, OptimizationMode.MINIMIZE, [[1.0, 5.0, 2.0], [0.0, 1.0, 6.0]]),
+    ('best', None, OptimizationMode.MAXIMIZE, [[3.0, 5.0, 2.0], [4.0, 7.0, 6.0]]),
+    ('worst', None, OptimizationMode.MINIMIZE, [[3.0, 5.0, 2.0], [4.0, 7.0, 6.0]]),
+    ('worst', None, OptimizationMode.MAXIMIZE, [[1.0, 5.0, 2.0], [0.0, 1.0, 6.0]]),
+    ('percentile', 25, OptimizationMode.MINIMIZE, [[1.5, 5.0, 2.0], [1.0, 2.5, 6.0]]),
+])
+def test_aggregate_ignores_the_padding(aggregation, percentile, mode, expected):
+    experiment_matrix = RunMatrix.from_table(TABLE).aggregate(aggregation, mode, percentile)
+
+    assert experiment_matrix.algorithm_names == ['A1', 'A2']
+    np.testing.assert_allclose(experiment_matrix.values, expected)
+
+
+@pytest.mark.parametrize('aggregation, percentile', [('mean', None), ('median', None), ('best', None),
+                                                     ('worst', None), ('percentile', 90)])
+@pytest.mark.parametrize('mode', [OptimizationMode.MINIMIZE, OptimizationMode.MAXIMIZE])
+def test_aggregate_of_a_full_block_matches_the_padded_path(aggregation, percentile, mode):
+    runs = np.random.default_rng(0).normal(size=(3, 4, 5))
+    full = RunMatrix(['A1', 'A2', 'A3'], ['b1', 'b2', 'b3', 'b4'], runs)
+    padded = RunMatrix(['A1', 'A2', 'A3'], ['b1', 'b2', 'b3', 'b4'], np.concatenate([runs, np.full((3, 4, 2), np.nan)], axis=2))
+
+    np.testing.assert_allclose(full.aggregate(aggregation, mode, percentile).values,
+                               padded.aggregate(aggregation, mode, percentile).values)
+
+
+@pytest.mark.parametrize('aggregation, percentile', [('sum', None), ('percentile', None), ('percentile', 101)])
+def test_aggregate_rejects_invalid_settings(aggregation, percentile):
+    with pytest.raises(ValueError):
+        RunMatrix.from_table(TABLE).aggregate(aggregation, OptimizationMode.MINIMIZE, percentile)
+
+
+def test_dispersion_is_the_sample_standard_deviation_of_every_cell():
+    run_matrix = RunMatrix.from_table(TABLE)
+
+    expected = [[np.std(cell, ddof=1) if len(cell) > 1 else 0.0 for cell in row[1:]]
+                for row in run_matrix.to_table()[1:]]
+    np.testing.assert_allclose(run_matrix.dispersion(), expected)
+
+
+def test_bytes_round_trip_keeps_the_padding():
+    run_matrix = RunMatrix.from_table(TABLE)
+    data = run_matrix.to_bytes()
+
+    assert len(data) == 2 * 3 * 3 * 8
+    restored = RunMatrix.from_bytes(run_matrix.algorithm_names, run_matrix.benchmark_names, 3, data)
+    np.testing.assert_array_equal(restored.runs, run_matrix.runs)
+    assert restored.to_table() == run_matrix.to_table()
+    np.testing.assert_array_equal(restored.aggregate('median', OptimizationMode.MINIMIZE).values,
+                                  run_matrix.aggregate('median', OptimizationMode.MINIMIZE).values)
+
+
+def test_cells_without_runs_are_rejected():
+    runs = np.ones((2, 2, 2))
+    runs[1, 0] = np.nan
+    with pytest.raises(ValueError, match=r"Cell \[2\]\[1\] has no runs"):
+        RunMatrix(['A1', 'A2'], ['b1', 'b2'], runs)
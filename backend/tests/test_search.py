@@ -0,0 +1,40 @@
+import pytest
+from app.api.routes.search import parse_flag, search_table
+
+
+class RecordingDatabase:
+    def __init__(self):
+        self.queries = []
+        self.cur = self
+
+    def execute_query(self, query, params):
+        self.queries.append(query)
+
+    def fetchone(self):
+        return (3,)
+
+    def stream_query(self, query, params):
+        self.queries.append(query)
+        return []
+
+
+@pytest.mark.parametrize('value, expected', [(None, None), (True, True), (False, False), ('true', True),
+                                             ('FALSE', False), ('1', True), ('0', False)])
+def test_parse_flag(value, expected):
+    assert parse_flag('includeTotal', value) is expected
+
+
+@pytest.mark.parametrize('value', ['yes', 'off', '', 2, [True]])
+def test_parse_flag_rejects_other_values(value):
+    with pytest.raises(ValueError):
+        parse_flag('includeTotal', value)
+
+
+@pytest.mark.parametrize('include_total, after, counted', [(None, None, True), (None, (0.5, 7), False),
+                                                           (True, (0.5, 7), True), (False, None, False)])
+def test_matches_are_counted_on_the_first_page_by_default(include_total, after, counted):
+    db = RecordingDatabase()
+    result = search_table(db, 'experiments', 'cec', ['experiment_id'], after, 10, include_total)
+
+    assert any('COUNT(*)' in query for query in db.queries) is counted
+    assert result['total'] == (3 if counted else None)
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from app.constants.optimization_mode import OptimizationMode
+from app.services.stats.nonparametric.effect_size.vargha_delaney import vargha_delaney_a12, a12_magnitude
+
+
+def _brute_a12(one, two, maximize):
+    # Counts every pair of runs of one benchmark directly, skipping the NaN padding.
+    one, two = [x for x in one if x == x], [y for y in two if y == y]
+    score = 0.0
+    for x in one:
+        for y in two:
+            if x == y:
+                score += 0.5
+            elif (x > y) == maximize:
+                score += 1.0
+    return score / (len(one) * len(two))
+
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('mode', [OptimizationMode.MINIMIZE, OptimizationMode.MAXIMIZE])
+def test_a12_matches_brute_force(seed, mode):
+    rng = np.random.default_rng(seed)
+    n, r1, r2 = 7, 6, 4
+    runs_one = rng.integers(0, 5, size=(n, r1)).astype(np.float64)
+    runs_two = rng.integers(0, 5, size=(n, r2)).astype(np.float64)
+    # Pad some cells, leaving at least one run in each.
+    runs_one[rng.random((n, r1)) < 0.3] = np.nan
+    runs_one[:, 0] = rng.integers(0, 5, size=n)
+    runs_two[:, 2:][rng.random((n, r2 - 2)) < 0.5] = np.nan
+
+    result = vargha_delaney_a12(runs_one, runs_two, mode)
+
+    expected = [_brute_a12(one, two, mode == OptimizationMode.MAXIMIZE) for one, two in zip(runs_one, runs_two)]
+    np.testing.assert_allclose(result.a12, expected, rtol=1e-12)
+    assert result.magnitude == [a12_magnitude(value) for value in expected]
+
+
+def test_a12_is_complementary_when_the_algorithms_swap():
+    rng = np.random.default_rng(9)
+    runs_one, runs_two = rng.normal(size=(5, 8)), rng.normal(size=(5, 3))
+
+    forward = vargha_delaney_a12(runs_one, runs_two, OptimizationMode.MINIMIZE).a12
+    backward = vargha_delaney_a12(runs_two, runs_one, OptimizationMode.MINIMIZE).a12
+    np.testing.assert_allclose(forward + backward, 1.0)
+
+
+@pytest.mark.parametrize('a12, label', [(0.5, 'negligible'), (0.45, 'negligible'), (0.56, 'small'), (0.37, 'small'),
+                                        (0.64, 'medium'), (0.31, 'medium'), (0.71, 'large'), (0.0, 'large')])
+def test_magnitude_thresholds(a12, label):
+    assert a12_magnitude(a12) == label
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+from scipy.stats import rankdata
+from statsmodels.stats.multitest import multipletests
+from app.constants.optimization_mode import OptimizationMode
+from app.util.conversion.experiment_matrix import ExperimentMatrix
+from app.services.analysis.analyse_pairwise_matrix import perform_pairwise_matrix_analysis
+from app.services.stats.nonparametric import wilcoxon_signed_rank_test
+from app.services.stats.nonparametric.wilcoxon_test import wilcoxon_matrix
+from app.services.stats.nonparametric.wilcoxon_test.wilcoxon_matrix import wilcoxon_signed_rank_matrix
+
+MODES = [OptimizationMode.MINIMIZE, OptimizationMode.MAXIMIZE]
+
+# SciPy warns about the samples it sends to the normal approximation, which the matrix mirrors.
+pytestmark = [pytest.mark.filterwarnings("ignore:Exact p-value calculation does not work:UserWarning"),
+              pytest.mark.filterwarnings("ignore:Sample size too small:UserWarning")]
+
+
+def _values(kind, k, n, seed):
+    rng = np.random.default_rng(seed)
+    if kind == 'ties-and-zeros':
+        return rng.integers(0, 5, size=(k, n)).astype(np.float64)
+    if kind == 'ties':
+        return np.round(rng.normal(size=(k, n)), 1)
+    return rng.normal(size=(k, n))
+
+
+def _reference_r_plus(better, worse):
+    # R⁺ sums the ranks of |d| where the first algorithm is better, and half the ranks of zero differences.
+    differences = better - worse
+    ranks = rankdata(np.abs(differences))
+    return ranks[differences > 0].sum() + ranks[differences == 0].sum() / 2
+
+
+def _assert_matches_single_pair_test(values, mode):
+    result = wilcoxon_signed_rank_matrix(values, mode)
+
+    for index, (i, j) in enumerate(zip(result.first, result.second)):
+        single = wilcoxon_signed_rank_test(values[i], values[j], 0.05)
+        better, worse = (values[j], values[i]) if mode == OptimizationMode.MINIMIZE else (values[i], values[j])
+
+        assert result.T[index] == pytest.approx(single.T, abs=1e-9)
+        assert result.p_value[index] == pytest.approx(single.p_value, rel=1e-9, abs=1e-15)
+        assert result.R_plus[index] == pytest.approx(_reference_r_plus(better, worse), abs=1e-9)
+        assert result.R_plus[index] + result.R_minus[index] == pytest.approx(values.shape[1] * (values.shape[1] + 1) / 2)
+
+
+@pytest.mark.parametrize('kind', ['ties-and-zeros', 'ties', 'continuous'])
+@pytest.mark.parametrize('n', [5, 12, 30, 50, 51, 80])
+@pytest.mark.parametrize('mode', MODES)
+def test_matrix_matches_the_single_pair_test(kind, n, mode):
+    _assert_matches_single_pair_test(_values(kind, 6, n, seed=n), mode)
+
+
+@pytest.mark.parametrize('mode', MODES)
+def test_matrix_spanning_several_batches_matches_the_single_pair_test(monkeypatch, mode):
+    values = _values('ties-and-zeros', 8, 20, seed=3)
+    single_batch = wilcoxon_signed_rank_matrix(values, mode)
+
+    # 28 pairs of 20 differences in batches of 3 pairs, the last one partial.
+    monkeypatch.setattr(wilcoxon_matrix, 'BATCH_CELLS', 60)
+    batched = wilcoxon_signed_rank_matrix(values, mode)
+
+    for field in ('R_plus', 'R_minus', 'T', 'p_value'):
+        np.testing.assert_array_equal(getattr(batched, field), getattr(single_batch, field))
+    _assert_matches_single_pair_test(values, mode)
+
+
+@pytest.mark.parametrize('correction', ['holm', 'bonferroni'])
+def test_pairwise_matrix_analysis(correction):
+    values = _values('ties', 5, 25, seed=1)
+    values[4] += 1.0
+    experiment_matrix = ExperimentMatrix([f'A{i}' for i in range(5)], [f'b{j}' for j in range(25)], values)
+
+    table, matrices, description = perform_pairwise_matrix_analysis(experiment_matrix, [4, 0, 2],
+                                                                    OptimizationMode.MINIMIZE, 0.05, correction)
+
+    result = wilcoxon_signed_rank_matrix(values[[4, 0, 2]], OptimizationMode.MINIMIZE)
+    rejected, adjusted, _, _ = multipletests(result.p_value, alpha=0.05, method=correction)
+    assert matrices['algorithms'] == ['A4', 'A0', 'A2']
+    assert [row[0] for row in table[1:]] == ['A4 vs A0', 'A4 vs A2', 'A0 vs A2']
+    assert description['comparisons'] == 3 and description['benchmark_cardinality'] == 25
+    assert description['significant_algorithms'] == [row[0] for row, reject in zip(table[1:], rejected) if reject]
+
+    for index, (i, j) in enumerate(zip(result.first, result.second)):
+        assert matrices['rPlus'][i][j] == result.R_plus[index] and matrices['rPlus'][j][i] == result.R_minus[index]
+        assert matrices['rMinus'][i][j] == result.R_minus[index]
+        assert matrices['pValues'][i][j] == matrices['pValues'][j][i] == result.p_value[index]
+        assert matrices['adjustedPValues'][j][i] == pytest.approx(adjusted[index])
+    assert all(matrices[name][i][i] is None for name in ('rPlus', 'pValues', 'nullHypothesis') for i in range(3))
@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+from app.services.stats.nonparametric.wilcoxon_test.wilcoxon_util import TABLE_ALPHAS, TABLE_MIN_N, TABLE_MAX_N, \
+    CRITICAL_TABLE, signed_rank_cdf, _compute_signed_rank_cdf
+
+
+@pytest.mark.parametrize('n', range(TABLE_MIN_N, TABLE_MAX_N + 1))
+def test_table_matches_exact_distribution(n):
+    # Every tabulated critical value is the largest t with P(T <= t) <= alpha / 2, and 'x' marks levels where even
+    # T = 0 is too likely.
+    cdf = signed_rank_cdf(n)
+    for alpha, critical in zip(TABLE_ALPHAS, CRITICAL_TABLE[n - TABLE_MIN_N]):
+        half_alpha = float(alpha) / 2
+        if critical < 0:
+            assert cdf[0] > half_alpha, f"n={n}, alpha={alpha}: T = 0 is significant but marked 'x'"
+        else:
+            assert cdf[critical] <= half_alpha, f"n={n}, alpha={alpha}: P(T <= {critical}) = {cdf[critical]:.4g}"
+            assert cdf[critical + 1] > half_alpha, f"n={n}, alpha={alpha}: {critical} is not the largest critical value"
+
+
+@pytest.mark.parametrize('n', [1, 2, 5, 10])
+def test_signed_rank_cdf_matches_enumeration(n):
+    # Each of the 2^n sign assignments is equally likely under the null hypothesis.
+    signs = (np.arange(2 ** n)[:, None] >> np.arange(n)) & 1
+    rank_sums = signs @ np.arange(1, n + 1)
+    expected = np.cumsum(np.bincount(rank_sums, minlength=n * (n + 1) // 2 + 1)) / 2 ** n
+    np.testing.assert_allclose(_compute_signed_rank_cdf(n), expected)
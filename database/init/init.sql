@@ -1,11 +1,13 @@
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 CREATE TABLE  IF NOT EXISTS algorithms (
     algorithm_id SERIAL PRIMARY KEY,
-    algorithm_name VARCHAR(255) NOT NULL
+    algorithm_name VARCHAR(255) NOT NULL UNIQUE
 );
 
 CREATE TABLE  IF NOT EXISTS benchmarks (
     benchmark_id SERIAL PRIMARY KEY,
-    benchmark_name VARCHAR(255) NOT NULL
+    benchmark_name VARCHAR(255) NOT NULL UNIQUE
 );
 
 CREATE TABLE  IF NOT EXISTS experiments (
@@ -13,7 +15,9 @@ CREATE TABLE  IF NOT EXISTS experiments (
     experiment_name VARCHAR(255) NOT NULL,
     experiment_description TEXT,
     alpha NUMERIC,
-    experiment_data json
+    experiment_data json,
+    experiment_matrix BYTEA,
+    matrix_version INTEGER NOT NULL DEFAULT 0
 );
 
 CREATE TABLE  IF NOT EXISTS experiment_algorithms (
@@ -32,15 +36,42 @@ CREATE TABLE  IF NOT EXISTS experiment_benchmarks (
     FOREIGN KEY (benchmark_id) REFERENCES benchmarks (benchmark_id)
 );
 
-CREATE TABLE  IF NOT EXISTS experiment_data (
-    data_id SERIAL PRIMARY KEY,
+CREATE TABLE  IF NOT EXISTS experiment_rank_states (
+    experiment_id INTEGER PRIMARY KEY,
+    algorithm_count INTEGER NOT NULL,
+    benchmark_count INTEGER NOT NULL,
+    rank_sums BYTEA NOT NULL,
+    tie_sum_total DOUBLE PRECISION NOT NULL,
+    algorithm_names TEXT[] NOT NULL,
+    FOREIGN KEY (experiment_id) REFERENCES experiments (experiment_id)
+);
+
+CREATE TABLE  IF NOT EXISTS experiment_matrix_columns (
     experiment_id INTEGER NOT NULL,
-    algorithm_id INTEGER NOT NULL,
-    benchmark_id INTEGER NOT NULL,
-    value NUMERIC NOT NULL,
-    FOREIGN KEY (experiment_id) REFERENCES experiments (experiment_id),
-    FOREIGN KEY (algorithm_id) REFERENCES algorithms (algorithm_id),
-    FOREIGN KEY (benchmark_id) REFERENCES benchmarks (benchmark_id)
+    position INTEGER NOT NULL,
+    benchmark_name VARCHAR(255) NOT NULL,
+    column_values BYTEA NOT NULL,
+    PRIMARY KEY (experiment_id, position),
+    FOREIGN KEY (experiment_id) REFERENCES experiments (experiment_id)
+);
+
+CREATE TABLE  IF NOT EXISTS experiment_runs (
+    experiment_id INTEGER PRIMARY KEY,
+    algorithm_count INTEGER NOT NULL,
+    benchmark_count INTEGER NOT NULL,
+    run_count INTEGER NOT NULL,
+    runs BYTEA NOT NULL,
+    FOREIGN KEY (experiment_id) REFERENCES experiments (experiment_id)
+);
+
+CREATE TABLE  IF NOT EXISTS experiment_pending_results (
+    experiment_id INTEGER NOT NULL,
+    benchmark_name VARCHAR(255) NOT NULL,
+    algorithm_name VARCHAR(255) NOT NULL,
+    value DOUBLE PRECISION NOT NULL,
+    received_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (experiment_id, benchmark_name, algorithm_name),
+    FOREIGN KEY (experiment_id) REFERENCES experiments (experiment_id)
 );
 
 CREATE TABLE  IF NOT EXISTS analyses (
@@ -72,3 +103,9 @@ CREATE TABLE  IF NOT EXISTS analysis_benchmarks (
     FOREIGN KEY (analysis_id) REFERENCES analyses (analysis_id),
     FOREIGN KEY (benchmark_id) REFERENCES benchmarks (benchmark_id)
 );
+
+CREATE INDEX IF NOT EXISTS experiments_name_trgm_idx ON experiments USING GIN (experiment_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS experiments_description_trgm_idx ON experiments USING GIN (experiment_description gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS analyses_name_trgm_idx ON analyses USING GIN (analysis_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS analyses_experiment_description_trgm_idx ON analyses USING GIN (experiment_description gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS analyses_notes_trgm_idx ON analyses USING GIN (analysis_notes gin_trgm_ops);
@@ -0,0 +1,93 @@
+-- Adds the unique name constraints that the bulk ingestion relies on to databases created before they were part of
+-- init.sql. Algorithms and benchmarks that share a name are first merged into the row with the lowest ID: every link to
+-- a duplicate is moved to that row, a link that would then repeat is dropped (keeping the one of the lowest ID), and the
+-- duplicate rows are deleted.
+-- Run once with: psql -U [username] -d [databasename] -f 001_unique_names.sql
+
+BEGIN;
+
+-- Every algorithm whose name is shared, mapped to the lowest ID with that name.
+CREATE TEMPORARY TABLE algorithm_id_map ON COMMIT DROP AS
+SELECT algorithm_id AS old_id, canonical_id AS new_id FROM (
+    SELECT algorithm_id,
+           MIN(algorithm_id) OVER (PARTITION BY algorithm_name) AS canonical_id,
+           COUNT(*) OVER (PARTITION BY algorithm_name) AS name_count
+    FROM algorithms
+) named WHERE name_count > 1;
+
+DELETE FROM experiment_algorithms link
+USING algorithm_id_map link_map, experiment_algorithms other, algorithm_id_map other_map
+WHERE link.algorithm_id = link_map.old_id
+  AND other.experiment_id = link.experiment_id
+  AND other.algorithm_id = other_map.old_id
+  AND other_map.new_id = link_map.new_id
+  AND other.algorithm_id < link.algorithm_id;
+
+UPDATE experiment_algorithms link SET algorithm_id = map.new_id
+FROM algorithm_id_map map WHERE link.algorithm_id = map.old_id AND map.old_id <> map.new_id;
+
+DELETE FROM analysis_algorithms link
+USING algorithm_id_map link_map, analysis_algorithms other, algorithm_id_map other_map
+WHERE link.algorithm_id = link_map.old_id
+  AND other.analysis_id = link.analysis_id
+  AND other.algorithm_id = other_map.old_id
+  AND other_map.new_id = link_map.new_id
+  AND other.algorithm_id < link.algorithm_id;
+
+UPDATE analysis_algorithms link SET algorithm_id = map.new_id
+FROM algorithm_id_map map WHERE link.algorithm_id = map.old_id AND map.old_id <> map.new_id;
+
+UPDATE experiment_data cell SET algorithm_id = map.new_id
+FROM algorithm_id_map map WHERE cell.algorithm_id = map.old_id AND map.old_id <> map.new_id;
+
+DELETE FROM algorithms WHERE algorithm_id IN (SELECT old_id FROM algorithm_id_map WHERE old_id <> new_id);
+
+-- Every benchmark whose name is shared, mapped to the lowest ID with that name.
+CREATE TEMPORARY TABLE benchmark_id_map ON COMMIT DROP AS
+SELECT benchmark_id AS old_id, canonical_id AS new_id FROM (
+    SELECT benchmark_id,
+           MIN(benchmark_id) OVER (PARTITION BY benchmark_name) AS canonical_id,
+           COUNT(*) OVER (PARTITION BY benchmark_name) AS name_count
+    FROM benchmarks
+) named WHERE name_count > 1;
+
+DELETE FROM experiment_benchmarks link
+USING benchmark_id_map link_map, experiment_benchmarks other, benchmark_id_map other_map
+WHERE link.benchmark_id = link_map.old_id
+  AND other.experiment_id = link.experiment_id
+  AND other.benchmark_id = other_map.old_id
+  AND other_map.new_id = link_map.new_id
+  AND other.benchmark_id < link.benchmark_id;
+
+UPDATE experiment_benchmarks link SET benchmark_id = map.new_id
+FROM benchmark_id_map map WHERE link.benchmark_id = map.old_id AND map.old_id <> map.new_id;
+
+DELETE FROM analysis_benchmarks link
+USING benchmark_id_map link_map, analysis_benchmarks other, benchmark_id_map other_map
+WHERE link.benchmark_id = link_map.old_id
+  AND other.analysis_id = link.analysis_id
+  AND other.benchmark_id = other_map.old_id
+  AND other_map.new_id = link_map.new_id
+  AND other.benchmark_id < link.benchmark_id;
+
+UPDATE analysis_benchmarks link SET benchmark_id = map.new_id
+FROM benchmark_id_map map WHERE link.benchmark_id = map.old_id AND map.old_id <> map.new_id;
+
+UPDATE experiment_data cell SET benchmark_id = map.new_id
+FROM benchmark_id_map map WHERE cell.benchmark_id = map.old_id AND map.old_id <> map.new_id;
+
+DELETE FROM benchmarks WHERE benchmark_id IN (SELECT old_id FROM benchmark_id_map WHERE old_id <> new_id);
+
+DO $$
+BEGIN
+    ALTER TABLE algorithms ADD CONSTRAINT algorithms_algorithm_name_key UNIQUE (algorithm_name);
+EXCEPTION WHEN duplicate_table OR duplicate_object THEN NULL;
+END $$;
+
+DO $$
+BEGIN
+    ALTER TABLE benchmarks ADD CONSTRAINT benchmarks_benchmark_name_key UNIQUE (benchmark_name);
+EXCEPTION WHEN duplicate_table OR duplicate_object THEN NULL;
+END $$;
+
+COMMIT;
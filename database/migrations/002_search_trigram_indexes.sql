@@ -0,0 +1,10 @@
+-- Adds the pg_trgm extension and the GIN trigram indexes used by the search endpoint to databases created before they were
+-- part of init.sql. Run once with: psql -U [username] -d [databasename] -f 002_search_trigram_indexes.sql
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS experiments_name_trgm_idx ON experiments USING GIN (experiment_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS experiments_description_trgm_idx ON experiments USING GIN (experiment_description gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS analyses_name_trgm_idx ON analyses USING GIN (analysis_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS analyses_experiment_description_trgm_idx ON analyses USING GIN (experiment_description gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS analyses_notes_trgm_idx ON analyses USING GIN (analysis_notes gin_trgm_ops);
@@ -0,0 +1,13 @@
+-- Adds the table holding the running Friedman rank sums of every stored experiment to databases created before it was
+-- part of init.sql. Rank states are derived from the stored matrices, so experiments stored earlier get theirs on first use.
+-- Run once with: psql -U [username] -d [databasename] -f 003_experiment_rank_states.sql
+
+CREATE TABLE IF NOT EXISTS experiment_rank_states (
+    experiment_id INTEGER PRIMARY KEY,
+    algorithm_count INTEGER NOT NULL,
+    benchmark_count INTEGER NOT NULL,
+    rank_sums BYTEA NOT NULL,
+    tie_sum_total DOUBLE PRECISION NOT NULL,
+    algorithm_names TEXT[] NOT NULL,
+    FOREIGN KEY (experiment_id) REFERENCES experiments (experiment_id)
+);
@@ -0,0 +1,14 @@
+-- Adds the table holding streamed results of benchmarks that not every algorithm has finished yet to databases created
+-- before it was part of init.sql. Results move into the experiment matrix, as a new column, once their benchmark is
+-- complete.
+-- Run once with: psql -U [username] -d [databasename] -f 004_experiment_pending_results.sql
+
+CREATE TABLE IF NOT EXISTS experiment_pending_results (
+    experiment_id INTEGER NOT NULL,
+    benchmark_name VARCHAR(255) NOT NULL,
+    algorithm_name VARCHAR(255) NOT NULL,
+    value DOUBLE PRECISION NOT NULL,
+    received_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (experiment_id, benchmark_name, algorithm_name),
+    FOREIGN KEY (experiment_id) REFERENCES experiments (experiment_id)
+);
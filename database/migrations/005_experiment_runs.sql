@@ -0,0 +1,13 @@
+-- Adds the table holding the raw results of every independent run of an experiment, as one NaN-padded
+-- (algorithms x benchmarks x runs) block of little-endian float64 values, to databases created before it was part of
+-- init.sql. experiment_data keeps one aggregated value per cell.
+-- Run once with: psql -U [username] -d [databasename] -f 005_experiment_runs.sql
+
+CREATE TABLE IF NOT EXISTS experiment_runs (
+    experiment_id INTEGER PRIMARY KEY,
+    algorithm_count INTEGER NOT NULL,
+    benchmark_count INTEGER NOT NULL,
+    run_count INTEGER NOT NULL,
+    runs BYTEA NOT NULL,
+    FOREIGN KEY (experiment_id) REFERENCES experiments (experiment_id)
+);
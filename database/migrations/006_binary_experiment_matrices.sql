@@ -0,0 +1,16 @@
+-- Adds the binary result matrix column to the experiments of databases created before it was part of init.sql, and the
+-- table of benchmark columns appended to an experiment after its matrix was written.
+-- Experiments stored earlier keep their JSON table until converted: each is converted on its first load, or all at once
+-- by running, from the 'backend' directory after this migration: python -m app.db.helpers.matrix_store
+-- Run once with: psql -U [username] -d [databasename] -f 006_binary_experiment_matrices.sql
+
+ALTER TABLE experiments ADD COLUMN IF NOT EXISTS experiment_matrix BYTEA;
+
+CREATE TABLE IF NOT EXISTS experiment_matrix_columns (
+    experiment_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    benchmark_name VARCHAR(255) NOT NULL,
+    column_values BYTEA NOT NULL,
+    PRIMARY KEY (experiment_id, position),
+    FOREIGN KEY (experiment_id) REFERENCES experiments (experiment_id)
+);
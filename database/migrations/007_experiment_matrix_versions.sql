@@ -0,0 +1,6 @@
+-- Adds the version counter of the binary result matrix to the experiments of databases created before it was part of
+-- init.sql. Every save of a matrix increments it, so the per-worker caches of decoded experiments can tell a stale
+-- entry from a fresh one with a single-row lookup.
+-- Run once with: psql -U [username] -d [databasename] -f 007_experiment_matrix_versions.sql
+
+ALTER TABLE experiments ADD COLUMN IF NOT EXISTS matrix_version INTEGER NOT NULL DEFAULT 0;
@@ -0,0 +1,32 @@
+-- Drops the per-cell 'experiment_data' table, which no query reads: the binary 'experiments.experiment_matrix' holds
+-- the results, and the experiment_algorithms and experiment_benchmarks tables record which names an experiment has.
+-- The links of experiments stored before they were written are taken from the cells before the table is dropped.
+-- The migration stops while any experiment has no binary matrix, so every experiment left after it loads from
+-- 'experiment_matrix'. Convert such experiments first by running, from the 'backend' directory:
+-- python -m app.db.helpers.matrix_store
+-- Run once with: psql -U [username] -d [databasename] -f 008_drop_experiment_cells.sql
+
+BEGIN;
+
+DO $$
+DECLARE
+    unconverted INTEGER;
+BEGIN
+    SELECT COUNT(*) INTO unconverted FROM experiments WHERE experiment_matrix IS NULL;
+    IF unconverted > 0 THEN
+        RAISE EXCEPTION '% experiments have no binary matrix yet; run python -m app.db.helpers.matrix_store before this migration.',
+            unconverted;
+    END IF;
+END $$;
+
+INSERT INTO experiment_algorithms (experiment_id, algorithm_id)
+SELECT DISTINCT experiment_id, algorithm_id FROM experiment_data
+ON CONFLICT DO NOTHING;
+
+INSERT INTO experiment_benchmarks (experiment_id, benchmark_id)
+SELECT DISTINCT experiment_id, benchmark_id FROM experiment_data
+ON CONFLICT DO NOTHING;
+
+DROP TABLE experiment_data;
+
+COMMIT;
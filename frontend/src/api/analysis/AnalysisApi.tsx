@@ -32,6 +32,7 @@ export const requestAnalysis = async (
             selectedRows,
             optimizationMode,
             experimentDescription,
+            renderPlots: true,
         };
 
         const endpoint = getEndpoint(analysisMode);
@@ -25,10 +25,14 @@ export const submitExperiment = async (
 	}
 };
 
-
-
-
-  
-  
-
-
+export const fetchExperiment = async (experimentId: number) => {
+	try {
+		const response = await apiClient.get(`api/experiments/${experimentId}`, { params: { include: 'table' } });
+		return response.data;
+	} 
+	catch (error: unknown)
+	{
+		if (error instanceof AxiosError) throw new Error(error?.response?.data?.error);
+		else throw new Error('An unknown error occurred.');
+	}
+};
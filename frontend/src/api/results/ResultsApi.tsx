@@ -26,4 +26,16 @@ export const submitResult = async (
 			if (error instanceof AxiosError) throw new Error(error?.response?.data?.error);
 			else throw new Error('An unknown error occurred.');
 		}
-};
\ No newline at end of file
+};
+
+export const fetchResult = async (analysisId: number) => {
+	try {
+		const response = await apiClient.get(`api/results/${analysisId}`);
+		return response.data;
+	} 
+	catch (error: unknown)
+	{
+		if (error instanceof AxiosError) throw new Error(error?.response?.data?.error);
+		else throw new Error('An unknown error occurred.');
+	}
+};
@@ -1,12 +1,13 @@
 import apiClient from '../../api';
 import { AxiosError } from 'axios';
-import { SearchType } from '../../types';
+import { SearchCursors, SearchPage, SearchType } from '../../types';
 
-export const searchQuery = async (searchType: SearchType, searchString: string = '') => {
+export const searchQuery = async (searchType: SearchType, searchString: string = '', cursor?: SearchCursors) => {
     try {
         const payload = {
             searchType,
             searchString,
+            ...(cursor ? { cursor } : {}),
         };
 
         const response = await apiClient.post('api/search', payload);
@@ -18,3 +19,12 @@ export const searchQuery = async (searchType: SearchType, searchString: string =
         throw new Error('An unknown error occurred.');
     }
 };
+
+export const searchNextPage = async (page: SearchPage) => {
+    // Only tables that returned a cursor have more rows; each is queried on its own so the exhausted ones do not
+    // restart from their first page. 'all' ignores the search string, so it pages by ID like an empty search.
+    const searchString = page.searchType === SearchType.All ? '' : page.searchString;
+    const responses = await Promise.all(Object.keys(page.cursors).map(table =>
+        searchQuery(table as SearchType, searchString, { [table]: page.cursors[table] })));
+    return Object.assign({}, ...responses);
+};
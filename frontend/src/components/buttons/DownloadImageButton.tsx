@@ -3,15 +3,16 @@ import { Button } from 'react-bootstrap';
 
 interface DownloadImageButtonProps {
     imageData: string;
+    mimeType?: string;
     filename: string;
 }
 
-const DownloadImageButton: React.FC<DownloadImageButtonProps> = ({ imageData, filename }) => {
+const DownloadImageButton: React.FC<DownloadImageButtonProps> = ({ imageData, mimeType = 'image/png', filename }) => {
     const downloadImage = () => {
         if (!imageData) return;
 
         const link = document.createElement('a');
-        link.href = `data:image/png;base64,${imageData}`;
+        link.href = `data:${mimeType};base64,${imageData}`;
         link.download = filename;
         document.body.appendChild(link);
         link.click();
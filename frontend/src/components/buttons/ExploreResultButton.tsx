@@ -4,6 +4,9 @@ import { useNavigate } from 'react-router-dom';
 import { SearchContext } from '../../contexts/SearchContext';
 import { LogClass } from '../../types';
 import { ResultType } from '../../types'
+import { fetchExperiment } from '../../api/experiments/ExperimentsApi';
+import { fetchResult } from '../../api/results/ResultsApi';
+import { processAnalysisRecord, processExperimentRecord } from '../../utils/result/ProcessResults';
 
 interface ExploreResultButtonProps {
     id: number;
@@ -16,16 +19,34 @@ const ExploreResultButton: React.FC<ExploreResultButtonProps> = ({ id, type, dat
     const { createLog } = useContext(SearchContext);
     const navigate = useNavigate();
 
-    const handleExploreResult = () => {
-        if (!data) {
+    const loadData = async () => {
+        if (data) return data;
+
+        if (type === ResultType.ANALYSIS) {
+            return processAnalysisRecord(await fetchResult(id));
+        }
+        return processExperimentRecord(await fetchExperiment(id));
+    }
+
+    const handleExploreResult = async () => {
+        let resultData;
+        try {
+            resultData = await loadData();
+        } catch (error) {
+            const message = error instanceof Error ? error.message : 'An unknown error occurred.';
+            createLog(`Could not load result ID ${id}: ${message}`, LogClass.ERROR);
+            return;
+        }
+
+        if (!resultData) {
             createLog(`No data available for result ID ${id}.`, LogClass.ERROR);
             return;
         }
 
         if (type === ResultType.ANALYSIS) {
-            navigate('/results', { state: { data: data, analysisName: item_name } });
+            navigate('/results', { state: { data: resultData, analysisName: item_name } });
         } else if (type === ResultType.EXPERIMENT) {
-            navigate('/analyser', { state: { data: data } });
+            navigate('/analyser', { state: { data: resultData } });
         }
     }
 
@@ -3,18 +3,21 @@ import DownloadImageButton from '../buttons/DownloadImageButton';
 
 interface CriticalDifferencePlotProps {
     imageData: string;
+    mimeType?: string;
     title: string;
 }
 
-const CriticalDifferencePlot: React.FC<CriticalDifferencePlotProps> = ({ imageData, title }) => {
+const CriticalDifferencePlot: React.FC<CriticalDifferencePlotProps> = ({ imageData, mimeType = 'image/png', title }) => {
     if (!imageData) return null;
 
+    const extension = mimeType === 'image/svg+xml' ? '.svg' : '.png';
+
     return (
         <div className="cd-diagram">
             <h2>{title}</h2>
-            <img src={`data:image/png;base64,${imageData}`} alt={title} />
+            <img src={`data:${mimeType};base64,${imageData}`} alt={title} />
             <div className="button-container">
-                <DownloadImageButton imageData={imageData} filename={title + '.png'} />
+                <DownloadImageButton imageData={imageData} mimeType={mimeType} filename={title + extension} />
             </div>
 
         </div>
@@ -17,7 +17,7 @@ const AllResult: React.FC<AllResultProps> = ({ analysisResult }) => {
     const mainContent = `
 ### All versus All Analysis (NvN) ###
 
-A all versus all analysis was conducted between all of the algorithms, using the \`Friedman Test\` with the \`Iman-Davenport correction\`, followed by seperate \`Holm and Neyemi post-hoc procedures\` to determine the significance of differences between algorithms.
+A all versus all analysis was conducted between all of the algorithms, using the \`Friedman Test\` with the \`Iman-Davenport correction\`, followed by seperate \`Holm, Nemenyi, Shaffer and Bergmann-Hommel post-hoc procedures\` to determine the significance of differences between algorithms.
 `;
 
     const theoryContent = `
@@ -44,7 +44,14 @@ for some pair of algorithms $\{j, l}$.
                 analysisResult={analysisResult}
                 comparisons={[
                     { postHocTestName: "Holm", significantAlgorithms: description.significant_algorithms_holm },
-                    { postHocTestName: "Nemenyi", significantAlgorithms: description.significant_algorithms_nemenyi }
+                    { postHocTestName: "Nemenyi", significantAlgorithms: description.significant_algorithms_nemenyi },
+                    { postHocTestName: "Shaffer", significantAlgorithms: description.significant_algorithms_shaffer },
+                    ...(description.bergmann_available
+                        ? [{ postHocTestName: "Bergmann-Hommel", significantAlgorithms: description.significant_algorithms_bergmann }]
+                        : []),
+                    ...(description.permutation
+                        ? [{ postHocTestName: "Permutation", significantAlgorithms: description.permutation.significant_algorithms }]
+                        : [])
                 ]}
             />
             {cdPlotData && (
@@ -5,6 +5,7 @@ import CriticalDifferencePlot from '../plots/CriticalDifferencePlot';
 
 interface CDPlotData {
     imageData: string;
+    mimeType?: string;
     title: string;
 }
 
@@ -44,6 +45,7 @@ The CD diagram is a powerful tool for visually summarizing complex statistical c
             {cdPlotData.map(plot => (
                 <CriticalDifferencePlot 
                     imageData={plot.imageData} 
+                    mimeType={plot.mimeType}
                     title={plot.title} 
                     key={plot.title}
                 />
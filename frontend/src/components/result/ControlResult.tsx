@@ -45,6 +45,9 @@ for some pair of algorithms $\{j, l}$.
                 analysisResult={analysisResult}
                 comparisons={[
                     { postHocTestName: "Holm", significantAlgorithms: description.significant_algorithms },
+                    ...(description.permutation
+                        ? [{ postHocTestName: "Permutation (Holm)", significantAlgorithms: description.permutation.significant_algorithms }]
+                        : [])
                 ]}
             />
 
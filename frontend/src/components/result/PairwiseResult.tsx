@@ -11,6 +11,7 @@ interface PairwiseResultProps {
 const PairwiseResult: React.FC<PairwiseResultProps> = ({ analysisResult }) => {
     const analysisData = analysisResult.analysisData || [];
     const cTable = analysisResult.cTable || [];
+    const runTable = analysisResult.runTable;
     const description = analysisResult.description || 'No description available';
 
     const initialContent = `
@@ -77,6 +78,12 @@ The p-value ($p = ${description.p_value}$) is compared against the predefined al
 The table below shows critical values ($c$) obtained for various levels of significance with ${description.benchmark_cardinality} degrees of freedom from a Wilcoxon T distribution. The test statistic ($T = ${description.t}$) is compared against these critical values. If $T \\leq c$ the null hypothesis $H_0$ of equality is rejected, an indication that a given algorithm outperforms the other one. If $T > c$, then $H_0$ is not rejected, an indication that no significant difference exists between the performance of the two algorithms.
 `;
 
+    const runContent = description.runs ? `
+#### **Run Dispersion and Effect Size** ####
+
+The Wilcoxon test above compares the ${description.runs.aggregation} of up to ${description.runs.max_runs} independent runs per benchmark. The table below gives the mean and standard deviation of the runs of both algorithms on every benchmark, and the Vargha-Delaney $A_{12}$ effect size: the probability that a run of \`${description.algorithm_one}\` beats a run of \`${description.algorithm_two}\`, with ties counting half. The mean $A_{12}$ over all benchmarks is ${description.runs.mean_a12}, with ${description.runs.large_effects} large effect(s).
+` : '';
+
     return (
         <div className='pairwise-container'>
             <MarkdownDisplay content={initialContent} />
@@ -86,6 +93,12 @@ The table below shows critical values ($c$) obtained for various levels of signi
             <MarkdownDisplay content={mainContentThree} />
             <MarkdownDisplay content={finalContent} />
             <WilcoxonCriticalTable analysisData={cTable} title='Critical values' />
+            {runTable && (
+                <>
+                    <MarkdownDisplay content={runContent} />
+                    <ResultTable analysisData={runTable} title='Run Dispersion' />
+                </>
+            )}
         </div>
     );
 }
@@ -5,9 +5,10 @@ import ExpandableMarkdown from '../general/ExpandableMarkdown';
 
 interface RankMarkdownProps {
     ranksData: string[][];
+    bootstrap?: any;
 }
 
-const RankMarkdown: React.FC<RankMarkdownProps> = ({ ranksData }) => {
+const RankMarkdown: React.FC<RankMarkdownProps> = ({ ranksData, bootstrap }) => {
     const initialContent = `
 #### **Algorithm Ranks** ####
 The crucial first step of the Friedman Test is to rank the algorithms based on performance across all benchmark functions.
@@ -23,12 +24,23 @@ For each algorithm $j$, average the ranks obtained in all problems to obtain the
 The table below provides an overview of the ranks for each algorithm:
 `;
 
+    const bootstrapContent = bootstrap ? `
+#### **Rank Stability** ####
+The benchmark suite was resampled with replacement ${bootstrap.replicates} times (seed ${bootstrap.seed}) to estimate how stable each mean rank and final position is. The table below gives the ${bootstrap.confidence * 100}% percentile intervals, computed in ${bootstrap.elapsed_seconds} s using ${bootstrap.workers} worker process(es).
+` : '';
+
     return (
         <>
             <MarkdownDisplay content={initialContent} />
             <ExpandableMarkdown previewContent="" fullContent={expandableContent} />
             <MarkdownDisplay content={finalContent} />
             <RanksTable title='Algorithm Ranks' ranksData={ranksData} />
+            {bootstrap && (
+                <>
+                    <MarkdownDisplay content={bootstrapContent} />
+                    <RanksTable title='Bootstrap Rank Intervals' ranksData={bootstrap.table.slice(1)} />
+                </>
+            )}
         </>
     );
 }
@@ -10,11 +10,12 @@ interface StandardFriedmanMarkdownProps {
 const StandardFriedmanMarkdown: React.FC<StandardFriedmanMarkdownProps> = ({ analysisResult }) => {
     const ranksData = analysisResult.ranksTable || [];
     const description = analysisResult.description || 'No description available';
+    const omnibusTests: any[] = description.omnibus_tests || [];
 
     const initialContent = `
 #### **Test Parameters** ####
 \`\`\`
-- Test Applied: Friedman Test with Iman-Davenport Correction
+- Test Applied: ${description.omnibus_test && description.omnibus_test !== 'friedman' ? description.test_applied : 'Friedman Test with Iman-Davenport Correction'}
 - Alpha (Significance Level): ${description.alpha}
 - Number of Algorithms: ${description.algorithm_cardinality}
 - Number of Benchmark Functions: ${description.benchmark_cardinality}
@@ -36,6 +37,11 @@ ${description.hypothesis_test_result}
 - Iman-Davenport Critical Value: ${description.iman_davenport_critical}
 - Significant Algorithms: ${description.significant_algorithms.join(', ')}
 \`\`\`
+${omnibusTests.length > 0 ? `
+| Omnibus Test | Statistic | Distribution | p-value | Null Hypothesis |
+| --- | --- | --- | --- | --- |
+${omnibusTests.map(test => `| ${test.name} | ${test.statistic} | ${test.distribution} | ${test.p_value} | ${test.significant ? 'Rejected' : 'Retained'} |`).join('\n')}
+` : ''}
 
 ---
 ### **Significance Analysis** ###
@@ -104,7 +110,7 @@ ${description.iman_davenport_stat > description.iman_davenport_critical ?
         <>
             <MarkdownDisplay content={initialContent} />
             <ExpandableMarkdown previewContent="" fullContent={expandableContent} />
-            <RankMarkdown ranksData={ranksData} />
+            <RankMarkdown ranksData={ranksData} bootstrap={description.bootstrap} />
             <MarkdownDisplay content={finalContent} />
         </>
     );
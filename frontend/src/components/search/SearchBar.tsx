@@ -2,12 +2,12 @@ import React, { FunctionComponent, useState, useContext } from 'react';
 import { Button } from 'react-bootstrap';
 import { SearchContext } from '../../contexts/SearchContext';
 import { searchQuery } from '../../api/search/SearchApi';
-import { processResults } from '../../utils/result/ProcessResults';
+import { processResults, countResults, nextCursors } from '../../utils/result/ProcessResults';
 import { LogClass, SearchType } from '../../types';
 
 const SearchBar: FunctionComponent = () => {
   const [query, setQuery] = useState<string>('');
-  const { createLog, setResults } = useContext(SearchContext);
+  const { createLog, setResults, setNextPage } = useContext(SearchContext);
 
   const handleSearch = async () => {
     const trimmedQuery = query.trim();
@@ -40,8 +40,10 @@ const SearchBar: FunctionComponent = () => {
     try {
       const data = await searchQuery(searchType, searchString);
       const processedResults = processResults(data);
+      const total = countResults(data);
       setResults(processedResults);
-      createLog('Search completed successfully.', LogClass.SUCCESS);
+      setNextPage({ searchType, searchString, cursors: nextCursors(data), total });
+      createLog(`Search completed successfully. Showing ${processedResults.length} of ${total} results.`, LogClass.SUCCESS);
     } catch (error) {
       if (error instanceof Error) {
         createLog(`Error during search: ${error.message}`, LogClass.ERROR);
@@ -16,6 +16,8 @@ The Search Bar allows you to quickly find results in three categories: All, Expe
 - \`[exp]\`: To search within **Experiments**, prefix your query with \`[exp]\`.
 - \`[als]\`: To search within **Analyses**, prefix your query with \`[als]\`.
 
+Results arrive 50 per category at a time; use Load more below the table to fetch the next ones.
+
 \`\`\`
 `;
 
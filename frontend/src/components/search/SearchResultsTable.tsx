@@ -1,12 +1,16 @@
-import React, { FunctionComponent, useContext, useEffect, useRef } from 'react';
+import React, { FunctionComponent, useContext, useEffect, useRef, useState } from 'react';
+import { Button } from 'react-bootstrap';
 import { SearchContext } from '../../contexts/SearchContext';
+import { searchNextPage } from '../../api/search/SearchApi';
+import { processResults, nextCursors } from '../../utils/result/ProcessResults';
 import Table from 'react-bootstrap/Table';
 import './SearchResultsTable.css';
 import { LogClass } from '../../types';
 import ExploreResultButton from '../buttons/ExploreResultButton';
 
 const SearchResultsTable: FunctionComponent = () => {
-  const { results, createLog } = useContext(SearchContext);
+  const { results, setResults, nextPage, setNextPage, createLog } = useContext(SearchContext);
+  const [loading, setLoading] = useState<boolean>(false);
   const prevResultsRef = useRef(results);
 
   useEffect(() => {
@@ -17,6 +21,32 @@ const SearchResultsTable: FunctionComponent = () => {
     prevResultsRef.current = results;
   }, [results, createLog]);
 
+  const hasMore = nextPage !== null && Object.keys(nextPage.cursors).length > 0;
+
+  const handleLoadMore = async () => {
+    if (nextPage === null) {
+      return;
+    }
+
+    setLoading(true);
+    try {
+      const data = await searchNextPage(nextPage);
+      const processedResults = processResults(data);
+      const shown = results.length + processedResults.length;
+      setResults(previous => [...previous, ...processedResults]);
+      setNextPage({ ...nextPage, cursors: nextCursors(data) });
+      createLog(`Loaded ${processedResults.length} more results. Showing ${shown} of ${nextPage.total} results.`, LogClass.SUCCESS);
+    } catch (error) {
+      if (error instanceof Error) {
+        createLog(`Error while loading more results: ${error.message}`, LogClass.ERROR);
+      } else {
+        createLog('An unknown error occurred while loading more results.', LogClass.ERROR);
+      }
+    } finally {
+      setLoading(false);
+    }
+  };
+
   if (results.length === 0) {
     return null;
   }
@@ -45,6 +75,11 @@ const SearchResultsTable: FunctionComponent = () => {
           ))}
         </tbody>
       </Table>
+      {hasMore && (
+        <Button className='load-more-button' onClick={handleLoadMore} disabled={loading}>
+          {loading ? 'Loading...' : 'Load more'}
+        </Button>
+      )}
     </div>
   );
 }
@@ -1,5 +1,5 @@
 import React, { Dispatch, SetStateAction } from 'react';
-import { Log, LogClass, Result} from '../types';
+import { Log, LogClass, Result, SearchPage } from '../types';
 
 export const SearchContext = React.createContext({
     logs: [] as Log[],
@@ -7,4 +7,6 @@ export const SearchContext = React.createContext({
     createLog: (() => {}) as (message: string, logClass: LogClass) => void,
     results: [] as Result[],
     setResults: (() => {}) as Dispatch<SetStateAction<Result[]>>,
+    nextPage: null as SearchPage | null,
+    setNextPage: (() => {}) as Dispatch<SetStateAction<SearchPage | null>>,
 });
\ No newline at end of file
@@ -4,7 +4,7 @@
  * This component acts as a context provider for managing and sharing state related to search functionality within the application.
  *
  * State Management:
- * - Manages state elements such as logs and search results.
+ * - Manages state elements such as logs, search results and the cursors of the next page of results.
  * - Utilizes useState for local state management within the context.
  * - Provides a function 'createLog' to encapsulate log management logic, enabling easy tracking of user actions and system events.
  *
@@ -27,12 +27,13 @@
 
 import React, { useState, useCallback } from 'react';
 import { SearchContext } from './SearchContext';
-import { Log, LogClass, Result } from '../types';
+import { Log, LogClass, Result, SearchPage } from '../types';
 import { createLog as createLogFunction} from '../utils/LoggerUtils';
 
 const SearchProvider = ({ children }: { children: React.ReactNode }) => {
     const [logs, setLogs] = useState<Log[]>([]);
     const [results, setResults] = useState<Result[]>([]);
+    const [nextPage, setNextPage] = useState<SearchPage | null>(null);
 
     const createLog = useCallback((message: string, logClass: LogClass) => {
         createLogFunction(setLogs, message, logClass);
@@ -46,6 +47,8 @@ const SearchProvider = ({ children }: { children: React.ReactNode }) => {
             createLog,
             results,
             setResults,
+            nextPage,
+            setNextPage,
         }}>
             {children}
         </SearchContext.Provider>
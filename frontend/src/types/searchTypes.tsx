@@ -4,3 +4,12 @@ export enum SearchType {
     Analyses = "analyses",
     All = "all"
 }
+
+export type SearchCursors = { [table: string]: unknown };
+
+export interface SearchPage {
+    searchType: SearchType;
+    searchString: string;
+    cursors: SearchCursors;
+    total: number;
+}
@@ -1,40 +1,43 @@
-import { Result, ResultType } from '../../types'
+import { Result, ResultType, SearchCursors } from '../../types'
+
+export function processAnalysisRecord(analysis: any) {
+  return {
+    ...analysis.result_data,
+    analysisNotes: analysis.analysis_notes,
+    experimentDescription: analysis.experiment_description,
+  };
+}
+
+export function processExperimentRecord(experiment: any) {
+  return {
+    experimentData: {
+      ...experiment.experiment_data,
+      experimentDescription: experiment.experiment_description,
+    },
+  };
+}
 
 export function processResults(data: any): Result[] {
   const results: Result[] = [];
 
   if (data.analyses) {
-    data.analyses.forEach((analysis: any) => {
-
-      const extendedResultData = {
-        ...analysis.result_data,
-        analysisNotes: analysis.analysis_notes,
-        experimentDescription: analysis.experiment_description,
-      };
-
+    data.analyses.items.forEach((analysis: any) => {
       results.push({
         id: analysis.analysis_id,
         name: analysis.analysis_name,
         type: ResultType.ANALYSIS,
-        data: extendedResultData,
+        data: analysis.result_data ? processAnalysisRecord(analysis) : undefined,
       });
     });
   }
 
   if (data.experiments) {
-    data.experiments.forEach((experiment: any) => {
-      const extendedExperimentData = {
-        ...experiment.experiment_data,
-        experimentDescription: experiment.experiment_description,
-      };
-
+    data.experiments.items.forEach((experiment: any) => {
       results.push({
         id: experiment.experiment_id,
         name: experiment.experiment_name,
         type: ResultType.EXPERIMENT,
-        data: {
-          experimentData: extendedExperimentData,
-        }
+        data: experiment.experiment_data ? processExperimentRecord(experiment) : undefined,
       });
     });
   }
@@ -42,5 +45,16 @@ export function processResults(data: any): Result[] {
   return results;
 }
 
+export function countResults(data: any): number {
+  return (data.analyses?.total ?? 0) + (data.experiments?.total ?? 0);
+}
 
-  
\ No newline at end of file
+export function nextCursors(data: any): SearchCursors {
+  const cursors: SearchCursors = {};
+  ['experiments', 'analyses'].forEach(table => {
+    if (data[table]?.nextCursor != null) {
+      cursors[table] = data[table].nextCursor;
+    }
+  });
+  return cursors;
+}